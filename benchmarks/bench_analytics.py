@@ -0,0 +1,111 @@
+"""Kline analytics over a long series: NumPy summarize() against the same indicators in plain Python,
+and the size of the summary against the candles it replaces.
+
+Both sides start from Bybit's kline rows (lists of strings) and compute returns, VWAP,
+ATR, EMA and realized volatility. Parsing the rows into floats and computing the
+indicators are timed separately, then together. The plain Python version is the
+straightforward loop an agent or a client script would write.
+
+Response sizes are compact JSON: the get_kline_range payload against the
+get_kline_analytics payload.
+
+Usage: python benchmarks/bench_analytics.py [--bars N] [--rounds N] [--period N]
+"""
+
+import argparse
+import math
+import random
+import time
+
+from util import report
+
+from bybit_mcp_server import client
+from bybit_mcp_server.analytics import INDICATORS, summarize, summarize_array, to_array
+from bybit_mcp_server.klines import range_payload
+
+MINUTE = 60_000
+
+
+def make_bars(count: int) -> list[list[str]]:
+    rng = random.Random(7)
+    bars, close = [], 30_000.0
+    for i in range(count):
+        open_ = close
+        close = open_ * math.exp(rng.gauss(0, 0.001))
+        high = max(open_, close) * (1 + rng.random() * 0.0005)
+        low = min(open_, close) * (1 - rng.random() * 0.0005)
+        volume = rng.uniform(1, 50)
+        prices = [f"{price:.2f}" for price in (open_, high, low, close)]
+        bars.append([str(i * MINUTE), *prices, f"{volume:.3f}", f"{volume * close:.2f}"])
+    return bars
+
+
+def parse_python(bars: list[list[str]]) -> list[list[float]]:
+    return [[float(value) for value in bar[:7]] for bar in bars]
+
+
+def summarize_python(rows: list[list[float]], step_ms: int, period: int) -> dict:
+    closes = [row[4] for row in rows]
+    log_returns = [math.log(b / a) for a, b in zip(closes, closes[1:])]
+    mean = sum(log_returns) / len(log_returns)
+    std = math.sqrt(sum((r - mean) ** 2 for r in log_returns) / (len(log_returns) - 1))
+    volume = sum(row[5] for row in rows)
+    vwap = sum((row[2] + row[3] + row[4]) / 3 * row[5] for row in rows) / volume
+    ranges = [rows[0][2] - rows[0][3]]
+    ranges += [max(row[2], prev[4]) - min(row[3], prev[4]) for prev, row in zip(rows, rows[1:])]
+    atr = sum(ranges[:period]) / period
+    for value in ranges[period:]:
+        atr += (value - atr) / period
+    alpha = 2 / (period + 1)
+    ema = sum(closes[:period]) / period
+    for value in closes[period:]:
+        ema = alpha * value + (1 - alpha) * ema
+    return {
+        "returns": {"total": closes[-1] / rows[0][1] - 1, "meanLog": mean, "stdLog": std, "lastLog": log_returns[-1]},
+        "vwap": vwap,
+        "atr": atr,
+        "ema": ema,
+        "volatility": {"perBar": std, "annualized": std * math.sqrt(365 * 86_400_000 / step_ms)},
+    }
+
+
+def _time(fn, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--period", type=int, default=14)
+    args = parser.parse_args()
+
+    bars = make_bars(args.bars)
+    data, rows = to_array(bars), parse_python(bars)
+    fast = summarize(bars, MINUTE, INDICATORS, args.period)
+    slow = summarize_python(rows, MINUTE, args.period)
+    for name in ("vwap", "atr", "ema"):
+        assert math.isclose(fast[name], slow[name], rel_tol=1e-9), name
+
+    print(f"{args.bars} bars, all indicators, period {args.period}")
+    report("parse: numpy", _time(lambda: to_array(bars), args.rounds))
+    report("parse: python", _time(lambda: parse_python(bars), args.rounds))
+    report("indicators: numpy", _time(lambda: summarize_array(data, MINUTE, INDICATORS, args.period), args.rounds))
+    report("indicators: python", _time(lambda: summarize_python(rows, MINUTE, args.period), args.rounds))
+    report("total: numpy", _time(lambda: summarize(bars, MINUTE, INDICATORS, args.period), args.rounds))
+    report("total: python", _time(lambda: summarize_python(parse_python(bars), MINUTE, args.period), args.rounds))
+
+    end = (args.bars - 1) * MINUTE
+    candles = client.format_payload(range_payload("linear", "BTCUSDT", "1", 0, end, bars), "compact")
+    summary = client.format_payload({"category": "linear", "symbol": "BTCUSDT", "interval": "1", **fast}, "compact")
+    print(f"{'get_kline_range':<24} {len(candles):>12,} bytes")
+    print(f"{'get_kline_analytics':<24} {len(summary):>12,} bytes")
+
+
+if __name__ == "__main__":
+    main()
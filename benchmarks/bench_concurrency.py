@@ -0,0 +1,53 @@
+"""Wall time for N concurrent tool calls against a stub that delays every response.
+
+Compares calling pybit inline from async code (blocks the event loop, so calls
+serialize) with client.call (offloaded to the worker pool, so calls overlap).
+
+Usage: python benchmarks/bench_concurrency.py [--calls N] [--delay SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from stub_server import StubServer
+
+from bybit_mcp_server import client
+
+
+async def _inline(session) -> None:
+    session.get_tickers(category="linear", symbol="BTCUSDT")
+
+
+async def _offloaded(session) -> None:
+    await client.call(session.get_tickers, category="linear", symbol="BTCUSDT")
+
+
+async def _run(fn, calls: int) -> float:
+    session = client.get_session()
+    started = time.perf_counter()
+    await asyncio.gather(*(fn(session) for _ in range(calls)))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with StubServer(delay=args.delay) as server:
+        os.environ["BYBIT_BASE_URL"] = server.url
+        # The stub has no rate limits; measure the client, not the throttle.
+        os.environ.setdefault("BYBIT_RATE_LIMITS", "market=0")
+        os.environ.setdefault("BYBIT_MAX_WORKERS", str(args.calls))
+        os.environ.setdefault("BYBIT_HTTP_POOL_SIZE", str(args.calls))
+        print(f"{args.calls} concurrent calls, {args.delay * 1000:.0f} ms server delay")
+        print(f"inline (blocking)   {asyncio.run(_run(_inline, args.calls)):.3f} s")
+        print(f"client.call         {asyncio.run(_run(_offloaded, args.calls)):.3f} s")
+        client.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
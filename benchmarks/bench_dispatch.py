@@ -0,0 +1,95 @@
+"""Per-call cost of the in-process dispatch path, with no REST call behind it.
+
+Times each layer a tool call passes through, in microseconds per call:
+
+- require_mode: a permission-gated no-op coroutine against the bare coroutine
+- get_session: fetching the shared pybit session once it exists
+- format_payload: encoding a small result in compact form
+- call_tool: FastMCP.call_tool for get_server_time served from the market cache
+- tools/call handler: the MCP request handler around call_tool, which also builds the
+  CallToolResult and, for tools with an output schema, validates the result against it.
+  Run for the server's BybitMCP and a plain FastMCP
+
+Usage: python benchmarks/bench_dispatch.py [--calls N]
+"""
+
+import argparse
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from unittest.mock import patch
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+from bybit_mcp_server.client import format_payload, get_session
+from bybit_mcp_server.decorators import instrument_tools, require_mode
+from bybit_mcp_server.server import BybitMCP
+from bybit_mcp_server.tools.market import register_market_tools
+
+SERVER_TIME = {"retCode": 0, "retMsg": "OK", "result": {"timeSecond": "1700000000", "timeNano": "1700000000000000000"}}
+
+
+class FakeSession:
+    endpoint = "http://fake"
+
+    def get_server_time(self, **params):
+        return SERVER_TIME
+
+
+async def _per_call_us(fn: Callable[[], Awaitable[object]], calls: int) -> float:
+    for _ in range(min(calls, 1000)):
+        await fn()
+    started = time.perf_counter()
+    for _ in range(calls):
+        await fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def _app(cls: type[FastMCP]) -> FastMCP:
+    app = cls("bench")
+    register_market_tools(app)
+    instrument_tools(app)
+    return app
+
+
+async def _run(calls: int) -> list[tuple[str, float]]:
+    async def bare():
+        return "ok"
+
+    gated = require_mode("read")(bare)
+
+    async def session():
+        get_session()
+
+    async def encode():
+        format_payload(SERVER_TIME["result"], "compact")
+
+    bybit, plain = _app(BybitMCP), _app(FastMCP)
+    request = CallToolRequest(params=CallToolRequestParams(name="get_server_time", arguments={}))
+    rows = [
+        ("bare coroutine", await _per_call_us(bare, calls)),
+        ("require_mode", await _per_call_us(gated, calls)),
+        ("get_session", await _per_call_us(session, calls)),
+        ("format_payload", await _per_call_us(encode, calls)),
+    ]
+    with patch("bybit_mcp_server.tools.market.get_session", return_value=FakeSession()):
+        for label, app in (("BybitMCP", bybit), ("FastMCP", plain)):
+            call = functools.partial(app.call_tool, "get_server_time", {})
+            rows.append((f"call_tool ({label})", await _per_call_us(call, calls)))
+            handler = functools.partial(app._mcp_server.request_handlers[CallToolRequest], request)
+            rows.append((f"tools/call handler ({label})", await _per_call_us(handler, calls)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    for label, us in asyncio.run(_run(args.calls)):
+        print(f"{label:<32}{us:>10.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Response size and encode time per output format, for a full-category tickers payload,
+with and without a field projection.
+
+Usage: python benchmarks/bench_encoding.py [--symbols N] [--rounds N]
+"""
+
+import argparse
+import time
+
+from util import report
+
+from bybit_mcp_server import client
+from bybit_mcp_server.filters import ListQuery
+
+FIELDS = (
+    "lastPrice",
+    "indexPrice",
+    "markPrice",
+    "prevPrice24h",
+    "price24hPcnt",
+    "highPrice24h",
+    "lowPrice24h",
+    "prevPrice1h",
+    "openInterest",
+    "openInterestValue",
+    "turnover24h",
+    "volume24h",
+    "fundingRate",
+    "nextFundingTime",
+    "bid1Price",
+    "bid1Size",
+    "ask1Price",
+    "ask1Size",
+)
+
+
+def _tickers(symbols: int) -> dict:
+    rows = [{"symbol": f"SYM{i}USDT", **{field: f"{i * 1.2345:.4f}" for field in FIELDS}} for i in range(symbols)]
+    return {"category": "linear", "list": rows}
+
+
+def _measure(response: dict, query: ListQuery, output_format: str, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        client.format_result(query.apply(response), output_format)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    response = {"retCode": 0, "result": _tickers(args.symbols)}
+    queries = {"all fields": ListQuery(), "3 fields": ListQuery(fields=["symbol", "lastPrice", "fundingRate"])}
+    print(f"{args.symbols} tickers, orjson {'on' if client.orjson else 'off'}")
+    for name, query in queries.items():
+        for output_format in ("pretty", "compact", "table"):
+            label = f"{name}, {output_format}"
+            size = len(client.format_result(query.apply(response), output_format).encode())
+            print(f"{label:<24} {size:>10} bytes")
+            report("  encode", _measure(response, query, output_format, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Throughput of the range kline downloader vs. concurrency against a delayed local stub.
+
+Usage: python benchmarks/bench_kline_range.py [--days N] [--delay SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from stub_server import StubServer
+
+from bybit_mcp_server import client
+from bybit_mcp_server.klines import fetch_range
+
+DAY_MS = 86_400_000
+
+
+async def _download(days: int, concurrency: int) -> tuple[int, float]:
+    end = int(time.time() * 1000) // 60_000 * 60_000
+    started = time.perf_counter()
+    payload = await fetch_range(client.get_session(), "linear", "BTCUSDT", "1", end - days * DAY_MS, end, concurrency)
+    return payload["count"], time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StubServer(delay=args.delay) as server:
+        os.environ["BYBIT_BASE_URL"] = server.url
+        # The stub has no rate limits; measure the client, not the throttle.
+        os.environ.setdefault("BYBIT_RATE_LIMITS", "market=0")
+        os.environ.setdefault("BYBIT_MAX_WORKERS", "16")
+        os.environ.setdefault("BYBIT_HTTP_POOL_SIZE", "16")
+        print(f"{args.days} days of 1m bars, {args.delay * 1000:.0f} ms server delay")
+        for concurrency in (1, 2, 4, 8, 16):
+            bars, elapsed = asyncio.run(_download(args.days, concurrency))
+            print(f"concurrency {concurrency:>2}   {bars} bars in {elapsed:6.3f} s   {bars / elapsed:10.0f} bars/s")
+        client.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
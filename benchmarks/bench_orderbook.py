@@ -0,0 +1,81 @@
+"""Delta throughput: the local OrderBook vs pybit's built-in orderbook merge.
+
+pybit's WebSocket merges each delta into a list-based book and deep-copies the
+whole book for every callback; OrderBook updates sorted levels in place.
+
+Usage: python benchmarks/bench_orderbook.py [--depth N] [--deltas N]
+"""
+
+import argparse
+import copy
+import random
+import time
+
+from pybit._websocket_stream import _V5WebSocketManager
+
+from bybit_mcp_server.orderbook import OrderBook
+
+TOPIC = "orderbook.{depth}.BTCUSDT"
+
+
+def _messages(depth: int, deltas: int) -> list[dict]:
+    """A snapshot followed by deltas that update, delete and re-insert levels."""
+    rng = random.Random(7)
+    bids = {50_000 - i * 0.5: rng.uniform(0.1, 5) for i in range(depth)}
+    asks = {50_000.5 + i * 0.5: rng.uniform(0.1, 5) for i in range(depth)}
+
+    def levels(side: dict) -> list[list[str]]:
+        return [[f"{price:.1f}", f"{size:.3f}"] for price, size in side.items()]
+
+    grids = {id(bids): list(bids), id(asks): list(asks)}
+    messages = [{"type": "snapshot", "ts": 0, "data": {"b": levels(bids), "a": levels(asks), "u": 1, "seq": 1}}]
+    for u in range(2, deltas + 2):
+        b, a = [], []
+        for side, out in ((bids, b), (asks, a)):
+            for price in rng.sample(grids[id(side)], 3):
+                if price in side and rng.random() < 0.2:
+                    out.append([f"{price:.1f}", "0"])
+                    del side[price]
+                else:
+                    side[price] = rng.uniform(0.1, 5)
+                    out.append([f"{price:.1f}", f"{side[price]:.3f}"])
+        messages.append({"type": "delta", "ts": u, "data": {"b": b, "a": a, "u": u, "seq": u}})
+    return messages
+
+
+def _local(messages: list[dict], depth: int) -> float:
+    book = OrderBook("linear", "BTCUSDT", depth)
+    started = time.perf_counter()
+    for message in messages:
+        book.apply(message)
+        book.snapshot(25)
+    return time.perf_counter() - started
+
+
+def _pybit(messages: list[dict], depth: int) -> float:
+    manager = _V5WebSocketManager.__new__(_V5WebSocketManager)
+    manager.data = {}
+    topic = TOPIC.format(depth=depth)
+    started = time.perf_counter()
+    for message in messages:
+        message = copy.deepcopy(message)
+        manager._process_delta_orderbook(message, topic)
+        copy.deepcopy(manager.data[topic])
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--deltas", type=int, default=5000)
+    args = parser.parse_args()
+
+    messages = _messages(args.depth, args.deltas)
+    print(f"{args.deltas} deltas on a {args.depth}-level book")
+    for label, run in (("OrderBook", _local), ("pybit merge", _pybit)):
+        elapsed = run(messages, args.depth)
+        print(f"{label:<12} {elapsed * 1000:9.1f} ms   {len(messages) / elapsed:10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Market reads against a degraded API: retries, hedging and the circuit breaker.
+
+The first table reads tickers from the stub V5 API while it drops --drop-rate of its
+replies, answers --error-rate of requests with HTTP 503 and holds --slow-rate of
+them for another --slow seconds:
+
+- single: one attempt per read (BYBIT_READ_RETRIES=0), as before reads were retried
+- retries: transient failures retried with backoff (BYBIT_READ_RETRIES, default 2)
+- retries + hedge: also sends a second request for reads still unanswered after
+  --hedge-after seconds
+
+The second table reads while every request fails with 503, with the circuit breaker
+off and on, to show how long the caller waits to learn that Bybit is down.
+"requests" is how many requests reached the stub. Client-side rate limiting is off.
+
+Usage: python benchmarks/bench_reads.py [--reads N] [--clients N] [--drop-rate F] [--error-rate F]
+       [--slow-rate F] [--slow S] [--hedge-after S]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from stub_server import StubServer
+from util import percentile
+
+from bybit_mcp_server.client import call, get_session
+from bybit_mcp_server.config import reload_settings
+from bybit_mcp_server.resilience import breakers
+
+PARAMS = {"category": "linear", "symbol": "BTCUSDT"}
+
+
+async def _run(reads: int, clients: int) -> tuple[int, list[float]]:
+    semaphore = asyncio.Semaphore(clients)
+    latencies: list[float] = []
+    failed = 0
+
+    async def one() -> None:
+        nonlocal failed
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(get_session().get_tickers, **PARAMS)
+            except Exception:
+                failed += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(reads)))
+    return failed, latencies
+
+
+def _measure(label: str, server: StubServer, env: dict[str, str], reads: int, clients: int) -> None:
+    os.environ.update(BYBIT_BASE_URL=server.url, BYBIT_RATE_LIMITS="market=0", **env)
+    reload_settings()
+    breakers.clear()
+    before = server.requests
+    failed, latencies = asyncio.run(_run(reads, clients))
+    p50, p99, worst = (percentile(latencies, pct) for pct in (50, 99, 100))
+    print(f"{label:<18}{reads - failed:>6}{failed:>8}{server.requests - before:>10}{p50:>9.1f}{p99:>9.1f}{worst:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.005)
+    parser.add_argument("--drop-rate", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--slow-rate", type=float, default=0.03)
+    parser.add_argument("--slow", type=float, default=0.25)
+    parser.add_argument("--hedge-after", type=float, default=0.05)
+    args = parser.parse_args()
+
+    header = f"{'mode':<18}{'ok':>6}{'failed':>8}{'requests':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    print(
+        f"{args.reads} reads, {args.clients} clients; {args.drop_rate:.0%} dropped, {args.error_rate:.0%} 503, "
+        f"{args.slow_rate:.0%} {args.slow * 1000:.0f} ms slower"
+    )
+    print(header)
+    modes = {
+        "single": {"BYBIT_READ_RETRIES": "0", "BYBIT_HEDGE_AFTER_SECONDS": ""},
+        "retries": {"BYBIT_READ_RETRIES": "2", "BYBIT_HEDGE_AFTER_SECONDS": ""},
+        "retries + hedge": {"BYBIT_READ_RETRIES": "2", "BYBIT_HEDGE_AFTER_SECONDS": str(args.hedge_after)},
+    }
+    stub = {"drop_rate": args.drop_rate, "slow_rate": args.slow_rate, "slow": args.slow, "error_rate": args.error_rate}
+    with StubServer(args.delay, **stub) as server:
+        for label, env in modes.items():
+            _measure(label, server, {**env, "BYBIT_BREAKER_THRESHOLD": "0"}, args.reads, args.clients)
+
+    print(f"\n{args.reads // 10} reads, {args.clients} clients; every request answered with 503")
+    print(header)
+    with StubServer(args.delay, error_rate=1.0) as server:
+        for label, threshold in (("breaker off", "0"), ("breaker on", "5")):
+            env = {"BYBIT_READ_RETRIES": "2", "BYBIT_HEDGE_AFTER_SECONDS": "", "BYBIT_BREAKER_THRESHOLD": threshold}
+            _measure(label, server, env, args.reads // 10, args.clients)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Per-call latency: fresh pybit HTTP per call vs the pooled shared session.
+
+The stub speaks plain HTTP, so the "fresh" numbers only include session construction
+and the TCP connect; against the real API each fresh session also pays a TLS handshake.
+
+Usage: python benchmarks/bench_session.py [--calls N]
+"""
+
+import argparse
+import os
+import time
+
+from pybit.unified_trading import HTTP
+from stub_server import StubServer
+from util import report
+
+from bybit_mcp_server import client
+
+
+def _measure(get_session, calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        get_session().get_server_time()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        os.environ["BYBIT_BASE_URL"] = server.url
+
+        def fresh_session() -> HTTP:
+            session = HTTP(testnet=True)
+            session.endpoint = server.url
+            return session
+
+        report("fresh session/call", _measure(fresh_session, args.calls))
+        client.reset_session()
+        report("pooled session", _measure(client.get_session, args.calls))
+
+
+if __name__ == "__main__":
+    main()
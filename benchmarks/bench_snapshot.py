@@ -0,0 +1,71 @@
+"""Latency of a multi-symbol market snapshot: one tool call per item vs. get_market_snapshot.
+
+The per-item baseline makes the 4 x N sequential tool calls an agent would make
+for ticker, order book, funding and open interest. get_market_snapshot fans the
+same requests out concurrently. The response cache is cleared before every round.
+
+Usage: python benchmarks/bench_snapshot.py [--symbols N] [--delay SECONDS] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from mcp.server.fastmcp import FastMCP
+from stub_server import StubServer
+from util import report
+
+from bybit_mcp_server import client
+from bybit_mcp_server.cache import market_cache
+from bybit_mcp_server.tools.market import register_market_tools
+
+
+async def _per_item(app: FastMCP, symbols: list[str]) -> None:
+    for symbol in symbols:
+        await app.call_tool("get_tickers", {"category": "linear", "symbol": symbol})
+        await app.call_tool("get_orderbook", {"category": "linear", "symbol": symbol})
+        await app.call_tool("get_funding_rate_history", {"category": "linear", "symbol": symbol, "limit": 1})
+        await app.call_tool(
+            "get_open_interest", {"category": "linear", "symbol": symbol, "intervalTime": "5min", "limit": 1}
+        )
+
+
+async def _snapshot(app: FastMCP, symbols: list[str]) -> None:
+    await app.call_tool("get_market_snapshot", {"category": "linear", "symbols": symbols})
+
+
+async def _run(fn, app: FastMCP, symbols: list[str], rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        market_cache.clear()
+        started = time.perf_counter()
+        await fn(app, symbols)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    with StubServer(delay=args.delay) as server:
+        os.environ["BYBIT_BASE_URL"] = server.url
+        # The stub has no rate limits; measure the fan-out, not the throttle.
+        os.environ.setdefault("BYBIT_RATE_LIMITS", "market=0")
+        os.environ.setdefault("BYBIT_MAX_WORKERS", str(4 * args.symbols))
+        os.environ.setdefault("BYBIT_HTTP_POOL_SIZE", str(4 * args.symbols))
+        app = FastMCP("bench")
+        register_market_tools(app)
+        print(f"{args.symbols} symbols x 4 kinds, {args.delay * 1000:.0f} ms server delay")
+        report("per-item tool calls", asyncio.run(_run(_per_item, app, symbols, args.rounds)))
+        report("get_market_snapshot", asyncio.run(_run(_snapshot, app, symbols, args.rounds)))
+        client.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
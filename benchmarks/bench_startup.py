@@ -0,0 +1,94 @@
+"""Cold-start cost: importing the server, and a fresh stdio process's first requests.
+
+Each run starts a new Python process, as an MCP client does per session:
+
+- import: time to import bybit_mcp_server.server in a fresh interpreter
+- initialize / tools/list / first call: time from spawning `python -m bybit_mcp_server`
+  until the handshake, the first tools/list and a first get_server_time (against the
+  stub V5 API) have each been answered
+
+--importtime N also lists the N modules with the largest cumulative import time,
+from one `python -X importtime` run.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--importtime N]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from stub_server import StubServer
+
+IMPORT = "import time; t = time.perf_counter(); import bybit_mcp_server.server; print(time.perf_counter() - t)"
+
+PHASES = ("import", "initialize", "tools/list", "first call")
+
+
+def _import_seconds() -> float:
+    result = subprocess.run([sys.executable, "-c", IMPORT], capture_output=True, text=True, check=True)
+    return float(result.stdout)
+
+
+async def _stdio_seconds(env: dict[str, str]) -> tuple[float, float, float]:
+    params = StdioServerParameters(command=sys.executable, args=["-m", "bybit_mcp_server"], env=env)
+    with open(os.devnull, "w") as errlog:
+        started = time.perf_counter()
+        async with stdio_client(params, errlog=errlog) as (read, write), ClientSession(read, write) as session:
+            await session.initialize()
+            initialized = time.perf_counter()
+            await session.list_tools()
+            listed = time.perf_counter()
+            await session.call_tool("get_server_time", {})
+            called = time.perf_counter()
+    return initialized - started, listed - started, called - started
+
+
+def _slowest_imports(count: int) -> list[tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import bybit_mcp_server.server"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="list the N slowest imports")
+    args = parser.parse_args()
+
+    samples: dict[str, list[float]] = {phase: [] for phase in PHASES}
+    with StubServer() as server:
+        env = {**os.environ, "BYBIT_BASE_URL": server.url, "BYBIT_API_KEY": "bench", "BYBIT_API_SECRET": "bench"}
+        for _ in range(args.runs):
+            samples["import"].append(_import_seconds())
+            for phase, seconds in zip(PHASES[1:], asyncio.run(_stdio_seconds(env))):
+                samples[phase].append(seconds)
+
+    print(f"{args.runs} cold starts (ms)")
+    print(f"{'phase':<14}{'median':>10}{'min':>10}{'max':>10}")
+    for phase, values in samples.items():
+        ms = [value * 1000 for value in values]
+        print(f"{phase:<14}{statistics.median(ms):>10.1f}{min(ms):>10.1f}{max(ms):>10.1f}")
+
+    if args.importtime:
+        print("\nslowest imports (cumulative ms, -X importtime)")
+        for micros, module in _slowest_imports(args.importtime):
+            print(f"{micros / 1000:>10.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
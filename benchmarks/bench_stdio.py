@@ -0,0 +1,185 @@
+"""End-to-end throughput and latency per tool: MCP client -> stdio -> server -> stub V5 API.
+
+Starts the stub server, launches the real server as a subprocess speaking MCP over
+stdio, and has --clients concurrent callers issue tool calls over that session for
+--duration seconds, cycling through a mix of read tools. Reports calls, errors,
+calls/s and latency percentiles per tool.
+
+For regression tracking, --json writes the results and --compare checks them against
+an earlier --json file: the run fails (exit code 1) if any tool's p50 latency grew,
+or its throughput fell, by more than --tolerance.
+
+Usage: python benchmarks/bench_stdio.py [--clients N] [--duration S] [--delay S] [--jitter S]
+       [--rate-limit-rate F] [--list-size N] [--cache] [--json PATH] [--compare PATH]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from stub_server import add_arguments, from_arguments
+from util import percentile
+
+# (tool, arguments) pairs the callers cycle through.
+WORKLOAD: list[tuple[str, dict]] = [
+    ("get_server_time", {}),
+    ("get_tickers", {"category": "linear", "symbol": "BTCUSDT"}),
+    ("get_tickers", {"category": "linear", "sort_by": "-turnover24h", "top": 5}),
+    ("get_kline", {"category": "linear", "symbol": "BTCUSDT", "interval": "1", "limit": 200}),
+    ("get_orderbook", {"category": "linear", "symbol": "BTCUSDT", "limit": 50}),
+    ("get_funding_rate_history", {"category": "linear", "symbol": "BTCUSDT", "limit": 50}),
+    ("get_open_interest", {"category": "linear", "symbol": "BTCUSDT", "intervalTime": "5min"}),
+    ("get_public_trades", {"category": "linear", "symbol": "BTCUSDT", "limit": 100}),
+    ("get_instruments_info", {"category": "linear"}),
+    ("get_market_snapshot", {"category": "linear", "symbols": ["BTCUSDT", "ETHUSDT", "SOLUSDT"]}),
+    ("get_wallet_balance", {"accountType": "UNIFIED"}),
+    ("get_positions", {"category": "linear", "settleCoin": "USDT"}),
+    ("get_open_orders", {"category": "linear", "symbol": "BTCUSDT"}),
+]
+
+
+class Results:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def add(self, tool: str, ms: float, error: bool) -> None:
+        self.latencies.setdefault(tool, []).append(ms)
+        self.errors[tool] = self.errors.get(tool, 0) + error
+
+    def summary(self, elapsed: float) -> dict[str, dict]:
+        rows = {}
+        everything = []
+        for tool, samples in sorted(self.latencies.items()):
+            everything += samples
+            rows[tool] = _stats(samples, self.errors[tool], elapsed)
+        rows["TOTAL"] = _stats(everything, sum(self.errors.values()), elapsed)
+        return rows
+
+
+def _stats(samples: list[float], errors: int, elapsed: float) -> dict:
+    return {
+        "calls": len(samples),
+        "errors": errors,
+        "calls_per_s": round(len(samples) / elapsed, 1),
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+def _is_error(result) -> bool:
+    if result.isError:
+        return True
+    text = result.content[0].text if result.content else ""
+    return text.lstrip("{ \n").startswith('"error"')
+
+
+async def _caller(session: ClientSession, work, deadline: float, results: Results) -> None:
+    while time.perf_counter() < deadline:
+        tool, arguments = next(work)
+        started = time.perf_counter()
+        try:
+            error = _is_error(await session.call_tool(tool, arguments))
+        except Exception:
+            error = True
+        results.add(tool, (time.perf_counter() - started) * 1000, error)
+
+
+async def _run(args: argparse.Namespace, env: dict[str, str]) -> tuple[dict, float]:
+    params = StdioServerParameters(command=sys.executable, args=["-m", "bybit_mcp_server"], env=env)
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write), ClientSession(read, write) as session:
+            await session.initialize()
+            for tool, arguments in WORKLOAD:  # warm up imports, sessions and connection pools
+                await session.call_tool(tool, arguments)
+            results = Results()
+            work = itertools.cycle(WORKLOAD)
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(_caller(session, work, deadline, results) for _ in range(args.clients)))
+            elapsed = time.perf_counter() - started
+    return results.summary(elapsed), elapsed
+
+
+def _print(rows: dict[str, dict]) -> None:
+    print(f"{'tool':<26}{'calls':>7}{'errors':>8}{'calls/s':>9}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for tool, row in rows.items():
+        print(
+            f"{tool:<26}{row['calls']:>7}{row['errors']:>8}{row['calls_per_s']:>9}"
+            f"{row['mean_ms']:>10.2f}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+        )
+
+
+def _compare(rows: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> bool:
+    """Print changes against baseline; False if any tool regressed beyond tolerance."""
+    ok = True
+    print(f"\n{'tool':<26}{'p50 change':>12}{'calls/s change':>16}")
+    for tool, row in rows.items():
+        before = baseline.get(tool)
+        if before is None:
+            continue
+        latency = row["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        throughput = row["calls_per_s"] / before["calls_per_s"] - 1 if before["calls_per_s"] else 0.0
+        regressed = latency > tolerance or throughput < -tolerance
+        ok = ok and not regressed
+        print(f"{tool:<26}{latency:>+12.1%}{throughput:>+16.1%}{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=8, help="concurrent callers over the stdio session")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--cache", action="store_true", help="keep the market data cache on")
+    parser.add_argument("--rate-limits", default="market=0,account=0,position=0,trade=0,asset=0,other=0")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="compare with results written earlier by --json")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    with from_arguments(args) as server:
+        env = {
+            **os.environ,
+            "BYBIT_BASE_URL": server.url,
+            "BYBIT_API_KEY": "bench",
+            "BYBIT_API_SECRET": "bench",
+            "BYBIT_RATE_LIMITS": args.rate_limits,
+            "BYBIT_OUTPUT_FORMAT": "compact",
+        }
+        if not args.cache:
+            env["BYBIT_CACHE_MAX_ENTRIES"] = "0"
+        print(
+            f"{args.clients} clients for {args.duration:g} s, stub delay {args.delay * 1000:.0f} ms "
+            f"+ jitter {args.jitter * 1000:.0f} ms, 10006 rate {args.rate_limit_rate:g}, list size {args.list_size}, "
+            f"cache {'on' if args.cache else 'off'}"
+        )
+        rows, elapsed = asyncio.run(_run(args, env))
+        print(f"{server.requests} stub requests ({server.rate_limited} rate limited) in {elapsed:.1f} s\n")
+    _print(rows)
+
+    config = {key: value for key, value in vars(args).items() if key not in ("json", "compare", "tolerance")}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": config, "tools": rows}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        changed = sorted(key for key in config if baseline["config"].get(key) != config[key])
+        if changed:
+            print(f"\nnote: baseline was run with different {', '.join(changed)}")
+        if not _compare(rows, baseline["tools"], args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
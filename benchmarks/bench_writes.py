@@ -0,0 +1,97 @@
+"""Order placement over a network that loses replies: success rate, duplicates and latency.
+
+Each mode places --orders orders on the stub V5 API, which processes every request but
+drops --drop-rate of the replies:
+
+- single: one attempt per order, so every lost reply is a failed call
+- naive retry: the order is sent again after any error, without an orderLinkId,
+  the way an agent retries a call that failed
+- idempotent: idempotency.place_order, which retries with the same orderLinkId and
+  recognizes an order that landed despite its lost reply
+
+"on stub" is how many orders the stub ended up with; anything above --orders is a
+duplicate, and anything above "ok" is an order the caller was told had failed.
+Client-side rate limiting is off, so the numbers show only the network and retries.
+
+Usage: python benchmarks/bench_writes.py [--orders N] [--clients N] [--drop-rate F] [--delay S]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from stub_server import StubServer
+from util import percentile
+
+from bybit_mcp_server import idempotency
+from bybit_mcp_server.client import call, get_session
+from bybit_mcp_server.config import get_settings, reload_settings
+
+PARAMS = {"category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Limit", "qty": "0.001"}
+
+
+async def _single() -> None:
+    await call(get_session().place_order, **PARAMS)
+
+
+async def _naive() -> None:
+    for attempt in range(get_settings().write_retries + 1):
+        try:
+            await call(get_session().place_order, **PARAMS)
+            return
+        except Exception:
+            if attempt == get_settings().write_retries:
+                raise
+
+
+async def _idempotent() -> None:
+    await idempotency.place_order(get_session(), PARAMS)
+
+
+MODES = {"single": _single, "naive retry": _naive, "idempotent": _idempotent}
+
+
+async def _run(place, orders: int, clients: int) -> tuple[int, list[float]]:
+    semaphore = asyncio.Semaphore(clients)
+    latencies: list[float] = []
+    failed = 0
+
+    async def one() -> None:
+        nonlocal failed
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await place()
+            except Exception:
+                failed += 1
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(orders)))
+    return failed, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--drop-rate", type=float, default=0.1)
+    parser.add_argument("--delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(f"{args.orders} orders, {args.clients} clients, {args.drop_rate:.0%} of replies dropped")
+    print(f"{'mode':<14}{'ok':>6}{'failed':>8}{'on stub':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for label, place in MODES.items():
+        with StubServer(delay=args.delay, drop_rate=args.drop_rate) as server:
+            os.environ.update(
+                BYBIT_BASE_URL=server.url, BYBIT_API_KEY="bench", BYBIT_API_SECRET="bench", BYBIT_RATE_LIMITS="trade=0"
+            )
+            reload_settings()
+            failed, latencies = asyncio.run(_run(place, args.orders, args.clients))
+        p50, p99 = (percentile(latencies, pct) if latencies else 0.0 for pct in (50, 99))
+        print(f"{label:<14}{len(latencies):>6}{failed:>8}{len(server.orders):>9}{p50:>9.1f}{p99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""Local stand-in for the Bybit V5 REST API used by the benchmarks.
+
+Speaks HTTP/1.1 with keep-alive so connection reuse on the client side is
+measurable. Every route the read-only tools use returns a synthetic
+``{"retCode": 0, "result": ...}`` body. Private routes accept any signature.
+
+Knobs, all off by default:
+
+- delay / jitter: each response waits delay plus a uniform 0..jitter seconds
+- rate_limit_rate: this fraction of requests is answered with retCode 10006 and
+  X-Bapi-Limit headers whose reset is rate_limit_reset seconds away, like Bybit
+- list_size: items in list responses that have no limit parameter (tickers for a
+  whole category, instruments, balances, positions, orders); scales payload size
+- drop_rate: this fraction of requests is processed, but the connection is closed
+  instead of answering, like a reply lost on the network
+- slow_rate / slow: this fraction of responses waits another slow seconds, a latency tail
+- error_rate: this fraction of requests is answered with HTTP 503, like an overloaded gateway
+
+Orders placed with /v5/order/create are kept by orderLinkId. Placing an orderLinkId
+twice is rejected with retCode 110072, as Bybit does, and the order queries return
+the stored order when asked for its orderLinkId.
+
+Run standalone with: python benchmarks/stub_server.py --port 8000 [--delay S] ...
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+KLINE_STEP_MS = {"1": 60_000, "5": 300_000, "15": 900_000, "60": 3_600_000, "D": 86_400_000}
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _symbols(query: dict, size: int) -> list[str]:
+    if "symbol" in query:
+        return [query["symbol"]]
+    return [f"SYM{i}USDT" for i in range(size)]
+
+
+def _kline(query: dict, size: int) -> dict:
+    """Synthetic bars for [start, end], newest first, like Bybit."""
+    step = KLINE_STEP_MS.get(query.get("interval", "1"), 60_000)
+    end = int(query.get("end", time.time() * 1000))
+    start = int(query.get("start", end - step * 199))
+    first = start - start % step
+    starts = list(range(first, end + 1, step))[: int(query.get("limit", 200))]
+    bars = [[str(ts), "100.0", "101.5", "99.5", "100.5", "12.5", "1256.25"] for ts in reversed(starts)]
+    return {"category": query.get("category", "linear"), "symbol": query.get("symbol", "BTCUSDT"), "list": bars}
+
+
+def _tickers(query: dict, size: int) -> dict:
+    rows = [
+        {
+            "symbol": symbol,
+            "lastPrice": "50000",
+            "bid1Price": "49999.5",
+            "ask1Price": "50000.5",
+            "volume24h": "12345.6",
+            "turnover24h": "617280000",
+            "fundingRate": "0.0001",
+            "openInterest": "50000",
+        }
+        for symbol in _symbols(query, size)
+    ]
+    return {"category": query.get("category", "linear"), "list": rows}
+
+
+def _orderbook(query: dict, size: int) -> dict:
+    depth = int(query.get("limit", 25))
+    return {
+        "s": query.get("symbol", "BTCUSDT"),
+        "b": [[f"{49999.5 - i * 0.5:.1f}", "1.2"] for i in range(depth)],
+        "a": [[f"{50000.5 + i * 0.5:.1f}", "0.8"] for i in range(depth)],
+        "ts": _now_ms(),
+        "u": 1,
+    }
+
+
+def _funding(query: dict, size: int) -> dict:
+    limit = int(query.get("limit", 200))
+    now = _now_ms() // 28_800_000 * 28_800_000
+    rows = [
+        {
+            "symbol": query.get("symbol", "BTCUSDT"),
+            "fundingRate": "0.0001",
+            "fundingRateTimestamp": str(now - i * 28_800_000),
+        }
+        for i in range(limit)
+    ]
+    return {"category": query.get("category", "linear"), "list": rows}
+
+
+def _open_interest(query: dict, size: int) -> dict:
+    limit = int(query.get("limit", 50))
+    now = _now_ms() // 300_000 * 300_000
+    rows = [{"openInterest": "50000", "timestamp": str(now - i * 300_000)} for i in range(limit)]
+    return {
+        "category": query.get("category", "linear"),
+        "symbol": query.get("symbol", "BTCUSDT"),
+        "list": rows,
+        "nextPageCursor": "",
+    }
+
+
+def _recent_trades(query: dict, size: int) -> dict:
+    limit = int(query.get("limit", 60 if query.get("category") == "spot" else 500))
+    now = _now_ms()
+    rows = [
+        {
+            "execId": f"e{now - i}",
+            "symbol": query.get("symbol", "BTCUSDT"),
+            "price": "50000",
+            "size": "0.1",
+            "side": "Buy" if i % 2 else "Sell",
+            "time": str(now - i),
+            "isBlockTrade": False,
+        }
+        for i in range(limit)
+    ]
+    return {"category": query.get("category", "linear"), "list": rows}
+
+
+def _instruments(query: dict, size: int) -> dict:
+    rows = [
+        {
+            "symbol": symbol,
+            "status": "Trading",
+            "baseCoin": symbol.removesuffix("USDT"),
+            "quoteCoin": "USDT",
+            "lotSizeFilter": {"minOrderQty": "0.001", "qtyStep": "0.001"},
+            "priceFilter": {"tickSize": "0.1"},
+        }
+        for symbol in _symbols(query, size)
+    ]
+    return {"category": query.get("category", "linear"), "list": rows, "nextPageCursor": ""}
+
+
+def _wallet(query: dict, size: int) -> dict:
+    coins = [{"coin": f"COIN{i}", "walletBalance": "1.5", "usdValue": "100"} for i in range(size)]
+    return {"list": [{"accountType": query.get("accountType", "UNIFIED"), "totalEquity": "10000", "coin": coins}]}
+
+
+def _positions(query: dict, size: int) -> dict:
+    rows = [
+        {"symbol": symbol, "side": "Buy", "size": "0.1", "avgPrice": "50000", "positionIdx": 0}
+        for symbol in _symbols(query, size)
+    ]
+    return {"category": query.get("category", "linear"), "list": rows, "nextPageCursor": ""}
+
+
+def _orders(query: dict, size: int) -> dict:
+    rows = [
+        {
+            "orderId": f"o{i}",
+            "orderLinkId": "",
+            "symbol": query.get("symbol", "BTCUSDT"),
+            "side": "Buy",
+            "orderType": "Limit",
+            "price": "49000",
+            "qty": "0.1",
+            "orderStatus": "New",
+            "createdTime": str(_now_ms() - i),
+        }
+        for i in range(size)
+    ]
+    return {"category": query.get("category", "linear"), "list": rows, "nextPageCursor": ""}
+
+
+def _executions(query: dict, size: int) -> dict:
+    rows = [
+        {
+            "execId": f"x{i}",
+            "symbol": query.get("symbol", "BTCUSDT"),
+            "execPrice": "50000",
+            "execTime": str(_now_ms() - i),
+        }
+        for i in range(int(query.get("limit", 50)))
+    ]
+    return {"category": query.get("category", "linear"), "list": rows, "nextPageCursor": ""}
+
+
+ROUTES = {
+    "/v5/market/kline": _kline,
+    "/v5/market/time": lambda query, size: {"timeSecond": str(int(time.time())), "timeNano": str(time.time_ns())},
+    "/v5/market/tickers": _tickers,
+    "/v5/market/orderbook": _orderbook,
+    "/v5/market/funding/history": _funding,
+    "/v5/market/open-interest": _open_interest,
+    "/v5/market/recent-trade": _recent_trades,
+    "/v5/market/instruments-info": _instruments,
+    "/v5/account/wallet-balance": _wallet,
+    "/v5/position/list": _positions,
+    "/v5/order/realtime": _orders,
+    "/v5/order/history": _orders,
+    "/v5/execution/list": _executions,
+}
+
+
+ORDER_QUERIES = ("/v5/order/realtime", "/v5/order/history")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body as one segment; avoids Nagle/delayed-ACK stalls on keep-alive.
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        self._respond()
+
+    def do_POST(self):  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        self._respond(json.loads(body) if body else {})
+
+    def _respond(self, body=None):
+        server = self.server
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()} | (body or {})
+        pause = server.delay + (random.uniform(0, server.jitter) if server.jitter else 0.0)
+        if server.slow_rate and random.random() < server.slow_rate:
+            pause += server.slow
+        if pause:
+            time.sleep(pause)
+        headers = {}
+        if server.error_rate and random.random() < server.error_rate:
+            with server.lock:
+                server.requests += 1
+            self.send_error(503)
+            return
+        if server.rate_limit_rate and random.random() < server.rate_limit_rate:
+            reset = _now_ms() + int(server.rate_limit_reset * 1000)
+            headers = {"X-Bapi-Limit": "100", "X-Bapi-Limit-Status": "0", "X-Bapi-Limit-Reset-Timestamp": str(reset)}
+            payload = {"retCode": 10006, "retMsg": "Too many visits!", "result": {}, "time": _now_ms()}
+        elif url.path == "/v5/order/create" or (url.path in ORDER_QUERIES and "orderLinkId" in query):
+            payload = server.order(url.path, query)
+        else:
+            route = ROUTES.get(url.path)
+            result = route(query, server.list_size) if route else {}
+            payload = {"retCode": 0, "retMsg": "OK", "result": result, "time": _now_ms()}
+        body = json.dumps(payload).encode()
+        with server.lock:
+            server.requests += 1
+            server.rate_limited += payload["retCode"] == 10006
+        if server.drop_rate and random.random() < server.drop_rate:
+            with server.lock:
+                server.dropped += 1
+            self.close_connection = True
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        rate_limit_reset: float = 0.05,
+        list_size: int = 20,
+        port: int = 0,
+        drop_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        super().__init__(("127.0.0.1", port), StubHandler)
+        self.delay = delay
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.rate_limit_reset = rate_limit_reset
+        self.list_size = list_size
+        self.drop_rate = drop_rate
+        self.slow_rate = slow_rate
+        self.slow = slow
+        self.error_rate = error_rate
+        self.requests = 0
+        self.rate_limited = 0
+        self.dropped = 0
+        self.orders: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def order(self, path: str, query: dict) -> dict:
+        """Place an order (rejecting a repeated orderLinkId) or look one up by orderLinkId."""
+        link_id = query.get("orderLinkId", "")
+        with self.lock:
+            if path in ORDER_QUERIES:
+                order = self.orders.get(link_id)
+                result = {"category": query.get("category", "linear"), "list": [order] if order else []}
+            elif link_id and link_id in self.orders:
+                return {"retCode": 110072, "retMsg": "OrderLinkedID is duplicate", "result": {}, "time": _now_ms()}
+            else:
+                order_id = f"o{len(self.orders) + 1}"
+                link_id = link_id or order_id
+                self.orders[link_id] = {
+                    "orderId": order_id,
+                    "orderLinkId": link_id,
+                    "symbol": query.get("symbol", "BTCUSDT"),
+                    "orderStatus": "New",
+                }
+                result = {"orderId": order_id, "orderLinkId": link_id}
+        return {"retCode": 0, "retMsg": "OK", "result": result, "time": _now_ms()}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """The stub's knobs as command line options, shared by the benchmarks that take them."""
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform 0..JITTER seconds per response")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 10006")
+    parser.add_argument("--rate-limit-reset", type=float, default=0.05, help="seconds until a 10006 limit resets")
+    parser.add_argument("--list-size", type=int, default=20, help="items in unbounded list responses")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of responses dropped after processing")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of responses delayed by --slow more")
+    parser.add_argument("--slow", type=float, default=0.0, help="extra seconds for a --slow-rate response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+
+
+def from_arguments(args: argparse.Namespace, port: int = 0) -> StubServer:
+    return StubServer(
+        args.delay,
+        args.jitter,
+        args.rate_limit_rate,
+        args.rate_limit_reset,
+        args.list_size,
+        port,
+        args.drop_rate,
+        args.slow_rate,
+        args.slow,
+        args.error_rate,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8000)
+    add_arguments(parser)
+    args = parser.parse_args()
+    with from_arguments(args, args.port) as server:
+        print(f"Bybit V5 stub at {server.url} (Ctrl-C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Shared helpers for the benchmark scripts."""
+
+import statistics
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted sample list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(label: str, samples_ms: list[float]) -> None:
+    """Print mean/p50/p95 for a list of millisecond samples."""
+    mean = statistics.mean(samples_ms)
+    p50 = percentile(samples_ms, 50)
+    p95 = percentile(samples_ms, 95)
+    print(f"{label:<24} mean {mean:8.3f} ms   p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
@@ -0,0 +1,434 @@
+"""In-memory mirror of the account's orders, positions, wallet and executions.
+
+The private WebSocket pushes every change to orders, positions and the wallet. The
+mirror applies those changes as they arrive. It is reconciled against REST snapshots
+on start, after every reconnect and periodically after that, so a missed message
+cannot leave it wrong for long. Reads are served only while the connection is up and
+the last reconciliation is recent. Each served result reports how old its data is.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from bybit_mcp_server.client import call, call_paged, get_session, run_sync
+from bybit_mcp_server.config import Settings, get_settings, on_reload
+from bybit_mcp_server.marketstream import TradeBuffer
+from bybit_mcp_server.streams import StreamHub, stream_hub
+
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("order", "execution", "position", "wallet")
+CATEGORIES = ("spot", "linear", "inverse", "option")
+POSITION_CATEGORIES = ("linear", "inverse", "option")
+# Categories whose orders and positions REST lists per settle coin.
+SETTLED_CATEGORIES = ("linear", "inverse")
+OPEN_ORDER_STATUSES = frozenset({"New", "PartiallyFilled", "Untriggered"})
+
+# Page sizes for reconciliation snapshots.
+ORDER_PAGE_LIMIT = 50
+POSITION_PAGE_LIMIT = 200
+EXECUTION_PAGE_LIMIT = 100
+RECONCILE_MAX_PAGES = 50
+
+# List sizes REST returns when no limit is given; served reads follow them.
+DEFAULT_ORDER_LIMIT = 20
+DEFAULT_POSITION_LIMIT = 20
+DEFAULT_EXECUTION_LIMIT = 50
+
+EXECUTION_BUFFER_SIZE = 1000
+
+# Reads fall back to REST once the last reconciliation is this many intervals old.
+MAX_RECONCILE_AGE = 3
+
+# Seconds between checks for a reconnect, which triggers an immediate reconciliation.
+RECONNECT_POLL = 1.0
+
+# (received at, item); items from a REST snapshot carry the time the snapshot started.
+Entry = tuple[float, dict[str, Any]]
+
+
+class ExecutionBuffer(TradeBuffer):
+    """Recent executions of one category, oldest first, seeded from get_trade_history."""
+
+    time_key = "execTime"
+
+    def add(self, executions: list[dict[str, Any]]) -> None:
+        with self.lock:
+            self.trades.extend(executions)
+            self.updated_at = time.time()
+
+
+def _account_of(settings: Settings) -> tuple:
+    """The settings that decide which account and environment the mirror reflects."""
+    return (settings.testnet, settings.api_key, settings.api_secret, settings.base_url, settings.ws_url)
+
+
+def _is_open(order: dict[str, Any]) -> bool:
+    return order.get("orderStatus") in OPEN_ORDER_STATUSES
+
+
+def _is_open_position(position: dict[str, Any]) -> bool:
+    return position.get("size") not in (None, "", "0")
+
+
+def _merge(
+    current: dict[Any, Entry],
+    snapshot: dict[Any, dict[str, Any]],
+    started: float,
+    in_scope: Callable[[Any], bool],
+    live: Callable[[dict[str, Any]], bool],
+) -> int:
+    """Replace in-scope entries with a REST snapshot taken from `started` on.
+
+    Stream updates received after `started` are newer than the snapshot and are kept.
+    Returns how many live items the snapshot added or removed.
+    """
+    corrections = 0
+    for key in [key for key in current if in_scope(key) and key not in snapshot]:
+        received, item = current[key]
+        if received < started:
+            corrections += live(item)
+            del current[key]
+    for key, item in snapshot.items():
+        entry = current.get(key)
+        if entry is not None and entry[0] >= started:
+            continue
+        corrections += live(item) != (entry is not None and live(entry[1]))
+        current[key] = (started, item)
+    return corrections
+
+
+class AccountMirror:
+    """Orders, positions, wallet and executions kept from the private stream."""
+
+    def __init__(self, hub: StreamHub):
+        self.hub = hub
+        self.categories: tuple[str, ...] = ()
+        self.settle_coins: tuple[str, ...] = ()
+        self.account_type = "UNIFIED"
+        self.interval = get_settings().mirror_reconcile_seconds
+        self.reconciles = 0
+        self.corrections = 0
+        self._orders: dict[tuple[str, str], Entry] = {}
+        self._positions: dict[tuple[str, str, int], Entry] = {}
+        # (category, symbol) -> settle coin, learned from the per-settle-coin REST snapshots.
+        self._settle_coin_of: dict[tuple[str, str], str] = {}
+        self._wallets: dict[str, Entry] = {}
+        self._executions: dict[str, ExecutionBuffer] = {}
+        self._reconciled_at = 0.0
+        self._generation: int | None = None
+        self._last_event = 0.0
+        self._task: asyncio.Task | None = None
+        self._account: tuple | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return bool(self.categories)
+
+    async def start(
+        self,
+        session: "HTTP",
+        categories: list[str] | None = None,
+        settle_coins: list[str] | None = None,
+        account_type: str = "UNIFIED",
+    ) -> None:
+        """Subscribe to the private topics, take the first snapshot and start reconciling."""
+        categories = tuple(categories or ("linear",))
+        unknown = [category for category in categories if category not in CATEGORIES]
+        if unknown:
+            raise ValueError(f"Unsupported categories: {unknown}; choose from {list(CATEGORIES)}")
+        settings = get_settings()
+        api_key, api_secret = settings.api_key, settings.api_secret
+        if not api_key or not api_secret:
+            raise ValueError("The private stream needs BYBIT_API_KEY and BYBIT_API_SECRET")
+
+        self.stop()
+        self.categories = categories
+        self.settle_coins = tuple(settle_coins or ("USDT", "USDC"))
+        self.account_type = account_type
+        self.interval = settings.mirror_reconcile_seconds
+        self._account = _account_of(settings)
+        self._executions = {category: ExecutionBuffer(category, "", EXECUTION_BUFFER_SIZE) for category in categories}
+        await run_sync(self._subscribe, api_key, api_secret)
+        try:
+            await self.reconcile(session)
+        except Exception:
+            self.stop()
+            raise
+        self._task = asyncio.create_task(self._run())
+
+    def _subscribe(self, api_key: str, api_secret: str) -> None:
+        stream = self.hub.stream("private", api_key=api_key, api_secret=api_secret)
+        for topic in TOPICS:
+            stream.subscribe(topic, self._on_message)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        stream = self.hub.get("private")
+        if self.running and stream is not None:
+            for topic in TOPICS:
+                stream.unsubscribe(topic)
+        with self._lock:
+            self.categories = ()
+            self._orders, self._positions, self._wallets, self._executions = {}, {}, {}, {}
+            self._settle_coin_of = {}
+            self._reconciled_at, self._generation, self._last_event = 0.0, None, 0.0
+            self.reconciles = self.corrections = 0
+
+    def reconfigure(self, settings: Settings) -> None:
+        """Stop mirroring when reloaded settings point at another account or environment.
+
+        The private stream and the mirrored data belong to the old account, so reads
+        fall back to REST until start_account_stream is called again.
+        """
+        if self.running and _account_of(settings) != self._account:
+            logger.warning("Account settings changed; stopping the account mirror")
+            self.stop()
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        topic, data = message["topic"], message["data"]
+        now = time.time()
+        with self._lock:
+            self._last_event = now
+            if topic == "order":
+                for order in data:
+                    self._orders[(order["category"], order["orderId"])] = (now, order)
+            elif topic == "position":
+                for position in data:
+                    key = (position["category"], position["symbol"], position.get("positionIdx", 0))
+                    self._positions[key] = (now, position)
+            elif topic == "wallet":
+                for wallet in data:
+                    self._wallets[wallet["accountType"]] = (now, wallet)
+            elif topic == "execution":
+                for execution in data:
+                    buffer = self._executions.get(execution["category"])
+                    if buffer is not None:
+                        buffer.add([execution])
+
+    def _scopes(self, category: str) -> list[dict[str, str]]:
+        if category in SETTLED_CATEGORIES:
+            return [{"category": category, "settleCoin": coin} for coin in self.settle_coins]
+        return [{"category": category}]
+
+    async def reconcile(self, session: "HTTP") -> None:
+        """Bring the mirror in line with REST snapshots of every mirrored category."""
+        stream = self.hub.get("private")
+        generation = stream.reconnects if stream is not None else None
+        started = time.time()
+        orders: dict[tuple[str, str], dict[str, Any]] = {}
+        positions: dict[tuple[str, str, int], dict[str, Any]] = {}
+        settle_coin_of: dict[tuple[str, str], str] = {}
+        executions: dict[str, list[dict[str, Any]]] = {}
+        for category in self.categories:
+            for params in self._scopes(category):
+                response = await call_paged(
+                    session.get_open_orders, {**params, "limit": ORDER_PAGE_LIMIT}, RECONCILE_MAX_PAGES
+                )
+                for order in response["result"]["list"]:
+                    orders[(category, order["orderId"])] = {"category": category, **order}
+                if category in POSITION_CATEGORIES:
+                    response = await call_paged(
+                        session.get_positions, {**params, "limit": POSITION_PAGE_LIMIT}, RECONCILE_MAX_PAGES
+                    )
+                    for position in response["result"]["list"]:
+                        key = (category, position["symbol"], position.get("positionIdx", 0))
+                        positions[key] = {"category": category, **position}
+                        if "settleCoin" in params:
+                            settle_coin_of[(category, position["symbol"])] = params["settleCoin"]
+            response = await call(session.get_executions, category=category, limit=EXECUTION_PAGE_LIMIT)
+            executions[category] = response["result"]["list"]
+        response = await call(session.get_wallet_balance, accountType=self.account_type)
+        wallets = {wallet["accountType"]: wallet for wallet in response["result"]["list"]}
+
+        categories = self.categories
+        with self._lock:
+            corrections = _merge(self._orders, orders, started, lambda key: key[0] in categories, _is_open)
+            corrections += _merge(
+                self._positions, positions, started, lambda key: key[0] in categories, _is_open_position
+            )
+            _merge(self._wallets, wallets, started, lambda key: key == self.account_type, lambda item: True)
+            self._settle_coin_of.update(settle_coin_of)
+            if self.reconciles:
+                # The first snapshot fills the mirror; later ones correct drift.
+                self.corrections += corrections
+            for category, rows in executions.items():
+                self._executions[category].seed(rows, generation, EXECUTION_PAGE_LIMIT)
+            self.reconciles += 1
+            self._reconciled_at = time.time()
+            self._generation = generation
+
+    def _reconnected(self) -> bool:
+        stream = self.hub.get("private")
+        return stream is not None and stream.is_connected() and stream.reconnects != self._generation
+
+    async def _run(self) -> None:
+        while True:
+            deadline = time.monotonic() + self.interval
+            while time.monotonic() < deadline and not self._reconnected():
+                await asyncio.sleep(min(RECONNECT_POLL, self.interval))
+            try:
+                # The shared session, rebuilt if a reload changed its pool size or timeout.
+                await self.reconcile(get_session())
+            except Exception:
+                logger.exception("Account mirror reconciliation failed")
+
+    def freshness(self) -> dict[str, Any] | None:
+        """How old the mirror's data is, or None if it must not be served."""
+        stream = self.hub.get("private")
+        if not self.running or stream is None or not stream.is_connected():
+            return None
+        if self._generation != stream.reconnects:
+            return None
+        now = time.time()
+        reconcile_age = now - self._reconciled_at
+        if reconcile_age > MAX_RECONCILE_AGE * self.interval:
+            return None
+        return {
+            "source": "private stream",
+            "lastEventAge": round(now - self._last_event, 3) if self._last_event else None,
+            "lastReconcileAge": round(reconcile_age, 3),
+        }
+
+    def _served(self, category: str, settle_coin: str | None = None) -> dict[str, Any] | None:
+        if category not in self.categories:
+            return None
+        if settle_coin is not None and category in SETTLED_CATEGORIES and settle_coin not in self.settle_coins:
+            return None
+        return self.freshness()
+
+    def open_orders(
+        self,
+        category: str,
+        symbol: str | None = None,
+        order_id: str | None = None,
+        order_link_id: str | None = None,
+        limit: int | None = None,
+        all_pages: bool = False,
+    ) -> dict[str, Any] | None:
+        """A get_open_orders response from the mirror, newest first, or None if it cannot be served."""
+        mirror = self._served(category)
+        if mirror is None:
+            return None
+        with self._lock:
+            orders = [
+                order
+                for (order_category, _), (_, order) in self._orders.items()
+                if order_category == category
+                and _is_open(order)
+                and symbol in (None, order["symbol"])
+                and order_id in (None, order["orderId"])
+                and order_link_id in (None, order.get("orderLinkId"))
+            ]
+        orders.sort(key=lambda order: int(order.get("createdTime") or 0), reverse=True)
+        if not all_pages:
+            orders = orders[: limit or DEFAULT_ORDER_LIMIT]
+        return {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"category": category, "list": orders, "nextPageCursor": "", "mirror": mirror},
+        }
+
+    def positions(
+        self,
+        category: str,
+        symbol: str | None = None,
+        settle_coin: str | None = None,
+        limit: int | None = None,
+        all_pages: bool = False,
+    ) -> dict[str, Any] | None:
+        """A get_positions response with the open positions in the mirror, or None if it cannot be served.
+
+        With settle_coin, a position the stream opened since the last reconciliation has no
+        known settle coin yet, so the read falls back to REST.
+        """
+        mirror = self._served(category, settle_coin)
+        if mirror is None or category not in POSITION_CATEGORIES:
+            return None
+        with self._lock:
+            positions = [
+                position
+                for (position_category, position_symbol, _), (_, position) in self._positions.items()
+                if position_category == category and _is_open_position(position) and symbol in (None, position_symbol)
+            ]
+            if settle_coin is not None and category in SETTLED_CATEGORIES:
+                coins = [self._settle_coin_of.get((category, position["symbol"])) for position in positions]
+                if None in coins:
+                    return None
+                positions = [position for position, coin in zip(positions, coins) if coin == settle_coin]
+        positions.sort(key=lambda position: (position["symbol"], position.get("positionIdx", 0)))
+        if not all_pages:
+            positions = positions[: limit or DEFAULT_POSITION_LIMIT]
+        return {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"category": category, "list": positions, "nextPageCursor": "", "mirror": mirror},
+        }
+
+    def wallet(self, account_type: str, coin: str | None = None) -> dict[str, Any] | None:
+        """A get_wallet_balance response from the mirror, or None if it cannot be served."""
+        if account_type != self.account_type:
+            return None
+        mirror = self.freshness()
+        with self._lock:
+            entry = self._wallets.get(account_type)
+        if mirror is None or entry is None:
+            return None
+        wallet = entry[1]
+        if coin:
+            coins = set(coin.split(","))
+            wallet = {**wallet, "coin": [item for item in wallet.get("coin", []) if item.get("coin") in coins]}
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": [wallet], "mirror": mirror}}
+
+    def executions(self, category: str, symbol: str | None = None, limit: int | None = None) -> dict[str, Any] | None:
+        """A get_trade_history response from recent executions, or None if it cannot be served."""
+        mirror = self._served(category)
+        buffer = self._executions.get(category)
+        if mirror is None or buffer is None:
+            return None
+        match = (lambda execution: execution["symbol"] == symbol) if symbol else None
+        executions = buffer.latest(limit or DEFAULT_EXECUTION_LIMIT, match)
+        if executions is None:
+            return None
+        return {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"category": category, "list": executions, "nextPageCursor": "", "mirror": mirror},
+        }
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            open_orders = sum(_is_open(order) for _, order in self._orders.values())
+            open_positions = sum(_is_open_position(position) for _, position in self._positions.values())
+            executions = {category: len(buffer.trades) for category, buffer in self._executions.items()}
+        stream = self.hub.get("private")
+        now = time.time()
+        return {
+            "running": self.running,
+            "categories": list(self.categories),
+            "settleCoins": list(self.settle_coins),
+            "accountType": self.account_type,
+            "connected": stream is not None and stream.is_connected(),
+            "served": self.freshness() is not None,
+            "openOrders": open_orders,
+            "positions": open_positions,
+            "executions": executions,
+            "reconciles": self.reconciles,
+            "corrections": self.corrections,
+            "lastEventAge": round(now - self._last_event, 3) if self._last_event else None,
+            "lastReconcileAge": round(now - self._reconciled_at, 3) if self._reconciled_at else None,
+        }
+
+
+account_mirror = AccountMirror(stream_hub)
+on_reload(account_mirror.reconfigure)
@@ -0,0 +1,106 @@
+"""Indicators over kline series, computed with NumPy over the whole series at once.
+
+summarize() turns Bybit kline rows into the latest value of each requested indicator,
+so a caller gets a handful of numbers instead of the candles.
+
+EMA and ATR are recursive (each value depends on the previous one). Their latest value
+is computed as a dot product with the recursion's weights instead of a loop. The
+weight of a bar k steps back is alpha * (1 - alpha)**k; once that falls below
+EMA_HORIZON_EPS (about 280 bars for period 14) older bars no longer change the
+float64 result, so they are not read.
+"""
+
+import itertools
+import math
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install 'bybit-mcp-server[analytics]'
+    np = None
+
+INDICATORS = ("returns", "vwap", "atr", "ema", "volatility")
+
+MISSING_NUMPY = "Kline analytics need NumPy. Install it with: pip install 'bybit-mcp-server[analytics]'"
+
+# Relative weight below which older bars no longer change an EMA in float64.
+EMA_HORIZON_EPS = 1e-17
+
+MS_PER_YEAR = 365 * 86_400_000
+
+
+def to_array(bars: list[list[str]]) -> "np.ndarray":
+    """Bybit kline rows (start, open, high, low, close, volume, turnover) as a float64 array, one row per bar."""
+    # Parsing the strings is most of the work; fromiter over map(float) avoids
+    # numpy's slower per-element string conversion.
+    values = map(float, itertools.chain.from_iterable(bars))
+    return np.fromiter(values, np.float64, len(bars) * 7).reshape(-1, 7)
+
+
+def ema_last(values: "np.ndarray", alpha: float, seed: int) -> float:
+    """Latest value of an EMA over values, seeded with the mean of the first seed values."""
+    steps = values[seed:]
+    decay = 1.0 - alpha
+    horizon = len(steps) if decay == 0 else min(len(steps), int(math.log(EMA_HORIZON_EPS) / math.log(decay)) + 1)
+    # Weights of the last `horizon` values, oldest first; the seed keeps what is left.
+    weights = alpha * decay ** np.arange(horizon - 1, -1, -1)
+    last = float(np.dot(weights, steps[len(steps) - horizon :]))
+    if horizon == len(steps):
+        last += decay**horizon * float(values[:seed].mean())
+    return last
+
+
+def true_range(high: "np.ndarray", low: "np.ndarray", close: "np.ndarray") -> "np.ndarray":
+    """Per-bar true range; the first bar, with no previous close, uses high - low."""
+    previous = np.concatenate((close[:1], close[:-1]))
+    return np.maximum(high, previous) - np.minimum(low, previous)
+
+
+def summarize(bars: list[list[str]], step_ms: int, indicators: tuple[str, ...], period: int) -> dict[str, Any]:
+    """summarize_array() of Bybit kline rows."""
+    return summarize_array(to_array(bars), step_ms, indicators, period)
+
+
+def summarize_array(data: "np.ndarray", step_ms: int, indicators: tuple[str, ...], period: int) -> dict[str, Any]:
+    """Latest value of each indicator over to_array() bars, which must be sorted oldest first.
+
+    - returns: total return from the first open to the last close, and the mean,
+      standard deviation and last of the per-bar log returns
+    - vwap: volume-weighted average of the typical price (high + low + close) / 3
+    - atr: Wilder's average true range over period bars
+    - ema: exponential moving average of the close over period bars
+    - volatility: standard deviation of per-bar log returns, and annualized over a
+      24/7 year
+
+    An indicator that needs more bars than there are is null.
+    """
+    count = len(data)
+    summary: dict[str, Any] = {"count": count}
+    if not count:
+        return summary | dict.fromkeys(indicators)
+    _, open_, high, low, close, volume, _ = data.T
+    summary |= {"first": int(data[0, 0]), "last": int(data[-1, 0]), "close": float(close[-1])}
+    log_returns = np.diff(np.log(close))
+    for name in indicators:
+        if name == "returns":
+            summary[name] = {
+                "total": float(close[-1] / open_[0] - 1),
+                "meanLog": float(log_returns.mean()) if count > 1 else None,
+                "stdLog": float(log_returns.std(ddof=1)) if count > 2 else None,
+                "lastLog": float(log_returns[-1]) if count > 1 else None,
+            }
+        elif name == "vwap":
+            total = float(volume.sum())
+            summary[name] = float(np.dot((high + low + close) / 3, volume) / total) if total else None
+        elif name == "atr":
+            ranges = true_range(high, low, close)
+            summary[name] = ema_last(ranges, 1 / period, period) if count >= period else None
+        elif name == "ema":
+            summary[name] = ema_last(close, 2 / (period + 1), period) if count >= period else None
+        elif name == "volatility":
+            if count > 2:
+                per_bar = float(log_returns.std(ddof=1))
+                summary[name] = {"perBar": per_bar, "annualized": per_bar * math.sqrt(MS_PER_YEAR / step_ms)}
+            else:
+                summary[name] = None
+    return summary
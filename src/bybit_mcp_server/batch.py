@@ -0,0 +1,96 @@
+"""Batch order requests: split to Bybit's per-request limits and sent concurrently.
+
+Bybit's batch endpoints take one category and a "request" list. Each list item gets
+its own result in result.list and its own status in retExtInfo.list, so one bad
+order does not fail the rest. Results here are reported per order, in input order.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from bybit_mcp_server.client import call
+
+# Most orders one batch request may carry, per category.
+BATCH_LIMITS: dict[str, int] = {"spot": 10, "linear": 20, "inverse": 20, "option": 20}
+
+# Keys every order must have for each batch operation; one key of each tuple is enough.
+REQUIRED_KEYS: dict[str, list[tuple[str, ...]]] = {
+    "place": [("symbol",), ("side",), ("orderType",), ("qty",)],
+    "amend": [("symbol",), ("orderId", "orderLinkId")],
+    "cancel": [("symbol",), ("orderId", "orderLinkId")],
+}
+
+
+def check_order(operation: str, order: Any) -> str | None:
+    """Why an order cannot be sent, or None if it has the keys the operation needs."""
+    if not isinstance(order, dict):
+        return "Each order must be an object"
+    for keys in REQUIRED_KEYS[operation]:
+        if not any(order.get(key) not in (None, "") for key in keys):
+            return f"Missing {' or '.join(keys)}"
+    return None
+
+
+def chunks(items: list[Any], size: int) -> list[list[Any]]:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def _chunk_results(chunk: list[tuple[int, dict[str, Any]]], response: dict[str, Any] | Exception) -> list[dict]:
+    if isinstance(response, Exception):
+        return [{"index": index, "success": False, "error": str(response)} for index, _ in chunk]
+    items = response.get("result", {}).get("list", [])
+    statuses = (response.get("retExtInfo") or {}).get("list", [])
+    results = []
+    for position, (index, _) in enumerate(chunk):
+        status = statuses[position] if position < len(statuses) else {}
+        code = status.get("code", response.get("retCode"))
+        results.append(
+            {
+                "index": index,
+                "success": code == 0,
+                "code": code,
+                "msg": status.get("msg", response.get("retMsg")),
+                **(items[position] if position < len(items) else {}),
+            }
+        )
+    return results
+
+
+async def run_batch(
+    method: Callable[..., dict], operation: str, category: str, orders: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Send orders through a pybit batch method in concurrent, limit-sized chunks.
+
+    Orders missing required keys are reported as failed without being sent. A chunk
+    whose request fails marks every order in it as failed.
+    """
+    results: list[dict[str, Any]] = []
+    valid: list[tuple[int, dict[str, Any]]] = []
+    for index, order in enumerate(orders):
+        error = check_order(operation, order)
+        if error is None:
+            valid.append((index, order))
+        else:
+            results.append({"index": index, "success": False, "error": error})
+
+    batches = chunks(valid, BATCH_LIMITS.get(category, min(BATCH_LIMITS.values())))
+    responses = await asyncio.gather(
+        *(call(method, category=category, request=[order for _, order in batch]) for batch in batches),
+        return_exceptions=True,
+    )
+    for batch, response in zip(batches, responses):
+        if isinstance(response, BaseException) and not isinstance(response, Exception):
+            raise response
+        results.extend(_chunk_results(batch, response))
+
+    results.sort(key=lambda result: result["index"])
+    succeeded = sum(result["success"] for result in results)
+    return {
+        "category": category,
+        "total": len(orders),
+        "succeeded": succeeded,
+        "failed": len(orders) - succeeded,
+        "requests": len(batches),
+        "list": results,
+    }
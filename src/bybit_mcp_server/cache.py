@@ -0,0 +1,105 @@
+"""Bounded in-memory TTL cache for public market data."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from bybit_mcp_server.config import get_settings
+
+# Result handed to coalesced waiters when the caller running the fetch was cancelled.
+_ABANDONED = object()
+
+
+class TTLCache:
+    """LRU cache with per-entry expiry and coalescing of concurrent identical misses.
+
+    Keys are tuples whose first element names the tool; hit/miss counters are kept
+    per tool. Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+        self.evictions = 0
+
+    def _count(self, key: Hashable, counter: str) -> None:
+        tool = key[0] if isinstance(key, tuple) and key else str(key)
+        counters = self._counters.setdefault(tool, {"hits": 0, "misses": 0, "coalesced": 0})
+        counters[counter] += 1
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(self, key: Hashable, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, or await fetch() and cache it for ttl seconds."""
+        if ttl <= 0 or self.max_entries <= 0:
+            return await fetch()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(key, "hits")
+                return entry[1]
+            del self._entries[key]
+
+        counted = False
+        while (inflight := self._inflight.get(key)) is not None:
+            if not counted:
+                self._count(key, "coalesced")
+                counted = True
+            value = await asyncio.shield(inflight)
+            if value is not _ABANDONED:
+                return value
+            # The fetching caller was cancelled; the first waiter to get here fetches instead.
+
+        if not counted:
+            self._count(key, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                # Only this caller was cancelled; waiters must not see its CancelledError.
+                future.set_result(_ABANDONED)
+            else:
+                future.set_exception(exc)
+                # Mark retrieved so an unawaited failure does not log a warning.
+                future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+        self._store(key, value, ttl)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self._counters.clear()
+        self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count, evictions and per-tool hit/miss counters."""
+        hits = sum(c["hits"] for c in self._counters.values())
+        lookups = hits + sum(c["misses"] + c["coalesced"] for c in self._counters.values())
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "tools": {tool: dict(counters) for tool, counters in sorted(self._counters.items())},
+        }
+
+
+# Shared by the public market data tools.
+market_cache = TTLCache(max_entries=get_settings().cache_max_entries)
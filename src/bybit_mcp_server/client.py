@@ -1,25 +1,275 @@
-"""Pybit HTTP session factory."""
+"""Pybit HTTP session management and the async execution layer."""
 
+import asyncio
+import contextvars
+import functools
 import json
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
-from pybit.unified_trading import HTTP
+from pybit.exceptions import InvalidRequestError
 
-from bybit_mcp_server.config import get_api_key, get_api_secret, get_recv_window, get_testnet
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encoding
+    orjson = None
 
+from bybit_mcp_server.config import OutputFormat, get_settings
+from bybit_mcp_server.metrics import endpoint_name, server_metrics
+from bybit_mcp_server.ratelimit import endpoint_group, observe_response, rate_limiter, run_in_bucket
+from bybit_mcp_server.resilience import CircuitOpenError, backoff, breakers, hedged, is_outage, is_transient
+from bybit_mcp_server.tracing import span
 
-def get_session() -> HTTP:
-    """Create a new pybit HTTP session from environment config."""
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
+
+# Process-wide session shared by every tool call. Reusing it keeps the underlying
+# requests.Session (and its TCP/TLS connections) alive between calls.
+_session: "HTTP | None" = None
+_session_key: tuple | None = None
+_session_lock = threading.Lock()
+
+# Page cap for fetch_all requests that do not set max_pages.
+DEFAULT_MAX_PAGES = 50
+
+# Bounded worker pool for blocking pybit calls, so a slow request never stalls the event loop.
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _build_session(key: tuple) -> "HTTP":
+    """Create a pybit HTTP session with a keep-alive connection pool.
+
+    pybit.unified_trading (and requests, websocket-client and pycryptodome with it)
+    is imported here rather than at module level, so starting the server and
+    answering tools/list never pay for it.
+    """
+    from pybit.unified_trading import HTTP
+    from requests.adapters import HTTPAdapter
+
+    testnet, api_key, api_secret, recv_window, pool_size, base_url, timeout = key
     kwargs: dict = {
-        "testnet": get_testnet(),
-        "api_key": get_api_key(),
-        "api_secret": get_api_secret(),
+        "testnet": testnet,
+        "api_key": api_key,
+        "api_secret": api_secret,
+        "timeout": timeout,
     }
-    recv_window = get_recv_window()
     if recv_window is not None:
         kwargs["recv_window"] = recv_window
-    return HTTP(**kwargs)
+    session = HTTP(**kwargs)
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.client.mount("https://", adapter)
+    session.client.mount("http://", adapter)
+    session.client.hooks["response"].append(observe_response)
+    if base_url:
+        session.endpoint = base_url
+    return session
+
+
+def get_session() -> "HTTP":
+    """Return the shared pybit HTTP session, rebuilding it if the settings it is built from changed."""
+    global _session, _session_key
+    with span("get_session") as current:
+        key = get_settings().session_key
+        with _session_lock:
+            rebuilt = _session is None or key != _session_key
+            if rebuilt:
+                _session = _build_session(key)
+                _session_key = key
+            current.set(rebuilt=rebuilt)
+            return _session
+
+
+def reset_session() -> None:
+    """Close the shared session. The next get_session() call builds a fresh one."""
+    global _session, _session_key
+    with _session_lock:
+        if _session is not None:
+            _session.client.close()
+        _session = None
+        _session_key = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_settings().max_workers, thread_name_prefix="bybit-http")
+        return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the worker pool, waiting for in-flight calls. It is recreated on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_sync(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable on the worker pool and await its result.
+
+    The callable runs in a copy of the caller's context, so trace spans opened in it
+    are children of the caller's span.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_get_executor(), functools.partial(context.run, fn, *args, **kwargs))
+
+
+def _request(bucket: Any, method: Callable[..., dict], params: dict) -> dict:
+    with span("http.request"):
+        return run_in_bucket(bucket, method, params)
+
+
+async def _call_once(method: Callable[..., dict], params: dict, endpoint: str, group: str) -> dict:
+    with span("bybit.call", endpoint=endpoint, group=group) as current:
+        bucket = rate_limiter.bucket_for(method)
+        if bucket is not None:
+            with span("rate_limit.wait"):
+                await bucket.acquire()
+        started = time.perf_counter()
+        try:
+            response = await run_sync(_request, bucket, method, params)
+        except Exception as e:
+            # InvalidRequestError carries Bybit's retCode in status_code.
+            ret_code = e.status_code if isinstance(e, InvalidRequestError) else None
+            server_metrics.observe_endpoint(endpoint, group, time.perf_counter() - started, ret_code, True)
+            raise
+        ret_code = response.get("retCode") if isinstance(response, dict) else None
+        server_metrics.observe_endpoint(endpoint, group, time.perf_counter() - started, ret_code, False)
+        current.set(retCode=ret_code)
+    return response
+
+
+async def call(method: Callable[..., dict], **params: Any) -> dict:
+    """Invoke a pybit REST method (e.g. ``session.get_tickers``) off the event loop.
+
+    Waits for the method's rate-limit bucket first, so bursts queue instead of failing.
+    Latency (after the rate-limit wait) and retCode are recorded in server_metrics.
+
+    Reads (get_* methods) go through the endpoint's circuit breaker, are retried on
+    transient failures and, for market data, hedged; see resilience. Writes are sent
+    once; idempotency retries the ones that are safe to repeat.
+    """
+    endpoint, group = endpoint_name(method), endpoint_group(method)
+    if not endpoint.startswith("get_"):
+        return await _call_once(method, params, endpoint, group)
+
+    def observe(event: str) -> None:
+        server_metrics.observe_event(endpoint, group, event)
+
+    settings = get_settings()
+    breaker = breakers.get(endpoint)
+    hedge_after = settings.hedge_after_seconds if group == "market" else None
+    attempt = 0
+    while True:
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            observe("shortCircuited")
+            raise
+        try:
+            if hedge_after is None:
+                response = await _call_once(method, params, endpoint, group)
+            else:
+                response = await hedged(lambda: _call_once(method, params, endpoint, group), hedge_after, observe)
+        except asyncio.CancelledError:
+            breaker.abandon()
+            raise
+        except Exception as e:
+            if breaker.record(not is_outage(e)):
+                observe("breakerOpens")
+            if attempt == settings.read_retries or not is_transient(e) or breaker.state != "closed":
+                raise
+        else:
+            breaker.record(True)
+            return response
+        observe("retries")
+        await asyncio.sleep(backoff(attempt, settings.read_retry_backoff))
+        attempt += 1
+
+
+def page_limit(fetch_all: bool | None, max_pages: int | None) -> int | None:
+    """Pages to walk for a fetch_all/max_pages request, or None for a plain single-page call."""
+    if max_pages is not None:
+        return max(1, max_pages)
+    return DEFAULT_MAX_PAGES if fetch_all else None
+
+
+async def call_paged(method: Callable[..., dict], params: dict, max_pages: int | None) -> dict:
+    """Call a cursor-paginated pybit method, following nextPageCursor for up to max_pages pages.
+
+    Returns the last page's response with every page's "list" merged into it, plus
+    "pageCount". "nextPageCursor" is non-empty if the page cap cut the walk short.
+    With max_pages=None this is a single call().
+    """
+    if max_pages is None:
+        return await call(method, **params)
+    params = dict(params)
+    items: list = []
+    for page in range(1, max_pages + 1):
+        response = await call(method, **params)
+        result = response["result"]
+        items.extend(result.get("list", []))
+        cursor = result.get("nextPageCursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    return {**response, "result": {**result, "list": items, "nextPageCursor": cursor or "", "pageCount": page}}
+
+
+_CONTAINERS = frozenset((dict, list))
+
+
+def tabulate(value: Any) -> Any:
+    """Turn every non-empty list of objects into {"columns": [...], "rows": [[...], ...]}.
+
+    Columns are the union of keys in first-seen order; missing keys become null.
+    """
+    if isinstance(value, dict):
+        if _CONTAINERS.isdisjoint(map(type, value.values())):
+            return value
+        return {key: tabulate(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [tabulate(item) for item in value]
+        if not items or not all(isinstance(item, dict) for item in items):
+            return items
+        keys = tuple(items[0])
+        if all(tuple(item) == keys for item in items):
+            # Usual case: every object has the same keys in the same order.
+            return {"columns": list(keys), "rows": [list(item.values()) for item in items]}
+        columns = list(dict.fromkeys(key for item in items for key in item))
+        return {"columns": columns, "rows": [[item.get(key) for key in columns] for item in items]}
+    return value
+
+
+def format_payload(payload: Any, output_format: OutputFormat | None = None) -> str:
+    """Format a tool response payload as a JSON string, in output_format or BYBIT_OUTPUT_FORMAT."""
+    output_format = output_format or get_settings().output_format
+    with span("format", output_format=output_format):
+        if output_format == "table":
+            payload = tabulate(payload)
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 if output_format == "pretty" else 0
+            try:
+                encoded = orjson.dumps(payload, option=option | orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass  # integers beyond 64 bits, which json encodes
+            else:
+                # orjson writes non-ASCII text raw where json escapes it; keep the output the same.
+                if encoded.isascii():
+                    return encoded.decode()
+        if output_format == "pretty":
+            return json.dumps(payload, indent=2)
+        return json.dumps(payload, separators=(",", ":"))
 
 
-def format_result(result: dict) -> str:
+def format_result(result: dict, output_format: OutputFormat | None = None) -> str:
     """Extract the 'result' key from pybit response and format as JSON string."""
-    return json.dumps(result["result"], indent=2)
+    return format_payload(result["result"], output_format)
@@ -1,7 +1,15 @@
-"""Configuration loaded from environment variables."""
+"""Configuration loaded from environment variables.
+
+The get_* functions read one variable each. The server reads them all once into an
+immutable Settings (get_settings()) and reads them again only on reload_settings().
+"""
 
 import os
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, fields
 from enum import Enum
+from types import MappingProxyType
+from typing import Any, Literal, get_args
 
 
 class Mode(str, Enum):
@@ -17,29 +25,429 @@ MODE_PERMISSIONS: dict[Mode, set[str]] = {
     Mode.FULL: {"read", "trade", "full"},
 }
 
+# Tool response encodings: indented JSON, minified JSON, or minified JSON with lists of
+# objects turned into {"columns": [...], "rows": [[...], ...]} tables.
+OutputFormat = Literal["pretty", "compact", "table"]
+
+# How MCP clients connect: one client over stdin/stdout, or many over HTTP.
+Transport = Literal["stdio", "streamable-http", "sse"]
+
+# Where trace spans go: stderr lines, a JSON lines file, or an OTLP/HTTP collector.
+TraceExporter = Literal["console", "json", "otlp"]
+
+# Levels for the MCP server's own log on stderr.
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+# Client-side request budget per endpoint group, in requests per second. Market data is
+# limited per IP (600 per 5 s); the private groups follow Bybit's per-UID order limits.
+DEFAULT_RATE_LIMITS: dict[str, float] = {
+    "market": 100.0,
+    "trade": 10.0,
+    "position": 10.0,
+    "account": 10.0,
+    "asset": 5.0,
+    "other": 10.0,
+}
+
 
 def get_mode() -> Mode:
-    raw = os.getenv("BYBIT_MODE", "read").lower()
+    raw = _getenv("BYBIT_MODE", "read").lower()
     try:
         return Mode(raw)
     except ValueError:
         return Mode.READ
 
 
+def get_transport() -> Transport:
+    raw = _getenv("BYBIT_TRANSPORT", "stdio").lower()
+    return raw if raw in get_args(Transport) else "stdio"
+
+
+def get_host() -> str:
+    return _getenv("BYBIT_HOST", "") or "127.0.0.1"
+
+
+def get_port() -> int:
+    raw = _getenv("BYBIT_PORT", "")
+    return int(raw) if raw else 8000
+
+
+def get_http_token() -> str | None:
+    """Bearer token HTTP clients must send. Required, or BYBIT_ALLOWED_HOSTS, to listen beyond localhost."""
+    return _getenv("BYBIT_HTTP_TOKEN", "") or None
+
+
+def get_allowed_hosts() -> tuple[str, ...]:
+    """Host header values HTTP clients may use, e.g. "mcp.example.com,10.0.0.5:*"."""
+    return tuple(host.strip() for host in _getenv("BYBIT_ALLOWED_HOSTS", "").split(",") if host.strip())
+
+
+def get_max_concurrent_calls() -> int:
+    """Tool calls run at once across all clients; 0 means no limit."""
+    raw = _getenv("BYBIT_MAX_CONCURRENT_CALLS", "")
+    return int(raw) if raw else 0
+
+
+def get_shutdown_timeout() -> float:
+    """Seconds an HTTP server waits for open requests and streams after a shutdown signal."""
+    raw = _getenv("BYBIT_SHUTDOWN_TIMEOUT", "")
+    return float(raw) if raw else 10.0
+
+
 def get_testnet() -> bool:
-    return os.getenv("BYBIT_TESTNET", "true").lower() == "true"
+    return _getenv("BYBIT_TESTNET", "true").lower() == "true"
 
 
 def get_api_key() -> str | None:
-    key = os.getenv("BYBIT_API_KEY", "")
+    key = _getenv("BYBIT_API_KEY", "")
     return key or None
 
 
 def get_api_secret() -> str | None:
-    secret = os.getenv("BYBIT_API_SECRET", "")
+    secret = _getenv("BYBIT_API_SECRET", "")
     return secret or None
 
 
 def get_recv_window() -> int | None:
-    raw = os.getenv("BYBIT_RECV_WINDOW", "")
+    raw = _getenv("BYBIT_RECV_WINDOW", "")
     return int(raw) if raw else None
+
+
+def get_base_url() -> str | None:
+    url = _getenv("BYBIT_BASE_URL", "")
+    return url.rstrip("/") or None
+
+
+def get_ws_url() -> str | None:
+    """Replaces Bybit's WebSocket host (e.g. ws://127.0.0.1:8765); the /v5/... path is kept."""
+    url = _getenv("BYBIT_WS_URL", "")
+    return url.rstrip("/") or None
+
+
+def get_http_timeout() -> float:
+    """Seconds pybit waits for a REST response before giving up (pybit's default is 10)."""
+    raw = _getenv("BYBIT_HTTP_TIMEOUT", "")
+    return float(raw) if raw else 10.0
+
+
+def get_write_retries() -> int:
+    """Extra attempts for an order write that failed with a network or transient Bybit error."""
+    raw = _getenv("BYBIT_WRITE_RETRIES", "")
+    return int(raw) if raw else 3
+
+
+def get_write_retry_backoff() -> float:
+    """Base delay before the first write retry; it doubles per attempt, with full jitter."""
+    raw = _getenv("BYBIT_WRITE_RETRY_BACKOFF", "")
+    return float(raw) if raw else 0.25
+
+
+def get_read_retries() -> int:
+    """Extra attempts for a read (get_*) that failed with a network or transient Bybit error."""
+    raw = _getenv("BYBIT_READ_RETRIES", "")
+    return int(raw) if raw else 2
+
+
+def get_read_retry_backoff() -> float:
+    """Base delay before the first read retry; it doubles per attempt, with full jitter."""
+    raw = _getenv("BYBIT_READ_RETRY_BACKOFF", "")
+    return float(raw) if raw else 0.1
+
+
+def get_breaker_threshold() -> int:
+    """Consecutive outage errors that open an endpoint's circuit breaker; 0 disables breakers."""
+    raw = _getenv("BYBIT_BREAKER_THRESHOLD", "")
+    return int(raw) if raw else 5
+
+
+def get_breaker_cooldown_seconds() -> float:
+    """Seconds an open circuit breaker fails calls before letting a trial call through."""
+    raw = _getenv("BYBIT_BREAKER_COOLDOWN_SECONDS", "")
+    return float(raw) if raw else 30.0
+
+
+def get_hedge_after_seconds() -> float | None:
+    """Seconds after which an unanswered market data read is sent again; None (unset or 0) disables hedging."""
+    raw = _getenv("BYBIT_HEDGE_AFTER_SECONDS", "")
+    return (float(raw) or None) if raw else None
+
+
+def get_http_pool_size() -> int:
+    raw = _getenv("BYBIT_HTTP_POOL_SIZE", "")
+    return int(raw) if raw else 10
+
+
+def get_max_workers() -> int:
+    raw = _getenv("BYBIT_MAX_WORKERS", "")
+    return int(raw) if raw else 10
+
+
+def get_cache_max_entries() -> int:
+    raw = _getenv("BYBIT_CACHE_MAX_ENTRIES", "")
+    return int(raw) if raw else 1024
+
+
+def get_instrument_refresh_seconds() -> float:
+    raw = _getenv("BYBIT_INSTRUMENT_REFRESH_SECONDS", "")
+    return float(raw) if raw else 3600.0
+
+
+def get_kline_concurrency() -> int:
+    raw = _getenv("BYBIT_KLINE_CONCURRENCY", "")
+    return int(raw) if raw else 4
+
+
+def get_trade_buffer_size() -> int:
+    raw = _getenv("BYBIT_TRADE_BUFFER_SIZE", "")
+    return int(raw) if raw else 1000
+
+
+def get_mirror_reconcile_seconds() -> float:
+    raw = _getenv("BYBIT_MIRROR_RECONCILE_SECONDS", "")
+    return float(raw) if raw else 60.0
+
+
+def get_metrics_port() -> int | None:
+    """Local port for Prometheus metrics (served on 127.0.0.1); unset disables the endpoint."""
+    raw = _getenv("BYBIT_METRICS_PORT", "")
+    return int(raw) if raw else None
+
+
+def get_trace_exporter() -> TraceExporter | None:
+    """Span exporter from BYBIT_TRACE_EXPORTER; unset (or unknown) leaves tracing off."""
+    raw = _getenv("BYBIT_TRACE_EXPORTER", "").lower()
+    return raw if raw in get_args(TraceExporter) else None
+
+
+def get_trace_file() -> str:
+    return os.path.expanduser(_getenv("BYBIT_TRACE_FILE", "") or "bybit-mcp-traces.jsonl")
+
+
+def get_otlp_endpoint() -> str:
+    return _getenv("BYBIT_OTLP_ENDPOINT", "") or "http://localhost:4318/v1/traces"
+
+
+def get_history_db() -> str | None:
+    path = _getenv("BYBIT_HISTORY_DB", "")
+    return os.path.expanduser(path) if path else None
+
+
+def get_confirmation_db() -> str | None:
+    """SQLite file for pending confirmations, shared by every server process using it; unset keeps them in memory."""
+    path = _getenv("BYBIT_CONFIRMATION_DB", "")
+    return os.path.expanduser(path) if path else None
+
+
+def get_max_pending_confirmations() -> int:
+    raw = _getenv("BYBIT_MAX_PENDING_CONFIRMATIONS", "")
+    return int(raw) if raw else 1000
+
+
+def get_rate_limits() -> dict[str, float]:
+    """DEFAULT_RATE_LIMITS updated from BYBIT_RATE_LIMITS ("market=50,trade=5"; 0 disables a group)."""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for item in _getenv("BYBIT_RATE_LIMITS", "").split(","):
+        group, sep, rate = item.partition("=")
+        if sep:
+            limits[group.strip()] = float(rate)
+    return limits
+
+
+def get_output_format() -> OutputFormat:
+    raw = _getenv("BYBIT_OUTPUT_FORMAT", "pretty").lower()
+    return raw if raw in get_args(OutputFormat) else "pretty"
+
+
+def get_log_level() -> LogLevel:
+    """Level of the server log on stderr. At INFO every request is logged, which costs about 3 ms each."""
+    raw = _getenv("BYBIT_LOG_LEVEL", "WARNING").upper()
+    return raw if raw in get_args(LogLevel) else "WARNING"
+
+
+def get_env_file() -> str | None:
+    """A KEY=VALUE file read on every settings load; its values override the environment."""
+    path = os.getenv("BYBIT_ENV_FILE", "")
+    return os.path.expanduser(path) if path else None
+
+
+def read_env_file(path: str) -> dict[str, str]:
+    """KEY=VALUE lines of path. Blank lines and # comments are skipped, quotes around values removed."""
+    values = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            key, sep, value = line.removeprefix("export ").partition("=")
+            if sep:
+                values[key.strip()] = value.strip().strip("\"'")
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Every setting, read once. Never changed in place: reload_settings() replaces it."""
+
+    mode: Mode
+    transport: Transport
+    host: str
+    port: int
+    http_token: str | None
+    allowed_hosts: tuple[str, ...]
+    max_concurrent_calls: int
+    shutdown_timeout: float
+    testnet: bool
+    api_key: str | None
+    api_secret: str | None
+    recv_window: int | None
+    base_url: str | None
+    ws_url: str | None
+    http_pool_size: int
+    http_timeout: float
+    write_retries: int
+    write_retry_backoff: float
+    read_retries: int
+    read_retry_backoff: float
+    breaker_threshold: int
+    breaker_cooldown_seconds: float
+    hedge_after_seconds: float | None
+    max_workers: int
+    cache_max_entries: int
+    instrument_refresh_seconds: float
+    kline_concurrency: int
+    trade_buffer_size: int
+    mirror_reconcile_seconds: float
+    metrics_port: int | None
+    trace_exporter: TraceExporter | None
+    trace_file: str
+    otlp_endpoint: str
+    history_db: str | None
+    confirmation_db: str | None
+    max_pending_confirmations: int
+    rate_limits: Mapping[str, float]
+    output_format: OutputFormat
+    log_level: LogLevel
+    # Derived from the fields above.
+    permissions: frozenset[str] = field(init=False)
+    session_key: tuple = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "permissions", frozenset(MODE_PERMISSIONS[self.mode]))
+        object.__setattr__(
+            self,
+            "session_key",
+            (
+                self.testnet,
+                self.api_key,
+                self.api_secret,
+                self.recv_window,
+                self.http_pool_size,
+                self.base_url,
+                self.http_timeout,
+            ),
+        )
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            mode=get_mode(),
+            transport=get_transport(),
+            host=get_host(),
+            port=get_port(),
+            http_token=get_http_token(),
+            allowed_hosts=get_allowed_hosts(),
+            max_concurrent_calls=get_max_concurrent_calls(),
+            shutdown_timeout=get_shutdown_timeout(),
+            testnet=get_testnet(),
+            api_key=get_api_key(),
+            api_secret=get_api_secret(),
+            recv_window=get_recv_window(),
+            base_url=get_base_url(),
+            ws_url=get_ws_url(),
+            http_pool_size=get_http_pool_size(),
+            http_timeout=get_http_timeout(),
+            write_retries=get_write_retries(),
+            write_retry_backoff=get_write_retry_backoff(),
+            read_retries=get_read_retries(),
+            read_retry_backoff=get_read_retry_backoff(),
+            breaker_threshold=get_breaker_threshold(),
+            breaker_cooldown_seconds=get_breaker_cooldown_seconds(),
+            hedge_after_seconds=get_hedge_after_seconds(),
+            max_workers=get_max_workers(),
+            cache_max_entries=get_cache_max_entries(),
+            instrument_refresh_seconds=get_instrument_refresh_seconds(),
+            kline_concurrency=get_kline_concurrency(),
+            trade_buffer_size=get_trade_buffer_size(),
+            mirror_reconcile_seconds=get_mirror_reconcile_seconds(),
+            metrics_port=get_metrics_port(),
+            trace_exporter=get_trace_exporter(),
+            trace_file=get_trace_file(),
+            otlp_endpoint=get_otlp_endpoint(),
+            history_db=get_history_db(),
+            confirmation_db=get_confirmation_db(),
+            max_pending_confirmations=get_max_pending_confirmations(),
+            rate_limits=MappingProxyType(get_rate_limits()),
+            output_format=get_output_format(),
+            log_level=get_log_level(),
+        )
+
+    def changes(self, other: "Settings") -> dict[str, tuple[Any, Any]]:
+        """(this value, other value) for each field that differs; credentials are masked."""
+        changed = {}
+        for item in fields(self):
+            if not item.init:
+                continue
+            before, after = _plain(getattr(self, item.name)), _plain(getattr(other, item.name))
+            if before != after:
+                if item.name in SECRET_FIELDS:
+                    before, after = "***" if before else None, "***" if after else None
+                changed[item.name] = (before, after)
+        return changed
+
+
+SECRET_FIELDS = frozenset({"api_key", "api_secret", "http_token"})
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return dict(value) if isinstance(value, Mapping) else value
+
+
+_settings: Settings | None = None
+_reload_hooks: list[Callable[[Settings], None]] = []
+# BYBIT_ENV_FILE's values at the last load. They take precedence over os.environ but are never written to it.
+_env_file_values: dict[str, str] = {}
+
+
+def _getenv(key: str, default: str) -> str:
+    """key's value from the env file if it sets it, else from the environment."""
+    value = _env_file_values.get(key)
+    return value if value is not None else os.environ.get(key, default)
+
+
+def get_settings() -> Settings:
+    """The current settings, loaded on first use."""
+    settings = _settings
+    return settings if settings is not None else reload_settings()
+
+
+def reload_settings() -> Settings:
+    """Read the environment and BYBIT_ENV_FILE again, make the result current and run the reload hooks."""
+    global _settings, _env_file_values
+    path = get_env_file()
+    previous, _env_file_values = _env_file_values, read_env_file(path) if path else {}
+    try:
+        settings = Settings.from_env()
+    except BaseException:
+        _env_file_values = previous
+        raise
+    _settings = settings
+    for hook in list(_reload_hooks):
+        hook(settings)
+    return settings
+
+
+def on_reload(hook: Callable[[Settings], None]) -> None:
+    """Call hook with the new Settings after every load."""
+    _reload_hooks.append(hook)
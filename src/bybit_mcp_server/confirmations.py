@@ -0,0 +1,183 @@
+"""Pending confirmations of HIGH-risk tool calls, kept until confirm_order or expiry.
+
+A pending confirmation is {"tool": name, "kwargs": arguments, "timestamp": created}.
+Two stores share one interface:
+
+- MemoryConfirmationStore: a dict plus a heap ordered by creation time. Expired and
+  evicted entries come off the top of the heap, so cleanup costs amortized O(log n)
+  per confirmation instead of a scan of every pending one.
+- SQLiteConfirmationStore: a table in BYBIT_CONFIRMATION_DB. Confirmations survive a
+  restart, and server processes sharing the file can confirm each other's orders.
+  Taking a confirmation is a single DELETE ... RETURNING, so it executes at most once.
+
+Both hold at most max_pending confirmations and drop the oldest first.
+"""
+
+import heapq
+import json
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from bybit_mcp_server.config import get_settings
+
+# Confirmation expiry in seconds
+CONFIRMATION_TTL = 300  # 5 minutes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS confirmations (
+    id TEXT NOT NULL UNIQUE,
+    tool TEXT NOT NULL,
+    kwargs TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS confirmations_timestamp ON confirmations (timestamp);
+"""
+
+
+class MemoryConfirmationStore:
+    """Confirmations of this process only."""
+
+    def __init__(self, ttl: float = CONFIRMATION_TTL, max_pending: int = 1000):
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._pending: dict[str, dict[str, Any]] = {}
+        # (timestamp, confirmation_id), oldest first. Entries of confirmations already
+        # taken stay until they reach the top or the heap is rebuilt.
+        self._heap: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, confirmation_id: str) -> bool:
+        return confirmation_id in self._pending
+
+    def get(self, confirmation_id: str) -> dict[str, Any] | None:
+        """The pending confirmation, left in place."""
+        return self._pending.get(confirmation_id)
+
+    def add(self, confirmation_id: str, pending: dict[str, Any]) -> None:
+        with self._lock:
+            self._pending[confirmation_id] = pending
+            heapq.heappush(self._heap, (pending["timestamp"], confirmation_id))
+            self._expire(time.time() - self.ttl)
+            while len(self._pending) > self.max_pending:
+                self._pop_oldest()
+            if len(self._heap) > 2 * len(self._pending) + 64:
+                self._heap = [(entry["timestamp"], key) for key, entry in self._pending.items()]
+                heapq.heapify(self._heap)
+
+    def take(self, confirmation_id: str) -> dict[str, Any] | None:
+        """Remove and return the confirmation; None if it is unknown or expired."""
+        with self._lock:
+            self._expire(time.time() - self.ttl)
+            return self._pending.pop(confirmation_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._heap.clear()
+
+    def close(self) -> None:
+        pass
+
+    def _pop_oldest(self) -> None:
+        timestamp, confirmation_id = heapq.heappop(self._heap)
+        entry = self._pending.get(confirmation_id)
+        if entry is not None and entry["timestamp"] == timestamp:
+            del self._pending[confirmation_id]
+
+    def _expire(self, cutoff: float) -> None:
+        """Drop confirmations created before cutoff. Caller holds the lock."""
+        while self._heap and self._heap[0][0] < cutoff:
+            self._pop_oldest()
+
+
+class SQLiteConfirmationStore:
+    """Confirmations in a SQLite file, shared by every process that opens it."""
+
+    def __init__(self, path: str, ttl: float = CONFIRMATION_TTL, max_pending: int = 1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM confirmations").fetchone()[0]
+
+    def __contains__(self, confirmation_id: str) -> bool:
+        return self.get(confirmation_id) is not None
+
+    def get(self, confirmation_id: str) -> dict[str, Any] | None:
+        """The pending confirmation, left in place."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tool, kwargs, timestamp FROM confirmations WHERE id=?", (confirmation_id,)
+            ).fetchone()
+        return _pending(row) if row else None
+
+    def add(self, confirmation_id: str, pending: dict[str, Any]) -> None:
+        """Store the confirmation, then drop expired ones and any beyond the newest max_pending.
+
+        Rows are numbered in insertion order, with gaps where confirmations were taken or
+        expired. The cap deletes every row at or below the rowid of the (max_pending + 1)th
+        newest, found by walking the rowid index.
+        """
+        row = (confirmation_id, pending["tool"], json.dumps(pending["kwargs"]), pending["timestamp"])
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO confirmations VALUES (?, ?, ?, ?)", row)
+            self._conn.execute("DELETE FROM confirmations WHERE timestamp < ?", (time.time() - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM confirmations WHERE rowid <= "
+                "(SELECT rowid FROM confirmations ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                (self.max_pending,),
+            )
+
+    def take(self, confirmation_id: str) -> dict[str, Any] | None:
+        """Remove and return the confirmation; None if it is unknown, expired or taken by another process."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "DELETE FROM confirmations WHERE id=? AND timestamp >= ? RETURNING tool, kwargs, timestamp",
+                (confirmation_id, time.time() - self.ttl),
+            ).fetchall()
+        return _pending(rows[0]) if rows else None
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM confirmations")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _pending(row: tuple[str, str, float]) -> dict[str, Any]:
+    tool, kwargs, timestamp = row
+    return {"tool": tool, "kwargs": json.loads(kwargs), "timestamp": timestamp}
+
+
+ConfirmationStore = MemoryConfirmationStore | SQLiteConfirmationStore
+
+_store: ConfirmationStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_confirmation_store() -> ConfirmationStore:
+    """The store at BYBIT_CONFIRMATION_DB, or the in-memory store when unset; opened on first use."""
+    global _store
+    settings = get_settings()
+    path = settings.confirmation_db
+    with _store_lock:
+        if _store is None or getattr(_store, "path", None) != path:
+            if _store is not None:
+                _store.close()
+            _store = MemoryConfirmationStore() if path is None else SQLiteConfirmationStore(path)
+        _store.max_pending = settings.max_pending_confirmations
+        return _store
@@ -4,16 +4,15 @@ import functools
 import json
 import time
 import uuid
+import weakref
 from typing import Any
 
-from bybit_mcp_server.config import MODE_PERMISSIONS, get_mode
+from mcp.server.fastmcp import FastMCP
 
-# In-memory store for pending confirmations
-# Key: confirmation_id, Value: dict with action details and timestamp
-_pending_confirmations: dict[str, dict[str, Any]] = {}
-
-# Confirmation expiry in seconds
-CONFIRMATION_TTL = 300  # 5 minutes
+from bybit_mcp_server.config import Settings, get_settings, on_reload
+from bybit_mcp_server.confirmations import CONFIRMATION_TTL, get_confirmation_store
+from bybit_mcp_server.metrics import is_error_response, server_metrics
+from bybit_mcp_server.tracing import span
 
 # Registry of implementation functions for confirmed execution
 _impl_registry: dict[str, Any] = {}
@@ -29,28 +28,51 @@ def get_impl(tool_name: str) -> Any:
     return _impl_registry.get(tool_name)
 
 
+# Every require_mode wrapper, so a settings reload can re-point them.
+_gated: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def _resolve(wrapper: Any, settings: Settings) -> None:
+    wrapper.target = wrapper.allowed if wrapper.permission in settings.permissions else wrapper.denied
+
+
+def _resolve_all(settings: Settings) -> None:
+    for wrapper in list(_gated):
+        _resolve(wrapper, settings)
+
+
+on_reload(_resolve_all)
+
+
 def require_mode(permission: str):
     """Decorator that checks if the current BYBIT_MODE allows this permission level.
 
+    The check runs when the tool is decorated and again on every settings reload, not
+    per call: the wrapper forwards to either the tool or a permission error.
+
     Args:
         permission: One of "read", "trade", "full"
     """
 
     def decorator(fn):
+        @functools.wraps(fn)
+        async def denied(*args, **kwargs):
+            mode = get_settings().mode.value
+            return json.dumps(
+                {
+                    "error": f"Permission denied. Tool requires '{permission}' permission, "
+                    f"but current BYBIT_MODE is '{mode}'. "
+                    f"Set BYBIT_MODE={permission} or higher to use this tool."
+                }
+            )
+
         @functools.wraps(fn)
         async def wrapper(*args, **kwargs):
-            mode = get_mode()
-            allowed = MODE_PERMISSIONS[mode]
-            if permission not in allowed:
-                return json.dumps(
-                    {
-                        "error": f"Permission denied. Tool requires '{permission}' permission, "
-                        f"but current BYBIT_MODE is '{mode.value}'. "
-                        f"Set BYBIT_MODE={permission} or higher to use this tool."
-                    }
-                )
-            return await fn(*args, **kwargs)
+            return await wrapper.target(*args, **kwargs)
 
+        wrapper.permission, wrapper.allowed, wrapper.denied = permission, fn, denied
+        _resolve(wrapper, get_settings())
+        _gated.add(wrapper)
         return wrapper
 
     return decorator
@@ -69,13 +91,10 @@ def require_confirmation(fn):
 
         # Generate confirmation ID and store the pending action
         confirmation_id = str(uuid.uuid4())
-        _pending_confirmations[confirmation_id] = {
-            "tool": fn.__name__,
-            "kwargs": filtered_kwargs,
-            "timestamp": time.time(),
-        }
-        # Clean expired confirmations
-        _clean_expired()
+        get_confirmation_store().add(
+            confirmation_id,
+            {"tool": fn.__name__, "kwargs": filtered_kwargs, "timestamp": time.time()},
+        )
         # Build a human-readable summary
         summary = {
             "status": "confirmation_required",
@@ -92,13 +111,38 @@ def require_confirmation(fn):
 
 def execute_confirmed(confirmation_id: str) -> dict[str, Any] | None:
     """Retrieve and remove a pending confirmation. Returns None if not found or expired."""
-    _clean_expired()
-    return _pending_confirmations.pop(confirmation_id, None)
+    with span("execute_confirmed") as current:
+        pending = get_confirmation_store().take(confirmation_id)
+        current.set(found=pending is not None)
+    return pending
+
+
+def instrument(tool_name: str):
+    """Decorator that records a tool's latency, response size and errors in server_metrics,
+    and runs the tool in a trace span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(f"tool.{tool_name}") as current:
+                started = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    server_metrics.observe_tool(tool_name, time.perf_counter() - started, 0, True)
+                    raise
+                size = len(result.encode()) if isinstance(result, str) else 0
+                error = is_error_response(result)
+                server_metrics.observe_tool(tool_name, time.perf_counter() - started, size, error)
+                current.set(response_bytes=size, error=error)
+            return result
+
+        return wrapper
+
+    return decorator
 
 
-def _clean_expired() -> None:
-    """Remove confirmations older than TTL."""
-    now = time.time()
-    expired = [k for k, v in _pending_confirmations.items() if now - v["timestamp"] > CONFIRMATION_TTL]
-    for k in expired:
-        del _pending_confirmations[k]
+def instrument_tools(mcp: FastMCP) -> None:
+    """Wrap every tool registered on mcp with instrument(). Call once, after registration."""
+    for tool in mcp._tool_manager.list_tools():
+        tool.fn = instrument(tool.name)(tool.fn)
@@ -0,0 +1,119 @@
+"""Field projection, predicate filters and top-N selection for list-shaped results."""
+
+import operator
+import re
+from collections.abc import Callable
+from typing import Any
+
+PREDICATE = re.compile(r"^\s*(\w+)\s*(>=|<=|!=|==|\^=|>|<|~)\s*(.*?)\s*$")
+
+COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _number(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_predicate(expression: str) -> Callable[[dict[str, Any]], bool]:
+    """Compile "field op value" into a test on one list item.
+
+    Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers, text otherwise),
+    ^= (prefix) and ~ (regular expression search). Items without the field never match.
+    """
+    match = PREDICATE.match(expression)
+    if match is None:
+        raise ValueError(f"Invalid filter {expression!r}; expected 'field op value', e.g. 'turnover24h > 1e8'")
+    field, op, raw = match.groups()
+
+    if op == "^=":
+        return lambda item: isinstance(item.get(field), str) and item[field].startswith(raw)
+    if op == "~":
+        try:
+            pattern = re.compile(raw)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression in filter {expression!r}: {e}") from None
+        return lambda item: item.get(field) is not None and pattern.search(str(item[field])) is not None
+
+    compare = COMPARISONS[op]
+    target = _number(raw)
+
+    def test(item: dict[str, Any]) -> bool:
+        value = item.get(field)
+        if value is None:
+            return False
+        if target is not None:
+            number = _number(value)
+            if number is not None:
+                return compare(number, target)
+        return compare(str(value), raw)
+
+    return test
+
+
+def _sort_key(value: Any) -> tuple[int, float | str]:
+    number = _number(value)
+    return (0, number) if number is not None else (1, str(value))
+
+
+class ListQuery:
+    """Filters, then sorts, then truncates, then projects the "list" of a result.
+
+    Built from tool arguments before any request is made, so a bad filter fails fast.
+    """
+
+    def __init__(
+        self,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+    ):
+        self.fields = list(fields) if fields else None
+        self.predicates = [parse_predicate(expression) for expression in filters or []]
+        self.descending = bool(sort_by) and sort_by.startswith("-")
+        self.sort_field = sort_by.lstrip("-") if sort_by else None
+        if top is not None and top < 0:
+            raise ValueError("top must not be negative")
+        self.top = top
+
+    @property
+    def active(self) -> bool:
+        return bool(self.fields or self.predicates or self.sort_field or self.top is not None)
+
+    def select(self, items: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], int]:
+        """The selected items and how many passed the filters (before top).
+
+        Neither the input list nor its dicts are modified.
+        """
+        if self.predicates:
+            items = [item for item in items if all(test(item) for test in self.predicates)]
+        matched = len(items)
+        if self.sort_field:
+            field = self.sort_field
+            present = [item for item in items if item.get(field) not in (None, "")]
+            missing = [item for item in items if item.get(field) in (None, "")]
+            present.sort(key=lambda item: _sort_key(item[field]), reverse=self.descending)
+            items = present + missing
+        if self.top is not None:
+            items = items[: self.top]
+        if self.fields:
+            items = [{field: item[field] for field in self.fields if field in item} for item in items]
+        return items, matched
+
+    def apply(self, response: dict[str, Any]) -> dict[str, Any]:
+        """A copy of a pybit response with result["list"] selected and a "matched" count added."""
+        result = response["result"]
+        if not self.active or not isinstance(result.get("list"), list):
+            return response
+        items, matched = self.select(result["list"])
+        return {**response, "result": {**result, "list": items, "matched": matched}}
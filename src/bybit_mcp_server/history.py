@@ -0,0 +1,178 @@
+"""Store-first loading of kline and funding history: only windows not on disk are fetched."""
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from bybit_mcp_server.client import call, run_sync
+from bybit_mcp_server.klines import align, fetch_bars, interval_ms, range_payload, window_bars
+from bybit_mcp_server.store import HistoryStore
+
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
+
+# Largest page Bybit serves for funding history, and the default page for klines and funding.
+FUNDING_PAGE_LIMIT = 200
+DEFAULT_LIMIT = 200
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+async def load_bars(
+    store: HistoryStore,
+    session: "HTTP",
+    category: str,
+    symbol: str,
+    interval: str,
+    start: int,
+    end: int,
+    concurrency: int,
+) -> list[list[str]]:
+    """Bars in [start, end], oldest first. Closed bars come from the store; only
+    windows never fetched before, and the still-open latest bar, hit Bybit."""
+    step = interval_ms(interval)
+    source = session.endpoint
+    first = align(start, step)
+    last_closed = min(end, align(_now_ms(), step) - step)
+    series = (source, "kline", category, symbol, interval)
+
+    bars: list[list[str]] = []
+    if first <= last_closed:
+        for lo, hi in await run_sync(store.missing, series, first, last_closed, step):
+            fetched = await fetch_bars(session, category, symbol, interval, lo, hi, concurrency)
+            await run_sync(store.put_bars, source, category, symbol, interval, fetched, lo, hi, step)
+        bars = await run_sync(store.get_bars, source, category, symbol, interval, first, last_closed)
+    if end > last_closed:
+        bars += await fetch_bars(session, category, symbol, interval, max(first, last_closed + step), end, concurrency)
+    return bars
+
+
+async def load_kline_bars(
+    store: HistoryStore | None,
+    session: "HTTP",
+    category: str,
+    symbol: str,
+    interval: str,
+    start: int,
+    end: int,
+    concurrency: int,
+) -> list[list[str]]:
+    """Bars in [start, end], oldest first, read through the store when one is configured."""
+    end = min(end, _now_ms())
+    if store is None:
+        return await fetch_bars(session, category, symbol, interval, start, end, concurrency)
+    return await load_bars(store, session, category, symbol, interval, start, end, concurrency)
+
+
+async def load_range(
+    store: HistoryStore | None,
+    session: "HTTP",
+    category: str,
+    symbol: str,
+    interval: str,
+    start: int,
+    end: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """get_kline_range payload, read through the store when one is configured."""
+    end = min(end, _now_ms())
+    bars = await load_kline_bars(store, session, category, symbol, interval, start, end, concurrency)
+    return range_payload(category, symbol, interval, start, end, bars)
+
+
+async def load_kline_page(
+    store: HistoryStore,
+    session: "HTTP",
+    category: str,
+    symbol: str,
+    interval: str,
+    start: int,
+    end: int,
+    limit: int | None,
+) -> dict[str, Any] | None:
+    """A get_kline response served from the store, or None if the window does not fit one page."""
+    count = window_bars(interval, start, end)
+    if count is None or count > (limit or DEFAULT_LIMIT):
+        return None
+    bars = await load_bars(store, session, category, symbol, interval, start, end, concurrency=1)
+    return {"retCode": 0, "retMsg": "OK", "result": {"category": category, "symbol": symbol, "list": bars[::-1]}}
+
+
+async def load_funding_page(
+    store: HistoryStore, session: "HTTP", category: str, symbol: str, start: int, end: int, limit: int | None
+) -> dict[str, Any]:
+    """A get_funding_rate_history response served from the store: newest first, up to limit."""
+    rows = await load_funding(store, session, category, symbol, start, end)
+    return {"retCode": 0, "retMsg": "OK", "result": {"category": category, "list": rows[: limit or DEFAULT_LIMIT]}}
+
+
+async def fetch_funding(session: "HTTP", category: str, symbol: str, start: int, end: int) -> list[dict[str, Any]]:
+    """Every funding record in [start, end], paging backwards from end."""
+    rows: list[dict[str, Any]] = []
+    while start <= end:
+        response = await call(
+            session.get_funding_rate_history,
+            category=category,
+            symbol=symbol,
+            startTime=start,
+            endTime=end,
+            limit=FUNDING_PAGE_LIMIT,
+        )
+        page = response["result"]["list"]
+        rows.extend(page)
+        if len(page) < FUNDING_PAGE_LIMIT:
+            break
+        end = min(int(row["fundingRateTimestamp"]) for row in page) - 1
+    return rows
+
+
+async def load_funding(
+    store: HistoryStore, session: "HTTP", category: str, symbol: str, start: int, end: int
+) -> list[dict[str, str]]:
+    """Funding records in [start, end], newest first, fetching only windows not yet stored."""
+    source = session.endpoint
+    end = min(end, _now_ms())
+    series = (source, "funding", category, symbol, "")
+    for lo, hi in await run_sync(store.missing, series, start, end, 1):
+        rows = await fetch_funding(session, category, symbol, lo, hi)
+        await run_sync(store.put_funding, source, category, symbol, rows, lo, hi)
+    return await run_sync(store.get_funding, source, category, symbol, start, end)
+
+
+async def sync_series(
+    store: HistoryStore,
+    session: "HTTP",
+    kind: str,
+    category: str,
+    symbol: str,
+    interval: str | None,
+    start: int | None,
+    concurrency: int,
+) -> dict[str, Any]:
+    """Bring a stored series up to date, from `start` or from the end of what is already stored."""
+    if kind not in ("kline", "funding"):
+        raise ValueError("kind must be 'kline' or 'funding'")
+    if kind == "kline" and not interval:
+        raise ValueError("interval is required for kline history")
+    series = (session.endpoint, kind, category, symbol, interval if kind == "kline" else "")
+    if start is None:
+        coverage = await run_sync(store.coverage, series)
+        if not coverage:
+            raise ValueError("start is required for the first sync of a series")
+        start = coverage[-1][1]
+
+    now = _now_ms()
+    if kind == "kline":
+        step = interval_ms(interval)
+        await load_bars(store, session, category, symbol, interval, start, align(now, step) - step, concurrency)
+    else:
+        await load_funding(store, session, category, symbol, start, now)
+    return {
+        "kind": kind,
+        "category": category,
+        "symbol": symbol,
+        "interval": interval if kind == "kline" else None,
+        "stored": await run_sync(store.count, series),
+        "coverage": [list(r) for r in await run_sync(store.coverage, series)],
+    }
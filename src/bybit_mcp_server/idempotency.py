@@ -0,0 +1,203 @@
+"""Safe retries for order writes.
+
+A write that fails on the network may or may not have reached Bybit, so blindly sending
+it again risks a duplicate order. Instead:
+
+- place_order always carries an orderLinkId, generated when the caller gives none.
+  Every retry reuses it, so Bybit rejects a second copy of an order that did land.
+- A write that failed with a network error or a transient Bybit error (rate limit,
+  server busy, HTTP 5xx; see resilience.is_transient) is retried up to
+  BYBIT_WRITE_RETRIES times, after an exponential backoff with full jitter starting at
+  BYBIT_WRITE_RETRY_BACKOFF seconds. Retries are counted in server_metrics.
+- Once an earlier attempt may have landed, a rejection of a later one is checked
+  against the order itself. If the earlier attempt went through, the order is returned
+  as the write's result.
+- write_ledger keeps the parameters and response of every order placed, by
+  orderLinkId. Placing the same order with the same orderLinkId again returns that
+  response without another request, and concurrent submissions of one orderLinkId
+  share a single request. Reusing the orderLinkId for a different order raises
+  ValueError instead.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from pybit.exceptions import InvalidRequestError
+
+from bybit_mcp_server.client import call
+from bybit_mcp_server.config import get_settings
+from bybit_mcp_server.metrics import endpoint_name, server_metrics
+from bybit_mcp_server.ratelimit import endpoint_group
+from bybit_mcp_server.resilience import backoff, is_transient
+
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
+
+# Order fields amend_order sets, compared when checking whether an amendment landed.
+AMEND_FIELDS = ("qty", "price", "triggerPrice", "takeProfit", "stopLoss")
+
+CANCELLED_STATUSES = frozenset({"Cancelled", "PartiallyFilledCanceled", "Deactivated"})
+
+
+def new_order_link_id() -> str:
+    """A fresh orderLinkId; 36 characters, Bybit's maximum."""
+    return f"mcp-{uuid.uuid4().hex}"
+
+
+async def submit_write(
+    method: Callable[..., dict],
+    params: dict[str, Any],
+    landed: Callable[[], Awaitable[dict | None]] | None = None,
+) -> dict:
+    """call() a write, retrying transient failures.
+
+    landed, if given, looks up the write's effect and returns a response for it, or
+    None if there is none. It is consulted when Bybit rejects a retry, in case an
+    earlier attempt whose reply was lost went through. Bybit's rejection is raised
+    when the write did not land.
+    """
+    settings = get_settings()
+    attempt = 0
+    while True:
+        try:
+            return await call(method, **params)
+        except Exception as e:
+            error: BaseException = e
+            if attempt and landed is not None and isinstance(e, InvalidRequestError):
+                try:
+                    response = await landed()
+                except Exception as lookup_error:
+                    # Couldn't tell whether the write landed; retry if the lookup may succeed next time.
+                    error = lookup_error
+                else:
+                    if response is not None:
+                        return response
+            if attempt == settings.write_retries or not is_transient(error):
+                raise
+        server_metrics.observe_event(endpoint_name(method), endpoint_group(method), "retries")
+        await asyncio.sleep(backoff(attempt, settings.write_retry_backoff))
+        attempt += 1
+
+
+class WriteLedger:
+    """Parameters and responses of placed orders by (API key, orderLinkId), kept for ttl seconds."""
+
+    def __init__(self, ttl: float = 86400.0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Insertion order is completion order, so the oldest entries are always first.
+        self._done: OrderedDict[tuple[str, str], tuple[float, dict[str, Any], dict]] = OrderedDict()
+        self._running: dict[tuple[str, str], asyncio.Event] = {}
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    async def run(self, key: tuple[str, str], params: dict[str, Any], submit: Callable[[], Awaitable[dict]]) -> dict:
+        """The recorded response for key, or submit()'s, recorded with params if it succeeds.
+
+        Raises ValueError when key was recorded with other params, rather than answering
+        a different order with the earlier one's response.
+        """
+        while (running := self._running.get(key)) is not None:
+            await running.wait()
+        self._expire()
+        if key in self._done:
+            _, recorded, response = self._done[key]
+            if recorded != params:
+                raise ValueError(
+                    f"orderLinkId {key[1]} was already used for a different order; "
+                    "use a new orderLinkId to place another order"
+                )
+            return response
+        event = self._running[key] = asyncio.Event()
+        try:
+            response = await submit()
+            self._done[key] = (time.monotonic(), params, response)
+            while len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+            return response
+        finally:
+            del self._running[key]
+            event.set()
+
+    def clear(self) -> None:
+        self._done.clear()
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        while self._done and next(iter(self._done.values()))[0] < cutoff:
+            self._done.popitem(last=False)
+
+
+write_ledger = WriteLedger()
+
+
+def _response(result: dict) -> dict:
+    return {"retCode": 0, "retMsg": "OK", "result": result}
+
+
+async def find_order(session: "HTTP", category: str, symbol: str, **order_id: str) -> dict | None:
+    """The order with this orderId or orderLinkId, open or recently closed, or None."""
+    for method in (session.get_open_orders, session.get_order_history):
+        response = await call(method, category=category, symbol=symbol, **order_id)
+        orders = response["result"].get("list") or []
+        if orders:
+            return orders[0]
+    return None
+
+
+def _same(expected: Any, actual: Any) -> bool:
+    try:
+        return float(expected) == float(actual)
+    except (TypeError, ValueError):
+        return expected == actual
+
+
+async def place_order(session: "HTTP", params: dict[str, Any]) -> dict:
+    """session.place_order with an orderLinkId, placed at most once and retried on transient failures."""
+    params = {**params, "orderLinkId": params.get("orderLinkId") or new_order_link_id()}
+    link_id = params["orderLinkId"]
+
+    async def landed() -> dict | None:
+        order = await find_order(session, params["category"], params["symbol"], orderLinkId=link_id)
+        return None if order is None else _response({"orderId": order["orderId"], "orderLinkId": link_id})
+
+    key = (get_settings().api_key or "", link_id)
+    return await write_ledger.run(key, params, lambda: submit_write(session.place_order, params, landed))
+
+
+async def amend_order(session: "HTTP", params: dict[str, Any]) -> dict:
+    """session.amend_order retried on transient failures.
+
+    The amended fields are absolute values, so sending an amendment twice changes the
+    order once. A retry rejected because the order already matches counts as success.
+    """
+    order_id = {key: params[key] for key in ("orderId", "orderLinkId") if params.get(key)}
+
+    async def landed() -> dict | None:
+        order = await find_order(session, params["category"], params["symbol"], **order_id)
+        if order is None or not all(_same(params[key], order.get(key)) for key in AMEND_FIELDS if key in params):
+            return None
+        return _response({"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]})
+
+    return await submit_write(session.amend_order, params, landed if order_id else None)
+
+
+async def cancel_order(session: "HTTP", params: dict[str, Any]) -> dict:
+    """session.cancel_order retried on transient failures.
+
+    A retry rejected because the order is already cancelled counts as success.
+    """
+    order_id = {key: params[key] for key in ("orderId", "orderLinkId") if params.get(key)}
+
+    async def landed() -> dict | None:
+        order = await find_order(session, params["category"], params["symbol"], **order_id)
+        if order is None or order.get("orderStatus") not in CANCELLED_STATUSES:
+            return None
+        return _response({"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]})
+
+    return await submit_write(session.cancel_order, params, landed if order_id else None)
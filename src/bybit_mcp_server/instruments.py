@@ -0,0 +1,108 @@
+"""In-memory index of instrument specifications, refreshed in the background."""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+from bybit_mcp_server.client import call_paged
+from bybit_mcp_server.config import get_settings
+
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
+
+# Secondary index fields, matched exactly against the instrument spec.
+INDEXED_FIELDS = ("baseCoin", "quoteCoin", "status")
+
+# Largest page Bybit serves for instruments-info, and a generous cap on pages per category.
+PAGE_LIMIT = 1000
+MAX_PAGES = 100
+
+# (API endpoint, category, baseCoin for options else None)
+IndexKey = tuple[str, str, str | None]
+
+
+class InstrumentIndex:
+    """All instruments of one category, by symbol and by baseCoin/quoteCoin/status."""
+
+    def __init__(self, instruments: list[dict[str, Any]]):
+        self.loaded_at = time.time()
+        self.by_symbol: dict[str, dict[str, Any]] = {}
+        self._secondary: dict[str, dict[str, set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        for instrument in instruments:
+            symbol = instrument["symbol"]
+            self.by_symbol[symbol] = instrument
+            for field in INDEXED_FIELDS:
+                value = instrument.get(field)
+                if value:
+                    self._secondary[field].setdefault(value, set()).add(symbol)
+
+    def lookup(self, symbol: str) -> dict[str, Any] | None:
+        return self.by_symbol.get(symbol)
+
+    def filter(self, **criteria: str | None) -> list[dict[str, Any]]:
+        """Instruments matching every given baseCoin/quoteCoin/status value, sorted by symbol."""
+        sets = [self._secondary[field].get(value, set()) for field, value in criteria.items() if value is not None]
+        if not sets:
+            symbols = self.by_symbol.keys()
+        else:
+            sets.sort(key=len)
+            symbols = sets[0].intersection(*sets[1:])
+        return [self.by_symbol[symbol] for symbol in sorted(symbols)]
+
+
+class InstrumentRegistry:
+    """Loads one InstrumentIndex per category on first use and refreshes it when stale.
+
+    Stale indexes keep serving lookups while a background task reloads them.
+    Indexes are kept per API endpoint, so switching between mainnet and testnet never
+    serves the other environment's instruments.
+    Options are indexed per baseCoin because Bybit only lists one base coin per request.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._indexes: dict[IndexKey, InstrumentIndex] = {}
+        self._loading: dict[IndexKey, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(endpoint: str, category: str, base_coin: str | None) -> IndexKey:
+        return (endpoint, category, (base_coin or "BTC") if category == "option" else None)
+
+    async def get(self, session: "HTTP", category: str, base_coin: str | None = None) -> InstrumentIndex:
+        key = self._key(session.endpoint, category, base_coin)
+        index = self._indexes.get(key)
+        if index is None:
+            return await asyncio.shield(self._reload(session, key))
+        if time.time() - index.loaded_at > self.refresh_interval:
+            self._reload(session, key)
+        return index
+
+    def _reload(self, session: "HTTP", key: IndexKey) -> asyncio.Task:
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(session, key))
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    def _finish(self, key: IndexKey, task: asyncio.Task) -> None:
+        self._loading.pop(key, None)
+        if not task.cancelled():
+            # A failed background refresh keeps the previous index; mark the error as seen.
+            task.exception()
+
+    async def _load(self, session: "HTTP", key: IndexKey) -> InstrumentIndex:
+        _, category, base_coin = key
+        params: dict = {"category": category, "limit": PAGE_LIMIT}
+        if base_coin:
+            params["baseCoin"] = base_coin
+        response = await call_paged(session.get_instruments_info, params, MAX_PAGES)
+        index = InstrumentIndex(response["result"].get("list", []))
+        self._indexes[key] = index
+        return index
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+instrument_registry = InstrumentRegistry(refresh_interval=get_settings().instrument_refresh_seconds)
@@ -0,0 +1,169 @@
+"""Kline range downloads: split a window into chunks, fetch concurrently, merge and check gaps."""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+from bybit_mcp_server.client import call
+
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
+
+# Milliseconds per bar for the fixed-length intervals ("M" varies with the month).
+INTERVAL_MS: dict[str, int] = {
+    "1": 60_000,
+    "3": 180_000,
+    "5": 300_000,
+    "15": 900_000,
+    "30": 1_800_000,
+    "60": 3_600_000,
+    "120": 7_200_000,
+    "240": 14_400_000,
+    "360": 21_600_000,
+    "720": 43_200_000,
+    "D": 86_400_000,
+    "W": 604_800_000,
+}
+
+# Weekly bars open on Monday 00:00 UTC; the Unix epoch fell on a Thursday.
+WEEK_ORIGIN_MS = 4 * 86_400_000
+
+# Bars requested per get_kline call.
+BARS_PER_REQUEST = 200
+
+# Largest window a single range download may cover.
+MAX_RANGE_BARS = 200_000
+
+COLUMNS = ("start", "open", "high", "low", "close", "volume", "turnover")
+
+
+def interval_ms(interval: str) -> int:
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported interval for range download: {interval!r}") from None
+
+
+def align(ts: int, step: int) -> int:
+    """Round a timestamp down to the start of its bar."""
+    origin = WEEK_ORIGIN_MS if step == INTERVAL_MS["W"] else 0
+    return ts - (ts - origin) % step
+
+
+def window_bars(interval: str, start: int, end: int) -> int | None:
+    """Number of bar starts in [start, end], or None for variable-length intervals."""
+    step = INTERVAL_MS.get(interval)
+    if step is None or end < start:
+        return None
+    return (align(end, step) - align(start, step)) // step + 1
+
+
+def split_range(start: int, end: int, step: int, bars: int = BARS_PER_REQUEST) -> list[tuple[int, int]]:
+    """Split [start, end] into windows of at most `bars` bar starts each."""
+    chunks = []
+    chunk_start = align(start, step)
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + step * (bars - 1), end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start += step * bars
+    return chunks
+
+
+def merge_bars(pages: list[list[list[str]]], start: int, end: int) -> list[list[str]]:
+    """Deduplicate bars by start time, keep those inside [start, end], sort oldest first."""
+    by_start: dict[int, list[str]] = {}
+    for page in pages:
+        for bar in page:
+            ts = int(bar[0])
+            if start <= ts <= end:
+                by_start[ts] = bar
+    return [by_start[ts] for ts in sorted(by_start)]
+
+
+def find_gaps(starts: list[int], step: int, start: int, end: int) -> list[list[int]]:
+    """Missing bar ranges as [first_missing_start, last_missing_start] pairs.
+
+    The window is [align(start), align(end)]; starts must be sorted ascending.
+    """
+    gaps = []
+    expected = align(start, step)
+    for ts in starts:
+        if ts > expected:
+            gaps.append([expected, ts - step])
+        expected = ts + step
+    last = align(end, step)
+    if expected <= last:
+        gaps.append([expected, last])
+    return gaps
+
+
+def to_columns(bars: list[list[str]]) -> dict[str, list]:
+    """Columnar form of Bybit kline rows: integer start times, float prices and volumes."""
+    columns: dict[str, list] = {name: [] for name in COLUMNS}
+    for bar in bars:
+        columns["start"].append(int(bar[0]))
+        for name, value in zip(COLUMNS[1:], bar[1:7]):
+            columns[name].append(float(value))
+    return columns
+
+
+async def fetch_bars(
+    session: "HTTP",
+    category: str,
+    symbol: str,
+    interval: str,
+    start: int,
+    end: int,
+    concurrency: int,
+) -> list[list[str]]:
+    """Fetch every bar in [start, end], at most `concurrency` requests in flight."""
+    step = interval_ms(interval)
+    chunks = split_range(start, end, step)
+    if len(chunks) * BARS_PER_REQUEST > MAX_RANGE_BARS:
+        raise ValueError(f"Window covers more than {MAX_RANGE_BARS} bars; narrow start/end or use a larger interval.")
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(chunk_start: int, chunk_end: int) -> list[list[str]]:
+        async with semaphore:
+            response = await call(
+                session.get_kline,
+                category=category,
+                symbol=symbol,
+                interval=interval,
+                start=chunk_start,
+                end=chunk_end,
+                limit=BARS_PER_REQUEST,
+            )
+        return response["result"]["list"]
+
+    pages = await asyncio.gather(*(fetch(chunk_start, chunk_end) for chunk_start, chunk_end in chunks))
+    return merge_bars(pages, align(start, step), end)
+
+
+async def fetch_range(
+    session: "HTTP",
+    category: str,
+    symbol: str,
+    interval: str,
+    start: int,
+    end: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """Download a kline window and return it as a columnar payload with gap report."""
+    end = min(end, int(time.time() * 1000))
+    bars = await fetch_bars(session, category, symbol, interval, start, end, concurrency)
+    return range_payload(category, symbol, interval, start, end, bars)
+
+
+def range_payload(category: str, symbol: str, interval: str, start: int, end: int, bars: list[list[str]]) -> dict:
+    """Columnar payload with gap report for the sorted bars of [start, end]."""
+    step = interval_ms(interval)
+    columns = to_columns(bars)
+    return {
+        "category": category,
+        "symbol": symbol,
+        "interval": interval,
+        "count": len(bars),
+        "gaps": find_gaps(columns["start"], step, start, end),
+        "bars": columns,
+    }
@@ -0,0 +1,234 @@
+"""Latest tickers and recent public trades kept in memory from the public WebSocket streams.
+
+Tickers start from the stream's snapshot and merge its deltas. Trades go into a
+ring buffer per symbol that is seeded from REST, so it holds every trade since the
+seed. A reconnect may lose trades, so after one the buffer is not served until it
+has been seeded again.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from bybit_mcp_server.client import call
+from bybit_mcp_server.config import get_settings
+from bybit_mcp_server.streams import StreamHub, stream_hub
+
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
+
+CATEGORIES = ("spot", "linear", "inverse", "option")
+
+# Most trades get_public_trades returns per request, and how many it returns by default.
+TRADE_PAGE_LIMITS: dict[str, int] = {"spot": 60, "linear": 1000, "inverse": 1000, "option": 1000}
+TRADE_DEFAULT_LIMITS: dict[str, int] = {"spot": 60, "linear": 500, "inverse": 500, "option": 500}
+
+# publicTrade stream keys and the get_public_trades keys they correspond to.
+TRADE_KEYS = {"i": "execId", "s": "symbol", "p": "price", "v": "size", "S": "side", "T": "time", "BT": "isBlockTrade"}
+
+
+def trade_from_stream(trade: dict[str, Any]) -> dict[str, Any]:
+    """A publicTrade stream entry in get_public_trades' format."""
+    row = {TRADE_KEYS.get(key, key): value for key, value in trade.items()}
+    row["time"] = str(row["time"])
+    return row
+
+
+class Ticker:
+    """The latest ticker of one symbol."""
+
+    def __init__(self, category: str, symbol: str):
+        self.category = category
+        self.symbol = symbol
+        self.data: dict[str, Any] | None = None
+        self.ts = 0
+        self.updated_at = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def topic(self) -> str:
+        return f"tickers.{self.symbol}"
+
+    def apply(self, message: dict[str, Any]) -> None:
+        with self.lock:
+            if message.get("type") == "snapshot":
+                self.data = dict(message["data"])
+            elif self.data is not None:
+                self.data.update(message["data"])
+            else:
+                return
+            self.ts = message.get("ts", self.ts)
+            self.updated_at = time.time()
+
+    def response(self) -> dict[str, Any] | None:
+        """The ticker as a get_tickers response, or None before the first snapshot."""
+        with self.lock:
+            if self.data is None:
+                return None
+            ticker = dict(self.data)
+            ts = self.ts
+        return {"retCode": 0, "retMsg": "OK", "result": {"category": self.category, "list": [ticker]}, "time": ts}
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "category": self.category,
+            "symbol": self.symbol,
+            "ready": self.data is not None,
+            "lastUpdateAge": round(time.time() - self.updated_at, 3) if self.updated_at else None,
+        }
+
+
+class TradeBuffer:
+    """The most recent public trades of one symbol, oldest first, bounded to maxlen."""
+
+    time_key = "time"
+
+    def __init__(self, category: str, symbol: str, maxlen: int):
+        self.category = category
+        self.symbol = symbol
+        self.trades: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        # Stream.reconnects at the last REST seed; None until seeded.
+        self.generation: int | None = None
+        # The seed returned fewer trades than asked for, so nothing older exists.
+        self.exhaustive = False
+        self.updated_at = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def topic(self) -> str:
+        return f"publicTrade.{self.symbol}"
+
+    def apply(self, message: dict[str, Any]) -> None:
+        trades = [trade_from_stream(trade) for trade in message["data"]]
+        with self.lock:
+            self.trades.extend(trades)
+            self.updated_at = time.time()
+
+    def seed(self, trades: list[dict[str, Any]], generation: int, requested: int) -> None:
+        """Merge a get_public_trades list (newest first) in front of the streamed trades."""
+        with self.lock:
+            seen = {trade["execId"] for trade in self.trades}
+            older = [trade for trade in reversed(trades) if trade["execId"] not in seen]
+            merged = sorted(older + list(self.trades), key=lambda trade: int(trade[self.time_key]))
+            self.trades.clear()
+            self.trades.extend(merged)
+            self.generation = generation
+            self.exhaustive = len(trades) < requested
+
+    def latest(self, limit: int, match: Callable[[dict[str, Any]], bool] | None = None) -> list[dict[str, Any]] | None:
+        """The newest `limit` trades (that `match`), newest first, or None if the buffer cannot tell."""
+        with self.lock:
+            trades = filter(match, reversed(self.trades)) if match else reversed(self.trades)
+            latest = list(itertools.islice(trades, limit))
+        if len(latest) < limit and not self.exhaustive:
+            return None
+        return latest
+
+    def status(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                "category": self.category,
+                "symbol": self.symbol,
+                "seeded": self.generation is not None,
+                "trades": len(self.trades),
+                "capacity": self.trades.maxlen,
+                "lastUpdateAge": round(time.time() - self.updated_at, 3) if self.updated_at else None,
+            }
+
+
+class MarketStreams:
+    """Subscribed tickers and trade buffers, fed from each category's public stream."""
+
+    def __init__(self, hub: StreamHub):
+        self.hub = hub
+        self._tickers: dict[tuple[str, str], Ticker] = {}
+        self._trades: dict[tuple[str, str], TradeBuffer] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, category: str, symbol: str, tickers: bool = True, trades: bool = True) -> None:
+        """Start following a symbol's ticker and/or trades. Blocks while the stream connects."""
+        if category not in CATEGORIES:
+            raise ValueError(f"Unsupported category for market data streams: {category!r}")
+        if trades and category == "option":
+            raise ValueError("Option trades are streamed per base coin, not per symbol; subscribe to tickers only")
+        stream = self.hub.stream(category)
+        with self._lock:
+            ticker = self._tickers.setdefault((category, symbol), Ticker(category, symbol)) if tickers else None
+            if trades:
+                size = get_settings().trade_buffer_size
+                buffer = self._trades.setdefault((category, symbol), TradeBuffer(category, symbol, size))
+        if ticker is not None:
+            stream.subscribe(ticker.topic, ticker.apply)
+        if trades:
+            stream.subscribe(buffer.topic, buffer.apply)
+
+    def unsubscribe(self, category: str, symbol: str) -> bool:
+        with self._lock:
+            followed = [
+                item
+                for item in (self._tickers.pop((category, symbol), None), self._trades.pop((category, symbol), None))
+                if item is not None
+            ]
+        stream = self.hub.get(category)
+        if stream is not None:
+            for item in followed:
+                stream.unsubscribe(item.topic)
+        return bool(followed)
+
+    def _connected(self, category: str) -> bool:
+        stream = self.hub.get(category)
+        return stream is not None and stream.is_connected()
+
+    def get_ticker(self, category: str, symbol: str) -> dict[str, Any] | None:
+        """A get_tickers response for one symbol, if it is followed and its stream is up."""
+        ticker = self._tickers.get((category, symbol))
+        if ticker is None or not self._connected(category):
+            return None
+        return ticker.response()
+
+    def needs_seed(self, category: str, symbol: str) -> bool:
+        """True if trades are followed but the buffer has not been seeded since the last reconnect."""
+        buffer = self._trades.get((category, symbol))
+        stream = self.hub.get(category)
+        return buffer is not None and stream is not None and buffer.generation != stream.reconnects
+
+    async def seed_trades(self, session: "HTTP", category: str, symbol: str) -> None:
+        """Fill a trade buffer with the trades REST knows about."""
+        buffer = self._trades.get((category, symbol))
+        stream = self.hub.get(category)
+        if buffer is None or stream is None:
+            return
+        generation = stream.reconnects
+        limit = min(TRADE_PAGE_LIMITS[category], buffer.trades.maxlen)
+        response = await call(session.get_public_trade_history, category=category, symbol=symbol, limit=limit)
+        buffer.seed(response["result"]["list"], generation, limit)
+
+    def get_trades(self, category: str, symbol: str, limit: int | None = None) -> dict[str, Any] | None:
+        """A get_public_trades response served from the buffer, or None if it cannot be."""
+        buffer = self._trades.get((category, symbol))
+        if buffer is None or self.needs_seed(category, symbol) or not self._connected(category):
+            return None
+        trades = buffer.latest(limit or TRADE_DEFAULT_LIMITS[category])
+        if trades is None:
+            return None
+        return {"retCode": 0, "retMsg": "OK", "result": {"category": category, "list": trades}}
+
+    def status(self) -> dict[str, list[dict[str, Any]]]:
+        with self._lock:
+            tickers, trades = list(self._tickers.values()), list(self._trades.values())
+        return {"tickers": [ticker.status() for ticker in tickers], "trades": [buffer.status() for buffer in trades]}
+
+    def clear(self) -> None:
+        with self._lock:
+            items = [*self._tickers.values(), *self._trades.values()]
+            self._tickers, self._trades = {}, {}
+        for item in items:
+            stream = self.hub.get(item.category)
+            if stream is not None:
+                stream.unsubscribe(item.topic)
+
+
+market_streams = MarketStreams(stream_hub)
@@ -0,0 +1,274 @@
+"""Latency, payload size and error metrics for tool calls and Bybit REST endpoints.
+
+Observations go into fixed-bucket histograms, so recording is O(log buckets) and
+memory does not grow with traffic. Percentiles are estimated from the buckets,
+to within one bucket width (about 41% apart for latency, 2x for sizes).
+"""
+
+import bisect
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+# Latency bucket upper bounds in seconds: 0.5 ms to about 46 s, each sqrt(2) above the last.
+LATENCY_BOUNDS: tuple[float, ...] = tuple(round(0.0005 * 2 ** (i / 2), 6) for i in range(34))
+
+# Response size bucket upper bounds in bytes: 64 B to 32 MiB, doubling.
+SIZE_BOUNDS: tuple[float, ...] = tuple(float(64 << i) for i in range(20))
+
+PERCENTILES = (50, 95, 99)
+
+# Endpoint events counted by observe_event(), with their Prometheus metric and help text.
+ENDPOINT_EVENTS: dict[str, tuple[str, str]] = {
+    "retries": ("bybit_mcp_endpoint_retries_total", "Bybit REST calls sent again after a transient failure."),
+    "hedges": ("bybit_mcp_endpoint_hedges_total", "Slow market reads sent a second time."),
+    "hedgeWins": ("bybit_mcp_endpoint_hedge_wins_total", "Hedged reads answered first by the second request."),
+    "breakerOpens": ("bybit_mcp_endpoint_breaker_opens_total", "Times the endpoint's circuit breaker opened."),
+    "shortCircuited": (
+        "bybit_mcp_endpoint_short_circuited_total",
+        "Calls failed without a request because the circuit breaker was open.",
+    ),
+}
+
+
+class Histogram:
+    """Observation counts per bucket, as in a Prometheus histogram."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # One count per bound plus the overflow bucket.
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the pct-th observation."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(estimate, self.max)
+            cumulative += count
+        return self.max
+
+    def summary(self, scale: float = 1.0, digits: int = 3) -> dict[str, float]:
+        """Mean, max and PERCENTILES, multiplied by scale (e.g. 1000 for milliseconds)."""
+        summary = {f"p{pct}": round(self.percentile(pct) * scale, digits) for pct in PERCENTILES}
+        summary["mean"] = round(self.sum / self.count * scale, digits) if self.count else 0.0
+        summary["max"] = round(self.max * scale, digits)
+        return summary
+
+    def prometheus(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ToolMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BOUNDS)
+        self.size = Histogram(SIZE_BOUNDS)
+        self.errors = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.latency.count,
+            "errors": self.errors,
+            "latency_ms": self.latency.summary(1000),
+            "response_bytes": {**self.size.summary(digits=0), "total": int(self.size.sum)},
+        }
+
+
+class EndpointMetrics:
+    def __init__(self, group: str):
+        self.group = group
+        self.latency = Histogram(LATENCY_BOUNDS)
+        self.errors = 0
+        self.ret_codes: Counter[str] = Counter()
+        self.events: Counter[str] = Counter()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "group": self.group,
+            "calls": self.latency.count,
+            "errors": self.errors,
+            "latency_ms": self.latency.summary(1000),
+            "retCodes": dict(self.ret_codes.most_common()),
+            **{event: self.events[event] for event in ENDPOINT_EVENTS},
+        }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ServerMetrics:
+    """Per-tool and per-endpoint metrics for the lifetime of the process."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._tools: dict[str, ToolMetrics] = {}
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe_tool(self, tool: str, seconds: float, size: int, error: bool) -> None:
+        with self._lock:
+            metrics = self._tools.get(tool)
+            if metrics is None:
+                metrics = self._tools[tool] = ToolMetrics()
+            metrics.latency.observe(seconds)
+            metrics.size.observe(size)
+            metrics.errors += error
+
+    def _endpoint(self, endpoint: str, group: str) -> EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = EndpointMetrics(group)
+        return metrics
+
+    def observe_endpoint(self, endpoint: str, group: str, seconds: float, ret_code: Any, error: bool) -> None:
+        """Record one REST call. ret_code is Bybit's retCode, or None if none came back."""
+        with self._lock:
+            metrics = self._endpoint(endpoint, group)
+            metrics.latency.observe(seconds)
+            metrics.errors += error
+            if ret_code is not None:
+                metrics.ret_codes[str(ret_code)] += 1
+
+    def observe_event(self, endpoint: str, group: str, event: str) -> None:
+        """Count one of the ENDPOINT_EVENTS for an endpoint."""
+        with self._lock:
+            self._endpoint(endpoint, group).events[event] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "uptimeSeconds": round(time.time() - self.started_at, 3),
+                "tools": {name: metrics.snapshot() for name, metrics in sorted(self._tools.items())},
+                "endpoints": {name: metrics.snapshot() for name, metrics in sorted(self._endpoints.items())},
+            }
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            tools = sorted(self._tools.items())
+            endpoints = sorted(self._endpoints.items())
+            lines = [
+                "# HELP bybit_mcp_tool_latency_seconds Tool call latency.",
+                "# TYPE bybit_mcp_tool_latency_seconds histogram",
+            ]
+            for name, metrics in tools:
+                lines += metrics.latency.prometheus("bybit_mcp_tool_latency_seconds", f'tool="{_label(name)}"')
+            lines += [
+                "# HELP bybit_mcp_tool_response_bytes Tool response size.",
+                "# TYPE bybit_mcp_tool_response_bytes histogram",
+            ]
+            for name, metrics in tools:
+                lines += metrics.size.prometheus("bybit_mcp_tool_response_bytes", f'tool="{_label(name)}"')
+            lines += [
+                "# HELP bybit_mcp_tool_errors_total Tool calls that raised or returned an error.",
+                "# TYPE bybit_mcp_tool_errors_total counter",
+            ]
+            for name, metrics in tools:
+                lines.append(f'bybit_mcp_tool_errors_total{{tool="{_label(name)}"}} {metrics.errors}')
+            lines += [
+                "# HELP bybit_mcp_endpoint_latency_seconds Bybit REST call latency, excluding rate-limit waits.",
+                "# TYPE bybit_mcp_endpoint_latency_seconds histogram",
+            ]
+            for name, metrics in endpoints:
+                labels = f'endpoint="{_label(name)}",group="{_label(metrics.group)}"'
+                lines += metrics.latency.prometheus("bybit_mcp_endpoint_latency_seconds", labels)
+            lines += [
+                "# HELP bybit_mcp_endpoint_errors_total Bybit REST calls that raised.",
+                "# TYPE bybit_mcp_endpoint_errors_total counter",
+            ]
+            for name, metrics in endpoints:
+                lines.append(f'bybit_mcp_endpoint_errors_total{{endpoint="{_label(name)}"}} {metrics.errors}')
+            lines += [
+                "# HELP bybit_mcp_endpoint_ret_codes_total Bybit retCode values returned per endpoint.",
+                "# TYPE bybit_mcp_endpoint_ret_codes_total counter",
+            ]
+            for name, metrics in endpoints:
+                for code, count in sorted(metrics.ret_codes.items()):
+                    labels = f'endpoint="{_label(name)}",ret_code="{_label(code)}"'
+                    lines.append(f"bybit_mcp_endpoint_ret_codes_total{{{labels}}} {count}")
+            for event, (metric, help_text) in ENDPOINT_EVENTS.items():
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                for name, metrics in endpoints:
+                    lines.append(f'{metric}{{endpoint="{_label(name)}"}} {metrics.events[event]}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self._endpoints.clear()
+            self.started_at = time.time()
+
+
+def is_error_response(response: Any) -> bool:
+    """True for the {"error": ...} objects tools return instead of raising."""
+    return isinstance(response, str) and response.lstrip("{ \n").startswith('"error"')
+
+
+def endpoint_name(method: Callable[..., Any]) -> str:
+    """Name of a bound pybit method, which identifies its endpoint (e.g. get_tickers)."""
+    name = getattr(getattr(method, "__func__", method), "__name__", None)
+    return name if isinstance(name, str) else "unknown"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        if self.path.partition("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """Serves /metrics in Prometheus text format from a daemon thread."""
+
+    daemon_threads = True
+
+    def __init__(self, metrics: ServerMetrics, port: int, host: str = "127.0.0.1"):
+        super().__init__((host, port), _MetricsHandler)
+        self.metrics = metrics
+
+    def start(self) -> "MetricsServer":
+        threading.Thread(target=self.serve_forever, name="bybit-metrics", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+# Shared by every tool and every REST call made through client.call().
+server_metrics = ServerMetrics()
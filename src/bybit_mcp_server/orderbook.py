@@ -0,0 +1,207 @@
+"""Local order books maintained from the public WebSocket orderbook stream.
+
+Each subscribed symbol gets a book built from the stream's snapshot and then
+updated in place from deltas. Delta update ids must be consecutive; a gap or a
+crossed book marks the book out of sync and asks the server for a fresh snapshot.
+Books that are out of sync, or whose connection is down, are never served.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any
+
+from bybit_mcp_server.streams import Stream, StreamHub, stream_hub
+
+# Depths Bybit publishes per category; the first is the default.
+STREAM_DEPTHS: dict[str, tuple[int, ...]] = {
+    "spot": (50, 1, 200),
+    "linear": (50, 1, 200, 500),
+    "inverse": (50, 1, 200, 500),
+    "option": (25, 100),
+}
+
+# Levels get_orderbook returns when no limit is given, matching the REST endpoint.
+REST_DEFAULT_LIMITS: dict[str, int] = {"spot": 1, "linear": 25, "inverse": 25, "option": 25}
+
+
+class BookSide:
+    """Price levels of one side, kept sorted best first."""
+
+    def __init__(self, descending: bool):
+        self._sign = -1.0 if descending else 1.0
+        self._keys: list[float] = []
+        self._levels: dict[float, list[str]] = {}
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._levels.clear()
+
+    def update(self, levels: list[list[str]]) -> None:
+        """Apply [price, size] entries; size 0 deletes the level."""
+        for price, size in levels:
+            key = self._sign * float(price)
+            if float(size) == 0:
+                if self._levels.pop(key, None) is not None:
+                    del self._keys[bisect.bisect_left(self._keys, key)]
+            else:
+                if key not in self._levels:
+                    bisect.insort(self._keys, key)
+                self._levels[key] = [price, size]
+
+    def best(self) -> float | None:
+        return self._sign * self._keys[0] if self._keys else None
+
+    def top(self, limit: int) -> list[list[str]]:
+        return [list(self._levels[key]) for key in self._keys[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class OrderBook:
+    """One symbol's book at one stream depth."""
+
+    def __init__(self, category: str, symbol: str, depth: int):
+        self.category = category
+        self.symbol = symbol
+        self.depth = depth
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.update_id = 0
+        self.seq = 0
+        self.ts = 0
+        self.cts = 0
+        self.synced = False
+        self.resyncs = 0
+        self.updated_at = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def topic(self) -> str:
+        return f"orderbook.{self.depth}.{self.symbol}"
+
+    def apply(self, message: dict[str, Any]) -> bool:
+        """Apply a stream message. Returns False if the book fell out of sync."""
+        data = message["data"]
+        with self.lock:
+            if message.get("type") == "snapshot" or data.get("u") == 1:
+                # Bybit also sends u=1 after a service restart; it replaces the book.
+                self.bids.clear()
+                self.asks.clear()
+            elif not self.synced:
+                return True
+            elif data["u"] != self.update_id + 1:
+                self.synced = False
+                return False
+            self.bids.update(data.get("b", []))
+            self.asks.update(data.get("a", []))
+            self.update_id = data["u"]
+            self.seq = data.get("seq", self.seq)
+            self.ts = message.get("ts", self.ts)
+            self.cts = message.get("cts", self.cts)
+            self.updated_at = time.time()
+            bid, ask = self.bids.best(), self.asks.best()
+            self.synced = bid is None or ask is None or bid < ask
+            return self.synced
+
+    def snapshot(self, limit: int | None = None) -> dict[str, Any]:
+        """The book in get_orderbook's REST result format, best levels first."""
+        limit = limit or self.depth
+        with self.lock:
+            return {
+                "s": self.symbol,
+                "b": self.bids.top(limit),
+                "a": self.asks.top(limit),
+                "ts": self.ts,
+                "u": self.update_id,
+                "seq": self.seq,
+                "cts": self.cts,
+            }
+
+    def status(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                "category": self.category,
+                "symbol": self.symbol,
+                "depth": self.depth,
+                "synced": self.synced,
+                "updateId": self.update_id,
+                "bids": len(self.bids),
+                "asks": len(self.asks),
+                "resyncs": self.resyncs,
+                "lastUpdateAge": round(time.time() - self.updated_at, 3) if self.updated_at else None,
+            }
+
+
+class OrderBookEngine:
+    """Subscribed order books, fed from the category's public stream."""
+
+    def __init__(self, hub: StreamHub):
+        self.hub = hub
+        self._books: dict[tuple[str, str], OrderBook] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, category: str, symbol: str, depth: int | None = None) -> OrderBook:
+        """Start maintaining a book. Blocks while the stream connects."""
+        depths = STREAM_DEPTHS.get(category)
+        if depths is None:
+            raise ValueError(f"Unsupported category for order book streams: {category!r}")
+        depth = depth or depths[0]
+        if depth not in depths:
+            raise ValueError(f"Unsupported depth {depth} for {category}; choose one of {sorted(depths)}")
+        with self._lock:
+            book = self._books.get((category, symbol))
+            if book is not None and book.depth == depth:
+                return book
+        if book is not None:
+            self.unsubscribe(category, symbol)
+
+        book = OrderBook(category, symbol, depth)
+        stream = self.hub.stream(category)
+        with self._lock:
+            self._books[(category, symbol)] = book
+        stream.subscribe(book.topic, lambda message: self._on_message(stream, book, message))
+        return book
+
+    def _on_message(self, stream: Stream, book: OrderBook, message: dict[str, Any]) -> None:
+        if not book.apply(message):
+            book.resyncs += 1
+            stream.resubscribe(book.topic)
+
+    def unsubscribe(self, category: str, symbol: str) -> bool:
+        with self._lock:
+            book = self._books.pop((category, symbol), None)
+        if book is None:
+            return False
+        stream = self.hub.get(category)
+        if stream is not None:
+            stream.unsubscribe(book.topic)
+        return True
+
+    def get(self, category: str, symbol: str, limit: int | None = None) -> dict[str, Any] | None:
+        """The book in REST format if it is subscribed, in sync, connected and deep enough."""
+        limit = limit or REST_DEFAULT_LIMITS.get(category)
+        book = self._books.get((category, symbol))
+        if book is None or not book.synced or (limit is not None and limit > book.depth):
+            return None
+        stream = self.hub.get(category)
+        if stream is None or not stream.is_connected():
+            return None
+        return book.snapshot(limit)
+
+    def status(self) -> list[dict[str, Any]]:
+        with self._lock:
+            books = list(self._books.values())
+        return [book.status() for book in books]
+
+    def clear(self) -> None:
+        with self._lock:
+            books, self._books = list(self._books.values()), {}
+        for book in books:
+            stream = self.hub.get(book.category)
+            if stream is not None:
+                stream.unsubscribe(book.topic)
+
+
+orderbook_engine = OrderBookEngine(stream_hub)
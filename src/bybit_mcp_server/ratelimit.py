@@ -0,0 +1,195 @@
+"""Client-side token-bucket rate limiting per endpoint group and account.
+
+Callers over budget are queued (they sleep until a token is due) rather than rejected.
+Buckets also follow Bybit's X-Bapi-Limit-Status / X-Bapi-Limit-Reset-Timestamp response
+headers: the local budget never exceeds what the server reports as remaining, and an
+exhausted group pauses until the server's reset time.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from bybit_mcp_server.config import Settings, get_settings, on_reload
+
+# pybit groups its REST methods into one mixin class per API section.
+GROUPS_BY_CLASS = {
+    "MarketHTTP": "market",
+    "TradeHTTP": "trade",
+    "PositionHTTP": "position",
+    "AccountHTTP": "account",
+    "AssetHTTP": "asset",
+}
+
+# The bucket whose request is running on this worker thread, for the response hook.
+_current = threading.local()
+
+
+def endpoint_group(method: Callable[..., Any]) -> str:
+    """Endpoint group of a bound pybit method, from the mixin class that defines it."""
+    qualname = getattr(getattr(method, "__func__", method), "__qualname__", "")
+    if not isinstance(qualname, str):
+        return "other"
+    return GROUPS_BY_CLASS.get(qualname.partition(".")[0], "other")
+
+
+def account_of(method: Callable[..., Any], group: str) -> str:
+    """Budget owner: market data is limited per IP, everything else per API key (one UID)."""
+    if group == "market":
+        return ""
+    api_key = getattr(getattr(method, "__self__", None), "api_key", None)
+    return api_key if isinstance(api_key, str) else ""
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second up to `rate` tokens (one second of burst).
+
+    Tokens may go negative: each reservation past the budget queues behind the ones
+    before it. Thread-safe, since response headers are observed on worker threads.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.server: dict[str, int] = {}
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, self._updated - now)
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            self.queued += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.queued -= 1
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate; tokens already earned above the new capacity are dropped."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = max(1.0, rate)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def observe(self, remaining: int, limit: int | None, reset_ms: int | None) -> None:
+        """Fold a server-reported budget into the bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.server = {"remaining": remaining}
+            if limit is not None:
+                self.server["limit"] = limit
+            if reset_ms is not None:
+                self.server["resetTimestamp"] = reset_ms
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset_ms is not None:
+                # Hold the refill until the server window resets.
+                self._updated = max(self._updated, now + reset_ms / 1000 - time.time())
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": self.rate,
+                "tokens": round(self.tokens, 2),
+                "queued": self.queued,
+                "pausedFor": round(max(0.0, self._updated - now), 3),
+                "server": dict(self.server),
+            }
+
+
+class RateLimiter:
+    """One TokenBucket per (account, endpoint group), created on first use."""
+
+    def __init__(self):
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, account: str, group: str) -> TokenBucket | None:
+        """The bucket for a group, or None if the group is not rate limited."""
+        with self._lock:
+            bucket = self._buckets.get((account, group))
+            if bucket is None:
+                rate = _rate(get_settings().rate_limits, group)
+                if rate <= 0:
+                    return None
+                bucket = self._buckets[(account, group)] = TokenBucket(rate)
+            return bucket
+
+    def bucket_for(self, method: Callable[..., Any]) -> TokenBucket | None:
+        group = endpoint_group(method)
+        return self.bucket(account_of(method, group), group)
+
+    def reconfigure(self, settings: Settings) -> None:
+        """Apply reloaded rate limits to existing buckets, dropping those of groups now disabled."""
+        with self._lock:
+            for key, bucket in list(self._buckets.items()):
+                rate = _rate(settings.rate_limits, key[1])
+                if rate <= 0:
+                    del self._buckets[key]
+                elif rate != bucket.rate:
+                    bucket.set_rate(rate)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def status(self) -> list[dict[str, Any]]:
+        with self._lock:
+            buckets = sorted(self._buckets.items())
+        return [{"account": _mask(account), "group": group, **bucket.status()} for (account, group), bucket in buckets]
+
+
+def _rate(limits: Mapping[str, float], group: str) -> float:
+    return limits.get(group, limits.get("other", 0.0))
+
+
+def _mask(api_key: str) -> str:
+    return f"***{api_key[-4:]}" if api_key else "public"
+
+
+def run_in_bucket(bucket: TokenBucket | None, method: Callable[..., Any], params: dict[str, Any]) -> Any:
+    """Call method on this thread with its bucket visible to observe_response."""
+    _current.bucket = bucket
+    try:
+        return method(**params)
+    finally:
+        _current.bucket = None
+
+
+def observe_response(response: Any, *args: Any, **kwargs: Any) -> None:
+    """requests response hook: feed rate-limit headers to the bucket of the running call."""
+    bucket = getattr(_current, "bucket", None)
+    remaining = response.headers.get("X-Bapi-Limit-Status")
+    if bucket is None or remaining is None:
+        return
+    limit = response.headers.get("X-Bapi-Limit")
+    reset = response.headers.get("X-Bapi-Limit-Reset-Timestamp")
+    bucket.observe(int(remaining), int(limit) if limit else None, int(reset) if reset else None)
+
+
+# Shared by every REST call made through client.call().
+rate_limiter = RateLimiter()
+on_reload(rate_limiter.reconfigure)
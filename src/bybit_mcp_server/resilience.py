@@ -0,0 +1,184 @@
+"""Failure handling for Bybit REST calls: retry policy, circuit breakers and hedging.
+
+client.call() applies these to reads (the get_* methods); idempotency applies the
+same retry policy to order writes.
+
+- Retries: a read that failed with a network error, an HTTP 5xx or a transient retCode
+  is sent again up to BYBIT_READ_RETRIES times, after an exponential backoff with full
+  jitter starting at BYBIT_READ_RETRY_BACKOFF seconds.
+- Circuit breakers: after BYBIT_BREAKER_THRESHOLD consecutive outage errors (network,
+  5xx, server timeout or busy; not rate limits) an endpoint's breaker opens, and calls
+  to it fail at once with CircuitOpenError for BYBIT_BREAKER_COOLDOWN_SECONDS. Then a
+  single trial call goes through; its success closes the breaker, its failure opens it
+  for another cooldown.
+- Hedging: a market data read still unanswered after BYBIT_HEDGE_AFTER_SECONDS is sent
+  a second time, and whichever reply arrives first is used.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from pybit.exceptions import FailedRequestError, InvalidRequestError
+
+from bybit_mcp_server.config import get_settings
+
+T = TypeVar("T")
+
+# Bybit retCodes for requests that failed for reasons unrelated to the request:
+# server timeout, rate limit, service restarting, system-level frequency protection.
+TRANSIENT_RET_CODES = frozenset({10000, 10006, 10016, 10429})
+RATE_LIMIT_RET_CODES = frozenset({10006, 10429})
+
+# pybit sleeps through a retCode in its retry_codes (10002, 10006, ...) and then raises
+# a bare Exception with this message instead of retrying.
+PYBIT_RETRYABLE = "Retryable error occurred"
+
+MAX_BACKOFF = 5.0
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed REST call is worth retrying unchanged."""
+    if isinstance(error, InvalidRequestError):
+        return error.status_code in TRANSIENT_RET_CODES
+    if isinstance(error, FailedRequestError):
+        return isinstance(error.status_code, int) and error.status_code >= 500
+    if type(error) is Exception:
+        return str(error).startswith(PYBIT_RETRYABLE)
+    # requests is loaded with the session, so importing it here costs nothing.
+    import requests
+
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def is_outage(error: BaseException) -> bool:
+    """A transient failure that says Bybit or the network is unhealthy, not that this client is too fast."""
+    if isinstance(error, InvalidRequestError) and error.status_code in RATE_LIMIT_RET_CODES:
+        return False
+    return is_transient(error) and type(error) is not Exception
+
+
+def backoff(attempt: int, base: float) -> float:
+    """Seconds to wait before retry number attempt + 1: full jitter over base * 2**attempt."""
+    return random.uniform(0, min(MAX_BACKOFF, base * 2**attempt))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"Bybit {endpoint} is failing repeatedly; not calling it for another {retry_in:.0f}s. "
+            "Check get_server_metrics for its errors."
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Breaker for one endpoint. Used from the event loop only."""
+
+    def __init__(self, endpoint: str, threshold: int, cooldown: float):
+        self.endpoint = endpoint
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go out now."""
+        if self.state == "closed":
+            return
+        retry_in = self.opened_at + self.cooldown - time.monotonic()
+        if self.state == "open" and retry_in <= 0:
+            self.state = "half-open"
+        if self.state == "half-open" and not self._trial:
+            self._trial = True
+            return
+        raise CircuitOpenError(self.endpoint, max(retry_in, 0.0))
+
+    def record(self, healthy: bool) -> bool:
+        """Record a call's outcome; True if this opened the breaker."""
+        self._trial = False
+        if healthy:
+            self.state, self.failures = "closed", 0
+            return False
+        self.failures += 1
+        if self.threshold <= 0 or (self.state == "closed" and self.failures < self.threshold):
+            return False
+        self.state, self.opened_at = "open", time.monotonic()
+        return True
+
+    def abandon(self) -> None:
+        """Forget a call that was cancelled before it had an outcome."""
+        self._trial = False
+
+    def status(self) -> dict[str, Any]:
+        status: dict[str, Any] = {"state": self.state, "consecutiveFailures": self.failures}
+        if self.state != "closed":
+            status["retryIn"] = round(max(self.opened_at + self.cooldown - time.monotonic(), 0.0), 3)
+        return status
+
+
+class BreakerRegistry:
+    """One CircuitBreaker per endpoint, created on first use."""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        settings = get_settings()
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(endpoint, 0, 0.0)
+        breaker.threshold, breaker.cooldown = settings.breaker_threshold, settings.breaker_cooldown_seconds
+        return breaker
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Breakers that are not closed or have failures, by endpoint."""
+        return {
+            name: breaker.status()
+            for name, breaker in sorted(self._breakers.items())
+            if breaker.state != "closed" or breaker.failures
+        }
+
+    def clear(self) -> None:
+        self._breakers.clear()
+
+
+# Shared by every read made through client.call().
+breakers = BreakerRegistry()
+
+
+async def hedged(attempt: Callable[[], Awaitable[T]], delay: float, observe: Callable[[str], None]) -> T:
+    """attempt(), started a second time if the first has not finished after delay seconds.
+
+    Returns the first successful result and cancels the other attempt; raises only if
+    both fail. observe is told of each "hedges" sent and "hedgeWins" by the second.
+    """
+    first = asyncio.ensure_future(attempt())
+    tasks = {first}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return first.result()
+        observe("hedges")
+        second = asyncio.ensure_future(attempt())
+        tasks.add(second)
+        pending = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        observe("hedgeWins")
+                    return task.result()
+            if not pending:
+                return first.result()
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -1,37 +1,93 @@
 """Bybit MCP Server implementation."""
 
+import argparse
+import asyncio
+import hmac
+import importlib
 import json
+import logging
+import signal
+from collections.abc import Callable
+from typing import Any, get_args
 
+import uvicorn
 from mcp.server.fastmcp import FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
+from mcp.types import Tool as MCPTool
 from mcp.types import ToolAnnotations
 
-from bybit_mcp_server.decorators import execute_confirmed, get_impl, require_mode
-from bybit_mcp_server.tools.account import register_account_tools
-from bybit_mcp_server.tools.asset import register_asset_tools
-from bybit_mcp_server.tools.market import register_market_tools
-from bybit_mcp_server.tools.position import register_position_tools
-from bybit_mcp_server.tools.trade import register_trade_tools
+from bybit_mcp_server.client import shutdown_executor
+from bybit_mcp_server.config import Transport, get_settings, reload_settings
+from bybit_mcp_server.decorators import execute_confirmed, get_impl, instrument_tools, require_mode
+from bybit_mcp_server.metrics import MetricsServer, server_metrics
+from bybit_mcp_server.streams import stream_hub
+from bybit_mcp_server.tracing import configure_tracing, shutdown_tracing, span
 
-mcp = FastMCP("bybit-mcp-server")
+logger = logging.getLogger(__name__)
+
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# Tool modules and their register functions, in tools/list order.
+TOOL_MODULES: tuple[tuple[str, str], ...] = (
+    ("bybit_mcp_server.tools.market", "register_market_tools"),
+    ("bybit_mcp_server.tools.account", "register_account_tools"),
+    ("bybit_mcp_server.tools.trade", "register_trade_tools"),
+    ("bybit_mcp_server.tools.position", "register_position_tools"),
+    ("bybit_mcp_server.tools.asset", "register_asset_tools"),
+    ("bybit_mcp_server.tools.diagnostics", "register_diagnostics_tools"),
+    ("bybit_mcp_server.tools.streams", "register_stream_tools"),
+)
+
+
+class BybitMCP(FastMCP):
+    """FastMCP with a trace span around each tool call, from dispatch to the converted result,
+    an optional cap on how many tool calls run at once across all clients, and tool
+    registration that can wait until the first tools/list or tools/call.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        kwargs.setdefault("log_level", get_settings().log_level)
+        super().__init__(*args, **kwargs)
+        self._call_slots: asyncio.Semaphore | None = None
+        self._deferred: list[Callable[[FastMCP], None]] = []
+
+    def defer(self, register: Callable[[FastMCP], None]) -> None:
+        """Run register(self) when the tools are first needed instead of now."""
+        self._deferred.append(register)
+
+    def load_tools(self) -> None:
+        """Run the deferred registrations, in order. Later calls do nothing."""
+        while self._deferred:
+            self._deferred.pop(0)(self)
+
+    async def list_tools(self) -> list[MCPTool]:
+        self.load_tools()
+        return await super().list_tools()
+
+    def limit_concurrent_calls(self, limit: int) -> None:
+        """Queue tool calls beyond limit until one finishes; 0 removes the cap."""
+        self._call_slots = asyncio.Semaphore(limit) if limit > 0 else None
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        self.load_tools()
+        with span("mcp.call_tool", tool=name):
+            if self._call_slots is None:
+                return await super().call_tool(name, arguments)
+            async with self._call_slots:
+                return await super().call_tool(name, arguments)
 
-# Register all tool modules
-register_market_tools(mcp)
-register_account_tools(mcp)
-register_trade_tools(mcp)
-register_position_tools(mcp)
-register_asset_tools(mcp)
 
 # Cross-cutting confirmation tool
 WRITE_DESTRUCTIVE = ToolAnnotations(readOnlyHint=False, destructiveHint=True, openWorldHint=True)
 
 
-@mcp.tool(annotations=WRITE_DESTRUCTIVE)
 @require_mode("trade")
 async def confirm_order(confirmation_id: str) -> str:
     """Execute a previously prepared HIGH-risk operation after review.
 
     When a HIGH-risk tool (place_order, amend_order, cancel_all_orders, set_leverage,
-    internal_transfer) is called, it returns a confirmation summary instead of executing.
+    internal_transfer, and the place/amend/cancel batch tools) is called, it returns a
+    confirmation summary instead of executing.
     Call this tool with the confirmation_id to actually execute the operation.
 
     Args:
@@ -54,9 +110,166 @@ async def confirm_order(confirmation_id: str) -> str:
     return await impl(**pending["kwargs"])
 
 
-def main():
+def register_tools(app: FastMCP) -> None:
+    """Import every tool module and register its tools, then confirm_order.
+
+    Building each tool's argument schema is most of the server's startup time, so the
+    server defers this to the first tools/list or tools/call.
+    """
+    for module, function in TOOL_MODULES:
+        getattr(importlib.import_module(module), function)(app)
+    app.tool(annotations=WRITE_DESTRUCTIVE)(confirm_order)
+    # Time every tool, including confirm_order
+    instrument_tools(app)
+
+
+mcp = BybitMCP("bybit-mcp-server")
+mcp.defer(register_tools)
+
+
+class BearerAuth:
+    """ASGI middleware answering 401 to HTTP requests without "Authorization: Bearer <token>"."""
+
+    def __init__(self, app: Any, token: str):
+        self.app = app
+        self._expected = f"Bearer {token}".encode()
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http":
+            supplied = dict(scope["headers"]).get(b"authorization", b"")
+            if not hmac.compare_digest(supplied, self._expected):
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 401,
+                        "headers": [(b"content-type", b"text/plain"), (b"www-authenticate", b"Bearer")],
+                    }
+                )
+                await send({"type": "http.response.body", "body": b"Unauthorized"})
+                return
+        await self.app(scope, receive, send)
+
+
+def build_http_server(
+    app: FastMCP,
+    transport: Transport,
+    host: str,
+    port: int,
+    shutdown_timeout: float,
+    token: str | None = None,
+    allowed_hosts: tuple[str, ...] = (),
+) -> uvicorn.Server:
+    """A uvicorn server for app over streamable HTTP (at /mcp) or SSE (at /sse).
+
+    With a token, every request must carry it as a bearer token. With allowed_hosts,
+    requests must name one of them in their Host header (DNS rebinding protection).
+    Binding beyond the loopback interface requires at least one of the two: without
+    them this raises ValueError rather than serve the account to anyone who can connect.
+
+    On SIGINT/SIGTERM it stops accepting connections and waits up to shutdown_timeout
+    seconds for open requests and event streams before closing them.
+    """
+    app.settings.host, app.settings.port = host, port
+    if allowed_hosts:
+        app.settings.transport_security = TransportSecuritySettings(
+            enable_dns_rebinding_protection=True,
+            allowed_hosts=list(allowed_hosts),
+            allowed_origins=[f"{scheme}://{allowed}" for allowed in allowed_hosts for scheme in ("http", "https")],
+        )
+    elif host not in LOCAL_HOSTS:
+        if not token:
+            raise ValueError(
+                f"Refusing to listen on {host} without authentication: "
+                "set BYBIT_HTTP_TOKEN or BYBIT_ALLOWED_HOSTS, or bind to 127.0.0.1"
+            )
+        # FastMCP only knows the Host headers of local hosts; here the token guards the server.
+        app.settings.transport_security = None
+    starlette_app = app.streamable_http_app() if transport == "streamable-http" else app.sse_app()
+    if token:
+        starlette_app = BearerAuth(starlette_app, token)
+    config = uvicorn.Config(
+        starlette_app,
+        host=host,
+        port=port,
+        log_level=app.settings.log_level.lower(),
+        timeout_graceful_shutdown=shutdown_timeout,
+    )
+    return uvicorn.Server(config)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="bybit-mcp-server", description="Bybit MCP server")
+    parser.add_argument("--transport", choices=get_args(Transport), default=settings.transport)
+    parser.add_argument("--host", default=settings.host, help="HTTP transports only")
+    parser.add_argument("--port", type=int, default=settings.port, help="HTTP transports only")
+    return parser.parse_args(argv)
+
+
+def _reload_on_sighup() -> None:
+    """Reload settings on SIGHUP, where the platform has it.
+
+    The handler interrupts the main thread, which also runs the event loop and may be
+    holding a lock that a reload hook takes (the rate limiter's, say). So while the loop
+    runs, the handler only schedules the reload as a loop callback.
+    """
+    if not hasattr(signal, "SIGHUP"):
+        return
+
+    def reload() -> None:
+        try:
+            reload_settings()
+        except (OSError, ValueError) as e:
+            logger.error("Settings reload failed, keeping the previous settings: %s", e)
+        else:
+            logger.warning("Settings reloaded")
+
+    def handler(signum: int, frame: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            reload()
+        else:
+            loop.call_soon_threadsafe(reload)
+
+    signal.signal(signal.SIGHUP, handler)
+
+
+def main(argv: list[str] | None = None):
     """Run the MCP server."""
-    mcp.run(transport="stdio")
+    args = _parse_args(argv)
+    settings = get_settings()
+    configure_tracing()
+    _reload_on_sighup()
+    mcp.limit_concurrent_calls(settings.max_concurrent_calls)
+    port = settings.metrics_port
+    metrics_server = MetricsServer(server_metrics, port).start() if port is not None else None
+    try:
+        if args.transport == "stdio":
+            # Tools load on the first tools/list, so the handshake is answered at once.
+            mcp.run(transport="stdio")
+        else:
+            # A long-lived shared server loads them up front instead of in a client's first request.
+            mcp.load_tools()
+            try:
+                server = build_http_server(
+                    mcp,
+                    args.transport,
+                    args.host,
+                    args.port,
+                    settings.shutdown_timeout,
+                    token=settings.http_token,
+                    allowed_hosts=settings.allowed_hosts,
+                )
+            except ValueError as e:
+                raise SystemExit(f"bybit-mcp-server: {e}") from None
+            server.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+        stream_hub.close()
+        shutdown_executor()
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
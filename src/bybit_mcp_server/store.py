@@ -0,0 +1,197 @@
+"""Append-only SQLite store for closed klines and funding rates.
+
+Rows are only ever inserted (closed bars and published funding rates never change).
+Each series also records which time windows have been fully fetched from Bybit, so
+callers can tell a genuine gap in the data from a window that was never downloaded.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any
+
+from bybit_mcp_server.config import get_settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS klines (
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    open TEXT NOT NULL,
+    high TEXT NOT NULL,
+    low TEXT NOT NULL,
+    close TEXT NOT NULL,
+    volume TEXT NOT NULL,
+    turnover TEXT NOT NULL,
+    PRIMARY KEY (source, category, symbol, interval, start)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS funding (
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    rate TEXT NOT NULL,
+    PRIMARY KEY (source, category, symbol, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS coverage (
+    source TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    category TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    lo INTEGER NOT NULL,
+    hi INTEGER NOT NULL,
+    PRIMARY KEY (source, kind, category, symbol, interval, lo)
+) WITHOUT ROWID;
+"""
+
+# (source, kind, category, symbol, interval); interval is "" for funding series.
+Series = tuple[str, str, str, str, str]
+
+
+def merge_ranges(ranges: list[tuple[int, int]], adjacency: int) -> list[tuple[int, int]]:
+    """Union of [lo, hi] ranges; ranges closer than `adjacency` are joined."""
+    merged: list[tuple[int, int]] = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + adjacency:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def subtract_ranges(lo: int, hi: int, covered: list[tuple[int, int]], step: int) -> list[tuple[int, int]]:
+    """Parts of [lo, hi] not inside any of the sorted, merged `covered` ranges."""
+    missing = []
+    cursor = lo
+    for c_lo, c_hi in covered:
+        if c_hi < cursor:
+            continue
+        if c_lo > hi:
+            break
+        if c_lo > cursor:
+            missing.append((cursor, c_lo - step))
+        cursor = c_hi + step
+    if cursor <= hi:
+        missing.append((cursor, hi))
+    return missing
+
+
+class HistoryStore:
+    """Thread-safe wrapper around one SQLite file. All methods block; call them via run_sync."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def coverage(self, series: Series) -> list[tuple[int, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lo, hi FROM coverage WHERE source=? AND kind=? AND category=? AND symbol=? AND interval=? "
+                "ORDER BY lo",
+                series,
+            ).fetchall()
+        return [(lo, hi) for lo, hi in rows]
+
+    def missing(self, series: Series, lo: int, hi: int, step: int) -> list[tuple[int, int]]:
+        """Windows inside [lo, hi] that have not been fetched yet."""
+        return subtract_ranges(lo, hi, self.coverage(series), step)
+
+    def _add_coverage(self, series: Series, lo: int, hi: int, step: int) -> None:
+        """Record [lo, hi] as fetched, merging with existing ranges. Caller holds the lock."""
+        where = "source=? AND kind=? AND category=? AND symbol=? AND interval=?"
+        rows = self._conn.execute(f"SELECT lo, hi FROM coverage WHERE {where}", series).fetchall()
+        merged = merge_ranges([*rows, (lo, hi)], step)
+        self._conn.execute(f"DELETE FROM coverage WHERE {where}", series)
+        self._conn.executemany(
+            "INSERT INTO coverage VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(*series, m_lo, m_hi) for m_lo, m_hi in merged],
+        )
+
+    def put_bars(
+        self, source: str, category: str, symbol: str, interval: str, bars: list[list[str]], lo: int, hi: int, step: int
+    ) -> None:
+        """Append closed bars fetched for the window [lo, hi] and mark it covered."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO klines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(source, category, symbol, interval, int(bar[0]), *bar[1:7]) for bar in bars],
+            )
+            self._add_coverage((source, "kline", category, symbol, interval), lo, hi, step)
+
+    def get_bars(self, source: str, category: str, symbol: str, interval: str, lo: int, hi: int) -> list[list[str]]:
+        """Stored bars with start in [lo, hi], oldest first, in Bybit's row format."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start, open, high, low, close, volume, turnover FROM klines "
+                "WHERE source=? AND category=? AND symbol=? AND interval=? AND start BETWEEN ? AND ? ORDER BY start",
+                (source, category, symbol, interval, lo, hi),
+            ).fetchall()
+        return [[str(row[0]), *row[1:]] for row in rows]
+
+    def put_funding(
+        self, source: str, category: str, symbol: str, rows: list[dict[str, Any]], lo: int, hi: int
+    ) -> None:
+        """Append funding records fetched for the window [lo, hi] and mark it covered."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO funding VALUES (?, ?, ?, ?, ?)",
+                [(source, category, symbol, int(row["fundingRateTimestamp"]), row["fundingRate"]) for row in rows],
+            )
+            self._add_coverage((source, "funding", category, symbol, ""), lo, hi, 1)
+
+    def get_funding(self, source: str, category: str, symbol: str, lo: int, hi: int) -> list[dict[str, str]]:
+        """Stored funding records in [lo, hi], newest first, in Bybit's row format."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, rate FROM funding WHERE source=? AND category=? AND symbol=? AND ts BETWEEN ? AND ? "
+                "ORDER BY ts DESC",
+                (source, category, symbol, lo, hi),
+            ).fetchall()
+        return [{"symbol": symbol, "fundingRate": rate, "fundingRateTimestamp": str(ts)} for ts, rate in rows]
+
+    def count(self, series: Series) -> int:
+        source, kind, category, symbol, interval = series
+        with self._lock:
+            if kind == "kline":
+                sql = "SELECT COUNT(*) FROM klines WHERE source=? AND category=? AND symbol=? AND interval=?"
+                return self._conn.execute(sql, (source, category, symbol, interval)).fetchone()[0]
+            sql = "SELECT COUNT(*) FROM funding WHERE source=? AND category=? AND symbol=?"
+            return self._conn.execute(sql, (source, category, symbol)).fetchone()[0]
+
+    def compact(self) -> dict[str, int]:
+        """Checkpoint the WAL and VACUUM the database file."""
+        before = os.path.getsize(self.path)
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+        return {"bytes_before": before, "bytes_after": os.path.getsize(self.path)}
+
+
+_store: HistoryStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore | None:
+    """The store at BYBIT_HISTORY_DB, opened on first use, or None when unset."""
+    global _store
+    path = get_settings().history_db
+    with _store_lock:
+        if path is None:
+            return None
+        if _store is None or _store.path != path:
+            if _store is not None:
+                _store.close()
+            _store = HistoryStore(path)
+        return _store
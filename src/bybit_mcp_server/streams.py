@@ -0,0 +1,132 @@
+"""Shared pybit WebSocket connections and per-topic message routing."""
+
+import json
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from bybit_mcp_server.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any]], None]
+
+
+def open_websocket(**kwargs: Any) -> Any:
+    """A new BybitWebSocket. pybit's WebSocket stack is imported on the first call."""
+    from bybit_mcp_server.wsclient import BybitWebSocket
+
+    return BybitWebSocket(**kwargs)
+
+
+class Stream:
+    """One pybit WebSocket (a channel such as "linear" or "private") shared by many topics.
+
+    Topic messages go straight to the registered handler; pybit's own order book and
+    ticker merging is bypassed. pybit still owns the connection: pings, reconnects,
+    and re-sending subscriptions after a reconnect.
+    """
+
+    def __init__(self, channel_type: str, testnet: bool, factory: Callable[..., Any] = open_websocket, **kwargs: Any):
+        self.channel_type = channel_type
+        self.testnet = testnet
+        self._handlers: dict[str, Handler] = {}
+        self._lock = threading.Lock()
+        self._ws = factory(channel_type=channel_type, testnet=testnet, callback_function=self._on_message, **kwargs)
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        topic = message.get("topic")
+        if topic is not None:
+            handler = self._handlers.get(topic)
+            if handler is not None:
+                handler(message)
+        elif message.get("success") is False:
+            logger.warning("WebSocket %s %s failed: %s", self.channel_type, message.get("op"), message.get("ret_msg"))
+        elif message.get("op") == "unsubscribe" and message.get("req_id"):
+            # Lets pybit drop the topic from the subscriptions it re-sends after a reconnect.
+            # Subscribe acks are not passed on: pybit records a request only after sending
+            # it, so a fast ack would not be found.
+            self._ws._handle_incoming_message(message)
+
+    def is_connected(self) -> bool:
+        return self._ws.is_connected()
+
+    @property
+    def reconnects(self) -> int:
+        """Times the connection has been re-established; messages may have been missed each time."""
+        return self._ws.reconnects
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        with self._lock:
+            if topic in self._handlers:
+                self._handlers[topic] = handler
+                return
+            self._handlers[topic] = handler
+        # pybit formats "{symbol}" into the topic; a topic without the placeholder is sent as is.
+        self._ws.subscribe(topic, handler, symbol=[topic])
+
+    def unsubscribe(self, topic: str) -> None:
+        with self._lock:
+            if self._handlers.pop(topic, None) is None:
+                return
+        self._ws.unsubscribe(topic)
+
+    def resubscribe(self, topic: str) -> None:
+        """Ask the server to restart a topic, which makes it send a fresh snapshot."""
+        self._ws.ws.send(json.dumps({"op": "unsubscribe", "args": [topic]}))
+        self._ws.ws.send(json.dumps({"op": "subscribe", "args": [topic]}))
+
+    def topics(self) -> list[str]:
+        with self._lock:
+            return sorted(self._handlers)
+
+    def close(self) -> None:
+        self._ws.close()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "channel": self.channel_type,
+            "connected": self.is_connected(),
+            "reconnects": self.reconnects,
+            "topics": self.topics(),
+        }
+
+
+class StreamHub:
+    """Opens one Stream per (testnet, channel type) on first use."""
+
+    def __init__(self, factory: Callable[..., Any] = open_websocket):
+        self.factory = factory
+        self._streams: dict[tuple[bool, str], Stream] = {}
+        self._lock = threading.Lock()
+
+    def stream(self, channel_type: str, **kwargs: Any) -> Stream:
+        """The shared stream for a channel. Blocks while a new connection is opened."""
+        settings = get_settings()
+        key = (settings.testnet, channel_type)
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = Stream(
+                    channel_type, key[0], self.factory, base_url=settings.ws_url, **kwargs
+                )
+            return stream
+
+    def get(self, channel_type: str) -> Stream | None:
+        """The open stream for a channel, without connecting."""
+        return self._streams.get((get_settings().testnet, channel_type))
+
+    def status(self) -> list[dict[str, Any]]:
+        with self._lock:
+            streams = list(self._streams.values())
+        return [stream.status() for stream in streams]
+
+    def close(self) -> None:
+        with self._lock:
+            streams, self._streams = list(self._streams.values()), {}
+        for stream in streams:
+            stream.close()
+
+
+stream_hub = StreamHub()
@@ -3,32 +3,46 @@
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
-from bybit_mcp_server.client import format_result, get_session
+from bybit_mcp_server.accountmirror import account_mirror
+from bybit_mcp_server.client import call, format_result, get_session
+from bybit_mcp_server.config import OutputFormat
 
 READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=True)
 
 
 def register_account_tools(mcp: FastMCP) -> None:
     @mcp.tool(annotations=READ_ONLY)
-    async def get_wallet_balance(accountType: str, coin: str | None = None) -> str:
+    async def get_wallet_balance(
+        accountType: str,
+        coin: str | None = None,
+        output_format: OutputFormat | None = None,
+    ) -> str:
         """Get wallet balance and account risk information.
 
+        While the account stream is running (start_account_stream), the balance is served
+        from its mirror; the result then carries a "mirror" block with the data's age.
+
         Args:
             accountType: Account type - UNIFIED, CONTRACT, SPOT, OPTION, FUND
             coin: Coin name (e.g. BTC). If omitted, returns all coins with balance.
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        result = account_mirror.wallet(accountType, coin)
+        if result is not None:
+            return format_result(result, output_format)
         session = get_session()
         params: dict = {"accountType": accountType}
         if coin:
             params["coin"] = coin
-        result = session.get_wallet_balance(**params)
-        return format_result(result)
+        result = await call(session.get_wallet_balance, **params)
+        return format_result(result, output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_fee_rate(
         category: str | None = None,
         symbol: str | None = None,
         baseCoin: str | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Get trading fee rate.
 
@@ -36,18 +50,23 @@ def register_account_tools(mcp: FastMCP) -> None:
             category: Product type - spot, linear, inverse, option
             symbol: Symbol name
             baseCoin: Base coin
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
         session = get_session()
         params: dict = {}
         for key, val in [("category", category), ("symbol", symbol), ("baseCoin", baseCoin)]:
             if val is not None:
                 params[key] = val
-        result = session.get_fee_rates(**params)
-        return format_result(result)
+        result = await call(session.get_fee_rates, **params)
+        return format_result(result, output_format)
 
     @mcp.tool(annotations=READ_ONLY)
-    async def get_account_info() -> str:
-        """Get account margin mode and configuration info."""
+    async def get_account_info(output_format: OutputFormat | None = None) -> str:
+        """Get account margin mode and configuration info.
+
+        Args:
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
+        """
         session = get_session()
-        result = session.get_account_info()
-        return format_result(result)
+        result = await call(session.get_account_info)
+        return format_result(result, output_format)
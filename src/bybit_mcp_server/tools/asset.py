@@ -3,7 +3,8 @@
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
-from bybit_mcp_server.client import format_result, get_session
+from bybit_mcp_server.client import call, call_paged, format_result, get_session, page_limit
+from bybit_mcp_server.config import OutputFormat
 from bybit_mcp_server.decorators import register_impl, require_confirmation, require_mode
 
 READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=True)
@@ -17,6 +18,7 @@ def register_asset_tools(mcp: FastMCP) -> None:
         coin: str | None = None,
         memberId: str | None = None,
         withTransferSafeAmount: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query coin balance of a specific account type.
 
@@ -25,6 +27,7 @@ def register_asset_tools(mcp: FastMCP) -> None:
             coin: Coin name
             memberId: UID (required when querying sub UID balance)
             withTransferSafeAmount: Query transfer safe amount (0 or 1)
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
         session = get_session()
         params: dict = {"accountType": accountType}
@@ -35,22 +38,23 @@ def register_asset_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_coin_balance(**params)
-        return format_result(result)
+        result = await call(session.get_coin_balance, **params)
+        return format_result(result, output_format)
 
     @mcp.tool(annotations=READ_ONLY)
-    async def get_coin_info(coin: str | None = None) -> str:
+    async def get_coin_info(coin: str | None = None, output_format: OutputFormat | None = None) -> str:
         """Query coin information including chain info, deposit/withdraw status.
 
         Args:
             coin: Coin name. If omitted, returns all coins.
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
         session = get_session()
         params: dict = {}
         if coin:
             params["coin"] = coin
-        result = session.get_coin_info(**params)
-        return format_result(result)
+        result = await call(session.get_coin_info, **params)
+        return format_result(result, output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_transfer_history(
@@ -61,6 +65,9 @@ def register_asset_tools(mcp: FastMCP) -> None:
         endTime: int | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query internal transfer records.
 
@@ -72,6 +79,9 @@ def register_asset_tools(mcp: FastMCP) -> None:
             endTime: End timestamp in milliseconds
             limit: Limit per page (max 50, default 20)
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
         session = get_session()
         params: dict = {}
@@ -86,14 +96,14 @@ def register_asset_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_internal_transfer_records(**params)
-        return format_result(result)
+        result = await call_paged(session.get_internal_transfer_records, params, page_limit(fetch_all, max_pages))
+        return format_result(result, output_format)
 
     # --- Write asset tools ---
 
     async def _internal_transfer_impl(**kwargs: object) -> str:
         session = get_session()
-        result = session.create_internal_transfer(**kwargs)
+        result = await call(session.create_internal_transfer, **kwargs)
         return format_result(result)
 
     register_impl("internal_transfer", _internal_transfer_impl)
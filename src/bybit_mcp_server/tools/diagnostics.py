@@ -0,0 +1,55 @@
+"""Diagnostics tools (local server state only)."""
+
+import json
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+
+from bybit_mcp_server import config
+from bybit_mcp_server.cache import market_cache
+from bybit_mcp_server.client import format_payload
+from bybit_mcp_server.decorators import require_mode
+from bybit_mcp_server.metrics import server_metrics
+from bybit_mcp_server.ratelimit import rate_limiter
+from bybit_mcp_server.resilience import breakers
+
+LOCAL_READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=False)
+LOCAL_WRITE = ToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=True, openWorldHint=False)
+
+
+def register_diagnostics_tools(mcp: FastMCP) -> None:
+    @mcp.tool(annotations=LOCAL_READ_ONLY)
+    async def get_cache_stats() -> str:
+        """Get market data cache statistics: entry count, evictions and per-tool hit/miss counters."""
+        return format_payload(market_cache.stats())
+
+    @mcp.tool(annotations=LOCAL_READ_ONLY)
+    async def get_rate_limit_status() -> str:
+        """Get the client-side rate limit budget per endpoint group and API key: rate, tokens left,
+        queued calls, pause time and the last limit reported by Bybit's response headers."""
+        return format_payload({"buckets": rate_limiter.status()})
+
+    @mcp.tool(annotations=LOCAL_READ_ONLY)
+    async def get_server_metrics() -> str:
+        """Get per-tool latency percentiles (p50/p95/p99), response sizes and error counts, and
+        per-Bybit-endpoint latency, errors, retCode counts, retries, hedged requests and circuit
+        breaker trips since the server started, plus the circuit breakers with recent failures."""
+        return format_payload({**server_metrics.snapshot(), "breakers": breakers.status()})
+
+    @mcp.tool(annotations=LOCAL_WRITE)
+    @require_mode("full")
+    async def reload_settings() -> str:
+        """Re-read the BYBIT_* settings from the environment and BYBIT_ENV_FILE, as SIGHUP does.
+
+        BYBIT_MODE, credentials, testnet, HTTP pool size and timeout, rate limits, output
+        format and the other per-call settings take effect at once. Transport, host, ports,
+        worker and cache sizes, tracing and the log level keep their startup values until restart.
+        Returns the settings that changed, with credentials masked.
+        """
+        before = config.get_settings()
+        try:
+            after = config.reload_settings()
+        except (OSError, ValueError) as e:
+            return json.dumps({"error": f"Settings reload failed, keeping the previous settings: {e}"})
+        changed = {name: {"from": old, "to": new} for name, (old, new) in before.changes(after).items()}
+        return format_payload({"mode": after.mode.value, "changed": changed})
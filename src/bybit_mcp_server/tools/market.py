@@ -1,11 +1,148 @@
 """Market data tools (read-only)."""
 
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
-from bybit_mcp_server.client import format_result, get_session
+from bybit_mcp_server.cache import market_cache
+from bybit_mcp_server.client import (
+    call,
+    call_paged,
+    format_payload,
+    format_result,
+    get_session,
+    page_limit,
+    run_sync,
+)
+from bybit_mcp_server.config import OutputFormat, get_settings
+from bybit_mcp_server.filters import ListQuery
+from bybit_mcp_server.history import (
+    load_funding_page,
+    load_kline_bars,
+    load_kline_page,
+    load_range,
+    sync_series,
+)
+from bybit_mcp_server.instruments import instrument_registry
+from bybit_mcp_server.klines import interval_ms
+from bybit_mcp_server.marketstream import market_streams
+from bybit_mcp_server.orderbook import orderbook_engine
+from bybit_mcp_server.store import get_history_store
+
+if TYPE_CHECKING:
+    from pybit.unified_trading import HTTP
 
 READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=True)
+LOCAL_WRITE = ToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=True, openWorldHint=True)
+
+HISTORY_DISABLED = "History store is disabled. Set BYBIT_HISTORY_DB to a file path to enable it."
+
+# Seconds a cached response stays fresh, per tool.
+CACHE_TTLS: dict[str, float] = {
+    "get_server_time": 1.0,
+    "get_tickers": 0.5,
+    "get_instruments_info": 300.0,
+    "get_orderbook": 0.2,
+    "get_funding_rate_history": 60.0,
+    "get_open_interest": 10.0,
+    "get_kline_analytics": 5.0,
+}
+
+# History windows that ended in the past can no longer change.
+CLOSED_WINDOW_TTL = 86400.0
+
+
+def _window_ttl(tool: str, end_ms: int | None) -> float:
+    """TTL for a time-windowed query: long-lived once the window is closed."""
+    if end_ms is not None and end_ms < time.time() * 1000:
+        return CLOSED_WINDOW_TTL
+    return CACHE_TTLS[tool]
+
+
+async def _cached_call(
+    tool: str,
+    session: "HTTP",
+    method: str,
+    params: dict,
+    ttl: float | None = None,
+    max_pages: int | None = None,
+) -> dict:
+    """Call a pybit method through market_cache, keyed on endpoint, tool, params and page cap."""
+    key = (tool, session.endpoint, tuple(sorted(params.items())), max_pages)
+    ttl = CACHE_TTLS[tool] if ttl is None else ttl
+    return await market_cache.get_or_fetch(key, ttl, lambda: call_paged(getattr(session, method), params, max_pages))
+
+
+# Data kinds get_market_snapshot can fetch, and the categories each is available for.
+SNAPSHOT_KINDS: dict[str, tuple[str, ...]] = {
+    "ticker": ("spot", "linear", "inverse", "option"),
+    "orderbook": ("spot", "linear", "inverse", "option"),
+    "funding": ("linear", "inverse"),
+    "open_interest": ("linear", "inverse"),
+}
+
+# Most symbols one get_market_snapshot call may ask for.
+MAX_SNAPSHOT_SYMBOLS = 50
+
+
+def _latest(result: dict) -> Any:
+    """First list item of a response, or None if the list is empty."""
+    items = result["result"].get("list") or []
+    return items[0] if items else None
+
+
+async def _snapshot_item(session: "HTTP", kind: str, category: str, symbol: str, depth: int | None) -> Any:
+    """One data kind for one symbol, from a local stream if it can serve it, otherwise REST."""
+    if category not in SNAPSHOT_KINDS[kind]:
+        raise ValueError(f"{kind} is not available for {category}")
+    if kind == "ticker":
+        result = market_streams.get_ticker(category, symbol)
+        if result is None:
+            result = await _cached_call("get_tickers", session, "get_tickers", {"category": category, "symbol": symbol})
+        return _latest(result)
+    if kind == "orderbook":
+        book = orderbook_engine.get(category, symbol, depth)
+        if book is not None:
+            return book
+        params: dict = {"category": category, "symbol": symbol}
+        if depth is not None:
+            params["limit"] = depth
+        return (await _cached_call("get_orderbook", session, "get_orderbook", params))["result"]
+    if kind == "funding":
+        params = {"category": category, "symbol": symbol, "limit": 1}
+        return _latest(await _cached_call("get_funding_rate_history", session, "get_funding_rate_history", params))
+    params = {"category": category, "symbol": symbol, "intervalTime": "5min", "limit": 1}
+    return _latest(await _cached_call("get_open_interest", session, "get_open_interest", params))
+
+
+async def market_snapshot(
+    session: "HTTP", category: str, symbols: list[str], kinds: list[str], depth: int | None = None
+) -> dict[str, Any]:
+    """Fetch every (symbol, kind) pair concurrently and merge them per symbol.
+
+    A failed item is reported under the symbol's "errors" and does not affect the others.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    pairs = [(symbol, kind) for symbol in symbols for kind in kinds]
+    results = await asyncio.gather(
+        *(_snapshot_item(session, kind, category, symbol, depth) for symbol, kind in pairs),
+        return_exceptions=True,
+    )
+    rows: dict[str, dict[str, Any]] = {symbol: {"symbol": symbol} for symbol in symbols}
+    failed = 0
+    for (symbol, kind), result in zip(pairs, results):
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+        if isinstance(result, Exception):
+            rows[symbol].setdefault("errors", {})[kind] = str(result)
+            failed += 1
+        else:
+            rows[symbol][kind] = result
+    return {"category": category, "kinds": kinds, "failed": failed, "list": list(rows.values())}
 
 
 def register_market_tools(mcp: FastMCP) -> None:
@@ -13,23 +150,45 @@ def register_market_tools(mcp: FastMCP) -> None:
     async def get_server_time() -> str:
         """Get the current Bybit server time."""
         session = get_session()
-        result = session.get_server_time()
+        result = await _cached_call("get_server_time", session, "get_server_time", {})
         return format_result(result)
 
     @mcp.tool(annotations=READ_ONLY)
-    async def get_tickers(category: str, symbol: str | None = None) -> str:
+    async def get_tickers(
+        category: str,
+        symbol: str | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
+    ) -> str:
         """Get latest price ticker for a symbol.
 
+        Symbols followed with subscribe_market_data are served from the WebSocket stream.
+
         Args:
             category: Product type - spot, linear, inverse, option
             symbol: Trading pair (e.g. BTCUSDT). If omitted, returns all tickers for the category.
+            fields: Keep only these keys in each list item (e.g. ["symbol", "lastPrice"])
+            filters: Conditions every list item must meet (e.g. ["turnover24h > 1e8", "symbol ^= BTC"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -turnover24h)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
-        session = get_session()
-        params: dict = {"category": category}
-        if symbol:
-            params["symbol"] = symbol
-        result = session.get_tickers(**params)
-        return format_result(result)
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        result = market_streams.get_ticker(category, symbol) if symbol else None
+        if result is None:
+            session = get_session()
+            params: dict = {"category": category}
+            if symbol:
+                params["symbol"] = symbol
+            result = await _cached_call("get_tickers", session, "get_tickers", params)
+        return format_result(query.apply(result), output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_kline(
@@ -39,9 +198,13 @@ def register_market_tools(mcp: FastMCP) -> None:
         start: int | None = None,
         end: int | None = None,
         limit: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query kline/candlestick data.
 
+        When the history store is enabled and both start and end are given, closed
+        candles are served from disk and only missing ones are fetched.
+
         Args:
             category: Product type - spot, linear, inverse
             symbol: Symbol name (e.g. BTCUSDT)
@@ -49,8 +212,14 @@ def register_market_tools(mcp: FastMCP) -> None:
             start: Start timestamp in milliseconds
             end: End timestamp in milliseconds
             limit: Limit for data size per page (max 200, default 200)
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
         session = get_session()
+        store = get_history_store()
+        if store is not None and start is not None and end is not None:
+            result = await load_kline_page(store, session, category, symbol, interval, start, end, limit)
+            if result is not None:
+                return format_result(result, output_format)
         params: dict = {"category": category, "symbol": symbol, "interval": interval}
         if start is not None:
             params["start"] = start
@@ -58,8 +227,117 @@ def register_market_tools(mcp: FastMCP) -> None:
             params["end"] = end
         if limit is not None:
             params["limit"] = limit
-        result = session.get_kline(**params)
-        return format_result(result)
+        result = await call(session.get_kline, **params)
+        return format_result(result, output_format)
+
+    @mcp.tool(annotations=READ_ONLY)
+    async def get_kline_range(
+        category: str,
+        symbol: str,
+        interval: str,
+        start: int,
+        end: int,
+        concurrency: int | None = None,
+        output_format: OutputFormat | None = None,
+    ) -> str:
+        """Download all klines in a time window in one call, returned in compact columnar form.
+
+        The window is split into 200-bar requests fetched concurrently, then bars are
+        deduplicated and ordered oldest first. Missing bars are reported in "gaps" as
+        [first_missing_start, last_missing_start] pairs. With the history store enabled,
+        closed candles already on disk are not downloaded again.
+
+        Args:
+            category: Product type - spot, linear, inverse
+            symbol: Symbol name (e.g. BTCUSDT)
+            interval: Kline interval - 1,3,5,15,30,60,120,240,360,720,D,W (monthly is not supported)
+            start: Start timestamp in milliseconds
+            end: End timestamp in milliseconds
+            concurrency: Maximum requests in flight (default from BYBIT_KLINE_CONCURRENCY)
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
+        """
+        session = get_session()
+        try:
+            payload = await load_range(
+                get_history_store(),
+                session,
+                category,
+                symbol,
+                interval,
+                start,
+                end,
+                concurrency or get_settings().kline_concurrency,
+            )
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        return format_payload(payload, output_format)
+
+    @mcp.tool(annotations=READ_ONLY)
+    async def get_kline_analytics(
+        category: str,
+        symbol: str,
+        interval: str,
+        start: int,
+        end: int,
+        indicators: list[str] | None = None,
+        period: int = 14,
+        output_format: OutputFormat | None = None,
+    ) -> str:
+        """Compute indicators over all klines in a time window and return only their latest values.
+
+        Cheaper than fetching the candles with get_kline_range and working them out yourself.
+        Candles are loaded as by get_kline_range (from the history store when enabled).
+        Returns the bar count, first and last bar start, last close, and per indicator:
+        - returns: total (first open to last close), meanLog, stdLog and lastLog per-bar log returns
+        - vwap: volume-weighted average of (high + low + close) / 3
+        - atr: Wilder's average true range over period bars
+        - ema: exponential moving average of the close over period bars
+        - volatility: perBar standard deviation of log returns, and annualized (365 days)
+        An indicator needing more bars than the window has is null.
+
+        Args:
+            category: Product type - spot, linear, inverse
+            symbol: Symbol name (e.g. BTCUSDT)
+            interval: Kline interval - 1,3,5,15,30,60,120,240,360,720,D,W (monthly is not supported)
+            start: Start timestamp in milliseconds
+            end: End timestamp in milliseconds
+            indicators: Any of returns, vwap, atr, ema, volatility (default all)
+            period: Bars in the atr and ema averages (default 14)
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
+        """
+        # NumPy is optional and slow to import; only this tool needs it.
+        from bybit_mcp_server import analytics
+
+        if analytics.np is None:
+            return json.dumps({"error": analytics.MISSING_NUMPY})
+        chosen = tuple(dict.fromkeys(indicators or analytics.INDICATORS))
+        unknown = [name for name in chosen if name not in analytics.INDICATORS]
+        if unknown:
+            return json.dumps({"error": f"Unknown indicators {unknown}; choose from {list(analytics.INDICATORS)}"})
+        if period < 1:
+            return json.dumps({"error": "period must be at least 1"})
+        session = get_session()
+
+        async def compute() -> dict:
+            bars = await load_kline_bars(
+                get_history_store(),
+                session,
+                category,
+                symbol,
+                interval,
+                start,
+                end,
+                get_settings().kline_concurrency,
+            )
+            summary = await run_sync(analytics.summarize, bars, interval_ms(interval), chosen, period)
+            return {"category": category, "symbol": symbol, "interval": interval, **summary}
+
+        key = ("get_kline_analytics", session.endpoint, category, symbol, interval, start, end, chosen, period)
+        try:
+            payload = await market_cache.get_or_fetch(key, _window_ttl("get_kline_analytics", end), compute)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        return format_payload(payload, output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_instruments_info(
@@ -69,6 +347,13 @@ def register_market_tools(mcp: FastMCP) -> None:
         baseCoin: str | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query instrument specifications and trading rules.
 
@@ -79,7 +364,19 @@ def register_market_tools(mcp: FastMCP) -> None:
             baseCoin: Base coin
             limit: Limit for data size per page
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            fields: Keep only these keys in each list item (e.g. ["symbol", "status", "priceFilter"])
+            filters: Conditions every list item must meet (e.g. ["status == Trading", "symbol ^= BTC"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -launchTime)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
         session = get_session()
         params: dict = {"category": category}
         for key, val in [
@@ -91,24 +388,79 @@ def register_market_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_instruments_info(**params)
-        return format_result(result)
+        pages = page_limit(fetch_all, max_pages)
+        result = await _cached_call("get_instruments_info", session, "get_instruments_info", params, max_pages=pages)
+        return format_result(query.apply(result), output_format)
+
+    @mcp.tool(annotations=READ_ONLY)
+    async def find_instruments(
+        category: str,
+        symbol: str | None = None,
+        baseCoin: str | None = None,
+        quoteCoin: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+        fields: list[str] | None = None,
+        output_format: OutputFormat | None = None,
+    ) -> str:
+        """Look up instrument specs (tick size, lot size, etc.) from a locally cached index.
+
+        Faster than paging through get_instruments_info: all instruments of the category are
+        loaded once, then refreshed in the background, and lookups never wait on Bybit.
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            symbol: Exact symbol name (e.g. BTCUSDT). Other filters are ignored when set.
+            baseCoin: Base coin filter (for option, also selects which base coin is indexed; default BTC)
+            quoteCoin: Quote coin filter (e.g. USDT)
+            status: Status filter - Trading, PreLaunch, Delivering, Closed
+            limit: Maximum number of instruments to return
+            fields: Keep only these keys in each instrument (e.g. ["symbol", "priceFilter", "lotSizeFilter"])
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
+        """
+        session = get_session()
+        index = await instrument_registry.get(session, category, baseCoin)
+        if symbol:
+            instrument = index.lookup(symbol)
+            instruments = [instrument] if instrument else []
+        else:
+            instruments = index.filter(baseCoin=baseCoin, quoteCoin=quoteCoin, status=status)
+        selected, total = ListQuery(fields=fields, top=limit).select(instruments)
+        payload = {
+            "category": category,
+            "total": total,
+            "indexedAt": int(index.loaded_at * 1000),
+            "list": selected,
+        }
+        return format_payload(payload, output_format)
 
     @mcp.tool(annotations=READ_ONLY)
-    async def get_orderbook(category: str, symbol: str, limit: int | None = None) -> str:
+    async def get_orderbook(
+        category: str,
+        symbol: str,
+        limit: int | None = None,
+        output_format: OutputFormat | None = None,
+    ) -> str:
         """Query order book depth data.
 
+        Served from the local WebSocket-fed book when the symbol was subscribed with
+        subscribe_orderbook at a depth of at least limit; otherwise fetched over REST.
+
         Args:
             category: Product type - spot, linear, inverse, option
             symbol: Symbol name (e.g. BTCUSDT)
             limit: Depth limit (spot: 1-200, default 1; derivatives: 1-500, default 25)
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        book = orderbook_engine.get(category, symbol, limit)
+        if book is not None:
+            return format_payload(book, output_format)
         session = get_session()
         params: dict = {"category": category, "symbol": symbol}
         if limit is not None:
             params["limit"] = limit
-        result = session.get_orderbook(**params)
-        return format_result(result)
+        result = await _cached_call("get_orderbook", session, "get_orderbook", params)
+        return format_result(result, output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_funding_rate_history(
@@ -117,23 +469,46 @@ def register_market_tools(mcp: FastMCP) -> None:
         startTime: int | None = None,
         endTime: int | None = None,
         limit: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query historical funding rate.
 
+        When the history store is enabled and both startTime and endTime are given,
+        records are served from disk and only windows not yet stored are fetched.
+
         Args:
             category: Product type - linear, inverse
             symbol: Symbol name (e.g. BTCUSDT)
             startTime: Start timestamp in milliseconds
             endTime: End timestamp in milliseconds
             limit: Limit for data size per page (max 200, default 200)
+            fields: Keep only these keys in each list item (e.g. ["fundingRateTimestamp", "fundingRate"])
+            filters: Conditions every list item must meet (e.g. ["fundingRate > 0.0001"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -fundingRate)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
         session = get_session()
+        store = get_history_store()
+        if store is not None and startTime is not None and endTime is not None:
+            result = await load_funding_page(store, session, category, symbol, startTime, endTime, limit)
+            return format_result(query.apply(result), output_format)
         params: dict = {"category": category, "symbol": symbol}
         for key, val in [("startTime", startTime), ("endTime", endTime), ("limit", limit)]:
             if val is not None:
                 params[key] = val
-        result = session.get_funding_rate_history(**params)
-        return format_result(result)
+        ttl = _window_ttl("get_funding_rate_history", endTime)
+        result = await _cached_call("get_funding_rate_history", session, "get_funding_rate_history", params, ttl)
+        return format_result(query.apply(result), output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_public_trades(
@@ -142,23 +517,46 @@ def register_market_tools(mcp: FastMCP) -> None:
         baseCoin: str | None = None,
         optionType: str | None = None,
         limit: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query recent public trading data.
 
+        Symbols followed with subscribe_market_data are served from the local trade buffer.
+
         Args:
             category: Product type - spot, linear, inverse, option
             symbol: Symbol name (e.g. BTCUSDT)
             baseCoin: Base coin (for option only)
             optionType: Option type - Call, Put (for option only)
             limit: Limit for data size (spot: 1-60 default 60; others: 1-1000 default 500)
+            fields: Keep only these keys in each list item (e.g. ["time", "price", "size", "side"])
+            filters: Conditions every list item must meet (e.g. ["side == Buy", "size >= 1"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -size)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
         session = get_session()
+        if baseCoin is None and optionType is None:
+            if market_streams.needs_seed(category, symbol):
+                await market_streams.seed_trades(session, category, symbol)
+            result = market_streams.get_trades(category, symbol, limit)
+            if result is not None:
+                return format_result(query.apply(result), output_format)
         params: dict = {"category": category, "symbol": symbol}
         for key, val in [("baseCoin", baseCoin), ("optionType", optionType), ("limit", limit)]:
             if val is not None:
                 params[key] = val
-        result = session.get_public_trade_history(**params)
-        return format_result(result)
+        result = await call(session.get_public_trade_history, **params)
+        return format_result(query.apply(result), output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_open_interest(
@@ -169,6 +567,13 @@ def register_market_tools(mcp: FastMCP) -> None:
         endTime: int | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Get open interest for each symbol.
 
@@ -180,7 +585,19 @@ def register_market_tools(mcp: FastMCP) -> None:
             endTime: End timestamp in milliseconds
             limit: Limit for data size per page (max 200, default 50)
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            fields: Keep only these keys in each list item (e.g. ["timestamp", "openInterest"])
+            filters: Conditions every list item must meet (e.g. ["openInterest > 50000"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -openInterest)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
         session = get_session()
         params: dict = {"category": category, "symbol": symbol, "intervalTime": intervalTime}
         for key, val in [
@@ -191,5 +608,84 @@ def register_market_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_open_interest(**params)
-        return format_result(result)
+        ttl = _window_ttl("get_open_interest", endTime)
+        pages = page_limit(fetch_all, max_pages)
+        result = await _cached_call("get_open_interest", session, "get_open_interest", params, ttl, pages)
+        return format_result(query.apply(result), output_format)
+
+    @mcp.tool(annotations=READ_ONLY)
+    async def get_market_snapshot(
+        category: str,
+        symbols: list[str],
+        kinds: list[str] | None = None,
+        orderbook_limit: int | None = None,
+        output_format: OutputFormat | None = None,
+    ) -> str:
+        """Get ticker, order book, latest funding rate and open interest for several symbols in one call.
+
+        All requests run concurrently under the rate limiter. Streamed tickers and books
+        are used when available. Items that fail are listed under the symbol's "errors".
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            symbols: Symbol names (e.g. ["BTCUSDT", "ETHUSDT"]), at most 50
+            kinds: Data to fetch per symbol - ticker, orderbook, funding, open_interest (default all).
+                funding and open_interest are available for linear and inverse only.
+            orderbook_limit: Order book depth (default as get_orderbook)
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
+        """
+        kinds = list(dict.fromkeys(kinds or SNAPSHOT_KINDS))
+        unknown = [kind for kind in kinds if kind not in SNAPSHOT_KINDS]
+        if unknown:
+            return json.dumps({"error": f"Unknown kinds: {', '.join(unknown)}. Use: {', '.join(SNAPSHOT_KINDS)}"})
+        if not symbols:
+            return json.dumps({"error": "symbols must not be empty"})
+        if len(symbols) > MAX_SNAPSHOT_SYMBOLS:
+            return json.dumps({"error": f"At most {MAX_SNAPSHOT_SYMBOLS} symbols per call"})
+        session = get_session()
+        payload = await market_snapshot(session, category, symbols, kinds, orderbook_limit)
+        return format_payload(payload, output_format)
+
+    # --- Local history store ---
+
+    @mcp.tool(annotations=LOCAL_WRITE)
+    async def sync_history(
+        category: str,
+        symbol: str,
+        kind: str = "kline",
+        interval: str | None = None,
+        start: int | None = None,
+    ) -> str:
+        """Download closed klines or funding rates into the local history store.
+
+        Incremental: only windows not stored yet are fetched. Later get_kline,
+        get_kline_range and get_funding_rate_history calls for stored windows are served
+        from disk. Requires BYBIT_HISTORY_DB.
+
+        Args:
+            category: Product type - spot, linear, inverse (funding: linear, inverse)
+            symbol: Symbol name (e.g. BTCUSDT)
+            kind: What to sync - kline or funding
+            interval: Kline interval (required for kind=kline) - 1,3,5,15,30,60,120,240,360,720,D,W
+            start: Start timestamp in milliseconds. Defaults to the end of the stored data;
+                required for the first sync of a series.
+        """
+        store = get_history_store()
+        if store is None:
+            return json.dumps({"error": HISTORY_DISABLED})
+        session = get_session()
+        try:
+            payload = await sync_series(
+                store, session, kind, category, symbol, interval, start, get_settings().kline_concurrency
+            )
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        return format_payload(payload)
+
+    @mcp.tool(annotations=LOCAL_WRITE)
+    async def compact_history() -> str:
+        """Compact the local history store file (checkpoint and VACUUM). Requires BYBIT_HISTORY_DB."""
+        store = get_history_store()
+        if store is None:
+            return json.dumps({"error": HISTORY_DISABLED})
+        return format_payload(await run_sync(store.compact))
@@ -1,10 +1,15 @@
 """Position tools."""
 
+import json
+
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
-from bybit_mcp_server.client import format_result, get_session
+from bybit_mcp_server.accountmirror import account_mirror
+from bybit_mcp_server.client import call, call_paged, format_result, get_session, page_limit
+from bybit_mcp_server.config import OutputFormat
 from bybit_mcp_server.decorators import register_impl, require_confirmation, require_mode
+from bybit_mcp_server.filters import ListQuery
 
 READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=True)
 WRITE_DESTRUCTIVE = ToolAnnotations(readOnlyHint=False, destructiveHint=True, openWorldHint=True)
@@ -19,9 +24,19 @@ def register_position_tools(mcp: FastMCP) -> None:
         settleCoin: str | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query real-time position data.
 
+        While the account stream is running (start_account_stream), open positions are served
+        from its mirror; the result then carries a "mirror" block with the data's age.
+
         Args:
             category: Product type - linear, inverse, option
             symbol: Symbol name
@@ -29,7 +44,25 @@ def register_position_tools(mcp: FastMCP) -> None:
             settleCoin: Settle coin
             limit: Limit per page (max 200, default 20)
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            fields: Keep only these keys in each list item (e.g. ["symbol", "size", "unrealisedPnl"])
+            filters: Conditions every list item must meet (e.g. ["size > 0", "symbol ~ USDT$"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -unrealisedPnl)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        if baseCoin is None and cursor is None:
+            result = account_mirror.positions(
+                category, symbol, settleCoin, limit, all_pages=page_limit(fetch_all, max_pages) is not None
+            )
+            if result is not None:
+                return format_result(query.apply(result), output_format)
         session = get_session()
         params: dict = {"category": category}
         for key, val in [
@@ -41,8 +74,8 @@ def register_position_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_positions(**params)
-        return format_result(result)
+        result = await call_paged(session.get_positions, params, page_limit(fetch_all, max_pages))
+        return format_result(query.apply(result), output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_closed_pnl(
@@ -52,6 +85,13 @@ def register_position_tools(mcp: FastMCP) -> None:
         endTime: int | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query closed profit and loss records.
 
@@ -62,7 +102,19 @@ def register_position_tools(mcp: FastMCP) -> None:
             endTime: End timestamp in milliseconds
             limit: Limit per page (max 100, default 50)
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            fields: Keep only these keys in each list item (e.g. ["symbol", "closedSize", "closedPnl"])
+            filters: Conditions every list item must meet (e.g. ["closedPnl < 0", "symbol ~ USDT$"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -closedPnl)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
         session = get_session()
         params: dict = {"category": category}
         for key, val in [
@@ -74,14 +126,14 @@ def register_position_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_closed_pnl(**params)
-        return format_result(result)
+        result = await call_paged(session.get_closed_pnl, params, page_limit(fetch_all, max_pages))
+        return format_result(query.apply(result), output_format)
 
     # --- Write position tools ---
 
     async def _set_leverage_impl(**kwargs: object) -> str:
         session = get_session()
-        result = session.set_leverage(**kwargs)
+        result = await call(session.set_leverage, **kwargs)
         return format_result(result)
 
     register_impl("set_leverage", _set_leverage_impl)
@@ -152,7 +204,7 @@ def register_position_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.set_trading_stop(**params)
+        result = await call(session.set_trading_stop, **params)
         return format_result(result)
 
     @mcp.tool(annotations=WRITE_DESTRUCTIVE)
@@ -175,5 +227,5 @@ def register_position_tools(mcp: FastMCP) -> None:
         params: dict = {"category": category, "symbol": symbol, "autoAddMargin": autoAddMargin}
         if positionIdx is not None:
             params["positionIdx"] = positionIdx
-        result = session.set_auto_add_margin(**params)
+        result = await call(session.set_auto_add_margin, **params)
         return format_result(result)
@@ -0,0 +1,130 @@
+"""WebSocket subscription tools (public market data and private account streams)."""
+
+import json
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+
+from bybit_mcp_server.accountmirror import account_mirror
+from bybit_mcp_server.client import format_payload, get_session, run_sync
+from bybit_mcp_server.marketstream import market_streams
+from bybit_mcp_server.orderbook import orderbook_engine
+from bybit_mcp_server.streams import stream_hub
+
+STREAM_CONTROL = ToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=True, openWorldHint=True)
+LOCAL_READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=False)
+
+
+def register_stream_tools(mcp: FastMCP) -> None:
+    @mcp.tool(annotations=STREAM_CONTROL)
+    async def subscribe_orderbook(category: str, symbol: str, depth: int | None = None) -> str:
+        """Keep a local order book for a symbol, updated from Bybit's WebSocket stream.
+
+        While subscribed, get_orderbook for this symbol (with limit up to depth) is served
+        locally without a REST request.
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            symbol: Symbol name (e.g. BTCUSDT)
+            depth: Stream depth (spot: 1, 50, 200; linear/inverse: 1, 50, 200, 500; option: 25, 100).
+                Defaults to 50 (25 for option).
+        """
+        try:
+            book = await run_sync(orderbook_engine.subscribe, category, symbol, depth)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        return format_payload(book.status())
+
+    @mcp.tool(annotations=STREAM_CONTROL)
+    async def unsubscribe_orderbook(category: str, symbol: str) -> str:
+        """Stop maintaining the local order book for a symbol.
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            symbol: Symbol name (e.g. BTCUSDT)
+        """
+        removed = await run_sync(orderbook_engine.unsubscribe, category, symbol)
+        return format_payload({"category": category, "symbol": symbol, "unsubscribed": removed})
+
+    @mcp.tool(annotations=STREAM_CONTROL)
+    async def subscribe_market_data(category: str, symbol: str, tickers: bool = True, trades: bool = True) -> str:
+        """Follow a symbol's ticker and public trades over Bybit's WebSocket stream.
+
+        While subscribed, get_tickers for this symbol and get_public_trades (up to
+        BYBIT_TRADE_BUFFER_SIZE trades) are served locally without a REST request.
+
+        Args:
+            category: Product type - spot, linear, inverse, option (option: tickers only)
+            symbol: Symbol name (e.g. BTCUSDT)
+            tickers: Keep the latest ticker
+            trades: Keep a buffer of recent public trades, seeded from REST
+        """
+        try:
+            await run_sync(market_streams.subscribe, category, symbol, tickers, trades)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        if trades:
+            await market_streams.seed_trades(get_session(), category, symbol)
+        status = market_streams.status()
+        return format_payload(
+            {
+                "ticker": next((t for t in status["tickers"] if t["symbol"] == symbol), None),
+                "trades": next((t for t in status["trades"] if t["symbol"] == symbol), None),
+            }
+        )
+
+    @mcp.tool(annotations=STREAM_CONTROL)
+    async def unsubscribe_market_data(category: str, symbol: str) -> str:
+        """Stop following a symbol's ticker and trades.
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            symbol: Symbol name (e.g. BTCUSDT)
+        """
+        removed = await run_sync(market_streams.unsubscribe, category, symbol)
+        return format_payload({"category": category, "symbol": symbol, "unsubscribed": removed})
+
+    @mcp.tool(annotations=STREAM_CONTROL)
+    async def start_account_stream(
+        categories: list[str] | None = None,
+        settleCoins: list[str] | None = None,
+        accountType: str = "UNIFIED",
+    ) -> str:
+        """Mirror open orders, positions, wallet balance and executions from Bybit's private stream.
+
+        The mirror is reconciled against REST on start, after every reconnect and every
+        BYBIT_MIRROR_RECONCILE_SECONDS. While it is connected and recently reconciled,
+        get_open_orders, get_positions, get_wallet_balance and get_trade_history are served
+        from it without a REST request, with a "mirror" block giving the data's age.
+
+        Args:
+            categories: Product types to mirror (default ["linear"])
+            settleCoins: Settle coins reconciled for linear/inverse (default ["USDT", "USDC"])
+            accountType: Wallet account type to mirror (default UNIFIED)
+        """
+        try:
+            await account_mirror.start(get_session(), categories, settleCoins, accountType)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        return format_payload(account_mirror.status())
+
+    @mcp.tool(annotations=STREAM_CONTROL)
+    async def stop_account_stream() -> str:
+        """Stop mirroring the account; reads go back to REST."""
+        account_mirror.stop()
+        return format_payload(account_mirror.status())
+
+    @mcp.tool(annotations=LOCAL_READ_ONLY)
+    async def get_stream_status() -> str:
+        """Get the state of WebSocket connections (connected, reconnect count, topics),
+        local order books (sync state, update id, level counts, resyncs), followed tickers
+        and trade buffers (fill level), and the account mirror (counts, reconciliations and
+        corrections), with seconds since each one's last update."""
+        return format_payload(
+            {
+                "connections": stream_hub.status(),
+                "orderbooks": orderbook_engine.status(),
+                **market_streams.status(),
+                "account": account_mirror.status(),
+            }
+        )
@@ -1,10 +1,17 @@
 """Trade tools (requires 'trade' permission mode for write operations)."""
 
+import json
+
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
-from bybit_mcp_server.client import format_result, get_session
+from bybit_mcp_server import idempotency
+from bybit_mcp_server.accountmirror import account_mirror
+from bybit_mcp_server.batch import run_batch
+from bybit_mcp_server.client import call_paged, format_payload, format_result, get_session, page_limit
+from bybit_mcp_server.config import OutputFormat
 from bybit_mcp_server.decorators import register_impl, require_confirmation, require_mode
+from bybit_mcp_server.filters import ListQuery
 
 READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=True)
 WRITE_DESTRUCTIVE = ToolAnnotations(readOnlyHint=False, destructiveHint=True, openWorldHint=True)
@@ -22,9 +29,19 @@ def register_trade_tools(mcp: FastMCP) -> None:
         orderLinkId: str | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query unfilled or partially filled orders.
 
+        While the account stream is running (start_account_stream), orders are served from
+        its mirror; the result then carries a "mirror" block with the data's age.
+
         Args:
             category: Product type - spot, linear, inverse, option
             symbol: Symbol name
@@ -33,7 +50,25 @@ def register_trade_tools(mcp: FastMCP) -> None:
             orderLinkId: User custom order ID
             limit: Limit per page (max 50, default 20)
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            fields: Keep only these keys in each list item (e.g. ["orderId", "symbol", "price"])
+            filters: Conditions every list item must meet (e.g. ["side == Buy", "symbol ^= BTC"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -createdTime)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        if baseCoin is None and cursor is None:
+            result = account_mirror.open_orders(
+                category, symbol, orderId, orderLinkId, limit, all_pages=page_limit(fetch_all, max_pages) is not None
+            )
+            if result is not None:
+                return format_result(query.apply(result), output_format)
         session = get_session()
         params: dict = {"category": category}
         for key, val in [
@@ -46,8 +81,8 @@ def register_trade_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_open_orders(**params)
-        return format_result(result)
+        result = await call_paged(session.get_open_orders, params, page_limit(fetch_all, max_pages))
+        return format_result(query.apply(result), output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_order_history(
@@ -58,6 +93,13 @@ def register_trade_tools(mcp: FastMCP) -> None:
         orderStatus: str | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query order history.
 
@@ -69,7 +111,19 @@ def register_trade_tools(mcp: FastMCP) -> None:
             orderStatus: Order status - New, PartiallyFilled, Filled, Cancelled, etc.
             limit: Limit per page (max 50, default 20)
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            fields: Keep only these keys in each list item (e.g. ["orderId", "symbol", "price"])
+            filters: Conditions every list item must meet (e.g. ["side == Buy", "symbol ^= BTC"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -createdTime)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
         session = get_session()
         params: dict = {"category": category}
         for key, val in [
@@ -82,8 +136,8 @@ def register_trade_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_order_history(**params)
-        return format_result(result)
+        result = await call_paged(session.get_order_history, params, page_limit(fetch_all, max_pages))
+        return format_result(query.apply(result), output_format)
 
     @mcp.tool(annotations=READ_ONLY)
     async def get_trade_history(
@@ -94,9 +148,19 @@ def register_trade_tools(mcp: FastMCP) -> None:
         endTime: int | None = None,
         limit: int | None = None,
         cursor: str | None = None,
+        fetch_all: bool = False,
+        max_pages: int | None = None,
+        fields: list[str] | None = None,
+        filters: list[str] | None = None,
+        sort_by: str | None = None,
+        top: int | None = None,
+        output_format: OutputFormat | None = None,
     ) -> str:
         """Query trade execution history.
 
+        While the account stream is running (start_account_stream), the latest executions
+        (no orderId, time range or cursor) are served from its mirror.
+
         Args:
             category: Product type - spot, linear, inverse, option
             symbol: Symbol name
@@ -105,7 +169,23 @@ def register_trade_tools(mcp: FastMCP) -> None:
             endTime: End timestamp in milliseconds
             limit: Limit per page (max 100, default 50)
             cursor: Pagination cursor
+            fetch_all: Follow nextPageCursor and merge all pages into one list (up to 50 pages)
+            max_pages: Follow nextPageCursor for at most this many pages (implies fetch_all)
+            fields: Keep only these keys in each list item (e.g. ["orderId", "symbol", "price"])
+            filters: Conditions every list item must meet (e.g. ["side == Buy", "symbol ^= BTC"]).
+                Operators: >, >=, <, <=, ==, != (numeric when both sides are numbers), ^= (prefix), ~ (regex)
+            sort_by: Sort the list by this field; prefix with - for descending (e.g. -createdTime)
+            top: Return only the first N list items after filtering and sorting
+            output_format: Response encoding - pretty, compact or table (default BYBIT_OUTPUT_FORMAT)
         """
+        try:
+            query = ListQuery(fields, filters, sort_by, top)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        if (orderId, startTime, endTime, cursor) == (None, None, None, None) and not page_limit(fetch_all, max_pages):
+            result = account_mirror.executions(category, symbol, limit)
+            if result is not None:
+                return format_result(query.apply(result), output_format)
         session = get_session()
         params: dict = {"category": category}
         for key, val in [
@@ -118,14 +198,17 @@ def register_trade_tools(mcp: FastMCP) -> None:
         ]:
             if val is not None:
                 params[key] = val
-        result = session.get_executions(**params)
-        return format_result(result)
+        result = await call_paged(session.get_executions, params, page_limit(fetch_all, max_pages))
+        return format_result(query.apply(result), output_format)
 
     # --- Write trade tools (require 'trade' mode) ---
 
     async def _place_order_impl(**kwargs: object) -> str:
         session = get_session()
-        result = session.place_order(**kwargs)
+        try:
+            result = await idempotency.place_order(session, kwargs)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
         return format_result(result)
 
     register_impl("place_order", _place_order_impl)
@@ -156,7 +239,9 @@ def register_trade_tools(mcp: FastMCP) -> None:
             qty: Order quantity (as string)
             price: Order price (required for Limit orders)
             timeInForce: Time in force - GTC, IOC, FOK, PostOnly
-            orderLinkId: User custom order ID
+            orderLinkId: User custom order ID (generated if omitted). An order with the
+                same orderLinkId is placed only once, so reuse it to retry safely; reusing
+                it for a different order within a day is an error.
             reduceOnly: Reduce only (true means close position)
             takeProfit: Take profit price
             stopLoss: Stop loss price
@@ -176,7 +261,7 @@ def register_trade_tools(mcp: FastMCP) -> None:
 
     async def _amend_order_impl(**kwargs: object) -> str:
         session = get_session()
-        result = session.amend_order(**kwargs)
+        result = await idempotency.amend_order(session, kwargs)
         return format_result(result)
 
     register_impl("amend_order", _amend_order_impl)
@@ -244,12 +329,12 @@ def register_trade_tools(mcp: FastMCP) -> None:
             params["orderId"] = orderId
         if orderLinkId:
             params["orderLinkId"] = orderLinkId
-        result = session.cancel_order(**params)
+        result = await idempotency.cancel_order(session, params)
         return format_result(result)
 
     async def _cancel_all_orders_impl(**kwargs: object) -> str:
         session = get_session()
-        result = session.cancel_all_orders(**kwargs)
+        result = await idempotency.submit_write(session.cancel_all_orders, kwargs)
         return format_result(result)
 
     register_impl("cancel_all_orders", _cancel_all_orders_impl)
@@ -276,3 +361,74 @@ def register_trade_tools(mcp: FastMCP) -> None:
             if val is not None:
                 params[key] = val
         return await _cancel_all_orders_impl(**params)
+
+    # --- Batch write tools: one confirmation covers every order in the batch ---
+
+    async def _run_batch(method_name: str, operation: str, category: str, orders: list[dict]) -> str:
+        if not orders:
+            return json.dumps({"error": "orders must not be empty"})
+        session = get_session()
+        return format_payload(await run_batch(getattr(session, method_name), operation, category, orders))
+
+    async def _place_batch_order_impl(category: str, orders: list[dict]) -> str:
+        return await _run_batch("place_batch_order", "place", category, orders)
+
+    register_impl("place_batch_order", _place_batch_order_impl)
+
+    @mcp.tool(annotations=WRITE_DESTRUCTIVE)
+    @require_mode("trade")
+    @require_confirmation
+    async def place_batch_order(category: str, orders: list[dict]) -> str:
+        """Place several orders at once (HIGH risk - one confirmation for the whole batch).
+
+        Orders are sent concurrently in requests of up to 20 (10 for spot). Each order
+        gets its own result, in input order, with success, code and msg.
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            orders: Orders with place_order's fields, e.g. [{"symbol": "BTCUSDT", "side": "Buy",
+                "orderType": "Limit", "qty": "0.001", "price": "50000"}]
+        """
+        return await _place_batch_order_impl(category=category, orders=orders)
+
+    async def _amend_batch_order_impl(category: str, orders: list[dict]) -> str:
+        return await _run_batch("amend_batch_order", "amend", category, orders)
+
+    register_impl("amend_batch_order", _amend_batch_order_impl)
+
+    @mcp.tool(annotations=WRITE_DESTRUCTIVE)
+    @require_mode("trade")
+    @require_confirmation
+    async def amend_batch_order(category: str, orders: list[dict]) -> str:
+        """Amend several orders at once (HIGH risk - one confirmation for the whole batch).
+
+        Orders are sent concurrently in requests of up to 20 (10 for spot). Each order
+        gets its own result, in input order, with success, code and msg.
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            orders: Amendments with amend_order's fields; each needs symbol and orderId or
+                orderLinkId, e.g. [{"symbol": "BTCUSDT", "orderId": "...", "price": "51000"}]
+        """
+        return await _amend_batch_order_impl(category=category, orders=orders)
+
+    async def _cancel_batch_order_impl(category: str, orders: list[dict]) -> str:
+        return await _run_batch("cancel_batch_order", "cancel", category, orders)
+
+    register_impl("cancel_batch_order", _cancel_batch_order_impl)
+
+    @mcp.tool(annotations=WRITE_DESTRUCTIVE)
+    @require_mode("trade")
+    @require_confirmation
+    async def cancel_batch_order(category: str, orders: list[dict]) -> str:
+        """Cancel several orders at once (HIGH risk - one confirmation for the whole batch).
+
+        Orders are sent concurrently in requests of up to 20 (10 for spot). Each order
+        gets its own result, in input order, with success, code and msg.
+
+        Args:
+            category: Product type - spot, linear, inverse, option
+            orders: Orders to cancel, each with symbol and orderId or orderLinkId,
+                e.g. [{"symbol": "BTCUSDT", "orderId": "..."}]
+        """
+        return await _cancel_batch_order_impl(category=category, orders=orders)
@@ -0,0 +1,306 @@
+"""Opt-in span tracing from MCP tool dispatch down to each pybit HTTP request.
+
+Spans nest through a context variable, so a span opened inside another (also across
+await points and client.run_sync worker threads) becomes its child. With no exporter
+configured, span() returns a shared no-op object and tracing costs one attribute check.
+
+Exporters: "console" writes one line per span to stderr (stdout carries the stdio MCP
+protocol), "json" appends JSON lines to a file, and "otlp" posts batches to an
+OpenTelemetry collector using OTLP/HTTP with JSON encoding, so no extra dependency
+is needed.
+"""
+
+import contextvars
+import json
+import random
+import sys
+import threading
+import time
+import urllib.request
+from typing import Any, Protocol, TextIO
+
+from bybit_mcp_server.config import get_settings
+
+SERVICE_NAME = "bybit-mcp-server"
+
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("bybit_mcp_span", default=None)
+
+
+class Exporter(Protocol):
+    def export(self, span: "Span") -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+_exporter: Exporter | None = None
+
+
+class Span:
+    """One timed stage. Use as a context manager; attributes can be added until it ends."""
+
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, name: str, attributes: dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = ""
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id: str | None = None
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+        else:
+            self.trace_id, self.parent_id = parent.trace_id, parent.span_id
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        exporter = _exporter
+        if exporter is not None:
+            exporter.export(self)
+        return False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "start": self.start_ns,
+            "durationMs": round(self.duration_ms, 3),
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """A span named name, child of the current span, or a no-op when tracing is off."""
+    if _exporter is None:
+        return _NOOP
+    return Span(name, attributes)
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+class ConsoleExporter:
+    """One readable line per span, written when the span ends."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stderr
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        status = f" error={span.error!r}" if span.error else ""
+        attributes = f" {json.dumps(span.attributes, default=str)}" if span.attributes else ""
+        line = (
+            f"[trace {span.trace_id[:8]}] {span.name} {span.duration_ms:.3f} ms "
+            f"span={span.span_id} parent={span.parent_id or '-'}{status}{attributes}\n"
+        )
+        with self._lock:
+            self.stream.write(line)
+            self.stream.flush()
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonFileExporter:
+    """Appends each span to a file as one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_span(span: Span) -> dict[str, Any]:
+    """A span in OTLP/JSON form (ids are hex, times are nanosecond strings)."""
+    payload: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        payload["parentSpanId"] = span.parent_id
+    return payload
+
+
+class OtlpExporter:
+    """Batches spans and posts them to an OTLP/HTTP endpoint from a background thread.
+
+    Spans are dropped, and counted, when the collector is unreachable or the queue is full,
+    so a missing collector never slows tool calls down.
+    """
+
+    def __init__(
+        self, endpoint: str, interval: float = 1.0, batch_size: int = 512, max_queue: int = 8192, timeout: float = 5.0
+    ):
+        self.endpoint = endpoint
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.exported = 0
+        self.dropped = 0
+        self._queue: list[Span] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="bybit-otlp", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                return
+            self._queue.append(span)
+            if len(self._queue) >= self.batch_size:
+                self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        while True:
+            with self._lock:
+                batch, self._queue = self._queue[: self.batch_size], self._queue[self.batch_size :]
+            if not batch:
+                return
+            body = {
+                "resourceSpans": [
+                    {
+                        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                        "scopeSpans": [{"scope": {"name": "bybit_mcp_server"}, "spans": [otlp_span(s) for s in batch]}],
+                    }
+                ]
+            }
+            request = urllib.request.Request(
+                self.endpoint,
+                data=json.dumps(body, default=str).encode(),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout):
+                    pass
+                self.exported += len(batch)
+            except OSError:
+                self.dropped += len(batch)
+
+    def shutdown(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(self.timeout)
+        self.flush()
+
+
+class MemoryExporter:
+    """Keeps finished spans in a list, for tests and ad-hoc inspection."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def names(self) -> list[str]:
+        return [span.name for span in self.spans]
+
+    def shutdown(self) -> None:
+        pass
+
+
+def set_exporter(exporter: Exporter | None) -> Exporter | None:
+    """Replace the exporter (None turns tracing off) and return the previous one."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+def configure_tracing() -> Exporter | None:
+    """Install the exporter named by BYBIT_TRACE_EXPORTER, if any."""
+    settings = get_settings()
+    kind = settings.trace_exporter
+    if kind == "console":
+        exporter: Exporter | None = ConsoleExporter()
+    elif kind == "json":
+        exporter = JsonFileExporter(settings.trace_file)
+    elif kind == "otlp":
+        exporter = OtlpExporter(settings.otlp_endpoint)
+    else:
+        exporter = None
+    set_exporter(exporter)
+    return exporter
+
+
+def shutdown_tracing() -> None:
+    """Flush and remove the exporter."""
+    exporter = set_exporter(None)
+    if exporter is not None:
+        exporter.shutdown()
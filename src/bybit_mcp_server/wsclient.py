@@ -0,0 +1,91 @@
+"""pybit's WebSocket client with an overridable host and reconnects on every dropped connection.
+
+Kept apart from streams so that pybit's WebSocket stack is imported only when the
+first stream opens.
+"""
+
+import logging
+import threading
+import time
+from typing import Any
+
+import websocket
+from pybit.unified_trading import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the connection dropped, as opposed to a bug in a callback.
+DISCONNECT_ERRORS = (websocket.WebSocketConnectionClosedException, websocket.WebSocketTimeoutException, OSError)
+
+# Backoff between reconnect attempts, in seconds.
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+class BybitWebSocket(WebSocket):
+    """pybit's WebSocket with an overridable host and reconnects on every dropped connection.
+
+    pybit reconnects only after some errors and not when the server closes the
+    connection cleanly. Here any close not asked for through close() starts a
+    reconnect loop with exponential backoff; pybit re-sends its recorded
+    subscriptions once connected.
+    """
+
+    def __init__(self, channel_type: str, base_url: str | None = None, **kwargs: Any):
+        self.base_url = base_url
+        self.reconnects = 0
+        self.closed = False
+        self._reconnecting = threading.Lock()
+        super().__init__(channel_type, **kwargs)
+
+    def _connect(self, url: str) -> None:
+        if self.base_url and "{SUBDOMAIN}" in url:
+            url = self.base_url + url[url.index("/v5/") :]
+        super()._connect(url)
+
+    def _on_close(self) -> None:
+        super()._on_close()
+        self._schedule_reconnect()
+
+    def _on_error(self, error: Exception) -> None:
+        if not isinstance(error, DISCONNECT_ERRORS):
+            super()._on_error(error)
+            return
+        logger.warning("WebSocket %s (%s) dropped: %s", self.ws_name, self.endpoint, error)
+        self._schedule_reconnect()
+
+    def _send_custom_ping(self) -> None:
+        # pybit's ping timer outlives the connection it was started for.
+        if self.is_connected():
+            super()._send_custom_ping()
+
+    def _schedule_reconnect(self) -> None:
+        if self.closed or self.attempting_connection or not self._reconnecting.acquire(blocking=False):
+            return
+        previous = self.wst
+        threading.Thread(
+            target=self._reconnect, args=(previous,), name=f"{self.ws_name} reconnect", daemon=True
+        ).start()
+
+    def _reconnect(self, previous: threading.Thread) -> None:
+        try:
+            # Let the dropped connection's thread finish so is_connected() reflects it.
+            previous.join(timeout=5)
+            delay = RECONNECT_DELAY
+            while not self.closed and not self.is_connected():
+                try:
+                    self._reset()
+                    self._connect(self.endpoint)
+                except websocket.WebSocketException as e:
+                    logger.warning("WebSocket %s reconnect failed, retrying in %.0fs: %s", self.ws_name, delay, e)
+                    time.sleep(delay)
+                    delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                else:
+                    self.reconnects += 1
+        finally:
+            self._reconnecting.release()
+
+    def close(self) -> None:
+        """Disconnect for good."""
+        self.closed = True
+        self.exit()
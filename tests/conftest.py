@@ -1,9 +1,60 @@
 """Test fixtures for bybit-mcp tests."""
 
+import base64
+import contextlib
+import hashlib
+import json
+import re
+import socket
+import struct
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from bybit_mcp_server.accountmirror import account_mirror
+from bybit_mcp_server.cache import market_cache
+from bybit_mcp_server.config import reload_settings
+from bybit_mcp_server.idempotency import write_ledger
+from bybit_mcp_server.instruments import instrument_registry
+from bybit_mcp_server.marketstream import market_streams
+from bybit_mcp_server.metrics import server_metrics
+from bybit_mcp_server.orderbook import orderbook_engine
+from bybit_mcp_server.ratelimit import rate_limiter
+from bybit_mcp_server.resilience import breakers
+from bybit_mcp_server.streams import StreamHub
+
+
+@pytest.fixture(autouse=True)
+def reload_settings_on_env_change(monkeypatch):
+    """Settings are read once per process; reload them whenever a test sets or removes a variable."""
+    for name in ("setenv", "delenv"):
+
+        def changed(*args, _change=getattr(monkeypatch, name), **kwargs):
+            _change(*args, **kwargs)
+            reload_settings()
+
+        monkeypatch.setattr(monkeypatch, name, changed)
+    reload_settings()
+
+
+@pytest.fixture(autouse=True)
+def clear_market_cache():
+    """Keep caches, instrument indexes, rate budgets, metrics, placed orders and breakers from leaking between tests."""
+    market_cache.clear()
+    instrument_registry.clear()
+    rate_limiter.clear()
+    server_metrics.clear()
+    write_ledger.clear()
+    breakers.clear()
+    yield
+    market_cache.clear()
+    instrument_registry.clear()
+    rate_limiter.clear()
+    server_metrics.clear()
+    write_ledger.clear()
+    breakers.clear()
+
 
 @pytest.fixture
 def mock_session():
@@ -167,6 +218,7 @@ def patch_session(mock_session):
         "bybit_mcp_server.tools.trade.get_session",
         "bybit_mcp_server.tools.position.get_session",
         "bybit_mcp_server.tools.asset.get_session",
+        "bybit_mcp_server.tools.streams.get_session",
     ]
     patches = [patch(t, return_value=mock_session) for t in targets]
     for p in patches:
@@ -174,3 +226,176 @@ def patch_session(mock_session):
     yield mock_session
     for p in patches:
         p.stop()
+
+
+class FakeWebSocket:
+    """Stands in for pybit's WebSocket: records subscriptions and sent frames."""
+
+    def __init__(self, channel_type, testnet, callback_function, **kwargs):
+        self.channel_type = channel_type
+        self.callback = callback_function
+        self.connected = True
+        self.subscribed: list[str] = []
+        self.unsubscribed: list[str] = []
+        self.sent: list[dict] = []
+        self.reconnects = 0
+        self.ws = self
+
+    def subscribe(self, topic, callback, symbol):
+        self.subscribed.append(topic)
+
+    def unsubscribe(self, topic):
+        self.unsubscribed.append(topic)
+
+    def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+@pytest.fixture
+def fake_streams(monkeypatch):
+    """A StreamHub on FakeWebSocket, installed in every stream consumer and the stream tools."""
+    hub = StreamHub(factory=FakeWebSocket)
+    monkeypatch.setattr(orderbook_engine, "hub", hub)
+    monkeypatch.setattr(market_streams, "hub", hub)
+    monkeypatch.setattr(account_mirror, "hub", hub)
+    monkeypatch.setattr("bybit_mcp_server.tools.streams.stream_hub", hub)
+    yield hub
+    orderbook_engine.clear()
+    market_streams.clear()
+    account_mirror.stop()
+
+
+class FakeStreamServer:
+    """A local WebSocket server speaking enough of Bybit's public stream protocol for pybit.
+
+    Acknowledges subscribe/unsubscribe requests, answers pings, and lets tests push
+    messages to every client or drop all connections.
+    """
+
+    GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+    def __init__(self):
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.url = f"ws://127.0.0.1:{self._server.getsockname()[1]}"
+        self.clients: list[socket.socket] = []
+        self.requests: list[dict] = []
+        self.connections = 0
+        self.changed = threading.Condition()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return
+            request += chunk
+        key = re.search(rb"Sec-WebSocket-Key: *(\S+)", request, re.IGNORECASE).group(1)
+        accept = base64.b64encode(hashlib.sha1(key + self.GUID).digest())
+        conn.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        with self.changed:
+            self.clients.append(conn)
+            self.connections += 1
+            self.changed.notify_all()
+        with contextlib.suppress(OSError, ConnectionError):
+            while True:
+                opcode, payload = self._read_frame(conn)
+                if opcode == 8:
+                    break
+                if opcode == 9:
+                    self._send_frame(conn, 10, payload)
+                elif opcode == 1:
+                    self._handle(conn, json.loads(payload))
+        with self.changed:
+            if conn in self.clients:
+                self.clients.remove(conn)
+            self.changed.notify_all()
+        conn.close()
+
+    def _handle(self, conn, message):
+        op = message.get("op")
+        if op == "ping":
+            self._send_frame(conn, 1, json.dumps({"success": True, "ret_msg": "pong", "op": "pong"}).encode())
+            return
+        with self.changed:
+            self.requests.append(message)
+            self.changed.notify_all()
+        ack = {"success": True, "ret_msg": "", "op": op, "conn_id": "fake"}
+        if "req_id" in message:
+            ack["req_id"] = message["req_id"]
+        self._send_frame(conn, 1, json.dumps(ack).encode())
+
+    @staticmethod
+    def _recv_exact(conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("client closed")
+            data += chunk
+        return data
+
+    def _read_frame(self, conn):
+        first, second = self._recv_exact(conn, 2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._recv_exact(conn, 2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._recv_exact(conn, 8))
+        mask = self._recv_exact(conn, 4) if second & 0x80 else b"\0\0\0\0"
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(conn, length)))
+        return first & 0x0F, payload
+
+    @staticmethod
+    def _send_frame(conn, opcode, payload):
+        if len(payload) < 126:
+            header = struct.pack("!BB", 0x80 | opcode, len(payload))
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, len(payload))
+        conn.sendall(header + payload)
+
+    def push(self, message):
+        payload = json.dumps(message).encode()
+        for conn in list(self.clients):
+            self._send_frame(conn, 1, payload)
+
+    def drop(self):
+        """Cut every client connection without a close handshake."""
+        for conn in list(self.clients):
+            conn.shutdown(socket.SHUT_RDWR)
+
+    def wait_for(self, predicate, timeout=5.0):
+        with self.changed:
+            assert self.changed.wait_for(predicate, timeout), "timed out waiting for the fake stream server"
+
+    def close(self):
+        self._server.close()
+        for conn in list(self.clients):
+            with contextlib.suppress(OSError):
+                conn.close()
+
+
+@pytest.fixture
+def stream_server(monkeypatch):
+    """A FakeStreamServer with BYBIT_WS_URL pointing at it."""
+    server = FakeStreamServer()
+    monkeypatch.setenv("BYBIT_WS_URL", server.url)
+    yield server
+    server.close()
@@ -42,3 +42,9 @@ class TestGetAccountInfo:
         result = await mcp_app.call_tool("get_account_info", {})
         data = json.loads(result[0][0].text)
         assert "marginMode" in data
+
+    @pytest.mark.asyncio
+    async def test_compact(self, mcp_app, patch_session):
+        result = await mcp_app.call_tool("get_account_info", {"output_format": "compact"})
+        assert "\n" not in result[0][0].text
+        assert "marginMode" in json.loads(result[0][0].text)
@@ -0,0 +1,225 @@
+"""Tests for the private stream account mirror."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from bybit_mcp_server.accountmirror import MAX_RECONCILE_AGE, AccountMirror, _merge
+from bybit_mcp_server.config import get_settings
+from bybit_mcp_server.tools.account import register_account_tools
+from bybit_mcp_server.tools.position import register_position_tools
+from bybit_mcp_server.tools.streams import register_stream_tools
+from bybit_mcp_server.tools.trade import register_trade_tools
+
+
+def order(order_id, status="New", symbol="BTCUSDT", created="1"):
+    return {"orderId": order_id, "symbol": symbol, "orderStatus": status, "createdTime": created, "orderLinkId": ""}
+
+
+def page(items, category="linear"):
+    return {"retCode": 0, "retMsg": "OK", "result": {"category": category, "list": items, "nextPageCursor": ""}}
+
+
+def push(hub, topic, data):
+    hub.get("private")._on_message({"topic": topic, "creationTime": 1, "data": data})
+
+
+@pytest.fixture
+def api_keys(monkeypatch):
+    monkeypatch.setenv("BYBIT_API_KEY", "key")
+    monkeypatch.setenv("BYBIT_API_SECRET", "secret")
+
+
+@pytest.fixture
+async def mirror(fake_streams, mock_session, api_keys, monkeypatch):
+    monkeypatch.setenv("BYBIT_MIRROR_RECONCILE_SECONDS", "3600")
+    mirror = AccountMirror(fake_streams)
+    mock_session.get_open_orders.return_value = page([order("1")])
+    await mirror.start(mock_session, ["linear"], ["USDT"])
+    yield mirror
+    mirror.stop()
+
+
+class TestMerge:
+    def test_snapshot_replaces_old_entries(self):
+        current = {"a": (1.0, {"live": True}), "b": (1.0, {"live": True})}
+        corrections = _merge(current, {"a": {"live": True}}, 2.0, lambda key: True, lambda item: item["live"])
+        assert current == {"a": (2.0, {"live": True})}
+        assert corrections == 1
+
+    def test_keeps_updates_newer_than_snapshot(self):
+        current = {"a": (3.0, {"live": False}), "b": (3.0, {"live": True})}
+        _merge(current, {"a": {"live": True}}, 2.0, lambda key: True, lambda item: item["live"])
+        assert current == {"a": (3.0, {"live": False}), "b": (3.0, {"live": True})}
+
+    def test_out_of_scope_untouched(self):
+        current = {"x": (1.0, {"live": True})}
+        _merge(current, {}, 2.0, lambda key: key != "x", lambda item: True)
+        assert "x" in current
+
+
+class TestAccountMirror:
+    @pytest.mark.asyncio
+    async def test_requires_keys(self, fake_streams, mock_session, monkeypatch):
+        monkeypatch.delenv("BYBIT_API_KEY", raising=False)
+        with pytest.raises(ValueError):
+            await AccountMirror(fake_streams).start(mock_session)
+
+    @pytest.mark.asyncio
+    async def test_start_subscribes_and_reconciles(self, mirror, fake_streams, mock_session):
+        assert fake_streams.get("private").topics() == ["execution", "order", "position", "wallet"]
+        mock_session.get_open_orders.assert_called_once_with(category="linear", settleCoin="USDT", limit=50)
+        result = mirror.open_orders("linear")["result"]
+        assert [o["orderId"] for o in result["list"]] == ["1"]
+        assert result["mirror"]["source"] == "private stream"
+
+    @pytest.mark.asyncio
+    async def test_stream_updates_orders(self, mirror, fake_streams):
+        push(fake_streams, "order", [{**order("2", created="2"), "category": "linear"}])
+        assert [o["orderId"] for o in mirror.open_orders("linear")["result"]["list"]] == ["2", "1"]
+        push(fake_streams, "order", [{**order("1", status="Filled"), "category": "linear"}])
+        assert [o["orderId"] for o in mirror.open_orders("linear")["result"]["list"]] == ["2"]
+
+    @pytest.mark.asyncio
+    async def test_reconcile_corrects_drift(self, mirror, mock_session):
+        mock_session.get_open_orders.return_value = page([order("1"), order("3")])
+        await mirror.reconcile(mock_session)
+        assert mirror.corrections == 1
+        assert {o["orderId"] for o in mirror.open_orders("linear")["result"]["list"]} == {"1", "3"}
+
+    @pytest.mark.asyncio
+    async def test_update_during_reconcile_wins(self, mirror, fake_streams, mock_session):
+        def snapshot(**params):
+            # The order fills while the snapshot that still lists it is in flight.
+            push(fake_streams, "order", [{**order("1", status="Filled"), "category": "linear"}])
+            return page([order("1")])
+
+        mock_session.get_open_orders.side_effect = snapshot
+        await mirror.reconcile(mock_session)
+        assert mirror.open_orders("linear")["result"]["list"] == []
+
+    @pytest.mark.asyncio
+    async def test_positions_and_wallet(self, mirror, fake_streams):
+        push(fake_streams, "position", [{"category": "linear", "symbol": "BTCUSDT", "positionIdx": 0, "size": "1"}])
+        push(
+            fake_streams,
+            "wallet",
+            [{"accountType": "UNIFIED", "coin": [{"coin": "BTC"}, {"coin": "USDT"}]}],
+        )
+        assert mirror.positions("linear")["result"]["list"][0]["size"] == "1"
+        assert mirror.positions("linear", settle_coin="USDC") is None
+        assert mirror.wallet("UNIFIED", "USDT")["result"]["list"][0]["coin"] == [{"coin": "USDT"}]
+
+    @pytest.mark.asyncio
+    async def test_positions_filtered_by_settle_coin(self, fake_streams, mock_session, api_keys):
+        held = {
+            "USDT": [{"symbol": "BTCUSDT", "positionIdx": 0, "size": "1"}],
+            "USDC": [{"symbol": "BTCPERP", "positionIdx": 0, "size": "2"}],
+        }
+        mock_session.get_positions.side_effect = lambda **params: page(held[params["settleCoin"]])
+        mirror = AccountMirror(fake_streams)
+        await mirror.start(mock_session, ["linear"], ["USDT", "USDC"])
+
+        def symbols(coin):
+            return [position["symbol"] for position in mirror.positions("linear", settle_coin=coin)["result"]["list"]]
+
+        try:
+            assert symbols("USDT") == ["BTCUSDT"]
+            assert symbols("USDC") == ["BTCPERP"]
+            assert symbols(None) == ["BTCPERP", "BTCUSDT"]
+            # Opened since the last reconciliation: its settle coin is unknown, so REST answers.
+            push(fake_streams, "position", [{"category": "linear", "symbol": "ETHPERP", "positionIdx": 0, "size": "1"}])
+            assert mirror.positions("linear", settle_coin="USDT") is None
+        finally:
+            mirror.stop()
+
+    @pytest.mark.asyncio
+    async def test_stops_when_account_changes_on_reload(self, mirror, monkeypatch):
+        monkeypatch.setenv("BYBIT_OUTPUT_FORMAT", "compact")
+        mirror.reconfigure(get_settings())
+        assert mirror.running
+        monkeypatch.setenv("BYBIT_API_KEY", "other-key")
+        mirror.reconfigure(get_settings())
+        assert not mirror.running
+        assert mirror.open_orders("linear") is None
+
+    @pytest.mark.asyncio
+    async def test_reconciles_with_current_session(self, fake_streams, mock_session, api_keys, monkeypatch):
+        monkeypatch.setenv("BYBIT_MIRROR_RECONCILE_SECONDS", "0.01")
+        current = MagicMock()
+        current.get_open_orders.return_value = page([])
+        monkeypatch.setattr("bybit_mcp_server.accountmirror.get_session", lambda: current)
+        mirror = AccountMirror(fake_streams)
+        await mirror.start(mock_session, ["spot"])
+        try:
+            await asyncio.sleep(0.1)
+            assert current.get_open_orders.called
+        finally:
+            mirror.stop()
+
+    @pytest.mark.asyncio
+    async def test_not_served_when_stale(self, mirror, fake_streams):
+        assert mirror.open_orders("spot") is None
+        fake_streams.get("private")._ws.reconnects = 1
+        assert mirror.open_orders("linear") is None
+        fake_streams.get("private")._ws.reconnects = 0
+        mirror._reconciled_at -= MAX_RECONCILE_AGE * mirror.interval + 1
+        assert mirror.open_orders("linear") is None
+
+    @pytest.mark.asyncio
+    async def test_executions_need_enough_history(self, mirror, fake_streams):
+        push(fake_streams, "execution", [{"category": "linear", "symbol": "BTCUSDT", "execId": "e", "execTime": "5"}])
+        assert mirror.executions("linear", limit=1)["result"]["list"][0]["execId"] == "e"
+
+
+class TestTools:
+    @pytest.fixture
+    def mcp_app(self, patch_session, fake_streams, api_keys, monkeypatch):
+        monkeypatch.setenv("BYBIT_MIRROR_RECONCILE_SECONDS", "3600")
+        app = FastMCP("test")
+        register_trade_tools(app)
+        register_position_tools(app)
+        register_account_tools(app)
+        register_stream_tools(app)
+        return app
+
+    @pytest.mark.asyncio
+    async def test_reads_served_from_mirror(self, mcp_app, patch_session):
+        patch_session.get_open_orders.return_value = page([order("1")])
+        result = await mcp_app.call_tool("start_account_stream", {})
+        assert json.loads(result[0][0].text)["served"] is True
+        patch_session.get_open_orders.reset_mock()
+
+        result = await mcp_app.call_tool("get_open_orders", {"category": "linear", "fields": ["orderId"]})
+        data = json.loads(result[0][0].text)
+        assert data["list"] == [{"orderId": "1"}]
+        assert "lastReconcileAge" in data["mirror"]
+        result = await mcp_app.call_tool("get_wallet_balance", {"accountType": "UNIFIED"})
+        assert json.loads(result[0][0].text)["list"][0]["accountType"] == "UNIFIED"
+        patch_session.get_open_orders.assert_not_called()
+        patch_session.get_wallet_balance.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cursor_goes_to_rest(self, mcp_app, patch_session):
+        await mcp_app.call_tool("start_account_stream", {})
+        patch_session.get_open_orders.reset_mock()
+        await mcp_app.call_tool("get_open_orders", {"category": "linear", "cursor": "abc"})
+        patch_session.get_open_orders.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stop(self, mcp_app, patch_session):
+        await mcp_app.call_tool("start_account_stream", {})
+        result = await mcp_app.call_tool("stop_account_stream", {})
+        assert json.loads(result[0][0].text)["running"] is False
+        patch_session.get_positions.reset_mock()
+        await mcp_app.call_tool("get_positions", {"category": "linear"})
+        patch_session.get_positions.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_keys(self, mcp_app, monkeypatch):
+        monkeypatch.delenv("BYBIT_API_SECRET")
+        result = await mcp_app.call_tool("start_account_stream", {})
+        assert "error" in json.loads(result[0][0].text)
@@ -0,0 +1,87 @@
+"""Tests for analytics module."""
+
+import math
+import random
+
+import pytest
+
+from bybit_mcp_server.analytics import INDICATORS, ema_last, summarize, true_range
+
+np = pytest.importorskip("numpy")
+
+MINUTE = 60_000
+
+
+def make_bars(count, seed=1):
+    """Random-walk klines in Bybit's row format, oldest first."""
+    rng = random.Random(seed)
+    bars, close = [], 100.0
+    for i in range(count):
+        open_ = close
+        close = open_ * math.exp(rng.gauss(0, 0.01))
+        high = max(open_, close) * (1 + rng.random() * 0.005)
+        low = min(open_, close) * (1 - rng.random() * 0.005)
+        volume = rng.uniform(1, 10)
+        bars.append([str(i * MINUTE), str(open_), str(high), str(low), str(close), str(volume), str(volume * close)])
+    return bars
+
+
+def ema_loop(values, alpha, seed):
+    ema = sum(values[:seed]) / seed
+    for value in values[seed:]:
+        ema = alpha * value + (1 - alpha) * ema
+    return ema
+
+
+class TestEmaLast:
+    @pytest.mark.parametrize("count", [14, 15, 100, 5000])
+    def test_matches_recursion(self, count):
+        values = [random.Random(count).uniform(90, 110) for _ in range(count)]
+        expected = ema_loop(values, 2 / 15, 14)
+        assert ema_last(np.array(values), 2 / 15, 14) == pytest.approx(expected, rel=1e-12)
+
+    def test_alpha_one_is_last_value(self):
+        assert ema_last(np.array([1.0, 2.0, 3.0]), 1.0, 1) == 3.0
+
+
+class TestTrueRange:
+    def test_uses_previous_close(self):
+        high, low, close = np.array([10.0, 12.0, 9.0]), np.array([8.0, 11.0, 7.0]), np.array([9.0, 11.5, 8.0])
+        assert true_range(high, low, close).tolist() == [2.0, 3.0, 4.5]
+
+
+class TestSummarize:
+    def test_matches_plain_python(self):
+        bars = make_bars(1000)
+        summary = summarize(bars, MINUTE, INDICATORS, 14)
+        rows = [[float(x) for x in bar] for bar in bars]
+        closes = [row[4] for row in rows]
+        log_returns = [math.log(b / a) for a, b in zip(closes, closes[1:])]
+        mean = sum(log_returns) / len(log_returns)
+        std = math.sqrt(sum((r - mean) ** 2 for r in log_returns) / (len(log_returns) - 1))
+        ranges = [rows[0][2] - rows[0][3]] + [
+            max(row[2], prev[4]) - min(row[3], prev[4]) for prev, row in zip(rows, rows[1:])
+        ]
+        typical_volume = sum((row[2] + row[3] + row[4]) / 3 * row[5] for row in rows)
+
+        assert summary["count"] == 1000
+        assert (summary["first"], summary["last"]) == (0, 999 * MINUTE)
+        assert summary["returns"]["total"] == pytest.approx(closes[-1] / rows[0][1] - 1)
+        assert summary["returns"]["meanLog"] == pytest.approx(mean)
+        assert summary["vwap"] == pytest.approx(typical_volume / sum(row[5] for row in rows))
+        assert summary["atr"] == pytest.approx(ema_loop(ranges, 1 / 14, 14))
+        assert summary["ema"] == pytest.approx(ema_loop(closes, 2 / 15, 14))
+        assert summary["volatility"]["perBar"] == pytest.approx(std)
+        assert summary["volatility"]["annualized"] == pytest.approx(std * math.sqrt(365 * 24 * 60))
+
+    def test_only_requested(self):
+        summary = summarize(make_bars(20), MINUTE, ("vwap",), 14)
+        assert set(summary) == {"count", "first", "last", "close", "vwap"}
+
+    def test_short_series_nulls(self):
+        summary = summarize(make_bars(2), MINUTE, INDICATORS, 14)
+        assert summary["atr"] is None and summary["ema"] is None and summary["volatility"] is None
+        assert summary["returns"]["lastLog"] is not None
+
+    def test_empty(self):
+        assert summarize([], MINUTE, ("ema", "vwap"), 14) == {"count": 0, "ema": None, "vwap": None}
@@ -5,7 +5,7 @@ import json
 import pytest
 from mcp.server.fastmcp import FastMCP
 
-from bybit_mcp_server.decorators import _pending_confirmations
+from bybit_mcp_server.confirmations import get_confirmation_store
 from bybit_mcp_server.tools.asset import register_asset_tools
 
 
@@ -18,9 +18,9 @@ def mcp_app(patch_session):
 
 @pytest.fixture(autouse=True)
 def clear_pending():
-    _pending_confirmations.clear()
+    get_confirmation_store().clear()
     yield
-    _pending_confirmations.clear()
+    get_confirmation_store().clear()
 
 
 class TestGetCoinBalance:
@@ -30,6 +30,13 @@ class TestGetCoinBalance:
         data = json.loads(result[0][0].text)
         assert "accountType" in data
 
+    @pytest.mark.asyncio
+    async def test_compact(self, mcp_app, patch_session):
+        args = {"accountType": "UNIFIED", "output_format": "compact"}
+        result = await mcp_app.call_tool("get_coin_balance", args)
+        assert "\n" not in result[0][0].text
+        assert "accountType" in json.loads(result[0][0].text)
+
 
 class TestGetCoinInfo:
     @pytest.mark.asyncio
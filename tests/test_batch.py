@@ -0,0 +1,89 @@
+"""Tests for batch order requests."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bybit_mcp_server.batch import check_order, chunks, run_batch
+
+
+def batch_response(request):
+    return {
+        "retCode": 0,
+        "retMsg": "OK",
+        "result": {"list": [{"symbol": order["symbol"], "orderId": f"id-{order['qty']}"} for order in request]},
+        "retExtInfo": {"list": [{"code": 0, "msg": "OK"} for _ in request]},
+    }
+
+
+def orders(count):
+    return [{"symbol": "BTCUSDT", "side": "Buy", "orderType": "Market", "qty": str(i)} for i in range(count)]
+
+
+class TestCheckOrder:
+    def test_valid(self):
+        assert check_order("cancel", {"symbol": "BTCUSDT", "orderLinkId": "a"}) is None
+
+    def test_missing_key(self):
+        assert check_order("cancel", {"symbol": "BTCUSDT"}) == "Missing orderId or orderLinkId"
+
+    def test_not_an_object(self):
+        assert check_order("place", "BTCUSDT") == "Each order must be an object"
+
+
+class TestChunks:
+    def test_splits(self):
+        assert chunks([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+
+
+class TestRunBatch:
+    @pytest.mark.asyncio
+    async def test_chunks_to_category_limit(self):
+        method = MagicMock(side_effect=lambda category, request: batch_response(request))
+        result = await run_batch(method, "place", "spot", orders(25))
+        assert [len(c.kwargs["request"]) for c in method.call_args_list] == [10, 10, 5]
+        assert result["requests"] == 3
+        assert result["succeeded"] == 25
+        assert [r["orderId"] for r in result["list"]] == [f"id-{i}" for i in range(25)]
+
+    @pytest.mark.asyncio
+    async def test_per_order_status(self):
+        def respond(category, request):
+            response = batch_response(request)
+            response["retExtInfo"]["list"][1] = {"code": 110007, "msg": "Insufficient balance"}
+            return response
+
+        result = await run_batch(MagicMock(side_effect=respond), "place", "linear", orders(3))
+        assert [r["success"] for r in result["list"]] == [True, False, True]
+        assert result["list"][1]["msg"] == "Insufficient balance"
+        assert result["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_request_fails_its_orders_only(self):
+        def respond(category, request):
+            if request[0]["qty"] == "0":
+                raise RuntimeError("timeout")
+            return batch_response(request)
+
+        result = await run_batch(MagicMock(side_effect=respond), "place", "spot", orders(15))
+        assert [r["success"] for r in result["list"]] == [False] * 10 + [True] * 5
+        assert result["list"][0]["error"] == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_invalid_orders_not_sent(self):
+        method = MagicMock(side_effect=lambda category, request: batch_response(request))
+        result = await run_batch(method, "place", "linear", [{"symbol": "BTCUSDT"}, *orders(1)])
+        assert method.call_args.kwargs["request"] == orders(1)
+        assert result["list"][0] == {"index": 0, "success": False, "error": "Missing side"}
+        assert result["list"][1]["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_chunks_run_concurrently(self):
+        def respond(category, request):
+            time.sleep(0.1)
+            return batch_response(request)
+
+        started = time.perf_counter()
+        await run_batch(MagicMock(side_effect=respond), "place", "spot", orders(40))
+        assert time.perf_counter() - started < 0.3
@@ -0,0 +1,95 @@
+"""Tests for cache module."""
+
+import asyncio
+
+import pytest
+
+from bybit_mcp_server.cache import TTLCache
+
+
+def fetcher(value, calls):
+    async def fetch():
+        calls.append(value)
+        await asyncio.sleep(0)
+        return value
+
+    return fetch
+
+
+class TestTTLCache:
+    @pytest.mark.asyncio
+    async def test_hit_within_ttl(self):
+        cache, calls = TTLCache(), []
+        assert await cache.get_or_fetch(("tool", 1), 60, fetcher("a", calls)) == "a"
+        assert await cache.get_or_fetch(("tool", 1), 60, fetcher("b", calls)) == "a"
+        assert calls == ["a"]
+        assert cache.stats()["tools"]["tool"] == {"hits": 1, "misses": 1, "coalesced": 0}
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_refetches(self):
+        cache, calls = TTLCache(), []
+        await cache.get_or_fetch(("tool", 1), 0.01, fetcher("a", calls))
+        await asyncio.sleep(0.02)
+        assert await cache.get_or_fetch(("tool", 1), 0.01, fetcher("b", calls)) == "b"
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_bypasses_cache(self):
+        cache, calls = TTLCache(), []
+        await cache.get_or_fetch(("tool", 1), 0, fetcher("a", calls))
+        await cache.get_or_fetch(("tool", 1), 0, fetcher("a", calls))
+        assert len(calls) == 2
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache, calls = TTLCache(max_entries=2), []
+        await cache.get_or_fetch(("tool", 1), 60, fetcher(1, calls))
+        await cache.get_or_fetch(("tool", 2), 60, fetcher(2, calls))
+        await cache.get_or_fetch(("tool", 1), 60, fetcher(1, calls))
+        await cache.get_or_fetch(("tool", 3), 60, fetcher(3, calls))
+        await cache.get_or_fetch(("tool", 1), 60, fetcher(1, calls))
+        assert calls == [1, 2, 3]
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_misses(self):
+        cache, calls = TTLCache(), []
+        results = await asyncio.gather(*(cache.get_or_fetch(("tool", 1), 60, fetcher("a", calls)) for _ in range(5)))
+        assert results == ["a"] * 5
+        assert calls == ["a"]
+        assert cache.stats()["tools"]["tool"]["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        cache = TTLCache()
+
+        async def fail():
+            raise RuntimeError("down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch(("tool", 1), 60, fail)
+        assert await cache.get_or_fetch(("tool", 1), 60, fetcher("ok", [])) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_fetcher_does_not_cancel_waiters(self):
+        cache, calls = TTLCache(), []
+
+        async def slow():
+            calls.append("slow")
+            await asyncio.sleep(10)
+
+        first = asyncio.create_task(cache.get_or_fetch(("tool", 1), 60, slow))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_fetch(("tool", 1), 60, fetcher("b", calls)))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "b"
+        assert first.cancelled()
+        assert calls == ["slow", "b"]
+
+    @pytest.mark.asyncio
+    async def test_clear(self):
+        cache = TTLCache()
+        await cache.get_or_fetch(("tool", 1), 60, fetcher("a", []))
+        cache.clear()
+        assert cache.stats() == {"entries": 0, "max_entries": 1024, "evictions": 0, "hit_rate": 0.0, "tools": {}}
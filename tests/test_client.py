@@ -0,0 +1,229 @@
+"""Tests for client module."""
+
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pybit.exceptions import InvalidRequestError
+
+from bybit_mcp_server.client import (
+    DEFAULT_MAX_PAGES,
+    call,
+    call_paged,
+    format_payload,
+    format_result,
+    get_session,
+    page_limit,
+    reset_session,
+    run_sync,
+    shutdown_executor,
+    tabulate,
+)
+from bybit_mcp_server.metrics import server_metrics
+from bybit_mcp_server.ratelimit import observe_response
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    for var in ["BYBIT_API_KEY", "BYBIT_API_SECRET", "BYBIT_RECV_WINDOW", "BYBIT_BASE_URL", "BYBIT_HTTP_POOL_SIZE"]:
+        monkeypatch.delenv(var, raising=False)
+    reset_session()
+    yield
+    reset_session()
+
+
+@pytest.fixture
+def mock_http():
+    with patch("pybit.unified_trading.HTTP", side_effect=lambda **kwargs: MagicMock()) as http:
+        yield http
+
+
+class TestGetSession:
+    def test_reuses_session(self, mock_http):
+        assert get_session() is get_session()
+        mock_http.assert_called_once()
+
+    def test_rebuilds_on_config_change(self, mock_http, monkeypatch):
+        first = get_session()
+        monkeypatch.setenv("BYBIT_TESTNET", "false")
+        second = get_session()
+        assert first is not second
+        assert mock_http.call_count == 2
+        assert mock_http.call_args.kwargs["testnet"] is False
+
+    def test_passes_recv_window(self, mock_http, monkeypatch):
+        monkeypatch.setenv("BYBIT_RECV_WINDOW", "8000")
+        get_session()
+        assert mock_http.call_args.kwargs["recv_window"] == 8000
+
+    def test_passes_timeout(self, mock_http, monkeypatch):
+        monkeypatch.setenv("BYBIT_HTTP_TIMEOUT", "3")
+        get_session()
+        assert mock_http.call_args.kwargs["timeout"] == 3.0
+
+    def test_mounts_pooled_adapter(self, mock_http, monkeypatch):
+        monkeypatch.setenv("BYBIT_HTTP_POOL_SIZE", "32")
+        session = get_session()
+        adapter = session.client.mount.call_args_list[0].args[1]
+        assert adapter._pool_maxsize == 32
+
+    def test_base_url_override(self, mock_http, monkeypatch):
+        monkeypatch.setenv("BYBIT_BASE_URL", "http://127.0.0.1:8080/")
+        assert get_session().endpoint == "http://127.0.0.1:8080"
+
+    def test_registers_rate_limit_hook(self):
+        assert observe_response in get_session().client.hooks["response"]
+
+    def test_reset_closes_session(self, mock_http):
+        session = get_session()
+        reset_session()
+        session.client.close.assert_called_once()
+        assert get_session() is not session
+
+
+class TestRunSync:
+    @pytest.fixture(autouse=True)
+    def fresh_executor(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_MAX_WORKERS", "4")
+        shutdown_executor()
+        yield
+        shutdown_executor()
+
+    @pytest.mark.asyncio
+    async def test_returns_result(self):
+        assert await run_sync(lambda a, b=0: a + b, 1, b=2) == 3
+
+    @pytest.mark.asyncio
+    async def test_propagates_exceptions(self):
+        def boom():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await run_sync(boom)
+
+    @pytest.mark.asyncio
+    async def test_blocking_calls_overlap(self):
+        started = time.perf_counter()
+        await asyncio.gather(*(run_sync(time.sleep, 0.2) for _ in range(4)))
+        assert time.perf_counter() - started < 0.6
+
+    @pytest.mark.asyncio
+    async def test_call_passes_params(self):
+        method = MagicMock(return_value={"retCode": 0, "result": {}})
+        await call(method, category="spot")
+        method.assert_called_once_with(category="spot")
+
+    @pytest.mark.asyncio
+    async def test_call_records_endpoint_metrics(self):
+        def get_tickers(**params):
+            return {"retCode": 0, "result": {}}
+
+        def place_order(**params):
+            raise InvalidRequestError("req", "Insufficient balance", 110007, 0, {})
+
+        await call(get_tickers, category="spot")
+        with pytest.raises(InvalidRequestError):
+            await call(place_order, category="spot")
+        endpoints = server_metrics.snapshot()["endpoints"]
+        assert endpoints["get_tickers"]["retCodes"] == {"0": 1}
+        assert endpoints["place_order"]["errors"] == 1
+        assert endpoints["place_order"]["retCodes"] == {"110007": 1}
+
+
+def page(items, cursor=""):
+    return {"retCode": 0, "retMsg": "OK", "result": {"category": "linear", "list": items, "nextPageCursor": cursor}}
+
+
+class TestPageLimit:
+    def test_single_page_by_default(self):
+        assert page_limit(False, None) is None
+
+    def test_fetch_all_uses_default_cap(self):
+        assert page_limit(True, None) == DEFAULT_MAX_PAGES
+
+    def test_max_pages_wins(self):
+        assert page_limit(False, 3) == 3
+        assert page_limit(True, 0) == 1
+
+
+class TestCallPaged:
+    @pytest.mark.asyncio
+    async def test_single_call_without_cap(self):
+        method = MagicMock(return_value=page([1], "next"))
+        assert await call_paged(method, {"category": "linear"}, None) == page([1], "next")
+        method.assert_called_once_with(category="linear")
+
+    @pytest.mark.asyncio
+    async def test_merges_until_cursor_exhausted(self):
+        method = MagicMock(side_effect=[page([1, 2], "c1"), page([3], "c2"), page([4])])
+        result = (await call_paged(method, {"category": "linear"}, 10))["result"]
+        assert result["list"] == [1, 2, 3, 4]
+        assert result["nextPageCursor"] == ""
+        assert result["pageCount"] == 3
+        assert method.call_args_list[1].kwargs == {"category": "linear", "cursor": "c1"}
+
+    @pytest.mark.asyncio
+    async def test_stops_at_cap_with_resume_cursor(self):
+        method = MagicMock(side_effect=[page([1], "c1"), page([2], "c2"), page([3])])
+        result = (await call_paged(method, {"category": "linear"}, 2))["result"]
+        assert result["list"] == [1, 2]
+        assert result["nextPageCursor"] == "c2"
+        assert method.call_count == 2
+
+
+class TestFormatResult:
+    def test_extracts_result(self):
+        assert json.loads(format_result({"retCode": 0, "result": {"a": 1}})) == {"a": 1}
+
+
+TICKERS = {"category": "spot", "list": [{"symbol": "BTCUSDT", "lastPrice": "1"}, {"symbol": "ETHUSDT", "bid1": "2"}]}
+
+
+class TestFormatPayload:
+    def test_pretty_by_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_OUTPUT_FORMAT", raising=False)
+        assert format_payload({"a": 1}) == '{\n  "a": 1\n}'
+
+    def test_compact_from_env(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_OUTPUT_FORMAT", "compact")
+        assert format_payload({"a": [1, 2]}) == '{"a":[1,2]}'
+
+    def test_per_call_format_wins(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_OUTPUT_FORMAT", "pretty")
+        assert format_result({"result": {"a": 1}}, "compact") == '{"a":1}'
+
+    def test_without_orjson(self, monkeypatch):
+        monkeypatch.setattr("bybit_mcp_server.client.orjson", None)
+        assert format_payload({"a": 1}, "compact") == '{"a":1}'
+        assert json.loads(format_payload(TICKERS, "pretty")) == TICKERS
+
+    @pytest.mark.parametrize("output_format", ["pretty", "compact", "table"])
+    @pytest.mark.parametrize(
+        "payload",
+        [TICKERS, {"name": "Bybit – 比特", "list": []}, {"id": 2**70, "price": 0.1}, {1: [True, None, {}]}],
+    )
+    def test_same_output_with_and_without_orjson(self, monkeypatch, payload, output_format):
+        with_orjson = format_payload(payload, output_format)
+        monkeypatch.setattr("bybit_mcp_server.client.orjson", None)
+        assert with_orjson == format_payload(payload, output_format)
+
+    def test_table(self):
+        data = json.loads(format_payload(TICKERS, "table"))
+        assert data["list"] == {
+            "columns": ["symbol", "lastPrice", "bid1"],
+            "rows": [["BTCUSDT", "1", None], ["ETHUSDT", None, "2"]],
+        }
+
+
+class TestTabulate:
+    def test_leaves_scalar_and_row_lists(self):
+        value = {"b": [["1", "2"]], "empty": [], "n": 1}
+        assert tabulate(value) == value
+
+    def test_nested_lists(self):
+        value = {"list": [{"accountType": "UNIFIED", "coin": [{"coin": "BTC"}, {"coin": "ETH"}]}]}
+        table = tabulate(value)["list"]
+        assert table["columns"] == ["accountType", "coin"]
+        assert table["rows"][0][1] == {"columns": ["coin"], "rows": [["BTC"], ["ETH"]]}
@@ -1,15 +1,52 @@
 """Tests for config module."""
 
+import dataclasses
+import os
 
+import pytest
 
 from bybit_mcp_server.config import (
     MODE_PERMISSIONS,
     Mode,
+    Settings,
+    get_allowed_hosts,
     get_api_key,
     get_api_secret,
+    get_base_url,
+    get_breaker_cooldown_seconds,
+    get_breaker_threshold,
+    get_confirmation_db,
+    get_env_file,
+    get_hedge_after_seconds,
+    get_history_db,
+    get_host,
+    get_http_pool_size,
+    get_http_timeout,
+    get_http_token,
+    get_log_level,
+    get_max_concurrent_calls,
+    get_max_pending_confirmations,
+    get_max_workers,
+    get_metrics_port,
+    get_mirror_reconcile_seconds,
     get_mode,
+    get_output_format,
+    get_port,
+    get_rate_limits,
+    get_read_retries,
+    get_read_retry_backoff,
     get_recv_window,
+    get_settings,
+    get_shutdown_timeout,
     get_testnet,
+    get_trade_buffer_size,
+    get_transport,
+    get_write_retries,
+    get_write_retry_backoff,
+    get_ws_url,
+    on_reload,
+    read_env_file,
+    reload_settings,
 )
 
 
@@ -83,6 +120,112 @@ class TestGetRecvWindow:
         assert get_recv_window() == 5000
 
 
+class TestGetBaseUrl:
+    def test_returns_none_when_empty(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_BASE_URL", raising=False)
+        assert get_base_url() is None
+
+    def test_strips_trailing_slash(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_BASE_URL", "http://localhost:8080/")
+        assert get_base_url() == "http://localhost:8080"
+
+
+class TestGetWsUrl:
+    def test_returns_none_when_empty(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_WS_URL", raising=False)
+        assert get_ws_url() is None
+
+    def test_strips_trailing_slash(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_WS_URL", "ws://127.0.0.1:8765/")
+        assert get_ws_url() == "ws://127.0.0.1:8765"
+
+
+class TestGetHttpPoolSize:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_HTTP_POOL_SIZE", raising=False)
+        assert get_http_pool_size() == 10
+
+    def test_returns_int(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HTTP_POOL_SIZE", "32")
+        assert get_http_pool_size() == 32
+
+
+class TestGetHttpTimeout:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_HTTP_TIMEOUT", raising=False)
+        assert get_http_timeout() == 10.0
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HTTP_TIMEOUT", "2.5")
+        assert get_http_timeout() == 2.5
+
+
+class TestGetWriteRetries:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_WRITE_RETRIES", raising=False)
+        monkeypatch.delenv("BYBIT_WRITE_RETRY_BACKOFF", raising=False)
+        assert get_write_retries() == 3
+        assert get_write_retry_backoff() == 0.25
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_WRITE_RETRIES", "0")
+        monkeypatch.setenv("BYBIT_WRITE_RETRY_BACKOFF", "1")
+        assert get_write_retries() == 0
+        assert get_write_retry_backoff() == 1.0
+
+
+class TestGetReadRetries:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_READ_RETRIES", raising=False)
+        monkeypatch.delenv("BYBIT_READ_RETRY_BACKOFF", raising=False)
+        assert get_read_retries() == 2
+        assert get_read_retry_backoff() == 0.1
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_READ_RETRIES", "0")
+        monkeypatch.setenv("BYBIT_READ_RETRY_BACKOFF", "0.5")
+        assert get_read_retries() == 0
+        assert get_read_retry_backoff() == 0.5
+
+
+class TestGetBreaker:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_BREAKER_THRESHOLD", raising=False)
+        monkeypatch.delenv("BYBIT_BREAKER_COOLDOWN_SECONDS", raising=False)
+        assert get_breaker_threshold() == 5
+        assert get_breaker_cooldown_seconds() == 30.0
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_BREAKER_THRESHOLD", "0")
+        monkeypatch.setenv("BYBIT_BREAKER_COOLDOWN_SECONDS", "5")
+        assert get_breaker_threshold() == 0
+        assert get_breaker_cooldown_seconds() == 5.0
+
+
+class TestGetHedgeAfterSeconds:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_HEDGE_AFTER_SECONDS", raising=False)
+        assert get_hedge_after_seconds() is None
+
+    def test_zero_disables(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HEDGE_AFTER_SECONDS", "0")
+        assert get_hedge_after_seconds() is None
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HEDGE_AFTER_SECONDS", "0.2")
+        assert get_hedge_after_seconds() == 0.2
+
+
+class TestGetMaxWorkers:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_MAX_WORKERS", raising=False)
+        assert get_max_workers() == 10
+
+    def test_returns_int(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_MAX_WORKERS", "4")
+        assert get_max_workers() == 4
+
+
 class TestModePermissions:
     def test_read_only_allows_read(self):
         assert MODE_PERMISSIONS[Mode.READ] == {"read"}
@@ -92,3 +235,246 @@ class TestModePermissions:
 
     def test_full_allows_all(self):
         assert MODE_PERMISSIONS[Mode.FULL] == {"read", "trade", "full"}
+
+
+class TestGetHistoryDb:
+    def test_default_is_disabled(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_HISTORY_DB", raising=False)
+        assert get_history_db() is None
+
+    def test_expands_home(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HISTORY_DB", "~/bybit.db")
+        assert not get_history_db().startswith("~")
+
+
+class TestGetConfirmationDb:
+    def test_default_is_in_memory(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_CONFIRMATION_DB", raising=False)
+        assert get_confirmation_db() is None
+
+    def test_expands_home(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_CONFIRMATION_DB", "~/confirmations.db")
+        assert not get_confirmation_db().startswith("~")
+
+
+class TestGetMaxPendingConfirmations:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_MAX_PENDING_CONFIRMATIONS", raising=False)
+        assert get_max_pending_confirmations() == 1000
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_MAX_PENDING_CONFIRMATIONS", "50")
+        assert get_max_pending_confirmations() == 50
+
+
+class TestGetTradeBufferSize:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_TRADE_BUFFER_SIZE", raising=False)
+        assert get_trade_buffer_size() == 1000
+
+    def test_returns_int(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_TRADE_BUFFER_SIZE", "200")
+        assert get_trade_buffer_size() == 200
+
+
+class TestGetMirrorReconcileSeconds:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_MIRROR_RECONCILE_SECONDS", raising=False)
+        assert get_mirror_reconcile_seconds() == 60.0
+
+    def test_returns_float(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_MIRROR_RECONCILE_SECONDS", "15")
+        assert get_mirror_reconcile_seconds() == 15.0
+
+
+class TestGetMetricsPort:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_METRICS_PORT", raising=False)
+        assert get_metrics_port() is None
+
+    def test_returns_int(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_METRICS_PORT", "9464")
+        assert get_metrics_port() == 9464
+
+
+class TestGetRateLimits:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_RATE_LIMITS", raising=False)
+        assert get_rate_limits()["trade"] == 10.0
+
+    def test_overrides(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_RATE_LIMITS", "market=0, trade=2.5")
+        limits = get_rate_limits()
+        assert limits["market"] == 0.0
+        assert limits["trade"] == 2.5
+        assert limits["asset"] == 5.0
+
+
+class TestGetOutputFormat:
+    def test_default_is_pretty(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_OUTPUT_FORMAT", raising=False)
+        assert get_output_format() == "pretty"
+
+    def test_table(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_OUTPUT_FORMAT", "TABLE")
+        assert get_output_format() == "table"
+
+    def test_invalid_falls_back(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_OUTPUT_FORMAT", "xml")
+        assert get_output_format() == "pretty"
+
+
+class TestGetTransport:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_TRANSPORT", raising=False)
+        assert get_transport() == "stdio"
+
+    def test_http(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_TRANSPORT", "Streamable-HTTP")
+        assert get_transport() == "streamable-http"
+
+    def test_invalid_defaults_to_stdio(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_TRANSPORT", "websocket")
+        assert get_transport() == "stdio"
+
+
+class TestGetHostAndPort:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_HOST", raising=False)
+        monkeypatch.delenv("BYBIT_PORT", raising=False)
+        assert (get_host(), get_port()) == ("127.0.0.1", 8000)
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HOST", "0.0.0.0")
+        monkeypatch.setenv("BYBIT_PORT", "9000")
+        assert (get_host(), get_port()) == ("0.0.0.0", 9000)
+
+
+class TestHttpAuthSettings:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_HTTP_TOKEN", raising=False)
+        monkeypatch.delenv("BYBIT_ALLOWED_HOSTS", raising=False)
+        assert (get_http_token(), get_allowed_hosts()) == (None, ())
+
+    def test_custom(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HTTP_TOKEN", "secret")
+        monkeypatch.setenv("BYBIT_ALLOWED_HOSTS", "mcp.example.com, 10.0.0.5:*,")
+        assert (get_http_token(), get_allowed_hosts()) == ("secret", ("mcp.example.com", "10.0.0.5:*"))
+
+
+class TestGetMaxConcurrentCalls:
+    def test_default_unlimited(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_MAX_CONCURRENT_CALLS", raising=False)
+        assert get_max_concurrent_calls() == 0
+
+    def test_returns_int(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_MAX_CONCURRENT_CALLS", "32")
+        assert get_max_concurrent_calls() == 32
+
+
+class TestGetShutdownTimeout:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_SHUTDOWN_TIMEOUT", raising=False)
+        assert get_shutdown_timeout() == 10.0
+
+    def test_returns_float(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_SHUTDOWN_TIMEOUT", "2.5")
+        assert get_shutdown_timeout() == 2.5
+
+
+class TestGetLogLevel:
+    def test_default_is_warning(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_LOG_LEVEL", raising=False)
+        assert get_log_level() == "WARNING"
+
+    def test_case_insensitive(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_LOG_LEVEL", "info")
+        assert get_log_level() == "INFO"
+
+    def test_invalid_falls_back(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_LOG_LEVEL", "verbose")
+        assert get_log_level() == "WARNING"
+
+
+class TestEnvFile:
+    def test_unset(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_ENV_FILE", raising=False)
+        assert get_env_file() is None
+
+    def test_parses_lines(self, tmp_path):
+        path = tmp_path / "bybit.env"
+        path.write_text('# comment\n\nBYBIT_MODE=trade\nexport BYBIT_OUTPUT_FORMAT="table"\nnot a setting\n')
+        assert read_env_file(str(path)) == {"BYBIT_MODE": "trade", "BYBIT_OUTPUT_FORMAT": "table"}
+
+
+class TestSettings:
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_MODE", "trade")
+        monkeypatch.setenv("BYBIT_API_KEY", "key")
+        monkeypatch.setenv("BYBIT_RATE_LIMITS", "market=5")
+        settings = get_settings()
+        assert settings.mode == Mode.TRADE
+        assert settings.permissions == {"read", "trade"}
+        assert settings.session_key[1] == "key"
+        assert settings.rate_limits["market"] == 5.0
+
+    def test_immutable(self):
+        settings = Settings.from_env()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            settings.mode = Mode.FULL
+        with pytest.raises(TypeError):
+            settings.rate_limits["market"] = 1.0
+
+    def test_loaded_once(self, monkeypatch):
+        settings = get_settings()
+        # Bypasses the test fixture that reloads settings on monkeypatch.setenv.
+        monkeypatch.setitem(os.environ, "BYBIT_MODE", "full")
+        assert get_settings() is settings
+        assert reload_settings().mode == Mode.FULL
+
+    def test_reload_runs_hooks(self, monkeypatch):
+        seen = []
+        monkeypatch.setattr("bybit_mcp_server.config._reload_hooks", [seen.append])
+        settings = reload_settings()
+        assert seen == [settings]
+        on_reload(seen.append)
+        reload_settings()
+        assert len(seen) == 3
+
+    def test_env_file_overrides_environment(self, monkeypatch, tmp_path):
+        path = tmp_path / "bybit.env"
+        path.write_text("BYBIT_MODE=full\n")
+        monkeypatch.setenv("BYBIT_MODE", "read")
+        monkeypatch.setenv("BYBIT_ENV_FILE", str(path))
+        assert get_settings().mode == Mode.FULL
+        path.write_text("")
+        assert reload_settings().mode == Mode.READ
+        monkeypatch.delenv("BYBIT_ENV_FILE")
+
+    def test_env_file_kept_out_of_environment(self, monkeypatch, tmp_path):
+        path = tmp_path / "bybit.env"
+        path.write_text("BYBIT_API_SECRET=file-secret\n")
+        monkeypatch.delenv("BYBIT_API_SECRET", raising=False)
+        monkeypatch.setenv("BYBIT_ENV_FILE", str(path))
+        assert get_settings().api_secret == "file-secret"
+        assert "BYBIT_API_SECRET" not in os.environ
+        monkeypatch.delenv("BYBIT_ENV_FILE")
+
+    def test_failed_reload_keeps_env_file_values(self, monkeypatch, tmp_path):
+        path = tmp_path / "bybit.env"
+        path.write_text("BYBIT_MODE=full\n")
+        monkeypatch.setenv("BYBIT_ENV_FILE", str(path))
+        path.write_text("BYBIT_MODE=trade\nBYBIT_PORT=http\n")
+        with pytest.raises(ValueError):
+            reload_settings()
+        assert get_mode() == Mode.FULL
+        monkeypatch.delenv("BYBIT_ENV_FILE")
+
+    def test_changes_mask_credentials(self, monkeypatch):
+        before = get_settings()
+        monkeypatch.setenv("BYBIT_API_SECRET", "secret")
+        monkeypatch.setenv("BYBIT_OUTPUT_FORMAT", "compact")
+        changes = before.changes(get_settings())
+        assert changes["api_secret"] == (None, "***")
+        assert changes["output_format"] == ("pretty", "compact")
+        assert "session_key" not in changes
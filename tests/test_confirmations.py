@@ -0,0 +1,124 @@
+"""Tests for confirmations module."""
+
+import time
+
+import pytest
+
+from bybit_mcp_server.confirmations import (
+    CONFIRMATION_TTL,
+    MemoryConfirmationStore,
+    SQLiteConfirmationStore,
+    get_confirmation_store,
+)
+
+
+def pending(tool="place_order", age=0.0, **kwargs):
+    return {"tool": tool, "kwargs": kwargs, "timestamp": time.time() - age}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryConfirmationStore(max_pending=3)
+    else:
+        store = SQLiteConfirmationStore(str(tmp_path / "confirmations.db"), max_pending=3)
+    yield store
+    store.close()
+
+
+class TestConfirmationStore:
+    def test_take_returns_once(self, store):
+        store.add("a", pending(symbol="BTCUSDT", qty="0.1"))
+        taken = store.take("a")
+        assert taken["tool"] == "place_order"
+        assert taken["kwargs"] == {"symbol": "BTCUSDT", "qty": "0.1"}
+        assert store.take("a") is None
+        assert "a" not in store
+
+    def test_unknown_id(self, store):
+        assert store.take("missing") is None
+        assert store.get("missing") is None
+
+    def test_expired_not_returned(self, store):
+        store.add("old", pending(age=CONFIRMATION_TTL + 1))
+        assert store.take("old") is None
+
+    def test_expired_dropped_on_add(self, store):
+        store.add("old", pending(age=CONFIRMATION_TTL + 1))
+        store.add("new", pending())
+        assert "old" not in store
+        assert len(store) == 1
+
+    def test_cap_drops_oldest(self, store):
+        for i in range(5):
+            store.add(str(i), pending())
+        assert len(store) == 3
+        assert ["0" in store, "1" in store, "4" in store] == [False, False, True]
+
+    def test_cap_counts_rows_not_ids(self, store):
+        for confirmation_id in ("c1", "c2", "c3"):
+            store.add(confirmation_id, pending())
+        store.take("c2")
+        store.add("c4", pending())
+        assert len(store) == 3
+        assert store.get("c1") is not None
+        store.add("c5", pending())
+        assert ["c1" in store, "c3" in store, "c4" in store, "c5" in store] == [False, True, True, True]
+
+    def test_nested_kwargs(self, store):
+        orders = [{"symbol": "BTCUSDT", "side": "Buy", "reduceOnly": True}]
+        store.add("batch", pending("place_batch_order", category="linear", orders=orders))
+        assert store.take("batch")["kwargs"]["orders"] == orders
+
+    def test_clear(self, store):
+        store.add("a", pending())
+        store.clear()
+        assert len(store) == 0
+
+
+class TestMemoryConfirmationStore:
+    def test_heap_stays_bounded(self):
+        store = MemoryConfirmationStore()
+        for i in range(1000):
+            store.add(str(i), pending())
+            store.take(str(i))
+        assert len(store) == 0
+        assert len(store._heap) <= 64
+
+
+class TestSQLiteConfirmationStore:
+    def test_shared_between_stores(self, tmp_path):
+        path = str(tmp_path / "confirmations.db")
+        first, second = SQLiteConfirmationStore(path), SQLiteConfirmationStore(path)
+        try:
+            first.add("a", pending(symbol="BTCUSDT"))
+            assert second.take("a")["kwargs"] == {"symbol": "BTCUSDT"}
+            assert first.take("a") is None
+        finally:
+            first.close()
+            second.close()
+
+    def test_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "confirmations.db")
+        store = SQLiteConfirmationStore(path)
+        store.add("a", pending())
+        store.close()
+        store = SQLiteConfirmationStore(path)
+        assert store.take("a")["tool"] == "place_order"
+        store.close()
+
+
+class TestGetConfirmationStore:
+    def test_memory_by_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_CONFIRMATION_DB", raising=False)
+        store = get_confirmation_store()
+        assert isinstance(store, MemoryConfirmationStore)
+        assert get_confirmation_store() is store
+
+    def test_sqlite_when_configured(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("BYBIT_CONFIRMATION_DB", str(tmp_path / "confirmations.db"))
+        monkeypatch.setenv("BYBIT_MAX_PENDING_CONFIRMATIONS", "10")
+        store = get_confirmation_store()
+        assert isinstance(store, SQLiteConfirmationStore)
+        assert store.max_pending == 10
+        assert get_confirmation_store() is store
@@ -5,15 +5,16 @@ import time
 
 import pytest
 
+from bybit_mcp_server.confirmations import CONFIRMATION_TTL, get_confirmation_store
 from bybit_mcp_server.decorators import (
-    CONFIRMATION_TTL,
-    _pending_confirmations,
     execute_confirmed,
     get_impl,
+    instrument,
     register_impl,
     require_confirmation,
     require_mode,
 )
+from bybit_mcp_server.metrics import server_metrics
 
 
 class TestRequireMode:
@@ -70,13 +71,26 @@ class TestRequireMode:
         result = json.loads(await my_tool())
         assert "error" in result
 
+    @pytest.mark.asyncio
+    async def test_follows_settings_reload(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_MODE", "read")
+
+        @require_mode("trade")
+        async def my_tool():
+            return "ok"
+
+        assert my_tool.target is my_tool.denied
+        monkeypatch.setenv("BYBIT_MODE", "trade")
+        assert my_tool.target is my_tool.allowed
+        assert await my_tool() == "ok"
+
 
 class TestRequireConfirmation:
     @pytest.fixture(autouse=True)
     def clear_pending(self):
-        _pending_confirmations.clear()
+        get_confirmation_store().clear()
         yield
-        _pending_confirmations.clear()
+        get_confirmation_store().clear()
 
     @pytest.mark.asyncio
     async def test_returns_confirmation_summary(self):
@@ -107,37 +121,43 @@ class TestRequireConfirmation:
 
         result = json.loads(await my_tool(x="1"))
         cid = result["confirmation_id"]
-        assert cid in _pending_confirmations
-        assert _pending_confirmations[cid]["tool"] == "my_tool"
+        assert cid in get_confirmation_store()
+        assert get_confirmation_store().get(cid)["tool"] == "my_tool"
 
 
 class TestExecuteConfirmed:
     @pytest.fixture(autouse=True)
     def clear_pending(self):
-        _pending_confirmations.clear()
+        get_confirmation_store().clear()
         yield
-        _pending_confirmations.clear()
+        get_confirmation_store().clear()
 
     def test_returns_and_removes_pending(self):
-        _pending_confirmations["test-id"] = {
-            "tool": "place_order",
-            "kwargs": {"symbol": "BTCUSDT"},
-            "timestamp": time.time(),
-        }
+        get_confirmation_store().add(
+            "test-id",
+            {
+                "tool": "place_order",
+                "kwargs": {"symbol": "BTCUSDT"},
+                "timestamp": time.time(),
+            },
+        )
         result = execute_confirmed("test-id")
         assert result is not None
         assert result["tool"] == "place_order"
-        assert "test-id" not in _pending_confirmations
+        assert "test-id" not in get_confirmation_store()
 
     def test_returns_none_for_unknown_id(self):
         assert execute_confirmed("nonexistent") is None
 
     def test_returns_none_for_expired(self):
-        _pending_confirmations["old-id"] = {
-            "tool": "place_order",
-            "kwargs": {},
-            "timestamp": time.time() - CONFIRMATION_TTL - 1,
-        }
+        get_confirmation_store().add(
+            "old-id",
+            {
+                "tool": "place_order",
+                "kwargs": {},
+                "timestamp": time.time() - CONFIRMATION_TTL - 1,
+            },
+        )
         assert execute_confirmed("old-id") is None
 
 
@@ -151,3 +171,31 @@ class TestImplRegistry:
 
     def test_get_unknown_returns_none(self):
         assert get_impl("nonexistent_tool") is None
+
+
+class TestInstrument:
+    @pytest.mark.asyncio
+    async def test_records_latency_and_size(self):
+        @instrument("my_tool")
+        async def my_tool():
+            return "ok"
+
+        assert await my_tool() == "ok"
+        stats = server_metrics.snapshot()["tools"]["my_tool"]
+        assert stats["calls"] == 1
+        assert stats["errors"] == 0
+        assert stats["response_bytes"]["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_counts_errors(self):
+        @instrument("my_tool")
+        async def my_tool(fail):
+            if fail:
+                raise RuntimeError("boom")
+            return json.dumps({"error": "bad input"})
+
+        await my_tool(False)
+        with pytest.raises(RuntimeError):
+            await my_tool(True)
+        stats = server_metrics.snapshot()["tools"]["my_tool"]
+        assert (stats["calls"], stats["errors"]) == (2, 2)
@@ -0,0 +1,86 @@
+"""Tests for diagnostics tools."""
+
+import json
+import os
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from bybit_mcp_server.decorators import instrument_tools
+from bybit_mcp_server.tools.diagnostics import register_diagnostics_tools
+from bybit_mcp_server.tools.market import register_market_tools
+
+
+@pytest.fixture
+def mcp_app(patch_session):
+    app = FastMCP("test")
+    register_market_tools(app)
+    register_diagnostics_tools(app)
+    return app
+
+
+class TestGetCacheStats:
+    @pytest.mark.asyncio
+    async def test_reports_hits_and_misses(self, mcp_app, patch_session):
+        await mcp_app.call_tool("get_server_time", {})
+        await mcp_app.call_tool("get_server_time", {})
+        result = await mcp_app.call_tool("get_cache_stats", {})
+        data = json.loads(result[0][0].text)
+        assert data["tools"]["get_server_time"] == {"hits": 1, "misses": 1, "coalesced": 0}
+        assert data["hit_rate"] == 0.5
+
+
+class TestGetRateLimitStatus:
+    @pytest.mark.asyncio
+    async def test_reports_used_buckets(self, mcp_app, patch_session):
+        await mcp_app.call_tool("get_kline", {"category": "linear", "symbol": "BTCUSDT", "interval": "1"})
+        result = await mcp_app.call_tool("get_rate_limit_status", {})
+        buckets = json.loads(result[0][0].text)["buckets"]
+        assert len(buckets) == 1
+        assert buckets[0]["queued"] == 0
+
+
+class TestGetServerMetrics:
+    @pytest.mark.asyncio
+    async def test_reports_tools_and_endpoints(self, mcp_app, patch_session):
+        instrument_tools(mcp_app)
+        await mcp_app.call_tool("get_server_time", {})
+        await mcp_app.call_tool("get_tickers", {"category": "spot", "filters": ["bad filter"]})
+        result = await mcp_app.call_tool("get_server_metrics", {})
+        data = json.loads(result[0][0].text)
+        assert data["tools"]["get_server_time"]["calls"] == 1
+        assert set(data["tools"]["get_server_time"]["latency_ms"]) == {"p50", "p95", "p99", "mean", "max"}
+        assert data["tools"]["get_tickers"]["errors"] == 1
+        # The mock session's methods are not named pybit methods.
+        assert data["endpoints"]["unknown"]["retCodes"] == {"0": 1}
+        assert data["endpoints"]["unknown"]["retries"] == 0
+        assert data["breakers"] == {}
+
+
+class TestReloadSettings:
+    @pytest.mark.asyncio
+    async def test_reports_changes(self, mcp_app, monkeypatch, tmp_path):
+        env_file = tmp_path / "bybit.env"
+        env_file.write_text("BYBIT_MODE=full\n")
+        monkeypatch.setenv("BYBIT_ENV_FILE", str(env_file))
+        env_file.write_text("BYBIT_MODE=trade\nBYBIT_API_KEY=new-key\n")
+        result = await mcp_app.call_tool("reload_settings", {})
+        data = json.loads(result[0][0].text)
+        assert data["mode"] == "trade"
+        assert data["changed"]["mode"] == {"from": "full", "to": "trade"}
+        assert data["changed"]["api_key"]["to"] == "***"
+        monkeypatch.delenv("BYBIT_ENV_FILE")
+
+    @pytest.mark.asyncio
+    async def test_keeps_settings_on_error(self, mcp_app, monkeypatch, tmp_path):
+        monkeypatch.setenv("BYBIT_MODE", "full")
+        # setitem, not setenv: the test fixture's reload would fail first.
+        monkeypatch.setitem(os.environ, "BYBIT_ENV_FILE", str(tmp_path / "missing.env"))
+        result = await mcp_app.call_tool("reload_settings", {})
+        assert "Settings reload failed" in json.loads(result[0][0].text)["error"]
+
+    @pytest.mark.asyncio
+    async def test_requires_full_mode(self, mcp_app, monkeypatch):
+        monkeypatch.setenv("BYBIT_MODE", "trade")
+        result = await mcp_app.call_tool("reload_settings", {})
+        assert "Permission denied" in json.loads(result[0][0].text)["error"]
@@ -0,0 +1,62 @@
+"""Tests for filters module."""
+
+import pytest
+
+from bybit_mcp_server.filters import ListQuery, parse_predicate
+
+TICKERS = [
+    {"symbol": "BTCUSDT", "lastPrice": "50000", "turnover24h": "900000000"},
+    {"symbol": "ETHUSDT", "lastPrice": "3000", "turnover24h": "400000000"},
+    {"symbol": "BTCPERP", "lastPrice": "50010", "turnover24h": "1000"},
+    {"symbol": "NEWUSDT", "lastPrice": "1", "turnover24h": ""},
+]
+
+
+class TestParsePredicate:
+    def test_numeric_comparison(self):
+        test = parse_predicate("turnover24h >= 4e8")
+        assert [t["symbol"] for t in TICKERS if test(t)] == ["BTCUSDT", "ETHUSDT"]
+
+    def test_text_equality(self):
+        assert parse_predicate("symbol == ETHUSDT")(TICKERS[1])
+        assert parse_predicate("symbol != ETHUSDT")(TICKERS[0])
+
+    def test_prefix_and_regex(self):
+        assert [t["symbol"] for t in TICKERS if parse_predicate("symbol ^= BTC")(t)] == ["BTCUSDT", "BTCPERP"]
+        assert [t["symbol"] for t in TICKERS if parse_predicate("symbol ~ ^[BE].*USDT$")(t)] == ["BTCUSDT", "ETHUSDT"]
+
+    def test_missing_field_never_matches(self):
+        assert not parse_predicate("fundingRate > 0")(TICKERS[0])
+        assert not parse_predicate("turnover24h > 0")(TICKERS[3])
+
+    @pytest.mark.parametrize("expression", ["turnover24h", "> 5", "symbol ~ ("])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            parse_predicate(expression)
+
+
+class TestListQuery:
+    def test_filter_sort_top_project(self):
+        query = ListQuery(fields=["symbol"], filters=["lastPrice > 100"], sort_by="-lastPrice", top=2)
+        items, matched = query.select(TICKERS)
+        assert items == [{"symbol": "BTCPERP"}, {"symbol": "BTCUSDT"}]
+        assert matched == 3
+
+    def test_missing_sort_values_go_last(self):
+        items, _ = ListQuery(sort_by="turnover24h").select(TICKERS)
+        assert [t["symbol"] for t in items] == ["BTCPERP", "ETHUSDT", "BTCUSDT", "NEWUSDT"]
+
+    def test_apply_copies_response(self):
+        response = {"retCode": 0, "result": {"category": "linear", "list": TICKERS}}
+        shaped = ListQuery(fields=["symbol"], top=1).apply(response)
+        assert shaped["result"] == {"category": "linear", "list": [{"symbol": "BTCUSDT"}], "matched": 4}
+        assert response["result"]["list"] is TICKERS
+        assert "matched" not in response["result"]
+
+    def test_inactive_query_returns_response_unchanged(self):
+        response = {"result": {"list": TICKERS}}
+        assert ListQuery().apply(response) is response
+
+    def test_negative_top(self):
+        with pytest.raises(ValueError):
+            ListQuery(top=-1)
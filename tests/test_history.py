@@ -0,0 +1,122 @@
+"""Tests for history module."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bybit_mcp_server.history import fetch_funding, load_bars, load_funding, load_kline_page, sync_series
+from bybit_mcp_server.klines import align
+from bybit_mcp_server.store import HistoryStore
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+
+
+def bar(ts):
+    return [str(ts), "1", "2", "0.5", "1.5", "10", "100"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def session():
+    """Mock session serving 1-minute bars and 8-hourly funding rates, newest first like Bybit."""
+
+    def get_kline(category, symbol, interval, start, end, limit):
+        starts = list(range(align(start, MINUTE), end + 1, MINUTE))[-limit:]
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": [bar(ts) for ts in reversed(starts)]}}
+
+    def get_funding_rate_history(category, symbol, startTime, endTime, limit):
+        stamps = [ts for ts in range(0, endTime + 1, 8 * HOUR) if ts >= startTime][-limit:]
+        rows = [{"symbol": symbol, "fundingRate": "0.0001", "fundingRateTimestamp": str(ts)} for ts in stamps]
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": rows[::-1]}}
+
+    session = MagicMock()
+    session.endpoint = "https://api-testnet.bybit.com"
+    session.get_kline.side_effect = get_kline
+    session.get_funding_rate_history.side_effect = get_funding_rate_history
+    return session
+
+
+class TestLoadBars:
+    @pytest.mark.asyncio
+    async def test_second_load_is_served_from_store(self, store, session):
+        bars = await load_bars(store, session, "linear", "BTCUSDT", "1", 0, 299 * MINUTE, concurrency=2)
+        assert len(bars) == 300
+        calls = session.get_kline.call_count
+
+        again = await load_bars(store, session, "linear", "BTCUSDT", "1", 0, 299 * MINUTE, concurrency=2)
+        assert again == bars
+        assert session.get_kline.call_count == calls
+
+    @pytest.mark.asyncio
+    async def test_only_missing_window_is_fetched(self, store, session):
+        await load_bars(store, session, "linear", "BTCUSDT", "1", 0, 99 * MINUTE, concurrency=1)
+        session.get_kline.reset_mock()
+        bars = await load_bars(store, session, "linear", "BTCUSDT", "1", 0, 149 * MINUTE, concurrency=1)
+        assert len(bars) == 150
+        assert session.get_kline.call_args.kwargs["start"] == 100 * MINUTE
+
+    @pytest.mark.asyncio
+    async def test_open_bar_is_not_stored(self, store, session):
+        now = int(time.time() * 1000)
+        start = align(now, MINUTE) - 5 * MINUTE
+        bars = await load_bars(store, session, "linear", "BTCUSDT", "1", start, now, concurrency=1)
+        assert int(bars[-1][0]) == align(now, MINUTE)
+        stored = store.get_bars(session.endpoint, "linear", "BTCUSDT", "1", start, now)
+        assert len(stored) == len(bars) - 1
+
+
+class TestLoadKlinePage:
+    @pytest.mark.asyncio
+    async def test_newest_first(self, store, session):
+        response = await load_kline_page(store, session, "linear", "BTCUSDT", "1", 0, 9 * MINUTE, None)
+        assert [int(b[0]) for b in response["result"]["list"]] == [ts * MINUTE for ts in range(9, -1, -1)]
+
+    @pytest.mark.asyncio
+    async def test_window_larger_than_limit(self, store, session):
+        assert await load_kline_page(store, session, "linear", "BTCUSDT", "1", 0, 9 * MINUTE, 5) is None
+
+
+class TestFunding:
+    @pytest.mark.asyncio
+    async def test_fetch_pages_backwards(self, session):
+        rows = await fetch_funding(session, "linear", "BTCUSDT", 0, 300 * 8 * HOUR)
+        assert len(rows) == 301
+        assert session.get_funding_rate_history.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_second_load_is_served_from_store(self, store, session):
+        first = await load_funding(store, session, "linear", "BTCUSDT", 0, 10 * 8 * HOUR)
+        again = await load_funding(store, session, "linear", "BTCUSDT", 0, 10 * 8 * HOUR)
+        assert again == first
+        assert len(first) == 11
+        assert session.get_funding_rate_history.call_count == 1
+
+
+class TestSyncSeries:
+    @pytest.mark.asyncio
+    async def test_first_sync_requires_start(self, store, session):
+        with pytest.raises(ValueError):
+            await sync_series(store, session, "kline", "linear", "BTCUSDT", "1", None, 1)
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_stored_end(self, store, session):
+        start = align(int(time.time() * 1000), MINUTE) - 30 * MINUTE
+        first = await sync_series(store, session, "kline", "linear", "BTCUSDT", "1", start, 1)
+        assert first["stored"] == 30
+        session.get_kline.reset_mock()
+        second = await sync_series(store, session, "kline", "linear", "BTCUSDT", "1", None, 1)
+        assert second["coverage"][0][0] == start
+        assert session.get_kline.call_count <= 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_kind(self, store, session):
+        with pytest.raises(ValueError):
+            await sync_series(store, session, "trades", "linear", "BTCUSDT", None, 0, 1)
@@ -0,0 +1,250 @@
+"""Tests for idempotency module."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+from pybit.exceptions import InvalidRequestError
+
+from bybit_mcp_server import idempotency
+from bybit_mcp_server.client import get_session
+from bybit_mcp_server.idempotency import (
+    WriteLedger,
+    new_order_link_id,
+    submit_write,
+)
+from bybit_mcp_server.metrics import server_metrics
+
+OK = {"retCode": 0, "retMsg": "OK", "result": {"orderId": "1", "orderLinkId": "link"}}
+PARAMS = {"category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Market", "qty": "0.1"}
+AMEND = {"category": "linear", "symbol": "BTCUSDT", "orderId": "7"}
+
+
+def rejected(code, message="rejected"):
+    return InvalidRequestError(request="", message=message, status_code=code, time="", resp_headers={})
+
+
+def orders(*items):
+    return {"retCode": 0, "retMsg": "OK", "result": {"list": list(items)}}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setenv("BYBIT_WRITE_RETRY_BACKOFF", "0")
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.get_open_orders.return_value = orders()
+    session.get_order_history.return_value = orders()
+    return session
+
+
+class TestSubmitWrite:
+    @pytest.mark.asyncio
+    async def test_retries_transient(self, session):
+        session.cancel_all_orders.side_effect = [requests.exceptions.ReadTimeout(), rejected(10006), OK]
+        assert await submit_write(session.cancel_all_orders, {"category": "linear"}) == OK
+        assert session.cancel_all_orders.call_count == 3
+        assert server_metrics.snapshot()["endpoints"]["unknown"]["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retries(self, session, monkeypatch):
+        monkeypatch.setenv("BYBIT_WRITE_RETRIES", "2")
+        session.cancel_all_orders.side_effect = requests.exceptions.ConnectionError()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            await submit_write(session.cancel_all_orders, {"category": "linear"})
+        assert session.cancel_all_orders.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_rejection_not_retried(self, session):
+        session.cancel_all_orders.side_effect = rejected(110001)
+        with pytest.raises(InvalidRequestError):
+            await submit_write(session.cancel_all_orders, {"category": "linear"})
+        session.cancel_all_orders.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_landed_only_after_a_retry(self, session):
+        landed = MagicMock()
+        session.cancel_all_orders.side_effect = rejected(110001)
+
+        async def lookup():
+            landed()
+            return OK
+
+        with pytest.raises(InvalidRequestError):
+            await submit_write(session.cancel_all_orders, {}, lookup)
+        landed.assert_not_called()
+
+
+class TestPlaceOrder:
+    @pytest.mark.asyncio
+    async def test_generates_order_link_id(self, session):
+        session.place_order.return_value = OK
+        await idempotency.place_order(session, PARAMS)
+        link_id = session.place_order.call_args.kwargs["orderLinkId"]
+        assert link_id.startswith("mcp-") and len(link_id) == 36
+        assert new_order_link_id() != link_id
+
+    @pytest.mark.asyncio
+    async def test_retry_keeps_order_link_id(self, session):
+        session.place_order.side_effect = [requests.exceptions.ReadTimeout(), OK]
+        await idempotency.place_order(session, PARAMS)
+        first, second = (c.kwargs["orderLinkId"] for c in session.place_order.call_args_list)
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_duplicate_after_lost_reply_returns_order(self, session):
+        session.place_order.side_effect = [requests.exceptions.ReadTimeout(), rejected(110072, "duplicate")]
+        session.get_order_history.return_value = orders({"orderId": "42", "orderLinkId": "mine"})
+        response = await idempotency.place_order(session, {**PARAMS, "orderLinkId": "mine"})
+        assert response["result"] == {"orderId": "42", "orderLinkId": "mine"}
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_retried(self, session):
+        duplicate = rejected(110072, "duplicate")
+        session.place_order.side_effect = [requests.exceptions.ReadTimeout(), duplicate, duplicate]
+        session.get_open_orders.side_effect = [requests.exceptions.ConnectionError(), orders()]
+        session.get_order_history.return_value = orders({"orderId": "42", "orderLinkId": "mine"})
+        response = await idempotency.place_order(session, {**PARAMS, "orderLinkId": "mine"})
+        assert response["result"]["orderId"] == "42"
+        assert session.place_order.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_ledger_returns_recorded_response(self, session):
+        session.place_order.return_value = OK
+        params = {**PARAMS, "orderLinkId": "mine"}
+        assert await idempotency.place_order(session, params) == await idempotency.place_order(session, params)
+        session.place_order.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_ledger_rejects_reuse_for_other_order(self, session):
+        session.place_order.return_value = OK
+        await idempotency.place_order(session, {**PARAMS, "orderLinkId": "mine"})
+        with pytest.raises(ValueError, match="orderLinkId mine was already used"):
+            await idempotency.place_order(session, {**PARAMS, "qty": "0.2", "orderLinkId": "mine"})
+        session.place_order.assert_called_once()
+
+
+class TestAmendOrder:
+    @pytest.mark.asyncio
+    async def test_rejected_retry_matching_order_succeeds(self, session):
+        session.amend_order.side_effect = [requests.exceptions.ReadTimeout(), rejected(10001, "not modified")]
+        session.get_open_orders.return_value = orders({"orderId": "7", "orderLinkId": "", "price": "50000.0"})
+        response = await idempotency.amend_order(session, {**AMEND, "price": "50000"})
+        assert response["result"]["orderId"] == "7"
+
+    @pytest.mark.asyncio
+    async def test_rejected_retry_other_values_raises(self, session):
+        session.amend_order.side_effect = [requests.exceptions.ReadTimeout(), rejected(110001)]
+        session.get_open_orders.return_value = orders({"orderId": "7", "orderLinkId": "", "price": "49000"})
+        with pytest.raises(InvalidRequestError):
+            await idempotency.amend_order(session, {**AMEND, "price": "50000"})
+
+
+class TestCancelOrder:
+    @pytest.mark.asyncio
+    async def test_rejected_retry_cancelled_order_succeeds(self, session):
+        session.cancel_order.side_effect = [requests.exceptions.ConnectionError(), rejected(110001)]
+        session.get_order_history.return_value = orders({"orderId": "7", "orderLinkId": "", "orderStatus": "Cancelled"})
+        response = await idempotency.cancel_order(session, AMEND)
+        assert response["result"]["orderId"] == "7"
+
+
+class TestWriteLedger:
+    @pytest.mark.asyncio
+    async def test_concurrent_submissions_share_one_request(self):
+        ledger = WriteLedger()
+        calls = 0
+
+        async def submit():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return OK
+
+        results = await asyncio.gather(*(ledger.run(("", "a"), PARAMS, submit) for _ in range(5)))
+        assert calls == 1
+        assert all(result == OK for result in results)
+
+    @pytest.mark.asyncio
+    async def test_failure_not_recorded(self):
+        ledger = WriteLedger()
+
+        async def fail():
+            raise requests.exceptions.ConnectionError()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            await ledger.run(("", "a"), PARAMS, fail)
+        assert len(ledger) == 0
+
+    @pytest.mark.asyncio
+    async def test_expires_and_caps(self, monkeypatch):
+        ledger = WriteLedger(ttl=60, max_entries=2)
+        for key in "abc":
+            await ledger.run(("", key), PARAMS, lambda: asyncio.sleep(0, OK))
+        assert len(ledger) == 2
+        monkeypatch.setattr(idempotency.time, "monotonic", lambda: 1e12)
+        ledger._expire()
+        assert len(ledger) == 0
+
+
+class DroppingHandler(BaseHTTPRequestHandler):
+    """Places orders like Bybit, but closes the connection instead of answering the first one."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        link_id = body["orderLinkId"]
+        if link_id in server.orders:
+            self._send({"retCode": 110072, "retMsg": "OrderLinkedID is duplicate", "result": {}})
+            return
+        server.orders[link_id] = {"orderId": f"o{len(server.orders)}", "orderLinkId": link_id}
+        if len(server.orders) <= server.drop:
+            self.close_connection = True
+            return
+        self._send({"retCode": 0, "retMsg": "OK", "result": server.orders[link_id]})
+
+    def do_GET(self):  # noqa: N802
+        query = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        order = self.server.orders.get(query.get("orderLinkId"))
+        self._send({"retCode": 0, "retMsg": "OK", "result": {"list": [order] if order else []}})
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDroppedResponses:
+    @pytest.fixture
+    def stub(self, monkeypatch):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), DroppingHandler)
+        server.orders, server.drop = {}, 1
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        monkeypatch.setenv("BYBIT_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+        monkeypatch.setenv("BYBIT_API_KEY", "key")
+        monkeypatch.setenv("BYBIT_API_SECRET", "secret")
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.mark.asyncio
+    async def test_order_placed_once(self, stub):
+        response = await idempotency.place_order(get_session(), PARAMS)
+        assert len(stub.orders) == 1
+        assert response["result"] == next(iter(stub.orders.values()))
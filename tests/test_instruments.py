@@ -0,0 +1,87 @@
+"""Tests for instruments module."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from bybit_mcp_server.instruments import InstrumentIndex, InstrumentRegistry
+
+INSTRUMENTS = [
+    {"symbol": "BTCUSDT", "baseCoin": "BTC", "quoteCoin": "USDT", "status": "Trading"},
+    {"symbol": "ETHUSDT", "baseCoin": "ETH", "quoteCoin": "USDT", "status": "Trading"},
+    {"symbol": "BTCUSDC", "baseCoin": "BTC", "quoteCoin": "USDC", "status": "Closed"},
+]
+
+
+def page(items, cursor=""):
+    return {"retCode": 0, "retMsg": "OK", "result": {"list": items, "nextPageCursor": cursor}}
+
+
+class TestInstrumentIndex:
+    def test_lookup(self):
+        index = InstrumentIndex(INSTRUMENTS)
+        assert index.lookup("ETHUSDT")["baseCoin"] == "ETH"
+        assert index.lookup("XRPUSDT") is None
+
+    def test_filter_intersects_criteria(self):
+        index = InstrumentIndex(INSTRUMENTS)
+        assert [i["symbol"] for i in index.filter(baseCoin="BTC", status="Trading")] == ["BTCUSDT"]
+
+    def test_filter_without_criteria_returns_all_sorted(self):
+        index = InstrumentIndex(INSTRUMENTS)
+        assert [i["symbol"] for i in index.filter()] == ["BTCUSDC", "BTCUSDT", "ETHUSDT"]
+
+    def test_filter_unknown_value(self):
+        assert InstrumentIndex(INSTRUMENTS).filter(quoteCoin="EUR") == []
+
+
+class TestInstrumentRegistry:
+    @pytest.mark.asyncio
+    async def test_follows_cursor(self):
+        session = MagicMock()
+        session.get_instruments_info.side_effect = [page(INSTRUMENTS[:2], "next"), page(INSTRUMENTS[2:])]
+        index = await InstrumentRegistry(refresh_interval=60).get(session, "linear")
+        assert len(index.by_symbol) == 3
+        assert session.get_instruments_info.call_args.kwargs["cursor"] == "next"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_loads_share_one_fetch(self):
+        session = MagicMock()
+        session.get_instruments_info.return_value = page(INSTRUMENTS)
+        registry = InstrumentRegistry(refresh_interval=60)
+        first, second = await asyncio.gather(registry.get(session, "linear"), registry.get(session, "linear"))
+        assert first is second
+        session.get_instruments_info.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_index_served_while_refreshing(self):
+        session = MagicMock()
+        session.get_instruments_info.return_value = page(INSTRUMENTS)
+        registry = InstrumentRegistry(refresh_interval=0)
+        first = await registry.get(session, "linear")
+        assert await registry.get(session, "linear") is first
+        await asyncio.sleep(0.05)
+        assert await registry.get(session, "linear") is not first
+        assert session.get_instruments_info.call_count >= 2
+
+    @pytest.mark.asyncio
+    async def test_option_indexed_per_base_coin(self):
+        session = MagicMock()
+        session.get_instruments_info.return_value = page([])
+        registry = InstrumentRegistry(refresh_interval=60)
+        await registry.get(session, "option")
+        await registry.get(session, "option", "ETH")
+        assert [c.kwargs.get("baseCoin") for c in session.get_instruments_info.call_args_list] == ["BTC", "ETH"]
+
+    @pytest.mark.asyncio
+    async def test_indexed_per_endpoint(self):
+        mainnet = MagicMock(endpoint="https://api.bybit.com")
+        testnet = MagicMock(endpoint="https://api-testnet.bybit.com")
+        mainnet.get_instruments_info.return_value = page(INSTRUMENTS)
+        testnet.get_instruments_info.return_value = page(INSTRUMENTS[:1])
+        registry = InstrumentRegistry(refresh_interval=60)
+        assert len((await registry.get(mainnet, "linear")).by_symbol) == 3
+        assert len((await registry.get(testnet, "linear")).by_symbol) == 1
+        assert len((await registry.get(mainnet, "linear")).by_symbol) == 3
+        mainnet.get_instruments_info.assert_called_once()
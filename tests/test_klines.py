@@ -0,0 +1,132 @@
+"""Tests for klines module."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bybit_mcp_server.klines import (
+    align,
+    fetch_bars,
+    fetch_range,
+    find_gaps,
+    merge_bars,
+    split_range,
+    to_columns,
+)
+
+MINUTE = 60_000
+
+
+def bar(ts, close="1"):
+    return [str(ts), "1", "2", "0.5", close, "10", "100"]
+
+
+def kline_session(missing=()):
+    """Mock session whose get_kline serves 1-minute bars newest first, like Bybit."""
+
+    def get_kline(category, symbol, interval, start, end, limit):
+        starts = [ts for ts in range(align(start, MINUTE), end + 1, MINUTE) if ts not in missing][:limit]
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": [bar(ts) for ts in reversed(starts)]}}
+
+    session = MagicMock()
+    session.get_kline.side_effect = get_kline
+    return session
+
+
+class TestSplitRange:
+    def test_chunks_cover_window(self):
+        assert split_range(0, 450 * MINUTE, MINUTE) == [
+            (0, 199 * MINUTE),
+            (200 * MINUTE, 399 * MINUTE),
+            (400 * MINUTE, 450 * MINUTE),
+        ]
+
+    def test_aligns_start(self):
+        assert split_range(30_000, 90_000, MINUTE) == [(0, 90_000)]
+
+    def test_weekly_bars_align_to_monday(self):
+        monday = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+        assert align(monday + 3 * 86_400_000, 604_800_000) == monday
+
+
+class TestMergeBars:
+    def test_dedupes_sorts_and_clips(self):
+        pages = [[bar(2 * MINUTE), bar(MINUTE)], [bar(3 * MINUTE), bar(2 * MINUTE, close="9")]]
+        merged = merge_bars(pages, MINUTE, 2 * MINUTE)
+        assert [b[0] for b in merged] == [str(MINUTE), str(2 * MINUTE)]
+
+
+class TestFindGaps:
+    def test_no_gaps(self):
+        assert find_gaps([0, MINUTE, 2 * MINUTE], MINUTE, 0, 2 * MINUTE) == []
+
+    def test_inner_leading_and_trailing_gaps(self):
+        starts = [MINUTE, 4 * MINUTE]
+        assert find_gaps(starts, MINUTE, 0, 6 * MINUTE) == [
+            [0, 0],
+            [2 * MINUTE, 3 * MINUTE],
+            [5 * MINUTE, 6 * MINUTE],
+        ]
+
+
+class TestToColumns:
+    def test_columnar(self):
+        columns = to_columns([bar(0), bar(MINUTE)])
+        assert columns["start"] == [0, MINUTE]
+        assert columns["close"] == [1.0, 1.0]
+        assert set(columns) == {"start", "open", "high", "low", "close", "volume", "turnover"}
+
+
+class TestFetchBars:
+    @pytest.mark.asyncio
+    async def test_fetches_all_chunks(self):
+        session = kline_session()
+        bars = await fetch_bars(session, "linear", "BTCUSDT", "1", 0, 999 * MINUTE, concurrency=3)
+        assert len(bars) == 1000
+        assert session.get_kline.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency(self):
+        in_flight, peak = 0, 0
+
+        async def fake_call(method, **params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return method(**params)
+
+        session = kline_session()
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("bybit_mcp_server.klines.call", fake_call)
+            await fetch_bars(session, "linear", "BTCUSDT", "1", 0, 1999 * MINUTE, concurrency=2)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_unsupported_interval(self):
+        with pytest.raises(ValueError):
+            await fetch_bars(MagicMock(), "linear", "BTCUSDT", "M", 0, MINUTE, concurrency=1)
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_window(self):
+        with pytest.raises(ValueError):
+            await fetch_bars(MagicMock(), "linear", "BTCUSDT", "1", 0, 10**12, concurrency=1)
+
+
+class TestFetchRange:
+    @pytest.mark.asyncio
+    async def test_reports_gaps(self):
+        session = kline_session(missing={5 * MINUTE, 6 * MINUTE})
+        payload = await fetch_range(session, "linear", "BTCUSDT", "1", 0, 9 * MINUTE, concurrency=1)
+        assert payload["count"] == 8
+        assert payload["gaps"] == [[5 * MINUTE, 6 * MINUTE]]
+
+    @pytest.mark.asyncio
+    async def test_clamps_end_to_now(self):
+        now = int(time.time() * 1000)
+        session = kline_session()
+        payload = await fetch_range(session, "linear", "BTCUSDT", "1", now - 5 * MINUTE, now + 60 * MINUTE, 1)
+        assert payload["gaps"] == []
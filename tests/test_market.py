@@ -1,11 +1,13 @@
 """Tests for market tools."""
 
 import json
+import time
 
 import pytest
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
 
-from bybit_mcp_server.tools.market import register_market_tools
+from bybit_mcp_server.tools.market import CACHE_TTLS, CLOSED_WINDOW_TTL, _window_ttl, register_market_tools
 
 
 @pytest.fixture
@@ -37,6 +39,94 @@ class TestGetTickers:
         patch_session.get_tickers.assert_called_once_with(category="spot")
 
 
+class TestOutputFormat:
+    @pytest.mark.asyncio
+    async def test_table_per_call(self, mcp_app, patch_session):
+        result = await mcp_app.call_tool("get_tickers", {"category": "spot", "output_format": "table"})
+        data = json.loads(result[0][0].text)
+        assert data["list"] == {"columns": ["symbol", "lastPrice"], "rows": [["BTCUSDT", "50000"]]}
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_format(self, mcp_app, patch_session):
+        with pytest.raises(ToolError):
+            await mcp_app.call_tool("get_tickers", {"category": "spot", "output_format": "xml"})
+
+
+class TestListQuery:
+    @pytest.fixture
+    def tickers(self, patch_session):
+        patch_session.get_tickers.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {
+                "category": "linear",
+                "list": [
+                    {"symbol": "BTCUSDT", "lastPrice": "50000", "turnover24h": "900000000"},
+                    {"symbol": "ETHUSDT", "lastPrice": "3000", "turnover24h": "400000000"},
+                    {"symbol": "DOGEUSDT", "lastPrice": "0.1", "turnover24h": "1000"},
+                ],
+            },
+        }
+        return patch_session
+
+    @pytest.mark.asyncio
+    async def test_filter_sort_top_fields(self, mcp_app, tickers):
+        args = {
+            "category": "linear",
+            "fields": ["symbol", "turnover24h"],
+            "filters": ["turnover24h > 1e6"],
+            "sort_by": "turnover24h",
+            "top": 1,
+        }
+        result = await mcp_app.call_tool("get_tickers", args)
+        data = json.loads(result[0][0].text)
+        assert data["list"] == [{"symbol": "ETHUSDT", "turnover24h": "400000000"}]
+        assert data["matched"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_response_is_not_modified(self, mcp_app, tickers):
+        await mcp_app.call_tool("get_tickers", {"category": "linear", "fields": ["symbol"], "top": 1})
+        result = await mcp_app.call_tool("get_tickers", {"category": "linear"})
+        data = json.loads(result[0][0].text)
+        assert len(data["list"]) == 3
+        assert "lastPrice" in data["list"][0]
+        tickers.get_tickers.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_filter_skips_request(self, mcp_app, tickers):
+        result = await mcp_app.call_tool("get_tickers", {"category": "linear", "filters": ["turnover24h"]})
+        assert "error" in json.loads(result[0][0].text)
+        tickers.get_tickers.assert_not_called()
+
+
+class TestMarketCache:
+    @pytest.mark.asyncio
+    async def test_repeated_call_is_cached(self, mcp_app, patch_session):
+        await mcp_app.call_tool("get_tickers", {"category": "spot", "symbol": "BTCUSDT"})
+        await mcp_app.call_tool("get_tickers", {"category": "spot", "symbol": "BTCUSDT"})
+        patch_session.get_tickers.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_different_params_miss(self, mcp_app, patch_session):
+        await mcp_app.call_tool("get_tickers", {"category": "spot", "symbol": "BTCUSDT"})
+        await mcp_app.call_tool("get_tickers", {"category": "spot", "symbol": "ETHUSDT"})
+        assert patch_session.get_tickers.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_kline_is_not_cached(self, mcp_app, patch_session):
+        params = {"category": "linear", "symbol": "BTCUSDT", "interval": "1"}
+        await mcp_app.call_tool("get_kline", params)
+        await mcp_app.call_tool("get_kline", params)
+        assert patch_session.get_kline.call_count == 2
+
+    def test_closed_window_ttl(self):
+        past = int(time.time() * 1000) - 60_000
+        future = int(time.time() * 1000) + 60_000
+        assert _window_ttl("get_funding_rate_history", past) == CLOSED_WINDOW_TTL
+        assert _window_ttl("get_funding_rate_history", future) == CACHE_TTLS["get_funding_rate_history"]
+        assert _window_ttl("get_funding_rate_history", None) == CACHE_TTLS["get_funding_rate_history"]
+
+
 class TestGetKline:
     @pytest.mark.asyncio
     async def test_required_params(self, mcp_app, patch_session):
@@ -55,6 +145,118 @@ class TestGetKline:
         )
 
 
+class TestGetKlineRange:
+    @pytest.mark.asyncio
+    async def test_returns_columns(self, mcp_app, patch_session):
+        patch_session.get_kline.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"list": [["120000", "2", "3", "1", "2", "5", "10"], ["60000", "1", "2", "1", "2", "5", "10"]]},
+        }
+        result = await mcp_app.call_tool(
+            "get_kline_range",
+            {"category": "linear", "symbol": "BTCUSDT", "interval": "1", "start": 60000, "end": 180000},
+        )
+        data = json.loads(result[0][0].text)
+        assert data["bars"]["start"] == [60000, 120000]
+        assert data["gaps"] == [[180000, 180000]]
+
+    @pytest.mark.asyncio
+    async def test_unsupported_interval(self, mcp_app, patch_session):
+        result = await mcp_app.call_tool(
+            "get_kline_range",
+            {"category": "linear", "symbol": "BTCUSDT", "interval": "M", "start": 0, "end": 1},
+        )
+        assert "error" in json.loads(result[0][0].text)
+
+
+class TestGetKlineAnalytics:
+    ARGS = {"category": "linear", "symbol": "BTCUSDT", "interval": "1", "start": 60000, "end": 120000}
+
+    @pytest.fixture
+    def klines(self, patch_session):
+        patch_session.get_kline.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"list": [["120000", "2", "3", "1", "2", "5", "10"], ["60000", "1", "2", "1", "2", "5", "10"]]},
+        }
+        return patch_session
+
+    @pytest.mark.asyncio
+    async def test_returns_summary_only(self, mcp_app, klines):
+        pytest.importorskip("numpy")
+        args = {**self.ARGS, "indicators": ["vwap", "ema"], "period": 2}
+        result = await mcp_app.call_tool("get_kline_analytics", args)
+        data = json.loads(result[0][0].text)
+        assert (data["count"], data["first"], data["last"], data["close"]) == (2, 60000, 120000, 2.0)
+        assert data["vwap"] == pytest.approx(11 / 6)
+        assert data["ema"] == 2.0
+        assert "bars" not in data and "atr" not in data
+
+    @pytest.mark.asyncio
+    async def test_closed_window_cached(self, mcp_app, klines):
+        pytest.importorskip("numpy")
+        first = await mcp_app.call_tool("get_kline_analytics", self.ARGS)
+        second = await mcp_app.call_tool("get_kline_analytics", self.ARGS)
+        assert first[0][0].text == second[0][0].text
+        assert klines.get_kline.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_indicator(self, mcp_app, klines):
+        result = await mcp_app.call_tool("get_kline_analytics", {**self.ARGS, "indicators": ["rsi"]})
+        assert "rsi" in json.loads(result[0][0].text)["error"]
+        klines.get_kline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_without_numpy(self, mcp_app, klines, monkeypatch):
+        monkeypatch.setattr("bybit_mcp_server.analytics.np", None)
+        result = await mcp_app.call_tool("get_kline_analytics", self.ARGS)
+        assert "NumPy" in json.loads(result[0][0].text)["error"]
+
+
+class TestHistoryStore:
+    @pytest.fixture
+    def history(self, patch_session, monkeypatch, tmp_path):
+        monkeypatch.setenv("BYBIT_HISTORY_DB", str(tmp_path / "history.db"))
+        patch_session.endpoint = "https://api-testnet.bybit.com"
+        patch_session.get_kline.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"list": [["120000", "2", "3", "1", "2", "5", "10"], ["60000", "1", "2", "1", "2", "5", "10"]]},
+        }
+        return patch_session
+
+    @pytest.mark.asyncio
+    async def test_kline_window_served_from_store(self, mcp_app, history):
+        args = {"category": "linear", "symbol": "BTCUSDT", "interval": "1", "start": 60000, "end": 120000}
+        first = await mcp_app.call_tool("get_kline", args)
+        second = await mcp_app.call_tool("get_kline", args)
+        assert first[0][0].text == second[0][0].text
+        assert [b[0] for b in json.loads(second[0][0].text)["list"]] == ["120000", "60000"]
+        assert history.get_kline.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_kline_without_window_uses_rest(self, mcp_app, history):
+        await mcp_app.call_tool("get_kline", {"category": "linear", "symbol": "BTCUSDT", "interval": "1"})
+        await mcp_app.call_tool("get_kline", {"category": "linear", "symbol": "BTCUSDT", "interval": "1"})
+        assert history.get_kline.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_and_compact(self, mcp_app, history):
+        result = await mcp_app.call_tool(
+            "sync_history", {"category": "linear", "symbol": "BTCUSDT", "kind": "funding", "start": 0}
+        )
+        assert json.loads(result[0][0].text)["kind"] == "funding"
+        result = await mcp_app.call_tool("compact_history", {})
+        assert "bytes_after" in json.loads(result[0][0].text)
+
+    @pytest.mark.asyncio
+    async def test_sync_requires_store(self, mcp_app, patch_session, monkeypatch):
+        monkeypatch.delenv("BYBIT_HISTORY_DB", raising=False)
+        result = await mcp_app.call_tool("sync_history", {"category": "linear", "symbol": "BTCUSDT", "start": 0})
+        assert "error" in json.loads(result[0][0].text)
+
+
 class TestGetInstrumentsInfo:
     @pytest.mark.asyncio
     async def test_basic(self, mcp_app, patch_session):
@@ -62,6 +264,50 @@ class TestGetInstrumentsInfo:
         patch_session.get_instruments_info.assert_called_once_with(category="spot")
 
 
+class TestFindInstruments:
+    @pytest.fixture
+    def instruments(self, patch_session):
+        patch_session.get_instruments_info.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {
+                "category": "linear",
+                "list": [
+                    {"symbol": "BTCUSDT", "baseCoin": "BTC", "quoteCoin": "USDT", "status": "Trading"},
+                    {"symbol": "ETHUSDT", "baseCoin": "ETH", "quoteCoin": "USDT", "status": "Trading"},
+                    {"symbol": "BTCPERP", "baseCoin": "BTC", "quoteCoin": "USDC", "status": "Trading"},
+                ],
+                "nextPageCursor": "",
+            },
+        }
+        return patch_session
+
+    @pytest.mark.asyncio
+    async def test_symbol_lookup(self, mcp_app, instruments):
+        result = await mcp_app.call_tool("find_instruments", {"category": "linear", "symbol": "ETHUSDT"})
+        data = json.loads(result[0][0].text)
+        assert [i["symbol"] for i in data["list"]] == ["ETHUSDT"]
+
+    @pytest.mark.asyncio
+    async def test_filter_and_limit(self, mcp_app, instruments):
+        result = await mcp_app.call_tool("find_instruments", {"category": "linear", "baseCoin": "BTC", "limit": 1})
+        data = json.loads(result[0][0].text)
+        assert data["total"] == 2
+        assert [i["symbol"] for i in data["list"]] == ["BTCPERP"]
+
+    @pytest.mark.asyncio
+    async def test_fields(self, mcp_app, instruments):
+        result = await mcp_app.call_tool("find_instruments", {"category": "linear", "fields": ["symbol"]})
+        data = json.loads(result[0][0].text)
+        assert data["list"] == [{"symbol": "BTCPERP"}, {"symbol": "BTCUSDT"}, {"symbol": "ETHUSDT"}]
+
+    @pytest.mark.asyncio
+    async def test_index_is_reused(self, mcp_app, instruments):
+        await mcp_app.call_tool("find_instruments", {"category": "linear", "symbol": "BTCUSDT"})
+        await mcp_app.call_tool("find_instruments", {"category": "linear", "quoteCoin": "USDT"})
+        instruments.get_instruments_info.assert_called_once_with(category="linear", limit=1000)
+
+
 class TestGetOrderbook:
     @pytest.mark.asyncio
     async def test_basic(self, mcp_app, patch_session):
@@ -92,3 +338,62 @@ class TestGetOpenInterest:
         patch_session.get_open_interest.assert_called_once_with(
             category="linear", symbol="BTCUSDT", intervalTime="1h",
         )
+
+
+class TestGetMarketSnapshot:
+    @pytest.mark.asyncio
+    async def test_merges_per_symbol(self, mcp_app, patch_session):
+        result = await mcp_app.call_tool("get_market_snapshot", {
+            "category": "linear", "symbols": ["BTCUSDT", "ETHUSDT"],
+        })
+        data = json.loads(result[0][0].text)
+        assert [row["symbol"] for row in data["list"]] == ["BTCUSDT", "ETHUSDT"]
+        row = data["list"][0]
+        assert set(row) == {"symbol", "ticker", "orderbook", "funding", "open_interest"}
+        assert data["failed"] == 0
+        assert patch_session.get_orderbook.call_count == 2
+        patch_session.get_open_interest.assert_any_call(
+            category="linear", symbol="ETHUSDT", intervalTime="5min", limit=1,
+        )
+
+    @pytest.mark.asyncio
+    async def test_item_errors_are_isolated(self, mcp_app, patch_session):
+        patch_session.get_funding_rate_history.side_effect = RuntimeError("boom")
+        result = await mcp_app.call_tool("get_market_snapshot", {
+            "category": "linear", "symbols": ["BTCUSDT"], "kinds": ["ticker", "funding"],
+        })
+        data = json.loads(result[0][0].text)
+        assert data["list"][0]["errors"] == {"funding": "boom"}
+        assert data["list"][0]["ticker"]["lastPrice"] == "50000"
+        assert data["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unsupported_kind_for_category(self, mcp_app, patch_session):
+        result = await mcp_app.call_tool("get_market_snapshot", {
+            "category": "spot", "symbols": ["BTCUSDT"], "kinds": ["open_interest"],
+        })
+        data = json.loads(result[0][0].text)
+        assert data["list"][0]["errors"] == {"open_interest": "open_interest is not available for spot"}
+        patch_session.get_open_interest.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind(self, mcp_app, patch_session):
+        result = await mcp_app.call_tool("get_market_snapshot", {
+            "category": "linear", "symbols": ["BTCUSDT"], "kinds": ["volume"],
+        })
+        assert "error" in json.loads(result[0][0].text)
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently(self, mcp_app, patch_session):
+        response = patch_session.get_orderbook.return_value
+
+        def slow(**params):
+            time.sleep(0.1)
+            return response
+
+        patch_session.get_orderbook.side_effect = slow
+        started = time.perf_counter()
+        await mcp_app.call_tool("get_market_snapshot", {
+            "category": "linear", "symbols": ["A", "B", "C", "D", "E"], "kinds": ["orderbook"],
+        })
+        assert time.perf_counter() - started < 0.3
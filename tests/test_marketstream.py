@@ -0,0 +1,107 @@
+"""Tests for streamed tickers and trade buffers."""
+
+import pytest
+
+from bybit_mcp_server.marketstream import MarketStreams, Ticker, TradeBuffer, trade_from_stream
+
+
+def stream_trade(exec_id, ts, price="50000", size="0.1"):
+    return {"T": ts, "s": "BTCUSDT", "S": "Buy", "v": size, "p": price, "L": "PlusTick", "i": exec_id, "BT": False}
+
+
+def rest_trade(exec_id, ts):
+    return {
+        "execId": exec_id,
+        "symbol": "BTCUSDT",
+        "price": "50000",
+        "size": "0.1",
+        "side": "Buy",
+        "time": str(ts),
+        "isBlockTrade": False,
+    }
+
+
+class TestTradeFromStream:
+    def test_renames_keys(self):
+        row = trade_from_stream(stream_trade("a", 1000))
+        assert row["execId"] == "a"
+        assert row["time"] == "1000"
+        assert row["price"] == "50000"
+        assert row["side"] == "Buy"
+
+
+class TestTicker:
+    def test_delta_before_snapshot_is_ignored(self):
+        ticker = Ticker("linear", "BTCUSDT")
+        ticker.apply({"type": "delta", "data": {"lastPrice": "1"}})
+        assert ticker.response() is None
+
+    def test_delta_merges_into_snapshot(self):
+        ticker = Ticker("linear", "BTCUSDT")
+        ticker.apply({"type": "snapshot", "ts": 1, "data": {"symbol": "BTCUSDT", "lastPrice": "1", "bid1Price": "0.9"}})
+        ticker.apply({"type": "delta", "ts": 2, "data": {"symbol": "BTCUSDT", "lastPrice": "2"}})
+        response = ticker.response()
+        assert response["result"]["list"] == [{"symbol": "BTCUSDT", "lastPrice": "2", "bid1Price": "0.9"}]
+        assert response["time"] == 2
+
+
+class TestTradeBuffer:
+    def test_bounded(self):
+        buffer = TradeBuffer("linear", "BTCUSDT", maxlen=3)
+        buffer.apply({"data": [stream_trade(str(i), i) for i in range(5)]})
+        assert [t["execId"] for t in buffer.trades] == ["2", "3", "4"]
+
+    def test_seed_merges_and_dedupes(self):
+        buffer = TradeBuffer("linear", "BTCUSDT", maxlen=10)
+        buffer.apply({"data": [stream_trade("c", 3), stream_trade("d", 4)]})
+        buffer.seed([rest_trade("c", 3), rest_trade("b", 2), rest_trade("a", 1)], generation=0, requested=3)
+        assert [t["execId"] for t in buffer.trades] == ["a", "b", "c", "d"]
+
+    def test_latest_needs_enough_trades(self):
+        buffer = TradeBuffer("linear", "BTCUSDT", maxlen=10)
+        buffer.seed([rest_trade("b", 2), rest_trade("a", 1)], generation=0, requested=2)
+        assert [t["execId"] for t in buffer.latest(2)] == ["b", "a"]
+        assert buffer.latest(3) is None
+
+    def test_short_seed_is_exhaustive(self):
+        buffer = TradeBuffer("linear", "BTCUSDT", maxlen=10)
+        buffer.seed([rest_trade("a", 1)], generation=0, requested=5)
+        assert [t["execId"] for t in buffer.latest(5)] == ["a"]
+
+
+class TestMarketStreams:
+    def test_subscribes_topics(self, fake_streams):
+        streams = MarketStreams(fake_streams)
+        streams.subscribe("linear", "BTCUSDT")
+        assert fake_streams.get("linear").topics() == ["publicTrade.BTCUSDT", "tickers.BTCUSDT"]
+
+    def test_option_trades_rejected(self, fake_streams):
+        with pytest.raises(ValueError):
+            MarketStreams(fake_streams).subscribe("option", "BTC-30DEC25-80000-C")
+
+    def test_ticker_not_served_while_disconnected(self, fake_streams):
+        streams = MarketStreams(fake_streams)
+        streams.subscribe("linear", "BTCUSDT", trades=False)
+        stream = fake_streams.get("linear")
+        stream._on_message({"topic": "tickers.BTCUSDT", "type": "snapshot", "data": {"symbol": "BTCUSDT"}})
+        assert streams.get_ticker("linear", "BTCUSDT") is not None
+        stream._ws.connected = False
+        assert streams.get_ticker("linear", "BTCUSDT") is None
+
+    def test_reconnect_requires_reseed(self, fake_streams):
+        streams = MarketStreams(fake_streams)
+        streams.subscribe("linear", "BTCUSDT", tickers=False)
+        assert streams.needs_seed("linear", "BTCUSDT")
+        streams._trades[("linear", "BTCUSDT")].seed([rest_trade("a", 1)], generation=0, requested=5)
+        assert streams.get_trades("linear", "BTCUSDT")["result"]["list"][0]["execId"] == "a"
+
+        fake_streams.get("linear")._ws.reconnects = 1
+        assert streams.needs_seed("linear", "BTCUSDT")
+        assert streams.get_trades("linear", "BTCUSDT") is None
+
+    def test_unsubscribe(self, fake_streams):
+        streams = MarketStreams(fake_streams)
+        streams.subscribe("linear", "BTCUSDT")
+        assert streams.unsubscribe("linear", "BTCUSDT") is True
+        assert fake_streams.get("linear")._ws.unsubscribed == ["tickers.BTCUSDT", "publicTrade.BTCUSDT"]
+        assert streams.unsubscribe("linear", "BTCUSDT") is False
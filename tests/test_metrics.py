@@ -0,0 +1,112 @@
+"""Tests for tool and endpoint metrics."""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from bybit_mcp_server.metrics import (
+    LATENCY_BOUNDS,
+    Histogram,
+    MetricsServer,
+    ServerMetrics,
+    endpoint_name,
+    is_error_response,
+)
+
+
+class TestHistogram:
+    def test_empty(self):
+        assert Histogram(LATENCY_BOUNDS).summary() == {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+
+    def test_percentiles_within_a_bucket(self):
+        histogram = Histogram(LATENCY_BOUNDS)
+        for i in range(1, 1001):
+            histogram.observe(i / 1000)
+        for pct in (50, 95, 99):
+            assert histogram.percentile(pct) == pytest.approx(pct / 100, rel=0.42)
+        assert histogram.max == 1.0
+
+    def test_overflow_bucket_ends_at_max(self):
+        histogram = Histogram((1.0, 2.0))
+        histogram.observe(10.0)
+        assert 2.0 < histogram.percentile(99) <= histogram.percentile(100) == 10.0
+
+    def test_prometheus_buckets_are_cumulative(self):
+        histogram = Histogram((1.0, 2.0))
+        histogram.observe(0.5)
+        histogram.observe(1.5)
+        assert histogram.prometheus("x", 'a="b"') == [
+            'x_bucket{a="b",le="1.0"} 1',
+            'x_bucket{a="b",le="2.0"} 2',
+            'x_bucket{a="b",le="+Inf"} 2',
+            'x_sum{a="b"} 2.0',
+            'x_count{a="b"} 2',
+        ]
+
+
+class TestServerMetrics:
+    def test_snapshot(self):
+        metrics = ServerMetrics()
+        metrics.observe_tool("get_tickers", 0.01, 200, False)
+        metrics.observe_tool("get_tickers", 0.02, 300, True)
+        metrics.observe_endpoint("get_tickers", "market", 0.005, 0, False)
+        metrics.observe_endpoint("get_tickers", "market", 0.005, 10001, False)
+        metrics.observe_endpoint("get_tickers", "market", 0.005, None, True)
+        data = metrics.snapshot()
+        assert data["tools"]["get_tickers"]["calls"] == 2
+        assert data["tools"]["get_tickers"]["errors"] == 1
+        assert data["tools"]["get_tickers"]["response_bytes"]["total"] == 500
+        assert data["endpoints"]["get_tickers"]["retCodes"] == {"0": 1, "10001": 1}
+        assert data["endpoints"]["get_tickers"]["errors"] == 1
+
+    def test_prometheus(self):
+        metrics = ServerMetrics()
+        metrics.observe_tool("get_tickers", 0.01, 200, False)
+        metrics.observe_endpoint("get_tickers", "market", 0.005, 0, False)
+        text = metrics.prometheus()
+        assert 'bybit_mcp_tool_latency_seconds_count{tool="get_tickers"} 1' in text
+        assert 'bybit_mcp_endpoint_ret_codes_total{endpoint="get_tickers",ret_code="0"} 1' in text
+        assert "# TYPE bybit_mcp_tool_response_bytes histogram" in text
+
+    def test_events(self):
+        metrics = ServerMetrics()
+        metrics.observe_event("get_tickers", "market", "retries")
+        metrics.observe_event("get_tickers", "market", "retries")
+        metrics.observe_event("get_tickers", "market", "hedges")
+        data = metrics.snapshot()["endpoints"]["get_tickers"]
+        assert (data["calls"], data["retries"], data["hedges"], data["shortCircuited"]) == (0, 2, 1, 0)
+        text = metrics.prometheus()
+        assert 'bybit_mcp_endpoint_retries_total{endpoint="get_tickers"} 2' in text
+        assert "# TYPE bybit_mcp_endpoint_short_circuited_total counter" in text
+
+
+class TestHelpers:
+    def test_is_error_response(self):
+        assert is_error_response('{"error": "x"}')
+        assert is_error_response('{\n  "error": "x"\n}')
+        assert not is_error_response('{"list": [{"error": "x"}]}')
+        assert not is_error_response(None)
+
+    def test_endpoint_name(self):
+        class Session:
+            def get_tickers(self):
+                pass
+
+        assert endpoint_name(Session().get_tickers) == "get_tickers"
+
+
+class TestMetricsServer:
+    def test_serves_prometheus_text(self):
+        metrics = ServerMetrics()
+        metrics.observe_tool("get_tickers", 0.01, 200, False)
+        server = MetricsServer(metrics, 0).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain")
+                assert b'tool="get_tickers"' in response.read()
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other", timeout=5)
+        finally:
+            server.stop()
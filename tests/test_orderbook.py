@@ -0,0 +1,109 @@
+"""Tests for orderbook module, replaying recorded stream messages."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bybit_mcp_server.orderbook import OrderBook, OrderBookEngine
+
+REPLAY = Path(__file__).parent / "fixtures" / "orderbook_linear_btcusdt.jsonl"
+
+
+def replay() -> list[dict]:
+    return [json.loads(line) for line in REPLAY.read_text().splitlines()]
+
+
+@pytest.fixture
+def engine(fake_streams):
+    return OrderBookEngine(fake_streams)
+
+
+def feed(engine, messages, category="linear"):
+    stream = engine.hub.get(category)
+    for message in messages:
+        stream._on_message(message)
+    return stream._ws
+
+
+class TestOrderBook:
+    def test_snapshot_and_deltas(self):
+        book = OrderBook("linear", "BTCUSDT", 50)
+        for message in replay()[:4]:
+            assert book.apply(message)
+        snapshot = book.snapshot()
+        assert snapshot["b"] == [["50000.2", "0.3"], ["50000.0", "1.5"], ["49999.0", "3.1"]]
+        assert snapshot["a"] == [["50000.4", "0.9"], ["50001.0", "2.0"], ["50002.0", "1.0"], ["50003.0", "4.0"]]
+        assert snapshot["u"] == 1003
+        assert snapshot["ts"] == 1700000000060
+
+    def test_gap_marks_out_of_sync(self):
+        book = OrderBook("linear", "BTCUSDT", 50)
+        messages = replay()
+        for message in messages[:4]:
+            book.apply(message)
+        assert not book.apply(messages[4])
+        assert not book.synced
+        # Deltas are ignored until the next snapshot.
+        assert book.apply(messages[5])
+        assert book.update_id == 1003
+        assert book.apply(messages[6]) and book.synced
+        assert book.apply(messages[7])
+        assert book.snapshot(1)["b"] == [["50000.1", "0.4"]]
+
+    def test_crossed_book_is_out_of_sync(self):
+        book = OrderBook("linear", "BTCUSDT", 50)
+        book.apply(replay()[0])
+        crossed = {"type": "delta", "data": {"b": [["50001.0", "1"]], "a": [], "u": 1001}}
+        assert not book.apply(crossed)
+
+    def test_update_id_one_replaces_book(self):
+        book = OrderBook("linear", "BTCUSDT", 50)
+        book.apply(replay()[0])
+        restart = {"type": "delta", "data": {"b": [["1.0", "1"]], "a": [["2.0", "1"]], "u": 1}}
+        assert book.apply(restart)
+        assert book.snapshot()["b"] == [["1.0", "1"]]
+
+
+class TestOrderBookEngine:
+    def test_serves_synced_book(self, engine):
+        engine.subscribe("linear", "BTCUSDT")
+        assert engine.get("linear", "BTCUSDT") is None
+        feed(engine, replay()[:2])
+        book = engine.get("linear", "BTCUSDT", 2)
+        assert book["b"] == [["50000.0", "1.5"], ["49999.5", "0.8"]]
+
+    def test_gap_triggers_resubscribe(self, engine):
+        engine.subscribe("linear", "BTCUSDT")
+        ws = feed(engine, replay()[:5])
+        assert ws.sent == [
+            {"op": "unsubscribe", "args": ["orderbook.50.BTCUSDT"]},
+            {"op": "subscribe", "args": ["orderbook.50.BTCUSDT"]},
+        ]
+        assert engine.get("linear", "BTCUSDT") is None
+        assert engine.status()[0]["resyncs"] == 1
+        feed(engine, replay()[6:])
+        assert engine.get("linear", "BTCUSDT")["u"] == 1011
+
+    def test_not_served_when_disconnected_or_too_shallow(self, engine):
+        engine.subscribe("linear", "BTCUSDT", depth=1)
+        ws = feed(engine, [{**replay()[0], "topic": "orderbook.1.BTCUSDT"}])
+        assert engine.get("linear", "BTCUSDT", 1) is not None
+        assert engine.get("linear", "BTCUSDT", 25) is None
+        ws.connected = False
+        assert engine.get("linear", "BTCUSDT", 1) is None
+
+    def test_unsubscribe(self, engine):
+        engine.subscribe("linear", "BTCUSDT")
+        assert engine.unsubscribe("linear", "BTCUSDT")
+        assert engine.hub.get("linear")._ws.unsubscribed == ["orderbook.50.BTCUSDT"]
+        assert not engine.unsubscribe("linear", "BTCUSDT")
+
+    def test_rejects_bad_depth(self, engine):
+        with pytest.raises(ValueError):
+            engine.subscribe("spot", "BTCUSDT", depth=500)
+
+    def test_other_topics_are_ignored(self, engine):
+        engine.subscribe("linear", "BTCUSDT")
+        feed(engine, [{**replay()[0], "topic": "orderbook.50.ETHUSDT"}])
+        assert engine.get("linear", "BTCUSDT") is None
@@ -5,7 +5,7 @@ import json
 import pytest
 from mcp.server.fastmcp import FastMCP
 
-from bybit_mcp_server.decorators import _pending_confirmations
+from bybit_mcp_server.confirmations import get_confirmation_store
 from bybit_mcp_server.tools.position import register_position_tools
 
 
@@ -18,9 +18,9 @@ def mcp_app(patch_session):
 
 @pytest.fixture(autouse=True)
 def clear_pending():
-    _pending_confirmations.clear()
+    get_confirmation_store().clear()
     yield
-    _pending_confirmations.clear()
+    get_confirmation_store().clear()
 
 
 class TestGetPositions:
@@ -30,6 +30,17 @@ class TestGetPositions:
         data = json.loads(result[0][0].text)
         assert "list" in data
 
+    @pytest.mark.asyncio
+    async def test_sort_and_top(self, mcp_app, patch_session):
+        patch_session.get_positions.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"list": [{"symbol": "A", "unrealisedPnl": "-5"}, {"symbol": "B", "unrealisedPnl": "12"}]},
+        }
+        args = {"category": "linear", "sort_by": "-unrealisedPnl", "top": 1}
+        result = await mcp_app.call_tool("get_positions", args)
+        assert [p["symbol"] for p in json.loads(result[0][0].text)["list"]] == ["B"]
+
 
 class TestGetClosedPnl:
     @pytest.mark.asyncio
@@ -0,0 +1,115 @@
+"""Tests for ratelimit module."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from pybit.unified_trading import HTTP
+
+from bybit_mcp_server.ratelimit import (
+    RateLimiter,
+    TokenBucket,
+    endpoint_group,
+    observe_response,
+    rate_limiter,
+    run_in_bucket,
+)
+
+
+def response(**headers):
+    return SimpleNamespace(headers=headers)
+
+
+class TestEndpointGroup:
+    def test_groups_from_pybit_mixins(self):
+        session = HTTP(api_key="key", api_secret="secret")
+        assert endpoint_group(session.get_tickers) == "market"
+        assert endpoint_group(session.place_order) == "trade"
+        assert endpoint_group(session.get_positions) == "position"
+        assert endpoint_group(session.get_wallet_balance) == "account"
+        assert endpoint_group(session.get_coin_balance) == "asset"
+
+    def test_unknown_callable(self):
+        assert endpoint_group(lambda: None) == "other"
+
+
+class TestTokenBucket:
+    def test_burst_is_free(self):
+        bucket = TokenBucket(rate=5)
+        assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+
+    def test_excess_calls_queue_in_order(self):
+        bucket = TokenBucket(rate=10)
+        for _ in range(10):
+            bucket.reserve()
+        waits = [bucket.reserve() for _ in range(3)]
+        assert waits == sorted(waits)
+        assert waits[0] == pytest.approx(0.1, abs=0.01)
+        assert waits[2] == pytest.approx(0.3, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_instead_of_failing(self):
+        bucket = TokenBucket(rate=50)
+        started = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire() for _ in range(60)))
+        assert time.perf_counter() - started >= 0.15
+
+    def test_server_remaining_caps_tokens(self):
+        bucket = TokenBucket(rate=10)
+        bucket.observe(remaining=2, limit=10, reset_ms=None)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() > 0
+
+    def test_exhausted_server_budget_pauses_until_reset(self):
+        bucket = TokenBucket(rate=100)
+        reset_ms = int(time.time() * 1000) + 500
+        bucket.observe(remaining=0, limit=10, reset_ms=reset_ms)
+        assert bucket.reserve() == pytest.approx(0.51, abs=0.05)
+        assert bucket.status()["server"] == {"remaining": 0, "limit": 10, "resetTimestamp": reset_ms}
+
+    def test_set_rate_caps_tokens(self):
+        bucket = TokenBucket(rate=10)
+        bucket.set_rate(2)
+        assert (bucket.rate, bucket.capacity, bucket.tokens) == (2, 2.0, 2.0)
+
+
+class TestRateLimiter:
+    def test_buckets_per_account_and_group(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_RATE_LIMITS", raising=False)
+        limiter = RateLimiter()
+        a = HTTP(api_key="aaaa1111", api_secret="s")
+        b = HTTP(api_key="bbbb2222", api_secret="s")
+        assert limiter.bucket_for(a.place_order) is not limiter.bucket_for(b.place_order)
+        assert limiter.bucket_for(a.get_tickers) is limiter.bucket_for(b.get_tickers)
+        accounts = {(s["account"], s["group"]) for s in limiter.status()}
+        assert accounts == {("***1111", "trade"), ("***2222", "trade"), ("public", "market")}
+
+    def test_disabled_group(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_RATE_LIMITS", "market=0")
+        assert RateLimiter().bucket("", "market") is None
+
+    def test_reload_updates_existing_buckets(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_RATE_LIMITS", "market=10,trade=5")
+        market = rate_limiter.bucket("", "market")
+        rate_limiter.bucket("key", "trade")
+        monkeypatch.setenv("BYBIT_RATE_LIMITS", "market=2,trade=0")
+        assert rate_limiter.bucket("", "market") is market
+        assert market.rate == 2
+        assert rate_limiter.bucket("key", "trade") is None
+
+
+class TestObserveResponse:
+    def test_headers_reach_running_bucket(self):
+        bucket = TokenBucket(rate=10)
+
+        def request():
+            observe_response(response(**{"X-Bapi-Limit-Status": "3", "X-Bapi-Limit": "10"}))
+            return "ok"
+
+        assert run_in_bucket(bucket, request, {}) == "ok"
+        assert bucket.server == {"remaining": 3, "limit": 10}
+
+    def test_ignored_outside_a_call(self):
+        observe_response(response(**{"X-Bapi-Limit-Status": "0"}))
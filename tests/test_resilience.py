@@ -0,0 +1,283 @@
+"""Tests for resilience module."""
+
+import asyncio
+import time
+
+import pytest
+import requests
+from pybit.exceptions import FailedRequestError, InvalidRequestError
+
+from bybit_mcp_server import resilience
+from bybit_mcp_server.client import call
+from bybit_mcp_server.metrics import server_metrics
+from bybit_mcp_server.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff,
+    breakers,
+    hedged,
+    is_outage,
+    is_transient,
+)
+
+OK = {"retCode": 0, "retMsg": "OK", "result": {}}
+
+
+def rejected(code):
+    return InvalidRequestError(request="", message="rejected", status_code=code, time="", resp_headers={})
+
+
+def server_error(status):
+    return FailedRequestError(request="", message="", status_code=status, time="", resp_headers={})
+
+
+class Scripted:
+    """Returns or raises the scripted outcomes in turn, after an optional delay each."""
+
+    def __init__(self, *outcomes, delays=()):
+        self.outcomes = list(outcomes)
+        self.delays = list(delays)
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        if self.delays:
+            time.sleep(self.delays.pop(0))
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+# Named like pybit's mixins, which is how call() finds an endpoint's group.
+class MarketHTTP:
+    def get_tickers(self, **params):
+        return self._next()
+
+
+class PositionHTTP:
+    def get_positions(self, **params):
+        return self._next()
+
+
+class TradeHTTP:
+    def place_order(self, **params):
+        return self._next()
+
+
+class Session(MarketHTTP, PositionHTTP, TradeHTTP, Scripted):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setenv("BYBIT_READ_RETRY_BACKOFF", "0")
+    monkeypatch.setenv("BYBIT_RATE_LIMITS", "market=0,trade=0,position=0")
+
+
+def endpoint(name):
+    return server_metrics.snapshot()["endpoints"][name]
+
+
+class TestIsTransient:
+    def test_network_errors(self):
+        assert is_transient(requests.exceptions.ReadTimeout())
+        assert is_transient(requests.exceptions.ConnectionError())
+
+    def test_ret_codes(self):
+        assert is_transient(rejected(10006))
+        assert not is_transient(rejected(110007))
+
+    def test_http_status(self):
+        assert is_transient(server_error(502))
+        assert not is_transient(server_error(403))
+
+    def test_pybit_retryable(self):
+        assert is_transient(Exception("Retryable error occurred, retrying..."))
+        assert not is_transient(ValueError("bad"))
+
+
+class TestIsOutage:
+    def test_rate_limits_are_not_outages(self):
+        assert not is_outage(rejected(10006))
+        assert not is_outage(Exception("Retryable error occurred, retrying..."))
+
+    def test_server_and_network_errors_are(self):
+        assert is_outage(server_error(503))
+        assert is_outage(rejected(10016))
+        assert is_outage(requests.exceptions.ConnectionError())
+
+
+class TestBackoff:
+    def test_bounded(self):
+        assert all(0 <= backoff(3, 0.1) <= 0.8 for _ in range(100))
+        assert backoff(30, 1.0) <= resilience.MAX_BACKOFF
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("get_tickers", threshold=3, cooldown=30)
+        assert [breaker.record(False) for _ in range(3)] == [False, False, True]
+        with pytest.raises(CircuitOpenError, match="get_tickers .* 30s"):
+            breaker.before_call()
+
+    def test_success_resets_count(self):
+        breaker = CircuitBreaker("get_tickers", threshold=2, cooldown=30)
+        breaker.record(False)
+        breaker.record(True)
+        assert not breaker.record(False)
+        breaker.before_call()
+
+    def test_half_open_lets_one_trial_through(self, monkeypatch):
+        breaker = CircuitBreaker("get_tickers", threshold=1, cooldown=30)
+        breaker.record(False)
+        later = time.monotonic() + 31
+        monkeypatch.setattr(resilience.time, "monotonic", lambda: later)
+        breaker.before_call()
+        assert breaker.state == "half-open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record(True)
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self, monkeypatch):
+        breaker = CircuitBreaker("get_tickers", threshold=1, cooldown=30)
+        breaker.record(False)
+        later = time.monotonic() + 31
+        monkeypatch.setattr(resilience.time, "monotonic", lambda: later)
+        breaker.before_call()
+        assert breaker.record(False)
+        assert breaker.state == "open"
+
+    def test_threshold_zero_never_opens(self):
+        breaker = CircuitBreaker("get_tickers", threshold=0, cooldown=30)
+        assert not any(breaker.record(False) for _ in range(100))
+        breaker.before_call()
+
+
+class TestHedged:
+    @pytest.mark.asyncio
+    async def test_fast_call_not_hedged(self):
+        events = []
+
+        async def attempt():
+            return "first"
+
+        assert await hedged(attempt, 0.05, events.append) == "first"
+        assert events == []
+
+    @pytest.mark.asyncio
+    async def test_slow_call_hedged(self):
+        events, delays = [], [1.0, 0.0]
+
+        async def attempt():
+            await asyncio.sleep(delays.pop(0))
+            return "answer"
+
+        started = time.perf_counter()
+        assert await hedged(attempt, 0.01, events.append) == "answer"
+        assert time.perf_counter() - started < 0.5
+        assert events == ["hedges", "hedgeWins"]
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_first(self):
+        events, calls = [], []
+
+        async def attempt():
+            calls.append(None)
+            if len(calls) == 2:
+                raise requests.exceptions.ConnectionError()
+            await asyncio.sleep(0.05)
+            return "first"
+
+        assert await hedged(attempt, 0.01, events.append) == "first"
+        assert events == ["hedges"]
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises(self):
+        async def attempt():
+            await asyncio.sleep(0.02)
+            raise requests.exceptions.ConnectionError()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            await hedged(attempt, 0.01, lambda event: None)
+
+
+class TestReadCalls:
+    @pytest.mark.asyncio
+    async def test_transient_read_retried(self):
+        session = Session(requests.exceptions.ReadTimeout(), server_error(502), OK)
+        assert await call(session.get_tickers, category="linear") == OK
+        assert session.calls == 3
+        assert endpoint("get_tickers")["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retries(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_READ_RETRIES", "1")
+        session = Session(requests.exceptions.ConnectionError())
+        with pytest.raises(requests.exceptions.ConnectionError):
+            await call(session.get_tickers, category="linear")
+        assert session.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_rejection_not_retried(self):
+        session = Session(rejected(10001))
+        with pytest.raises(InvalidRequestError):
+            await call(session.get_tickers, category="linear")
+        assert session.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_not_retried(self):
+        session = Session(requests.exceptions.ReadTimeout(), OK)
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            await call(session.place_order, category="linear")
+        assert session.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_breaker_fails_fast(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_READ_RETRIES", "0")
+        monkeypatch.setenv("BYBIT_BREAKER_THRESHOLD", "2")
+        session = Session(server_error(503))
+        for _ in range(2):
+            with pytest.raises(FailedRequestError):
+                await call(session.get_positions, category="linear")
+        with pytest.raises(CircuitOpenError):
+            await call(session.get_positions, category="linear")
+        assert session.calls == 2
+        metrics = endpoint("get_positions")
+        assert (metrics["breakerOpens"], metrics["shortCircuited"]) == (1, 1)
+        assert breakers.status()["get_positions"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_stops_retries(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_BREAKER_THRESHOLD", "1")
+        session = Session(server_error(503))
+        with pytest.raises(FailedRequestError):
+            await call(session.get_positions, category="linear")
+        assert session.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_do_not_open_breaker(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_READ_RETRIES", "0")
+        monkeypatch.setenv("BYBIT_BREAKER_THRESHOLD", "1")
+        session = Session(rejected(10006), OK)
+        with pytest.raises(InvalidRequestError):
+            await call(session.get_tickers, category="linear")
+        assert await call(session.get_tickers, category="linear") == OK
+
+    @pytest.mark.asyncio
+    async def test_market_read_hedged(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HEDGE_AFTER_SECONDS", "0.02")
+        session = Session(OK, delays=[0.5, 0.0])
+        started = time.perf_counter()
+        assert await call(session.get_tickers, category="linear") == OK
+        assert time.perf_counter() - started < 0.4
+        metrics = endpoint("get_tickers")
+        assert (metrics["hedges"], metrics["hedgeWins"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_private_read_not_hedged(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_HEDGE_AFTER_SECONDS", "0.01")
+        session = Session(OK, delays=[0.05])
+        assert await call(session.get_positions, category="linear") == OK
+        assert session.calls == 1
@@ -0,0 +1,218 @@
+"""Tests for the server entry point and its transports."""
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamable_http_client
+
+from bybit_mcp_server.config import Mode, get_settings
+from bybit_mcp_server.ratelimit import rate_limiter
+from bybit_mcp_server.server import BybitMCP, _parse_args, _reload_on_sighup, build_http_server
+from bybit_mcp_server.server import mcp as server_mcp
+from bybit_mcp_server.tools.market import register_market_tools
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def http_server(patch_session):
+    """Start a fresh app over an HTTP transport in a thread; yields (url, app, server)."""
+    started = []
+
+    def start(transport, **options):
+        app = BybitMCP("test")
+        register_market_tools(app)
+        port = free_port()
+        server = build_http_server(app, transport, "127.0.0.1", port, shutdown_timeout=2, **options)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        started.append((server, thread))
+        deadline = time.monotonic() + 10
+        while not server.started:
+            assert time.monotonic() < deadline, "server did not start"
+            time.sleep(0.01)
+        path = "/mcp" if transport == "streamable-http" else "/sse"
+        return f"http://127.0.0.1:{port}{path}", server, thread
+
+    yield start
+    for server, thread in started:
+        server.should_exit = True
+        thread.join(10)
+
+
+async def server_time(client, url, **options):
+    async with client(url, **options) as streams, ClientSession(streams[0], streams[1]) as session:
+        await session.initialize()
+        result = await session.call_tool("get_server_time", {})
+        return json.loads(result.content[0].text)
+
+
+class TestParseArgs:
+    def test_defaults_from_env(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_TRANSPORT", "sse")
+        monkeypatch.setenv("BYBIT_PORT", "9000")
+        args = _parse_args([])
+        assert (args.transport, args.host, args.port) == ("sse", "127.0.0.1", 9000)
+
+    def test_flags_override_env(self, monkeypatch):
+        monkeypatch.setenv("BYBIT_TRANSPORT", "sse")
+        args = _parse_args(["--transport", "streamable-http", "--port", "9001"])
+        assert (args.transport, args.port) == ("streamable-http", 9001)
+
+
+class TestConcurrencyLimit:
+    @pytest.mark.asyncio
+    async def test_limits_calls_in_flight(self):
+        app = BybitMCP("test")
+        running = peak = 0
+
+        @app.tool()
+        async def slow() -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return "ok"
+
+        app.limit_concurrent_calls(2)
+        await asyncio.gather(*(app.call_tool("slow", {}) for _ in range(6)))
+        assert peak == 2
+
+        app.limit_concurrent_calls(0)
+        peak = 0
+        await asyncio.gather(*(app.call_tool("slow", {}) for _ in range(6)))
+        assert peak == 6
+
+
+class TestDeferredTools:
+    @pytest.mark.asyncio
+    async def test_registered_on_first_list(self, patch_session):
+        app = BybitMCP("test")
+        calls = []
+        app.defer(lambda target: calls.append(target) or register_market_tools(target))
+        assert calls == []
+        assert "get_tickers" in {tool.name for tool in await app.list_tools()}
+        await app.list_tools()
+        assert calls == [app]
+
+    @pytest.mark.asyncio
+    async def test_registered_on_first_call(self, patch_session):
+        app = BybitMCP("test")
+        app.defer(register_market_tools)
+        result = await app.call_tool("get_server_time", {})
+        assert json.loads(result[0][0].text)["timeSecond"] == "1700000000"
+
+    @pytest.mark.asyncio
+    async def test_server_tools(self):
+        tools = [tool.name for tool in await server_mcp.list_tools()]
+        assert tools[0] == "get_server_time"
+        assert tools[-1] == "confirm_order"
+        assert len(tools) == len(set(tools))
+
+    def test_import_skips_pybit_and_tool_modules(self):
+        heavy = ("pybit.unified_trading", "requests", "websocket", "numpy", "bybit_mcp_server.tools.market")
+        code = f"import sys, bybit_mcp_server.server\nprint([name for name in {heavy!r} if name in sys.modules])"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "[]"
+
+
+class TestSettingsReload:
+    @pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="no SIGHUP on this platform")
+    def test_sighup_reloads(self, monkeypatch):
+        previous = signal.getsignal(signal.SIGHUP)
+        try:
+            _reload_on_sighup()
+            monkeypatch.setitem(os.environ, "BYBIT_MODE", "full")
+            assert get_settings().mode == Mode.READ
+            os.kill(os.getpid(), signal.SIGHUP)
+            assert get_settings().mode == Mode.FULL
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="no SIGHUP on this platform")
+    @pytest.mark.asyncio
+    async def test_sighup_while_loop_holds_bucket_lock(self, monkeypatch):
+        previous = signal.getsignal(signal.SIGHUP)
+        try:
+            _reload_on_sighup()
+            monkeypatch.setitem(os.environ, "BYBIT_MODE", "full")
+            bucket = rate_limiter.bucket("", "market")
+            with rate_limiter._lock, bucket._lock:
+                # Reloading here would block on locks this thread holds.
+                os.kill(os.getpid(), signal.SIGHUP)
+                assert get_settings().mode == Mode.READ
+            await asyncio.sleep(0.01)
+            assert get_settings().mode == Mode.FULL
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+
+
+class TestDispatchDefaults:
+    def test_quiet_log(self):
+        assert BybitMCP("test").settings.log_level == "WARNING"
+
+
+class TestHttpTransports:
+    @pytest.mark.asyncio
+    async def test_streamable_http_serves_concurrent_clients(self, http_server, patch_session):
+        url, _, _ = http_server("streamable-http")
+        results = await asyncio.gather(*(server_time(streamable_http_client, url) for _ in range(3)))
+        assert all(result["timeSecond"] == "1700000000" for result in results)
+        # One process, so every client shares the response cache.
+        patch_session.get_server_time.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sse(self, http_server, patch_session):
+        url, _, _ = http_server("sse")
+        assert (await server_time(sse_client, url))["timeSecond"] == "1700000000"
+
+    def test_graceful_shutdown(self, http_server):
+        _, server, thread = http_server("streamable-http")
+        server.should_exit = True
+        thread.join(10)
+        assert not thread.is_alive()
+
+
+class TestHttpAuth:
+    def test_refuses_public_bind_without_auth(self):
+        with pytest.raises(ValueError, match="BYBIT_HTTP_TOKEN"):
+            build_http_server(BybitMCP("test"), "streamable-http", "0.0.0.0", free_port(), shutdown_timeout=2)
+
+    def test_public_bind_with_token(self):
+        app = BybitMCP("test")
+        build_http_server(app, "streamable-http", "0.0.0.0", free_port(), shutdown_timeout=2, token="secret")
+        assert app.settings.transport_security is None
+
+    def test_public_bind_with_allowed_hosts(self):
+        app = BybitMCP("test")
+        build_http_server(
+            app, "streamable-http", "0.0.0.0", free_port(), shutdown_timeout=2, allowed_hosts=("mcp.example.com",)
+        )
+        security = app.settings.transport_security
+        assert security.enable_dns_rebinding_protection
+        assert security.allowed_hosts == ["mcp.example.com"]
+
+    @pytest.mark.asyncio
+    async def test_token_required(self, http_server):
+        url, _, _ = http_server("sse", token="secret")
+        async with httpx.AsyncClient() as client:
+            assert (await client.get(url)).status_code == 401
+            assert (await client.get(url, headers={"Authorization": "Bearer wrong"})).status_code == 401
+        headers = {"Authorization": "Bearer secret"}
+        assert (await server_time(sse_client, url, headers=headers))["timeSecond"] == "1700000000"
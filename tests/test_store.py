@@ -0,0 +1,85 @@
+"""Tests for store module."""
+
+import pytest
+
+from bybit_mcp_server.store import HistoryStore, get_history_store, merge_ranges, subtract_ranges
+
+MINUTE = 60_000
+SOURCE = "https://api-testnet.bybit.com"
+SERIES = (SOURCE, "kline", "linear", "BTCUSDT", "1")
+
+
+def bar(ts):
+    return [str(ts), "1", "2", "0.5", "1.5", "10", "100"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+class TestRanges:
+    def test_merge_joins_overlapping_and_adjacent(self):
+        assert merge_ranges([(5, 6), (0, 2), (3, 4), (10, 12)], 1) == [(0, 6), (10, 12)]
+
+    def test_subtract_returns_uncovered_parts(self):
+        covered = [(2 * MINUTE, 4 * MINUTE), (7 * MINUTE, 8 * MINUTE)]
+        assert subtract_ranges(0, 9 * MINUTE, covered, MINUTE) == [
+            (0, MINUTE),
+            (5 * MINUTE, 6 * MINUTE),
+            (9 * MINUTE, 9 * MINUTE),
+        ]
+
+    def test_subtract_fully_covered(self):
+        assert subtract_ranges(MINUTE, 2 * MINUTE, [(0, 5 * MINUTE)], MINUTE) == []
+
+
+class TestHistoryStore:
+    def test_bars_round_trip(self, store):
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", [bar(MINUTE), bar(0)], 0, MINUTE, MINUTE)
+        assert store.get_bars(SOURCE, "linear", "BTCUSDT", "1", 0, MINUTE) == [bar(0), bar(MINUTE)]
+        assert store.count(SERIES) == 2
+
+    def test_duplicate_bars_are_ignored(self, store):
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", [bar(0)], 0, 0, MINUTE)
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", [bar(0)], 0, 0, MINUTE)
+        assert store.count(SERIES) == 1
+
+    def test_coverage_merges_adjacent_windows(self, store):
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", [], 0, 4 * MINUTE, MINUTE)
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", [], 5 * MINUTE, 9 * MINUTE, MINUTE)
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", [], 20 * MINUTE, 29 * MINUTE, MINUTE)
+        assert store.coverage(SERIES) == [(0, 9 * MINUTE), (20 * MINUTE, 29 * MINUTE)]
+        assert store.missing(SERIES, 0, 30 * MINUTE, MINUTE) == [(10 * MINUTE, 19 * MINUTE), (30 * MINUTE, 30 * MINUTE)]
+
+    def test_series_are_separated_by_source(self, store):
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", [bar(0)], 0, 0, MINUTE)
+        assert store.get_bars("https://api.bybit.com", "linear", "BTCUSDT", "1", 0, 0) == []
+
+    def test_funding_round_trip(self, store):
+        rows = [{"symbol": "BTCUSDT", "fundingRate": "0.0001", "fundingRateTimestamp": str(ts)} for ts in (0, 100)]
+        store.put_funding(SOURCE, "linear", "BTCUSDT", rows, 0, 200)
+        assert [r["fundingRateTimestamp"] for r in store.get_funding(SOURCE, "linear", "BTCUSDT", 0, 200)] == [
+            "100",
+            "0",
+        ]
+        assert store.coverage((SOURCE, "funding", "linear", "BTCUSDT", "")) == [(0, 200)]
+
+    def test_compact(self, store):
+        bars = [bar(ts * MINUTE) for ts in range(100)]
+        store.put_bars(SOURCE, "linear", "BTCUSDT", "1", bars, 0, 99 * MINUTE, MINUTE)
+        sizes = store.compact()
+        assert sizes["bytes_after"] > 0
+        assert store.count(SERIES) == 100
+
+
+class TestGetHistoryStore:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_HISTORY_DB", raising=False)
+        assert get_history_store() is None
+
+    def test_opened_once(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("BYBIT_HISTORY_DB", str(tmp_path / "history.db"))
+        assert get_history_store() is get_history_store()
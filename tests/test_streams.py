@@ -0,0 +1,176 @@
+"""Tests for stream tools and the shared stream layer."""
+
+import functools
+import json
+import time
+from pathlib import Path
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from bybit_mcp_server.marketstream import MarketStreams
+from bybit_mcp_server.streams import StreamHub
+from bybit_mcp_server.tools.market import register_market_tools
+from bybit_mcp_server.tools.streams import register_stream_tools
+from bybit_mcp_server.wsclient import BybitWebSocket
+
+REPLAY = Path(__file__).parent / "fixtures" / "orderbook_linear_btcusdt.jsonl"
+
+
+@pytest.fixture
+def mcp_app(patch_session, fake_streams):
+    app = FastMCP("test")
+    register_market_tools(app)
+    register_stream_tools(app)
+    return app
+
+
+def feed(hub, count):
+    stream = hub.get("linear")
+    for line in REPLAY.read_text().splitlines()[:count]:
+        stream._on_message(json.loads(line))
+
+
+class TestStream:
+    def test_unsubscribe_acks_go_to_pybit(self, fake_streams):
+        stream = fake_streams.stream("linear")
+        handled = []
+        stream._ws._handle_incoming_message = handled.append
+        stream._on_message({"op": "subscribe", "success": True, "req_id": "abc"})
+        stream._on_message({"op": "unsubscribe", "success": True, "req_id": "abc"})
+        assert handled == [{"op": "unsubscribe", "success": True, "req_id": "abc"}]
+
+    def test_one_connection_per_channel(self, fake_streams):
+        assert fake_streams.stream("linear") is fake_streams.stream("linear")
+        assert fake_streams.stream("spot") is not fake_streams.stream("linear")
+
+
+class TestOrderbookTools:
+    @pytest.mark.asyncio
+    async def test_get_orderbook_served_from_stream(self, mcp_app, patch_session, fake_streams):
+        result = await mcp_app.call_tool("subscribe_orderbook", {"category": "linear", "symbol": "BTCUSDT"})
+        assert json.loads(result[0][0].text)["depth"] == 50
+        feed(fake_streams, 2)
+
+        result = await mcp_app.call_tool("get_orderbook", {"category": "linear", "symbol": "BTCUSDT", "limit": 1})
+        data = json.loads(result[0][0].text)
+        assert data["b"] == [["50000.0", "1.5"]]
+        assert data["u"] == 1001
+        patch_session.get_orderbook.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_rest_until_synced(self, mcp_app, patch_session, fake_streams):
+        await mcp_app.call_tool("subscribe_orderbook", {"category": "linear", "symbol": "BTCUSDT"})
+        await mcp_app.call_tool("get_orderbook", {"category": "linear", "symbol": "BTCUSDT"})
+        patch_session.get_orderbook.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_and_status(self, mcp_app, fake_streams):
+        await mcp_app.call_tool("subscribe_orderbook", {"category": "linear", "symbol": "BTCUSDT"})
+        feed(fake_streams, 1)
+        result = await mcp_app.call_tool("get_stream_status", {})
+        [book] = json.loads(result[0][0].text)["orderbooks"]
+        assert book["synced"] and book["bids"] == 3
+
+        result = await mcp_app.call_tool("unsubscribe_orderbook", {"category": "linear", "symbol": "BTCUSDT"})
+        assert json.loads(result[0][0].text)["unsubscribed"] is True
+        result = await mcp_app.call_tool("get_stream_status", {})
+        assert json.loads(result[0][0].text)["orderbooks"] == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_depth(self, mcp_app):
+        result = await mcp_app.call_tool("subscribe_orderbook", {"category": "linear", "symbol": "BTCUSDT", "depth": 7})
+        assert "error" in json.loads(result[0][0].text)
+
+
+class TestMarketDataTools:
+    @pytest.mark.asyncio
+    async def test_trades_seeded_then_streamed(self, mcp_app, patch_session, fake_streams):
+        patch_session.get_public_trade_history.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {
+                "category": "linear",
+                "list": [{"execId": "a", "symbol": "BTCUSDT", "price": "1", "size": "1", "side": "Buy", "time": "1"}],
+            },
+        }
+        result = await mcp_app.call_tool("subscribe_market_data", {"category": "linear", "symbol": "BTCUSDT"})
+        assert json.loads(result[0][0].text)["trades"]["trades"] == 1
+        patch_session.get_public_trade_history.assert_called_once_with(category="linear", symbol="BTCUSDT", limit=1000)
+
+        fake_streams.get("linear")._on_message(
+            {
+                "topic": "publicTrade.BTCUSDT",
+                "type": "snapshot",
+                "data": [{"T": 2, "s": "BTCUSDT", "S": "Sell", "v": "2", "p": "2", "i": "b", "BT": False}],
+            }
+        )
+        result = await mcp_app.call_tool("get_public_trades", {"category": "linear", "symbol": "BTCUSDT"})
+        data = json.loads(result[0][0].text)
+        assert [t["execId"] for t in data["list"]] == ["b", "a"]
+        patch_session.get_public_trade_history.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_ticker_served_from_stream(self, mcp_app, patch_session, fake_streams):
+        await mcp_app.call_tool("subscribe_market_data", {"category": "linear", "symbol": "BTCUSDT", "trades": False})
+        fake_streams.get("linear")._on_message(
+            {"topic": "tickers.BTCUSDT", "type": "snapshot", "ts": 5, "data": {"symbol": "BTCUSDT", "lastPrice": "7"}}
+        )
+        result = await mcp_app.call_tool("get_tickers", {"category": "linear", "symbol": "BTCUSDT"})
+        assert json.loads(result[0][0].text)["list"] == [{"symbol": "BTCUSDT", "lastPrice": "7"}]
+        patch_session.get_tickers.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_status_lists_connections(self, mcp_app, fake_streams):
+        await mcp_app.call_tool("subscribe_market_data", {"category": "spot", "symbol": "BTCUSDT", "trades": False})
+        result = await mcp_app.call_tool("get_stream_status", {})
+        data = json.loads(result[0][0].text)
+        assert data["connections"] == [
+            {"channel": "spot", "connected": True, "reconnects": 0, "topics": ["tickers.BTCUSDT"]}
+        ]
+        assert data["tickers"][0]["ready"] is False
+
+    @pytest.mark.asyncio
+    async def test_option_trades_error(self, mcp_app):
+        result = await mcp_app.call_tool("subscribe_market_data", {"category": "option", "symbol": "BTC-1JAN26-1-C"})
+        assert "error" in json.loads(result[0][0].text)
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestLiveConnection:
+    """pybit against a local WebSocket server."""
+
+    @pytest.fixture
+    def hub(self, stream_server):
+        hub = StreamHub(factory=functools.partial(BybitWebSocket, ping_interval=2, ping_timeout=1))
+        yield hub
+        hub.close()
+
+    def test_ticker_survives_reconnect(self, stream_server, hub):
+        streams = MarketStreams(hub)
+        streams.subscribe("linear", "BTCUSDT", trades=False)
+        stream_server.wait_for(lambda: any(r.get("args") == ["tickers.BTCUSDT"] for r in stream_server.requests))
+
+        stream_server.push({"topic": "tickers.BTCUSDT", "type": "snapshot", "ts": 1, "data": {"lastPrice": "1"}})
+        wait_until(lambda: streams.get_ticker("linear", "BTCUSDT") is not None)
+
+        stream_server.drop()
+        stream_server.wait_for(lambda: stream_server.connections == 2 and len(stream_server.requests) == 2)
+        assert stream_server.requests[1]["args"] == ["tickers.BTCUSDT"]
+        wait_until(lambda: hub.get("linear").reconnects == 1 and hub.get("linear").is_connected())
+
+        stream_server.push({"topic": "tickers.BTCUSDT", "type": "delta", "ts": 2, "data": {"lastPrice": "2"}})
+        wait_until(lambda: streams.get_ticker("linear", "BTCUSDT")["result"]["list"][0]["lastPrice"] == "2")
+
+    def test_close_does_not_reconnect(self, stream_server, hub):
+        hub.stream("spot")
+        stream_server.wait_for(lambda: stream_server.connections == 1)
+        hub.close()
+        time.sleep(0.3)
+        assert stream_server.connections == 1
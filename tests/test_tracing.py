@@ -0,0 +1,199 @@
+"""Tests for span tracing."""
+
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from bybit_mcp_server.client import get_session, reset_session, run_sync
+from bybit_mcp_server.decorators import instrument_tools
+from bybit_mcp_server.server import BybitMCP
+from bybit_mcp_server.server import mcp as server_mcp
+from bybit_mcp_server.tools.market import register_market_tools
+from bybit_mcp_server.tracing import (
+    ConsoleExporter,
+    JsonFileExporter,
+    MemoryExporter,
+    OtlpExporter,
+    configure_tracing,
+    set_exporter,
+    shutdown_tracing,
+    span,
+    tracing_enabled,
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = MemoryExporter()
+    previous = set_exporter(exporter)
+    yield exporter
+    set_exporter(previous)
+
+
+def by_name(exporter):
+    return {span.name: span for span in exporter.spans}
+
+
+class TestSpan:
+    def test_disabled_is_noop(self):
+        assert not tracing_enabled()
+        with span("a") as outer, span("b") as inner:
+            inner.set(x=1)
+        assert outer is inner
+
+    def test_nesting(self, exporter):
+        with span("outer", a=1):
+            with span("inner") as inner:
+                inner.set(b=2)
+        with span("next"):
+            pass
+        spans = by_name(exporter)
+        assert exporter.names() == ["inner", "outer", "next"]
+        assert spans["inner"].parent_id == spans["outer"].span_id
+        assert spans["inner"].trace_id == spans["outer"].trace_id != spans["next"].trace_id
+        assert spans["inner"].attributes == {"b": 2}
+        assert spans["outer"].end_ns >= spans["inner"].end_ns
+
+    def test_records_errors(self, exporter):
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+        assert exporter.spans[0].to_dict()["status"] == "error"
+        assert exporter.spans[0].error == "ValueError: boom"
+
+    @pytest.mark.asyncio
+    async def test_parent_crosses_worker_threads(self, exporter):
+        def work():
+            with span("worker"):
+                pass
+
+        with span("caller"):
+            await run_sync(work)
+        spans = by_name(exporter)
+        assert spans["worker"].parent_id == spans["caller"].span_id
+
+
+class TestExporters:
+    def test_console(self):
+        stream = io.StringIO()
+        exporter = ConsoleExporter(stream)
+        previous = set_exporter(exporter)
+        try:
+            with span("stage", endpoint="get_tickers"):
+                pass
+        finally:
+            set_exporter(previous)
+        assert " stage " in stream.getvalue()
+        assert '"endpoint": "get_tickers"' in stream.getvalue()
+
+    def test_json_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "traces.jsonl"
+        monkeypatch.setenv("BYBIT_TRACE_EXPORTER", "json")
+        monkeypatch.setenv("BYBIT_TRACE_FILE", str(path))
+        assert isinstance(configure_tracing(), JsonFileExporter)
+        try:
+            with span("outer"), span("inner"):
+                pass
+        finally:
+            shutdown_tracing()
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [row["name"] for row in rows] == ["inner", "outer"]
+        assert rows[0]["parentSpanId"] == rows[1]["spanId"]
+
+    def test_unset_leaves_tracing_off(self, monkeypatch):
+        monkeypatch.delenv("BYBIT_TRACE_EXPORTER", raising=False)
+        assert configure_tracing() is None
+        assert not tracing_enabled()
+
+    def test_otlp(self):
+        bodies = []
+
+        class Collector(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802
+                bodies.append((self.path, json.loads(self.rfile.read(int(self.headers["Content-Length"])))))
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Collector)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        exporter = OtlpExporter(f"http://127.0.0.1:{server.server_address[1]}/v1/traces", interval=60)
+        previous = set_exporter(exporter)
+        try:
+            with span("outer", n=1), span("inner"):
+                pass
+            exporter.shutdown()
+        finally:
+            set_exporter(previous)
+            server.shutdown()
+            server.server_close()
+        path, body = bodies[0]
+        assert path == "/v1/traces"
+        spans = body["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in spans] == ["inner", "outer"]
+        assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+        assert spans[1]["attributes"] == [{"key": "n", "value": {"intValue": "1"}}]
+        assert exporter.exported == 2
+
+    def test_otlp_drops_when_collector_is_down(self):
+        exporter = OtlpExporter("http://127.0.0.1:9/v1/traces", interval=60, timeout=1)
+        previous = set_exporter(exporter)
+        try:
+            with span("lost"):
+                pass
+            exporter.shutdown()
+        finally:
+            set_exporter(previous)
+        assert exporter.dropped == 1
+
+
+class TestToolTracing:
+    @pytest.mark.asyncio
+    async def test_stages_of_a_tool_call(self, exporter, patch_session):
+        app = BybitMCP("test")
+        register_market_tools(app)
+        instrument_tools(app)
+        await app.call_tool("get_tickers", {"category": "spot", "symbol": "BTCUSDT"})
+        spans = by_name(exporter)
+        # get_session is patched out here, so it has no span.
+        assert set(spans) == {
+            "mcp.call_tool",
+            "tool.get_tickers",
+            "bybit.call",
+            "rate_limit.wait",
+            "http.request",
+            "format",
+        }
+        assert len({s.trace_id for s in exporter.spans}) == 1
+        assert spans["http.request"].parent_id == spans["bybit.call"].span_id
+        assert spans["bybit.call"].parent_id == spans["tool.get_tickers"].span_id
+        assert spans["tool.get_tickers"].parent_id == spans["mcp.call_tool"].span_id
+        assert spans["bybit.call"].attributes["retCode"] == 0
+
+    @pytest.mark.asyncio
+    async def test_confirm_order_stages(self, exporter, patch_session, monkeypatch):
+        monkeypatch.setenv("BYBIT_MODE", "trade")
+        result = await server_mcp.call_tool("cancel_all_orders", {"category": "linear"})
+        confirmation_id = json.loads(result[0][0].text)["confirmation_id"]
+        exporter.spans.clear()
+        await server_mcp.call_tool("confirm_order", {"confirmation_id": confirmation_id})
+        spans = by_name(exporter)
+        assert spans["execute_confirmed"].attributes == {"found": True}
+        # Permissions are resolved when settings load, not per call.
+        assert "require_mode" not in spans
+        assert spans["http.request"].trace_id == spans["mcp.call_tool"].trace_id
+
+    def test_session_creation(self, exporter):
+        with patch("pybit.unified_trading.HTTP"):
+            reset_session()
+            get_session()
+            get_session()
+            reset_session()
+        assert [s.attributes["rebuilt"] for s in exporter.spans] == [True, False]
@@ -5,7 +5,8 @@ import json
 import pytest
 from mcp.server.fastmcp import FastMCP
 
-from bybit_mcp_server.decorators import _pending_confirmations
+from bybit_mcp_server.confirmations import get_confirmation_store
+from bybit_mcp_server.decorators import execute_confirmed, get_impl
 from bybit_mcp_server.tools.trade import register_trade_tools
 
 
@@ -18,9 +19,9 @@ def mcp_app(patch_session):
 
 @pytest.fixture(autouse=True)
 def clear_pending():
-    _pending_confirmations.clear()
+    get_confirmation_store().clear()
     yield
-    _pending_confirmations.clear()
+    get_confirmation_store().clear()
 
 
 class TestGetOpenOrders:
@@ -30,6 +31,29 @@ class TestGetOpenOrders:
         data = json.loads(result[0][0].text)
         assert "list" in data
 
+    @pytest.mark.asyncio
+    async def test_fetch_all(self, mcp_app, patch_session):
+        patch_session.get_open_orders.side_effect = [
+            {"retCode": 0, "retMsg": "OK", "result": {"list": [{"orderId": "1"}], "nextPageCursor": "abc"}},
+            {"retCode": 0, "retMsg": "OK", "result": {"list": [{"orderId": "2"}], "nextPageCursor": ""}},
+        ]
+        result = await mcp_app.call_tool("get_open_orders", {"category": "linear", "fetch_all": True})
+        data = json.loads(result[0][0].text)
+        assert [o["orderId"] for o in data["list"]] == ["1", "2"]
+        assert data["pageCount"] == 2
+        patch_session.get_open_orders.assert_called_with(category="linear", cursor="abc")
+
+    @pytest.mark.asyncio
+    async def test_filters(self, mcp_app, patch_session):
+        patch_session.get_open_orders.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"list": [{"orderId": "1", "side": "Buy"}, {"orderId": "2", "side": "Sell"}]},
+        }
+        args = {"category": "linear", "filters": ["side == Sell"], "fields": ["orderId"]}
+        result = await mcp_app.call_tool("get_open_orders", args)
+        assert json.loads(result[0][0].text)["list"] == [{"orderId": "2"}]
+
 
 class TestGetOrderHistory:
     @pytest.mark.asyncio
@@ -68,6 +92,15 @@ class TestPlaceOrder:
         assert data["status"] == "confirmation_required"
         assert "confirmation_id" in data
 
+    @pytest.mark.asyncio
+    async def test_reused_order_link_id_for_other_order(self, mcp_app, patch_session):
+        order = {"category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Market", "orderLinkId": "mine"}
+        place = get_impl("place_order")
+        await place(**order, qty="0.001")
+        data = json.loads(await place(**order, qty="0.002"))
+        assert "already used for a different order" in data["error"]
+        patch_session.place_order.assert_called_once()
+
 
 class TestCancelOrder:
     @pytest.mark.asyncio
@@ -96,3 +129,37 @@ class TestCancelAllOrders:
         result = await mcp_app.call_tool("cancel_all_orders", {"category": "spot"})
         data = json.loads(result[0][0].text)
         assert data["status"] == "confirmation_required"
+
+
+class TestBatchOrders:
+    @pytest.mark.asyncio
+    async def test_one_confirmation_for_the_batch(self, mcp_app, patch_session, monkeypatch):
+        monkeypatch.setenv("BYBIT_MODE", "trade")
+        patch_session.cancel_batch_order.return_value = {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"list": [{"symbol": "BTCUSDT", "orderId": "1"}, {"symbol": "ETHUSDT", "orderId": "2"}]},
+            "retExtInfo": {"list": [{"code": 0, "msg": "OK"}, {"code": 110001, "msg": "Order does not exist"}]},
+        }
+        orders = [{"symbol": "BTCUSDT", "orderId": "1"}, {"symbol": "ETHUSDT", "orderId": "2"}]
+        result = await mcp_app.call_tool("cancel_batch_order", {"category": "linear", "orders": orders})
+        data = json.loads(result[0][0].text)
+        assert data["status"] == "confirmation_required"
+        patch_session.cancel_batch_order.assert_not_called()
+
+        pending = execute_confirmed(data["confirmation_id"])
+        data = json.loads(await get_impl(pending["tool"])(**pending["kwargs"]))
+        patch_session.cancel_batch_order.assert_called_once_with(category="linear", request=orders)
+        assert (data["succeeded"], data["failed"]) == (1, 1)
+        assert data["list"][1]["msg"] == "Order does not exist"
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, mcp_app, patch_session):
+        data = json.loads(await get_impl("place_batch_order")(category="linear", orders=[]))
+        assert "error" in data
+
+    @pytest.mark.asyncio
+    async def test_requires_trade_mode(self, mcp_app, monkeypatch):
+        monkeypatch.setenv("BYBIT_MODE", "read")
+        result = await mcp_app.call_tool("place_batch_order", {"category": "linear", "orders": [{}]})
+        assert "Permission denied" in json.loads(result[0][0].text)["error"]